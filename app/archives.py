@@ -0,0 +1,93 @@
+"""완료된 대회의 스냅샷 보관본.
+
+완료(`status = completed`)된 대회는 더 바뀌지 않는데, 지난 대회를 열 때마다 팀/회원/경기를 읽어
+순위와 대진을 다시 계산했다. 관리자가 대회를 완료로 바꾸는 순간 스냅샷을 한 번 만들어
+`tournament_archives`에 JSON 그대로 저장하고, 이후 조회는 그 바이트를 ETag와 함께 바로 돌려준다.
+관리자가 상태를 다시 바꿔 대회를 열면 보관본을 지우고, 다음 완료 때 새로 만든다. 클라이언트는 매번 ETag로
+재검증하므로(`no-cache`) 평소에는 본문 없는 304로 끝나고, 다시 열린 대회는 바로 새 스냅샷을 받는다.
+
+워커마다 보관본(과 "보관본이 없음")을 메모리에 들고 있되 `tournament:{id}` 태그 버전을 함께 적어
+두므로, 완료/재개가 태그를 무효화하면 공유 캐시를 통해 모든 워커가 다음 요청에서 다시 읽는다.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi.responses import Response
+
+from app.cache import response_cache
+from app.compression import etag_matches, precompressed_response
+from app.config import TOURNAMENT_ARCHIVE_CACHE_ENTRIES
+from app.serialization import dumps
+
+
+@dataclass
+class Archive:
+    body: bytes
+    etag: str
+    # Content-Encoding별 압축본. 처음 요청될 때 한 번만 만든다.
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+
+def make_archive(snapshot: dict) -> Archive:
+    body = dumps(snapshot)
+    return Archive(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def archive_tag(event_id: str) -> str:
+    return f"tournament:{event_id}"
+
+
+class ArchiveStore:
+    """대회 id → (태그 버전, 보관본 또는 None). 태그 버전이 바뀐 항목은 다시 읽는다."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, ...], Optional[Archive]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, event_id: str, load: Callable[[], Optional[Archive]]) -> Optional[Archive]:
+        version = response_cache.tag_versions([archive_tag(event_id)])
+        with self._lock:
+            hit = self._entries.get(event_id)
+            if hit is not None and hit[0] == version:
+                self._entries.move_to_end(event_id)
+                return hit[1]
+        archive = load()
+        self.put(event_id, archive, version)
+        return archive
+
+    def put(self, event_id: str, archive: Optional[Archive], version: Optional[Tuple[int, ...]] = None) -> None:
+        if version is None:
+            version = response_cache.tag_versions([archive_tag(event_id)])
+        with self._lock:
+            self._entries[event_id] = (version, archive)
+            self._entries.move_to_end(event_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, event_id: str) -> None:
+        with self._lock:
+            self._entries.pop(event_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+archive_store = ArchiveStore(TOURNAMENT_ARCHIVE_CACHE_ENTRIES)
+
+
+def archived_response(archive: Archive, if_none_match: Optional[str]) -> Response:
+    """보관본 응답. If-None-Match가 (어느 인코딩의) ETag와 맞으면 본문 없이 304."""
+    headers = {
+        "ETag": archive.etag,
+        # 다시 열린 대회를 캐시가 계속 보여주지 않도록 저장은 허용하되 매번 ETag로 재검증하게 한다.
+        "Cache-Control": "public, no-cache",
+        "X-Cache": "ARCHIVE",
+    }
+    not_modified = etag_matches(archive.etag, if_none_match)
+    return precompressed_response(archive.body, archive.variants, "application/json", headers, not_modified)
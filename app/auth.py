@@ -1,14 +1,23 @@
-from typing import Optional
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
 
 import jwt
 from fastapi import Depends, Header, HTTPException
 
-from app.config import SUPABASE_JWT_SECRET
-from app.db import get_supabase
+from app.config import CALENDAR_FEED_SECRET, ROLE_CACHE_TTL_SECONDS, SUPABASE_JWT_SECRET
+from app.repositories import get_repositories
 
 _ALGORITHM = "HS256"
 _AUDIENCE = "authenticated"
 
+# user_id -> (role, 만료 시각). 관리자 API마다 붙는 role 조회를 TTL 동안 재사용한다.
+_role_cache: Dict[str, Tuple[Optional[str], float]] = {}
+_role_lock = threading.Lock()
+
 
 def _decode_token(token: str) -> dict:
     secret = SUPABASE_JWT_SECRET
@@ -35,19 +44,61 @@ def require_auth(authorization: Optional[str] = Header(default=None)) -> str:
     return user_id
 
 
+def remember_roles(roles: Mapping[str, Optional[str]]) -> None:
+    """조회한 role을 캐시에 넣는다. 워밍업에서 전체 회원의 role을 한 번에 채울 때도 쓴다."""
+    if ROLE_CACHE_TTL_SECONDS <= 0:
+        return
+    expires_at = time.monotonic() + ROLE_CACHE_TTL_SECONDS
+    with _role_lock:
+        for user_id, role in roles.items():
+            _role_cache[user_id] = (role, expires_at)
+
+
+def get_role(user_id: str) -> Optional[str]:
+    with _role_lock:
+        hit = _role_cache.get(user_id)
+    if hit is not None and hit[1] > time.monotonic():
+        return hit[0]
+    role = get_repositories().users.get_role(user_id)
+    remember_roles({user_id: role})
+    return role
+
+
 def require_admin(user_id: str = Depends(require_auth)) -> str:
     """DB의 public.users.role을 직접 조회하여 admin 여부를 확인합니다.
     user_metadata는 사용하지 않으므로 클라이언트 위변조에 안전합니다.
+    조회 결과는 ROLE_CACHE_TTL_SECONDS 동안 재사용합니다.
     """
-    sb = get_supabase()
-    result = sb.table("users").select("role").eq("id", user_id).limit(1).execute()
-    if not result.data or result.data[0].get("role") != "admin":
+    if get_role(user_id) != "admin":
         raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
     return user_id
 
 
 def is_admin_user(user_id: str) -> bool:
     """소유자 확인과 병행하여 admin 여부를 인라인으로 확인할 때 쓰는 헬퍼."""
-    sb = get_supabase()
-    result = sb.table("users").select("role").eq("id", user_id).limit(1).execute()
-    return bool(result.data and result.data[0].get("role") == "admin")
+    return get_role(user_id) == "admin"
+
+
+# -----------------------------
+# 개인 캘린더 피드 주소
+# -----------------------------
+# 캘린더 앱은 구독 주소만 주기적으로 부를 뿐 Authorization 헤더를 보낼 수 없으므로,
+# 개인 피드는 user_id와 그 서명을 주소에 담는다. 만료가 없는 대신 서명 키를 바꾸면 모두 무효가 된다.
+def _calendar_signature(user_id: str) -> str:
+    secret = CALENDAR_FEED_SECRET or SUPABASE_JWT_SECRET
+    if not secret:
+        raise HTTPException(status_code=500, detail="서버 인증 설정이 누락되었습니다.")
+    digest = hmac.new(secret.encode(), f"calendar:{user_id}".encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:18]).decode()
+
+
+def calendar_feed_token(user_id: str) -> str:
+    return f"{user_id}.{_calendar_signature(user_id)}"
+
+
+def calendar_feed_user(token: str) -> str:
+    """개인 피드 토큰을 검증하고 user_id를 반환합니다."""
+    user_id, _, signature = token.rpartition(".")
+    if not user_id or not hmac.compare_digest(signature, _calendar_signature(user_id)):
+        raise HTTPException(status_code=404, detail="캘린더를 찾을 수 없습니다.")
+    return user_id
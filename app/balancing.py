@@ -0,0 +1,257 @@
+"""참가자를 팀과 조로 나눈다.
+
+팀 평균 경력점수의 분산을 줄이고, 원하면 같은 팀에 같은 기수/전공이 몰리지 않게 한다.
+
+1. 초기 배정: 경력점수가 높은 사람부터(동점은 seed로 섞는다) 자리가 남은 팀 중 합계가 가장 작은 팀에 넣는다.
+2. 국소 탐색: 서로 다른 두 팀에서 한 명씩 골라 바꿔 보고 비용이 줄면 받아들인다. 팀 합계와 팀별 기수/전공
+   인원만 들고 있으므로 바꿨을 때의 비용 변화는 O(1)에 계산한다. 연속으로 `patience`번 나아지지 않으면 멈춘다.
+3. 조 배정: 팀을 평균 경력점수 순으로 뱀 모양(1→G, G→1)으로 나누고, 조 사이에서 팀을 바꿔 조 평균 차이를 줄인다.
+
+비용은 팀 평균 경력점수의 분산 + 같은 팀 안에서 기수/전공이 겹치는 쌍의 수다. 겹치는 쌍 하나가 경력점수
+분산(1~3점이므로 1 이하)보다 크므로, 다양성 조건은 사실상 먼저 지켜진다. 같은 입력과 seed면 항상 같은 결과다.
+"""
+
+import heapq
+import random
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 같은 팀에서 기수/전공이 겹치는 쌍 하나의 비용
+DIVERSITY_WEIGHT = 1.0
+_EPSILON = 1e-12
+
+
+@dataclass
+class Participant:
+    user_id: str
+    experience: int
+    generation: Optional[str] = None
+    major: Optional[str] = None
+
+
+@dataclass
+class Balance:
+    teams: List[List[Participant]]
+    # 팀 번호 → 조 번호
+    groups: List[int]
+    iterations: int = 0
+    improvements: int = 0
+    stats: Dict[str, float] = field(default_factory=dict)
+
+
+def team_sizes(count: int, team_size: int) -> List[int]:
+    """count명을 team_size명 안팎의 팀으로 나눌 때 팀별 인원. 인원 차이는 많아야 1명이다."""
+    teams = max(1, -(-count // team_size))
+    base, extra = divmod(count, teams)
+    return [base + 1 if index < extra else base for index in range(teams)]
+
+
+def _duplicates(counts: Dict[Optional[str], int]) -> int:
+    return sum(count * (count - 1) // 2 for value, count in counts.items() if value)
+
+
+def duplicate_pairs(teams: Sequence[Sequence[Participant]], name: str) -> int:
+    """같은 팀 안에서 name(generation/major) 값이 겹치는 쌍의 수. 값이 없는 사람은 세지 않는다."""
+    total = 0
+    for team in teams:
+        counts: Dict[Optional[str], int] = defaultdict(int)
+        for member in team:
+            counts[getattr(member, name)] += 1
+        total += _duplicates(counts)
+    return total
+
+
+def group_spread(averages: Sequence[float], groups: Sequence[int]) -> float:
+    """조 평균 경력점수(팀 평균의 평균)의 최대 - 최소."""
+    totals: Dict[int, float] = defaultdict(float)
+    counts: Dict[int, int] = defaultdict(int)
+    for average, group in zip(averages, groups):
+        totals[group] += average
+        counts[group] += 1
+    means = [totals[group] / counts[group] for group in totals]
+    return max(means) - min(means) if means else 0.0
+
+
+class _TeamState:
+    """팀 합계, 팀별 기수/전공 인원. swap 비용 변화를 O(1)에 계산한다."""
+
+    def __init__(self, teams: List[List[Participant]], spread_generation: bool, spread_major: bool) -> None:
+        self.teams = teams
+        self.sizes = [len(team) for team in teams]
+        self.sums = [sum(member.experience for member in team) for team in teams]
+        self.attributes: List[str] = []
+        if spread_generation:
+            self.attributes.append("generation")
+        if spread_major:
+            self.attributes.append("major")
+        self.counts: Dict[str, List[Dict[Optional[str], int]]] = {}
+        for name in self.attributes:
+            per_team = []
+            for team in teams:
+                counts: Dict[Optional[str], int] = defaultdict(int)
+                for member in team:
+                    counts[getattr(member, name)] += 1
+                per_team.append(counts)
+            self.counts[name] = per_team
+        averages = [total / size for total, size in zip(self.sums, self.sizes)]
+        self.total = sum(averages)
+        self.total_sq = sum(average * average for average in averages)
+
+    def variance(self, total: Optional[float] = None, total_sq: Optional[float] = None) -> float:
+        count = len(self.teams)
+        mean = (self.total if total is None else total) / count
+        return max(0.0, (self.total_sq if total_sq is None else total_sq) / count - mean * mean)
+
+    def cost(self) -> float:
+        duplicates = sum(_duplicates(counts) for name in self.attributes for counts in self.counts[name])
+        return self.variance() + DIVERSITY_WEIGHT * duplicates
+
+    def _swap_sums(self, i: int, a: int, j: int, b: int) -> Tuple[float, float, float, float]:
+        x, y = self.teams[i][a].experience, self.teams[j][b].experience
+        old_i, old_j = self.sums[i] / self.sizes[i], self.sums[j] / self.sizes[j]
+        new_i, new_j = (self.sums[i] - x + y) / self.sizes[i], (self.sums[j] - y + x) / self.sizes[j]
+        total = self.total - old_i - old_j + new_i + new_j
+        total_sq = self.total_sq - old_i * old_i - old_j * old_j + new_i * new_i + new_j * new_j
+        return total, total_sq, new_i, new_j
+
+    def swap_delta(self, i: int, a: int, j: int, b: int) -> float:
+        """팀 i의 a번째와 팀 j의 b번째를 바꿨을 때의 비용 변화."""
+        first, second = self.teams[i][a], self.teams[j][b]
+        total, total_sq, _, _ = self._swap_sums(i, a, j, b)
+        delta = self.variance(total, total_sq) - self.variance()
+        for name in self.attributes:
+            out_value, in_value = getattr(first, name), getattr(second, name)
+            if out_value == in_value:
+                continue
+            counts_i, counts_j = self.counts[name][i], self.counts[name][j]
+            # 팀 i에서 out_value 한 명이 빠지고 in_value 한 명이 들어온다 (팀 j는 반대).
+            change = 0
+            if out_value:
+                change -= counts_i[out_value] - 1
+                change += counts_j[out_value]
+            if in_value:
+                change += counts_i[in_value]
+                change -= counts_j[in_value] - 1
+            delta += DIVERSITY_WEIGHT * change
+        return delta
+
+    def swap(self, i: int, a: int, j: int, b: int) -> None:
+        first, second = self.teams[i][a], self.teams[j][b]
+        total, total_sq, _, _ = self._swap_sums(i, a, j, b)
+        self.total, self.total_sq = total, total_sq
+        self.sums[i] += second.experience - first.experience
+        self.sums[j] += first.experience - second.experience
+        for name in self.attributes:
+            counts_i, counts_j = self.counts[name][i], self.counts[name][j]
+            out_value, in_value = getattr(first, name), getattr(second, name)
+            counts_i[out_value] -= 1
+            counts_i[in_value] += 1
+            counts_j[in_value] -= 1
+            counts_j[out_value] += 1
+        self.teams[i][a], self.teams[j][b] = second, first
+
+
+def _initial_teams(participants: Sequence[Participant], sizes: List[int], rng: random.Random) -> List[List[Participant]]:
+    order = list(participants)
+    rng.shuffle(order)
+    order.sort(key=lambda member: -member.experience)
+    teams: List[List[Participant]] = [[] for _ in sizes]
+    # (평균 경력점수, 현재 인원, 팀 번호): 자리가 남은 팀 중 평균이 가장 낮은 팀을 꺼낸다.
+    heap = [(0.0, 0, index) for index in range(len(sizes))]
+    sums = [0] * len(sizes)
+    for member in order:
+        _, _, index = heapq.heappop(heap)
+        teams[index].append(member)
+        sums[index] += member.experience
+        if len(teams[index]) < sizes[index]:
+            heapq.heappush(heap, (sums[index] / sizes[index], len(teams[index]), index))
+    return teams
+
+
+def _assign_groups(averages: List[float], group_count: int) -> List[int]:
+    order = sorted(range(len(averages)), key=lambda index: -averages[index])
+    groups = [0] * len(averages)
+    for position, index in enumerate(order):
+        lap, offset = divmod(position, group_count)
+        groups[index] = offset if lap % 2 == 0 else group_count - 1 - offset
+
+    # 조가 다른 두 팀을 바꿔 보며 Σ(조 합계² / 조 팀 수)가 줄면 받아들인다. 전체 합계가 그대로이므로
+    # 이 값이 줄면 조 평균의 (팀 수 가중) 분산이 준다. 한 번 바꿀 때의 변화는 두 조만 보면 된다.
+    totals = [0.0] * group_count
+    counts = [0] * group_count
+    for index, group in enumerate(groups):
+        totals[group] += averages[index]
+        counts[group] += 1
+    improved = True
+    while improved:
+        improved = False
+        for first in range(len(groups)):
+            for second in range(first + 1, len(groups)):
+                g, h = groups[first], groups[second]
+                if g == h:
+                    continue
+                moved = averages[second] - averages[first]
+                new_g, new_h = totals[g] + moved, totals[h] - moved
+                delta = (new_g * new_g - totals[g] * totals[g]) / counts[g] + (new_h * new_h - totals[h] * totals[h]) / counts[h]
+                if delta < -_EPSILON:
+                    totals[g], totals[h] = new_g, new_h
+                    groups[first], groups[second] = h, g
+                    improved = True
+    return groups
+
+
+def balance_teams(
+    participants: Sequence[Participant],
+    team_size: int,
+    group_count: int = 1,
+    *,
+    spread_generation: bool = False,
+    spread_major: bool = False,
+    seed: int = 0,
+    patience: Optional[int] = None,
+    max_iterations: Optional[int] = None,
+) -> Balance:
+    rng = random.Random(seed)
+    sizes = team_sizes(len(participants), team_size)
+    state = _TeamState(_initial_teams(participants, sizes, rng), spread_generation, spread_major)
+    initial_cost = state.cost()
+
+    count = len(participants)
+    patience = patience if patience is not None else max(200, 20 * count)
+    max_iterations = max_iterations if max_iterations is not None else 400 * count
+    iterations = improvements = stale = 0
+    team_count = len(sizes)
+    while team_count > 1 and iterations < max_iterations and stale < patience:
+        iterations += 1
+        i = rng.randrange(team_count)
+        j = rng.randrange(team_count - 1)
+        if j >= i:
+            j += 1
+        a = rng.randrange(sizes[i])
+        b = rng.randrange(sizes[j])
+        if state.swap_delta(i, a, j, b) < -_EPSILON:
+            state.swap(i, a, j, b)
+            improvements += 1
+            stale = 0
+        else:
+            stale += 1
+
+    averages = [total / size for total, size in zip(state.sums, state.sizes)]
+    groups = _assign_groups(averages, min(group_count, team_count))
+    return Balance(
+        teams=state.teams,
+        groups=groups,
+        iterations=iterations,
+        improvements=improvements,
+        stats={
+            "initial_cost": initial_cost,
+            "cost": state.cost(),
+            "team_experience_stdev": state.variance() ** 0.5,
+            "team_experience_min": min(averages),
+            "team_experience_max": max(averages),
+            "group_experience_range": group_spread(averages, groups),
+            "duplicate_generation_pairs": duplicate_pairs(state.teams, "generation"),
+            "duplicate_major_pairs": duplicate_pairs(state.teams, "major"),
+        },
+    )
@@ -0,0 +1,569 @@
+"""공개 조회 API용 read-through 응답 캐시.
+
+쓰기는 드물고 관리자만 하므로, 조회 결과를 직렬화된 JSON 바이트로 보관했다가
+같은 라우트 + 같은 쿼리 파라미터 요청에 그대로 돌려준다. 변경 API는 관련 태그를
+무효화해서 다음 조회가 새로 계산되도록 한다.
+
+soft TTL이 지난 항목은 즉시 그대로 응답하고 백그라운드에서 갱신한다
+(stale-while-revalidate). 갱신이 Supabase 장애로 실패하면 hard TTL까지 마지막
+정상 응답을 계속 제공하며, 이때 응답에 `Warning` 헤더로 오래된 응답임을 표시한다.
+
+워커 여러 개로 돌 때(SHARED_CACHE_PATH 설정)는 app.shared_cache의 공유 저장소를 2차 캐시로
+쓴다. 로컬에 없는 항목은 공유 저장소에서 가져오고, 무효화는 다른 워커에도 전파된다.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import urlencode
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from app.config import (
+    CACHE_ENABLED,
+    CACHE_HARD_TTL_SECONDS,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_ENTRY_BYTES,
+    CACHE_MAX_TOTAL_BYTES,
+    CACHE_TTL_SECONDS,
+    SHARED_CACHE_PATH,
+)
+from app.compression import accept_encoding, add_vary, compress, compression_stats, negotiate, should_compress
+from app.serialization import adapter_for, serialize
+from app.shared_cache import SharedCacheStore, open_shared_store
+from app.singleflight import flights
+
+logger = logging.getLogger(__name__)
+
+TagSpec = Union[Iterable[str], Callable[[Dict[str, Any]], Iterable[str]]]
+
+# 백그라운드 갱신 전용 스레드. 요청 스레드풀을 잡아먹지 않도록 따로 둔다.
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    tags: Set[str]
+    created_at: float
+    fresh_until: float
+    stale_until: float
+    refresh_failed: bool = False
+    # Content-Encoding별 압축본. 처음 요청될 때 한 번만 만든다.
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(variant) for variant in self.variants.values())
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (time.monotonic() if now is None else now) < self.fresh_until
+
+    def age(self, now: Optional[float] = None) -> int:
+        return int((time.monotonic() if now is None else now) - self.created_at)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_failures: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    oversized: int = 0
+    shared_hits: int = 0
+    remote_invalidations: int = 0
+
+
+class ResponseCache:
+    """TTL + LRU 캐시. 항목 수, 항목당 크기, 전체 바이트 수를 모두 제한한다.
+
+    default_ttl(soft)이 지나면 갱신 대상이 되고, hard_ttl이 지나면 삭제된다.
+    shared가 주어지면 로컬 미스를 공유 저장소에서 채우고, 저장/무효화를 공유 저장소에도 반영한다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_entry_bytes: int = CACHE_MAX_ENTRY_BYTES,
+        max_total_bytes: int = CACHE_MAX_TOTAL_BYTES,
+        default_ttl: float = CACHE_TTL_SECONDS,
+        hard_ttl: float = CACHE_HARD_TTL_SECONDS,
+        enabled: bool = CACHE_ENABLED,
+        shared: Optional[SharedCacheStore] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self.max_total_bytes = max_total_bytes
+        self.default_ttl = default_ttl
+        self.hard_ttl = hard_ttl
+        self.enabled = enabled
+        self.shared = shared
+        # 이 프로세스가 적용한 마지막 공유 무효화 순번
+        self._synced_seq = shared.latest_seq() if shared is not None else 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._tag_versions: Dict[str, int] = {}
+        self._refreshing: Set[str] = set()
+        self._generation = 0
+        self._total_bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """항목을 반환한다. soft TTL이 지난(오래된) 항목도 hard TTL 전까지는 반환한다."""
+        if not self.enabled:
+            return None
+        self._sync()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stale_until <= now:
+                self._remove(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                synced_seq = self._synced_seq
+            else:
+                return self._count_hit(key, entry, now)
+        # 공유 저장소 조회는 락 밖에서 한다. 그 사이 무효화가 적용되었으면 가져온 값을 버린다.
+        entry = self._from_shared(key, now)
+        with self._lock:
+            if entry is None or self._synced_seq != synced_seq:
+                self._stats.misses += 1
+                return None
+            self._insert_locked(key, entry)
+            self._stats.shared_hits += 1
+            return self._count_hit(key, entry, now)
+
+    def _count_hit(self, key: str, entry: CacheEntry, now: float) -> CacheEntry:
+        self._entries.move_to_end(key)
+        if entry.is_fresh(now):
+            self._stats.hits += 1
+        else:
+            self._stats.stale_hits += 1
+        return entry
+
+    def _sync(self) -> None:
+        """다른 워커가 남긴 무효화를 로컬 캐시에 적용한다. 새 무효화가 없으면 mmap 읽기 한 번으로 끝난다."""
+        shared = self.shared
+        if shared is None or shared.latest_seq() == self._synced_seq:
+            return
+        with self._lock:
+            seq, changes = shared.changes_since(self._synced_seq)
+            for tags in changes:
+                if tags is None:
+                    self._clear_locked()
+                else:
+                    self._invalidate_locked(tags)
+                self._stats.remote_invalidations += 1
+            self._synced_seq = seq
+
+    def _from_shared(self, key: str, now: float) -> Optional[CacheEntry]:
+        # 공유 항목의 만료 시각은 벽시계 기준이므로 이 프로세스의 monotonic 기준으로 옮긴다.
+        found = self.shared.get(key) if self.shared is not None else None
+        if found is None:
+            return None
+        offset = now - time.time()
+        return CacheEntry(
+            body=found.body,
+            tags=set(found.tags),
+            created_at=found.created_at + offset,
+            fresh_until=found.fresh_until + offset,
+            stale_until=found.stale_until + offset,
+        )
+
+    def begin_refresh(self, key: str) -> bool:
+        """키 하나당 백그라운드 갱신은 하나만 돌도록 표시한다. 이미 진행 중이면 False."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._stats.refreshes += 1
+            return True
+
+    def end_refresh(self, key: str, failed: bool = False) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+            if failed:
+                self._stats.refresh_failures += 1
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refresh_failed = True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def tag_versions(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        """전체 비우기 횟수 + 태그별 무효화 횟수. 계산 시작 전에 읽어 두었다가 set()에 넘긴다."""
+        self._sync()
+        with self._lock:
+            return self._versions_locked(tags)
+
+    def _versions_locked(self, tags: Sequence[str]) -> Tuple[int, ...]:
+        return (self._generation, *(self._tag_versions.get(tag, 0) for tag in tags))
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        tags: Sequence[str] = (),
+        ttl: Optional[float] = None,
+        versions: Optional[Tuple[int, ...]] = None,
+        hard_ttl: Optional[float] = None,
+    ) -> Optional[CacheEntry]:
+        """항목을 저장한다.
+
+        versions가 주어졌고 그 사이 태그가 무효화되었다면, 계산 도중 쓰기가 있었던
+        것이므로 오래된 결과를 저장하지 않는다.
+        """
+        if not self.enabled:
+            return None
+        if len(body) > self.max_entry_bytes:
+            with self._lock:
+                self._stats.oversized += 1
+            return None
+        now = time.monotonic()
+        soft = self.default_ttl if ttl is None else ttl
+        hard = self.hard_ttl if hard_ttl is None else hard_ttl
+        entry = CacheEntry(
+            body=body,
+            tags=set(tags),
+            created_at=now,
+            fresh_until=now + soft,
+            stale_until=now + max(soft, hard),
+        )
+        self._sync()
+        with self._lock:
+            if versions is not None and versions != self._versions_locked(tags):
+                return None
+            self._insert_locked(key, entry)
+            self._stats.stores += 1
+            stored = entry if key in self._entries else None
+            synced_seq = self._synced_seq
+        if self.shared is not None and stored is not None:
+            self.shared.put(key, body, tags, soft, hard, synced_seq)
+        return stored
+
+    def _insert_locked(self, key: str, entry: CacheEntry) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._total_bytes += entry.size
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_total_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats.evictions += 1
+
+    def encoded(self, key: str, entry: CacheEntry, encoding: str) -> Optional[bytes]:
+        """항목의 압축본을 반환한다. 캐시에서 이미 빠진 항목이면 None."""
+        variant = entry.variants.get(encoding)
+        if variant is not None:
+            compression_stats.record_precompressed_hit()
+            return variant
+        with self._lock:
+            if self._entries.get(key) is not entry:
+                return None
+        variant = compress(entry.body, encoding, stored=True)
+        with self._lock:
+            if self._entries.get(key) is entry and encoding not in entry.variants:
+                entry.variants[encoding] = variant
+                self._total_bytes += len(variant)
+        return variant
+
+    def invalidate(self, *tags: str) -> int:
+        """주어진 태그 중 하나라도 가진 항목을 모두 지우고 지운 개수를 반환한다."""
+        if not tags:
+            return 0
+        with self._lock:
+            removed = self._invalidate_locked(tags)
+        self._publish(list(tags))
+        return removed
+
+    def _invalidate_locked(self, tags: Sequence[str]) -> int:
+        removed = 0
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+                removed += 1
+        self._stats.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear_locked()
+        self._publish(None)
+
+    def _clear_locked(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._total_bytes = 0
+        self._generation += 1
+
+    def _publish(self, tags: Optional[List[str]]) -> None:
+        if self.shared is None:
+            return
+        seq = self.shared.publish(tags)
+        with self._lock:
+            # 바로 앞까지 적용한 상태였다면 자기 무효화를 다시 적용할 필요가 없다.
+            if seq == self._synced_seq + 1:
+                self._synced_seq = seq
+
+    def stats(self) -> Dict[str, Any]:
+        shared = self.shared.stats() if self.shared is not None else None
+        with self._lock:
+            lookups = self._stats.hits + self._stats.stale_hits + self._stats.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self._stats.hits,
+                "stale_hits": self._stats.stale_hits,
+                "misses": self._stats.misses,
+                "hit_rate": round(self._stats.hits / lookups, 4) if lookups else 0.0,
+                "refreshes": self._stats.refreshes,
+                "refreshing": len(self._refreshing),
+                "refresh_failures": self._stats.refresh_failures,
+                "stores": self._stats.stores,
+                "evictions": self._stats.evictions,
+                "expirations": self._stats.expirations,
+                "invalidations": self._stats.invalidations,
+                "oversized": self._stats.oversized,
+                "shared_hits": self._stats.shared_hits,
+                "remote_invalidations": self._stats.remote_invalidations,
+                "shared": shared,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+
+response_cache = ResponseCache(shared=open_shared_store(SHARED_CACHE_PATH, CACHE_MAX_ENTRIES))
+
+
+def _normalize_param(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple, set)):
+        return ",".join(sorted(str(item) for item in value))
+    return str(value)
+
+
+def cache_key(route: str, params: Dict[str, Any]) -> str:
+    """라우트 이름과 (FastAPI가 이미 파싱한) 파라미터로 정규화된 키를 만든다.
+
+    값이 None인 파라미터는 생략하고 이름순으로 정렬하므로
+    `?year=2026`과 `?year=02026&unused=` 같은 요청은 같은 키가 된다.
+    """
+    items = []
+    for name in sorted(params):
+        normalized = _normalize_param(params[name])
+        if normalized is not None:
+            items.append((name, normalized))
+    return f"{route}?{urlencode(items)}" if items else route
+
+
+def _resolve_tags(tags: TagSpec, params: Dict[str, Any]) -> List[str]:
+    return list(tags(params) if callable(tags) else tags)
+
+
+def json_response(body: bytes, cache_status: str, encoding: Optional[str] = None) -> Response:
+    response = Response(content=body, media_type="application/json", headers={"X-Cache": cache_status})
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+        add_vary(response.headers)
+    return response
+
+
+def _encoded_response(store: ResponseCache, key: str, entry: Optional[CacheEntry], body: bytes, cache_status: str) -> Response:
+    # 캐시에 있는 항목은 저장된 압축본을 쓴다. 저장되지 않은 응답은 미들웨어가 압축한다.
+    encoding = negotiate(accept_encoding.get())
+    if entry is not None and encoding and should_compress(len(body), "application/json"):
+        variant = store.encoded(key, entry, encoding)
+        if variant is not None:
+            return json_response(variant, cache_status, encoding)
+    return json_response(body, cache_status)
+
+
+def cached_response(store: ResponseCache, key: str, entry: CacheEntry) -> Response:
+    """캐시 항목으로 응답을 만든다. 오래된 항목이면 Age/Warning 헤더로 표시한다."""
+    now = time.monotonic()
+    if entry.is_fresh(now):
+        return _encoded_response(store, key, entry, entry.body, "HIT")
+    response = _encoded_response(store, key, entry, entry.body, "STALE")
+    response.headers["Age"] = str(entry.age(now))
+    response.headers["Warning"] = (
+        '111 - "Revalidation Failed"' if entry.refresh_failed else '110 - "Response is Stale"'
+    )
+    return response
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    # 404 같은 정상적인 4xx 응답은 장애가 아니라 "대상이 사라졌다"는 결과다.
+    if isinstance(exc, HTTPException):
+        return exc.status_code >= 500
+    return isinstance(exc, Exception)
+
+
+_background_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def cached(
+    response_model: Any = None,
+    *,
+    tags: TagSpec = (),
+    ttl: Optional[float] = None,
+    hard_ttl: Optional[float] = None,
+    validate: bool = True,
+    cache: Optional[ResponseCache] = None,
+) -> Callable:
+    """조회 핸들러를 read-through 캐시로 감싸는 데코레이터.
+
+    라우터 데코레이터 바로 아래에 붙인다. 캐시된 응답은 직렬화된 바이트를 그대로
+    돌려주므로 response_model 검증을 다시 거치지 않는다. 미스가 동시에 몰리면
+    single-flight로 병합되어 upstream 계산은 한 번만 일어난다. ttl(soft)이 지난
+    항목은 바로 응답하고 백그라운드에서 갱신하며, 갱신이 실패해도 hard_ttl까지
+    계속 제공한다. 동기/비동기 핸들러 모두 지원한다.
+
+    validate=False는 핸들러가 직접 만든 데이터(모델 인스턴스, 컬럼을 지정해 읽은 행)를
+    돌려줄 때 쓰며, response_model 검증 없이 바로 직렬화한다. upstream 행을 그대로 돌려주는
+    핸들러에는 쓰지 않는다. 시각 문자열('+00:00')이 모델 직렬화('Z')와 달라져 응답 형식이 바뀐다.
+
+        @router.get("", response_model=List[Debate])
+        @cached(List[Debate], tags=["debates"])
+        def list_debates(...): ...
+    """
+    adapter = adapter_for(response_model) if response_model is not None else None
+
+    def decorator(func: Callable) -> Callable:
+        route = f"{func.__module__}.{func.__name__}"
+
+        def lookup(kwargs: Dict[str, Any]) -> Tuple[ResponseCache, str, Optional[CacheEntry], List[str]]:
+            store = cache or response_cache
+            key = cache_key(route, kwargs)
+            return store, key, store.get(key), _resolve_tags(tags, kwargs)
+
+        def flight_key(key: str, versions: Tuple[int, ...]) -> str:
+            # 무효화 이후 도착한 요청이 무효화 이전에 시작된 계산에 합류하지 않도록
+            # 태그 버전을 병합 키에 포함한다.
+            return f"{key}#{'.'.join(map(str, versions))}"
+
+        def store_body(
+            store: ResponseCache, key: str, value: Any, entry_tags: List[str], versions: Tuple[int, ...]
+        ) -> Tuple[Optional[CacheEntry], bytes]:
+            body = serialize(value, adapter, validate)
+            return store.set(key, body, entry_tags, ttl, versions=versions, hard_ttl=hard_ttl), body
+
+        def refresh_finished(store: ResponseCache, key: str, exc: Optional[BaseException]) -> None:
+            if exc is not None and not _is_upstream_failure(exc):
+                store.discard(key)
+            elif exc is not None:
+                logger.warning("cache refresh failed for %s: %r", key, exc)
+            store.end_refresh(key, failed=exc is not None and _is_upstream_failure(exc))
+
+        if inspect.iscoroutinefunction(func):
+
+            async def load_async(
+                store: ResponseCache, key: str, kwargs: Dict[str, Any], entry_tags: List[str]
+            ) -> Tuple[Optional[CacheEntry], bytes]:
+                versions = store.tag_versions(entry_tags)
+
+                async def load() -> Tuple[Optional[CacheEntry], bytes]:
+                    return store_body(store, key, await func(**kwargs), entry_tags, versions)
+
+                return await flights.do_async(flight_key(key, versions), load)
+
+            async def refresh_async(store: ResponseCache, key: str, kwargs: Dict[str, Any], entry_tags: List[str]) -> None:
+                error: Optional[BaseException] = None
+                try:
+                    await load_async(store, key, kwargs, entry_tags)
+                except Exception as exc:
+                    error = exc
+                refresh_finished(store, key, error)
+
+            @functools.wraps(func)
+            async def async_wrapper(**kwargs: Any) -> Response:
+                store, key, entry, entry_tags = lookup(kwargs)
+                if entry is not None:
+                    if not entry.is_fresh() and store.begin_refresh(key):
+                        task = asyncio.create_task(refresh_async(store, key, kwargs, entry_tags))
+                        _background_tasks.add(task)
+                        task.add_done_callback(_background_tasks.discard)
+                    return cached_response(store, key, entry)
+                loaded, body = await load_async(store, key, kwargs, entry_tags)
+                return _encoded_response(store, key, loaded, body, "MISS")
+
+            return async_wrapper
+
+        def load_sync(
+            store: ResponseCache, key: str, kwargs: Dict[str, Any], entry_tags: List[str]
+        ) -> Tuple[Optional[CacheEntry], bytes]:
+            versions = store.tag_versions(entry_tags)
+            return flights.do(
+                flight_key(key, versions),
+                lambda: store_body(store, key, func(**kwargs), entry_tags, versions),
+            )
+
+        def refresh_sync(store: ResponseCache, key: str, kwargs: Dict[str, Any], entry_tags: List[str]) -> None:
+            error: Optional[BaseException] = None
+            try:
+                load_sync(store, key, kwargs, entry_tags)
+            except Exception as exc:
+                error = exc
+            refresh_finished(store, key, error)
+
+        @functools.wraps(func)
+        def wrapper(**kwargs: Any) -> Response:
+            store, key, entry, entry_tags = lookup(kwargs)
+            if entry is not None:
+                if not entry.is_fresh() and store.begin_refresh(key):
+                    _refresh_executor.submit(refresh_sync, store, key, kwargs, entry_tags)
+                return cached_response(store, key, entry)
+            loaded, body = load_sync(store, key, kwargs, entry_tags)
+            return _encoded_response(store, key, loaded, body, "MISS")
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*tags: str) -> int:
+    return response_cache.invalidate(*tags)
+
+
+def month_tag(prefix: str, value: Union[date, datetime, str]) -> str:
+    """`reservations:2026-10` 형식의 월 단위 태그."""
+    if isinstance(value, str):
+        return f"{prefix}:{value[:7]}"
+    return f"{prefix}:{value.year:04d}-{value.month:02d}"
@@ -0,0 +1,251 @@
+"""Accept-Encoding 협상 기반 gzip/brotli 응답 압축.
+
+대회 스냅샷과 3개월 예약 목록은 수십 KB의 반복적인 JSON이고, 행사장에서는 모바일
+회선으로 받는다. 임계값 이상의 JSON/텍스트 응답만 압축하며, 캐시된 응답은 캐시
+항목에 압축본을 보관해서 같은 응답을 매번 다시 압축하지 않는다.
+"""
+
+import gzip
+import threading
+import time
+import zlib
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import COMPRESSION_ENABLED, COMPRESSION_MIN_BYTES
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli는 requirements에 포함되어 있다.
+    brotli = None
+
+# 현재 요청의 Accept-Encoding. 미들웨어가 설정하고, 스레드풀의 캐시 데코레이터가 읽는다.
+accept_encoding: ContextVar[str] = ContextVar("accept_encoding", default="")
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/x-ndjson", "text/calendar")
+
+# 요청마다 압축하는 경우는 빠른 레벨, 캐시에 한 번 저장하는 압축본은 높은 레벨을 쓴다.
+_LEVELS = {
+    "gzip": {"dynamic": 6, "stored": 9},
+    "br": {"dynamic": 4, "stored": 9},
+}
+
+
+def supported_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(header: str) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 인코딩을 고른다. 같은 q값이면 br을 우선한다."""
+    if not COMPRESSION_ENABLED or not header:
+        return None
+    weights: Dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+    best, best_quality = None, 0.0
+    for encoding in supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, stored: bool = False) -> bytes:
+    level = _LEVELS[encoding]["stored" if stored else "dynamic"]
+    started = time.perf_counter()
+    if encoding == "br":
+        result = brotli.compress(body, quality=level)
+    else:
+        result = gzip.compress(body, compresslevel=level, mtime=0)
+    compression_stats.record(len(body), len(result), time.perf_counter() - started)
+    return result
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """스트리밍 응답을 조각 단위로 압축한다. 미들웨어는 스트리밍 응답을 건드리지 않으므로 핸들러가 직접 쓴다."""
+    level = _LEVELS[encoding]["dynamic"]
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        step, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip 헤더/트레일러
+        step, finish = compressor.compress, compressor.flush
+    bytes_in = bytes_out = 0
+    seconds = 0.0
+    for chunk in chunks:
+        started = time.perf_counter()
+        out = step(chunk)
+        seconds += time.perf_counter() - started
+        bytes_in += len(chunk)
+        bytes_out += len(out)
+        if out:
+            yield out
+    tail = finish()
+    compression_stats.record(bytes_in, bytes_out + len(tail), seconds)
+    yield tail
+
+
+def should_compress(size: int, content_type: str) -> bool:
+    return size >= COMPRESSION_MIN_BYTES and content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """압축본의 ETag. 인코딩마다 바이트가 다르므로 strong ETag도 달라야 한다 ("abc" → "abc-gzip")."""
+    weak = "W/" if etag.startswith("W/") else ""
+    opaque = etag.removeprefix(weak).strip('"')
+    return f'{weak}"{opaque}-{encoding}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """If-None-Match가 이 본문의 어느 인코딩 ETag와든 맞는지 본다 (weak 비교, RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags:
+        return True
+    etag = etag.removeprefix("W/")
+    return etag in tags or any(variant_etag(etag, encoding) in tags for encoding in _LEVELS)
+
+
+def precompressed_response(
+    body: bytes, variants: Dict[str, bytes], media_type: str, headers: Dict[str, str], not_modified: bool = False
+) -> Response:
+    """바뀌지 않는 본문(보관본, 캘린더 피드)의 응답. 인코딩별 압축본은 variants에 한 번만 만들어 둔다.
+
+    headers의 ETag는 원본 기준이며, 압축본을 보낼 때는 인코딩을 붙인 ETag로 바꾼다.
+    not_modified면 같은 헤더(ETag 포함)로 본문 없는 304를 돌려준다.
+    """
+    compressible = should_compress(len(body), media_type)
+    encoding = negotiate(accept_encoding.get()) if compressible else None
+    headers = dict(headers)
+    if encoding and "ETag" in headers:
+        headers["ETag"] = variant_etag(headers["ETag"], encoding)
+    if not_modified:
+        response = Response(status_code=304, headers=headers)
+    elif encoding:
+        variant = variants.get(encoding)
+        if variant is None:
+            variant = variants[encoding] = compress(body, encoding, stored=True)
+        response = Response(content=variant, media_type=media_type, headers=headers)
+        response.headers["Content-Encoding"] = encoding
+    else:
+        response = Response(content=body, media_type=media_type, headers=headers)
+    if compressible and COMPRESSION_ENABLED:
+        # 인코딩마다 본문과 ETag가 다르므로 압축하지 않은 응답과 304에도 붙인다.
+        add_vary(response.headers)
+    return response
+
+
+class CompressionStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.compressions = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self.precompressed_hits = 0
+
+    def record(self, bytes_in: int, bytes_out: int, seconds: float) -> None:
+        with self._lock:
+            self.compressions += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.seconds += seconds
+
+    def record_precompressed_hit(self) -> None:
+        with self._lock:
+            self.precompressed_hits += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "encodings": list(supported_encodings()),
+                "min_bytes": COMPRESSION_MIN_BYTES,
+                "compressions": self.compressions,
+                "precompressed_hits": self.precompressed_hits,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+                "cpu_ms_per_compression": round(self.seconds * 1000 / self.compressions, 3) if self.compressions else 0.0,
+            }
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """임계값 이상의 응답을 협상된 인코딩으로 압축한다.
+
+    이미 Content-Encoding이 있는 응답(캐시의 압축본)과 스트리밍 응답은 건드리지 않는다.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = Headers(scope=scope).get("accept-encoding", "")
+        token = accept_encoding.set(header)
+        encoding = negotiate(header)
+        start_message: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not should_compress(len(body), headers.get("content-type", ""))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            if "etag" in headers:
+                headers["ETag"] = variant_etag(headers["etag"], encoding)
+            headers["Content-Length"] = str(len(compressed))
+            add_vary(headers)
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        try:
+            await self.app(scope, receive, send_compressed if encoding else send)
+        finally:
+            accept_encoding.reset(token)
@@ -41,6 +41,111 @@ MEMBER_SHEET_URL: Optional[str] = get_env("MEMBER_SHEET_URL")
 MEMBER_EMAIL_DOMAIN: str = get_env("MEMBER_EMAIL_DOMAIN", "member.manjang.site")
 
 
+def get_env_flag(name: str, default: bool = False) -> bool:
+    value = get_env(name)
+    if value is None:
+        return default
+    return value.lower() not in ("0", "false", "no", "off")
+
+
+# 공개 조회 API 응답 캐시 (프로세스 내 LRU)
+CACHE_ENABLED: bool = get_env_flag("CACHE_ENABLED", True)
+CACHE_TTL_SECONDS: float = float(get_env("CACHE_TTL_SECONDS", "60"))
+# soft TTL이 지난 항목은 백그라운드 갱신 중/Supabase 장애 중에도 hard TTL까지 제공한다.
+CACHE_HARD_TTL_SECONDS: float = float(get_env("CACHE_HARD_TTL_SECONDS", "3600"))
+CACHE_MAX_ENTRIES: int = int(get_env("CACHE_MAX_ENTRIES", "512"))
+CACHE_MAX_ENTRY_BYTES: int = int(get_env("CACHE_MAX_ENTRY_BYTES", str(512 * 1024)))
+CACHE_MAX_TOTAL_BYTES: int = int(get_env("CACHE_MAX_TOTAL_BYTES", str(32 * 1024 * 1024)))
+# 워커 프로세스들이 함께 쓰는 2차 캐시 파일(SQLite). 비어 있으면 프로세스 내 캐시만 쓴다.
+# `python -m app.server`가 워커를 2개 이상 띄울 때 SHARED_CACHE_ENABLED이면 자동으로 채운다.
+SHARED_CACHE_PATH: Optional[str] = get_env("SHARED_CACHE_PATH")
+SHARED_CACHE_ENABLED: bool = get_env_flag("SHARED_CACHE_ENABLED", True)
+
+# 생성 요청의 Idempotency-Key: 첫 응답 보관 시간, 보관 키 수, 처리 중 표시가 스스로 풀리는 시간
+IDEMPOTENCY_ENABLED: bool = get_env_flag("IDEMPOTENCY_ENABLED", True)
+IDEMPOTENCY_TTL_SECONDS: float = float(get_env("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+IDEMPOTENCY_MAX_KEYS: int = int(get_env("IDEMPOTENCY_MAX_KEYS", "10000"))
+IDEMPOTENCY_LOCK_SECONDS: float = float(get_env("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+# 대회 진출 확률(GET /tournaments/{id}/odds)의 기본/최대 시뮬레이션 횟수
+TOURNAMENT_ODDS_SIMULATIONS: int = int(get_env("TOURNAMENT_ODDS_SIMULATIONS", "20000"))
+TOURNAMENT_ODDS_MAX_SIMULATIONS: int = int(get_env("TOURNAMENT_ODDS_MAX_SIMULATIONS", "200000"))
+
+# 완료된 대회 보관본: 워커 메모리에 들고 있는 보관본 수
+TOURNAMENT_ARCHIVE_CACHE_ENTRIES: int = int(get_env("TOURNAMENT_ARCHIVE_CACHE_ENTRIES", "64"))
+
+# iCalendar 피드: 클라이언트 갱신 주기, 예약 피드에 담는 기간(오늘 기준 과거/미래 일수), 경기 일정 길이(분)
+CALENDAR_MAX_AGE_SECONDS: int = int(get_env("CALENDAR_MAX_AGE_SECONDS", "3600"))
+CALENDAR_PAST_DAYS: int = int(get_env("CALENDAR_PAST_DAYS", "30"))
+CALENDAR_FUTURE_DAYS: int = int(get_env("CALENDAR_FUTURE_DAYS", "180"))
+CALENDAR_MATCH_MINUTES: int = int(get_env("CALENDAR_MATCH_MINUTES", "60"))
+# 워커 메모리에 들고 있는 피드 수와 렌더링해 둔 VEVENT 수
+CALENDAR_FEED_CACHE_ENTRIES: int = int(get_env("CALENDAR_FEED_CACHE_ENTRIES", "256"))
+CALENDAR_EVENT_CACHE_ENTRIES: int = int(get_env("CALENDAR_EVENT_CACHE_ENTRIES", "8192"))
+# 개인 예약 피드 주소의 서명 키. 비어 있으면 SUPABASE_JWT_SECRET을 쓰며, 바꾸면 기존 구독 주소가 모두 무효가 된다.
+CALENDAR_FEED_SECRET: Optional[str] = get_env("CALENDAR_FEED_SECRET")
+
+# 대량 내보내기(GET /export/{dataset})에서 upstream 한 번에 읽는 행 수. PostgREST의 max-rows(Supabase 기본 1000)를 넘기지 않는다.
+EXPORT_PAGE_SIZE: int = int(get_env("EXPORT_PAGE_SIZE", "1000"))
+
+# 응답 압축 (gzip/brotli)
+COMPRESSION_ENABLED: bool = get_env_flag("COMPRESSION_ENABLED", True)
+COMPRESSION_MIN_BYTES: int = int(get_env("COMPRESSION_MIN_BYTES", "1024"))
+
+# 데이터 접근 백엔드: supabase(PostgREST REST) | postgres(asyncpg로 Postgres 직접 연결)
+DATA_BACKEND: str = (get_env("DATA_BACKEND", "supabase") or "supabase").lower()
+DATABASE_URL: Optional[str] = get_env("DATABASE_URL")
+PG_POOL_MIN_SIZE: int = int(get_env("PG_POOL_MIN_SIZE", "1"))
+PG_POOL_MAX_SIZE: int = int(get_env("PG_POOL_MAX_SIZE", "10"))
+# Supabase 트랜잭션 풀러(pgbouncer, 6543 포트)를 거칠 때는 0으로 둔다.
+PG_STATEMENT_CACHE_SIZE: int = int(get_env("PG_STATEMENT_CACHE_SIZE", "100"))
+PG_COMMAND_TIMEOUT_SECONDS: float = float(get_env("PG_COMMAND_TIMEOUT_SECONDS", "10"))
+
+# 요청당 upstream 호출 예산 (라우트별 값은 @query_budget으로 지정)
+QUERY_BUDGET: int = int(get_env("QUERY_BUDGET", "10"))
+# 한 요청에서 같은 테이블/작업이 이 횟수 이상 반복되면 N+1로 보고 경고한다.
+QUERY_REPEAT_THRESHOLD: int = int(get_env("QUERY_REPEAT_THRESHOLD", "5"))
+# 켜면 모든 응답에 Server-Timing(테이블/작업별 호출 시간)을 붙인다. 끄면 관리자의 X-Profile 요청에만 붙인다.
+SERVER_TIMING_ENABLED: bool = get_env_flag("SERVER_TIMING_ENABLED", False)
+
+# 요청 deadline(라우트별 값은 @time_budget으로 지정)과 upstream 호출당 타임아웃 상한
+REQUEST_DEADLINE_SECONDS: float = float(get_env("REQUEST_DEADLINE_SECONDS", "10"))
+UPSTREAM_TIMEOUT_SECONDS: float = float(get_env("UPSTREAM_TIMEOUT_SECONDS", "5"))
+# 조회의 일시적 오류 재시도: 최대 시도 횟수(첫 호출 포함), 지터 백오프 기준/상한
+RETRY_MAX_ATTEMPTS: int = int(get_env("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BACKOFF_BASE_SECONDS: float = float(get_env("RETRY_BACKOFF_BASE_SECONDS", "0.05"))
+RETRY_BACKOFF_MAX_SECONDS: float = float(get_env("RETRY_BACKOFF_MAX_SECONDS", "1"))
+# 재시도 예산: 원 호출 대비 비율 + 호출이 적을 때를 위한 초당 최소 허용량
+RETRY_BUDGET_RATIO: float = float(get_env("RETRY_BUDGET_RATIO", "0.1"))
+RETRY_BUDGET_MIN_PER_SECOND: float = float(get_env("RETRY_BUDGET_MIN_PER_SECOND", "1"))
+# 서킷 브레이커: 연속 일시적 오류 횟수, 열린 뒤 시험 호출까지의 시간
+BREAKER_FAILURE_THRESHOLD: int = int(get_env("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS: float = float(get_env("BREAKER_RESET_SECONDS", "10"))
+
+# 온디맨드 프로파일링: 일반 요청을 샘플링할 확률(0이면 관리자 X-Profile 헤더로만), 샘플 간격, 보관 개수
+PROFILE_SAMPLE_RATE: float = float(get_env("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS: float = float(get_env("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_RESULTS: int = int(get_env("PROFILE_MAX_RESULTS", "20"))
+
+# 관리자 여부(role) 조회 결과를 이 시간 동안 재사용한다. 0이면 매 요청 DB를 조회한다.
+ROLE_CACHE_TTL_SECONDS: float = float(get_env("ROLE_CACHE_TTL_SECONDS", "30"))
+
+# 시작 시 워밍업: 클라이언트/커넥션을 미리 열고 자주 쓰는 캐시를 채운다.
+WARMUP_ENABLED: bool = get_env_flag("WARMUP_ENABLED", True)
+# 워밍업이 이 시간을 넘기면 기다리지 않고 요청을 받기 시작한다 (남은 작업은 백그라운드에서 끝난다).
+WARMUP_TIMEOUT_SECONDS: float = float(get_env("WARMUP_TIMEOUT_SECONDS", "10"))
+
+# 워커 프로세스 수(`python -m app.server`): 숫자 또는 auto(컨테이너에 할당된 CPU 수)
+WEB_CONCURRENCY: str = get_env("WEB_CONCURRENCY", "auto")
+# 종료/재시작 시 처리 중인 요청을 기다리는 최대 시간. Cloud Run은 SIGTERM 후 10초를 준다.
+GRACEFUL_SHUTDOWN_SECONDS: int = int(get_env("GRACEFUL_SHUTDOWN_SECONDS", "8"))
+
+# /metrics 접근: 기본은 관리자 토큰 또는 METRICS_TOKEN(스크래퍼용 Bearer 토큰)이 있어야 한다.
+# 외부에 열리지 않은 내부망에서만 METRICS_PUBLIC=true로 인증 없이 연다.
+METRICS_TOKEN: Optional[str] = get_env("METRICS_TOKEN")
+METRICS_PUBLIC: bool = get_env_flag("METRICS_PUBLIC", False)
+
+
 def get_allowed_origins() -> List[str]:
     raw = get_env("ALLOWED_ORIGINS")
     default_prod = [
@@ -1,32 +1,152 @@
-from supabase import create_client, Client
-
 from dotenv import load_dotenv
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from datetime import datetime
 
 from app.config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, require_env
+from app.metrics import record_upstream
+from app.resilience import UpstreamStatusError, call_timeout, resilient
+from app.tracing import record_call
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 load_dotenv()
 
+# PostgREST 요청 빌더에서 실제 작업 종류를 결정하는 메서드
+_OPERATIONS = ("select", "insert", "upsert", "update", "delete")
+
+
+class _TracedQuery:
+    """PostgREST 요청 빌더 프록시. execute() 호출마다 테이블/작업별 시간을 기록한다."""
+
+    __slots__ = ("_builder", "_table", "_operation")
+
+    def __init__(self, builder: Any, table: str, operation: Optional[str] = None) -> None:
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+        if callable(attr):
+            operation = self._operation or (name if name in _OPERATIONS else None)
+
+            def call(*args: Any, **kwargs: Any) -> Any:
+                result = attr(*args, **kwargs)
+                return _TracedQuery(result, self._table, operation) if hasattr(result, "execute") else result
+
+            return call
+        if hasattr(attr, "execute"):
+            # `.not_` 같은 프로퍼티도 빌더를 돌려준다.
+            return _TracedQuery(attr, self._table, self._operation)
+        return attr
+
+    def execute(self) -> Any:
+        operation = self._operation or "select"
+        return resilient("rest", self._table, operation, lambda: timed(self._table, operation, self._builder.execute))
+
+
+class _TracedAuthAdmin:
+    """sb.auth.admin 프록시. create_user, update_user_by_id 등의 호출을 기록한다."""
+
+    def __init__(self, admin: Any) -> None:
+        self._admin = admin
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._admin, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return resilient("auth", "auth", name, lambda: timed("auth", name, lambda: attr(*args, **kwargs)))
+
+        return call
+
+
+class _TracedAuth:
+    def __init__(self, auth: Any) -> None:
+        self._auth = auth
+        self.admin = _TracedAuthAdmin(auth.admin)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._auth, name)
+
+
+class TracedClient:
+    """Supabase Client 래퍼. 라우터 코드는 그대로 두고 모든 upstream 호출을 계측한다."""
+
+    def __init__(self, client: "Client") -> None:
+        self.client = client
+        self.auth = _TracedAuth(client.auth)
+
+    def table(self, name: str) -> _TracedQuery:
+        return _TracedQuery(self.client.table(name), name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None) -> _TracedQuery:
+        return _TracedQuery(self.client.rpc(fn, params or {}), fn, "rpc")
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+def timed(table: str, operation: str, call: Any) -> Any:
+    started = time.perf_counter()
+    ok = False
+    try:
+        result = call()
+        ok = True
+        return result
+    finally:
+        elapsed = time.perf_counter() - started
+        record_upstream(table, operation, elapsed, ok)
+        record_call(table, operation, elapsed, ok)
+
+
 # TTL 기반 싱글턴 캐시: 장기 HTTP/2 세션 이슈 완화 + 성능 유지
-_SB_CLIENT: Optional[Client] = None
+_SB_CLIENT: Optional[TracedClient] = None
 _SB_CREATED_AT: float = 0.0
 _TTL_SECONDS: int = int(os.getenv("SUPABASE_CLIENT_TTL_SECONDS", "300"))  # 기본 5분
 
 
-def _create_client() -> Client:
+def _bound_session(session: Any) -> None:
+    """postgrest가 쓰는 httpx 세션에 호출별 타임아웃을 넣고, 5xx는 상태 코드를 담은 예외로 바꾼다.
+
+    postgrest-py는 요청마다 타임아웃을 받지 않고(클라이언트 기본값 120초) 5xx도 상태 코드 없는
+    APIError로 바꾸므로, 재시도 여부를 판단할 수 있도록 세션 단계에서 처리한다.
+    """
+    request = session.request
+
+    def request_with_timeout(*args: Any, **kwargs: Any) -> Any:
+        kwargs.setdefault("timeout", call_timeout())
+        response = request(*args, **kwargs)
+        if response.status_code >= 500:
+            raise UpstreamStatusError(response.status_code, response.text[:200])
+        return response
+
+    session.request = request_with_timeout
+
+
+def _create_client() -> "Client":
+    # supabase는 gotrue/postgrest/storage/realtime까지 끌고 와 import만 100ms가 넘는다.
+    # postgres 백엔드에서는 auth.admin을 쓰는 드문 요청에서야 필요하므로 처음 만들 때 import한다.
+    from supabase import create_client
+
     url = SUPABASE_URL or require_env("SUPABASE_URL")
     key = SUPABASE_SERVICE_ROLE_KEY or require_env("SUPABASE_SERVICE_ROLE_KEY")
-    return create_client(url, key)
+    client = create_client(url, key)
+    _bound_session(client.postgrest.session)
+    return client
 
 
-def get_supabase() -> Client:
+def get_supabase() -> TracedClient:
     global _SB_CLIENT, _SB_CREATED_AT
     now = time.time()
     if _SB_CLIENT is None or (now - _SB_CREATED_AT) > _TTL_SECONDS:
-        _SB_CLIENT = _create_client()
+        _SB_CLIENT = TracedClient(_create_client())
         _SB_CREATED_AT = now
     return _SB_CLIENT
 
@@ -0,0 +1,172 @@
+"""대량 내보내기 (GET /export/{dataset}).
+
+연말 보고서용 전체 이력을 목록 API로 받으면 서버가 모든 행을 메모리에 올리고 JSON 배열 하나로
+직렬화한다. 내보내기는 upstream을 (정렬 키, id) 키셋으로 EXPORT_PAGE_SIZE행씩 읽고, 읽은 페이지를
+바로 CSV/NDJSON 조각으로 흘려보내므로 테이블 크기와 무관하게 메모리에는 한 페이지만 남는다.
+offset 대신 키셋을 쓰므로 뒤쪽 페이지도 앞쪽과 같은 비용으로 읽는다.
+"""
+
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import EXPORT_PAGE_SIZE
+from app.repositories import Repositories, get_repositories
+from app.repositories.base import Row
+from app.serialization import dumps
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+# 엑셀이 UTF-8 CSV의 한글을 깨뜨리지 않도록 BOM을 붙인다.
+_CSV_BOM = "﻿"
+# 스프레드시트가 수식으로 실행하는 값(=, +, -, @로 시작)은 앞에 '를 붙여 글자로 둔다.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+PageFetcher = Callable[[Repositories, Optional[date], Optional[date], Any, int], List[Row]]
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    name: str
+    fetch: PageFetcher
+    # 다음 페이지를 읽을 커서 (페이지 마지막 원본 행에서)
+    cursor: Callable[[Row], Any]
+    # 원본 행 → NDJSON 한 줄의 객체
+    shape: Callable[[Row], Row]
+    columns: Tuple[str, ...]
+    # shape한 객체 → CSV 한 행 (columns 순서)
+    csv_row: Callable[[Row], Sequence[Any]]
+
+
+def _participants(row: Row) -> Row:
+    participants = row.pop("debate_participants", None) or []
+    return {**row, "participants": participants}
+
+
+def _debate_csv(row: Row) -> Sequence[Any]:
+    names = {"pro": [], "con": []}
+    for participant in row["participants"]:
+        names.get(participant.get("side"), []).append(participant.get("participant_name") or "")
+    return (
+        row["id"], row["debate_date"], row.get("debate_type"), row.get("topic_text"), row.get("winner_side"),
+        row.get("notes"), names["pro"], names["con"], len(row["participants"]),
+    )
+
+
+def _member_stats(row: Row) -> Row:
+    decided = row["wins"] + row["losses"]
+    return {
+        "user_id": row["user_id"],
+        "name": (row.get("name") or "").strip() or "이름 미입력",
+        "generation": (row.get("generation") or "").strip(),
+        "major": (row.get("major") or "").strip(),
+        "wins": row["wins"],
+        "losses": row["losses"],
+        "total": row["total"],
+        "win_rate": round(row["wins"] / decided, 4) if decided > 0 else 0.0,
+    }
+
+
+def _columns_row(columns: Tuple[str, ...]) -> Callable[[Row], Sequence[Any]]:
+    return lambda row: [row.get(column) for column in columns]
+
+
+_RECORD_COLUMNS = (
+    "id", "date", "category", "title", "summary", "keyPoints", "conclusion", "participants", "participantNames",
+)
+_RESERVATION_COLUMNS = (
+    "id", "starts_at", "ends_at", "title", "reserved_by", "reserved_by_name", "debate_id", "allow_simultaneous",
+    "created_at",
+)
+_MEMBER_STATS_COLUMNS = ("user_id", "name", "generation", "major", "wins", "losses", "total", "win_rate")
+
+DATASETS = {
+    dataset.name: dataset
+    for dataset in (
+        ExportDataset(
+            name="debates",
+            fetch=lambda repos, start, end, after, limit: repos.debates.export_page(start, end, after, limit),
+            cursor=lambda row: (row["debate_date"], row["id"]),
+            shape=_participants,
+            columns=(
+                "id", "debate_date", "debate_type", "topic_text", "winner_side", "notes", "pro_participants",
+                "con_participants", "participant_count",
+            ),
+            csv_row=_debate_csv,
+        ),
+        ExportDataset(
+            name="records",
+            fetch=lambda repos, start, end, after, limit: repos.records.export_page(start, end, after, limit),
+            cursor=lambda row: (row["date"], row["id"]),
+            shape=lambda row: row,
+            columns=_RECORD_COLUMNS,
+            csv_row=_columns_row(_RECORD_COLUMNS),
+        ),
+        ExportDataset(
+            name="member-stats",
+            fetch=lambda repos, start, end, after, limit: repos.users.debate_stats(start, end, after, limit),
+            cursor=lambda row: row["user_id"],
+            shape=_member_stats,
+            columns=_MEMBER_STATS_COLUMNS,
+            csv_row=_columns_row(_MEMBER_STATS_COLUMNS),
+        ),
+        ExportDataset(
+            name="reservations",
+            fetch=lambda repos, start, end, after, limit: repos.reservations.export_page(start, end, after, limit),
+            cursor=lambda row: (row["starts_at"], row["id"]),
+            shape=lambda row: row,
+            columns=_RESERVATION_COLUMNS,
+            csv_row=_columns_row(_RESERVATION_COLUMNS),
+        ),
+    )
+}
+
+
+def iter_pages(
+    dataset: ExportDataset, start: Optional[date], end: Optional[date], page_size: Optional[int] = None
+) -> Iterator[List[Row]]:
+    """키셋 커서로 페이지를 차례로 읽는다. PostgREST max-rows가 page_size보다 작아도 빠짐없이 읽도록 빈 페이지에서 멈춘다."""
+    page_size = page_size or EXPORT_PAGE_SIZE
+    repos = get_repositories()
+    after = None
+    while True:
+        rows = dataset.fetch(repos, start, end, after, page_size)
+        if not rows:
+            return
+        after = dataset.cursor(rows[-1])
+        yield [dataset.shape(row) for row in rows]
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        value = "; ".join(str(item) for item in value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def csv_chunks(dataset: ExportDataset, pages: Iterator[List[Row]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(dataset.columns)
+    yield (_CSV_BOM + buffer.getvalue()).encode()
+    for page in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in dataset.csv_row(row)] for row in page)
+        yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(pages: Iterator[List[Row]]) -> Iterator[bytes]:
+    for page in pages:
+        yield b"".join(dumps(row) + b"\n" for row in page)
+
+
+def export_chunks(
+    dataset: ExportDataset, export_format: str, start: Optional[date], end: Optional[date]
+) -> Iterator[bytes]:
+    pages = iter_pages(dataset, start, end)
+    return csv_chunks(dataset, pages) if export_format == "csv" else ndjson_chunks(pages)
@@ -0,0 +1,199 @@
+"""iCalendar(RFC 5545) 구독 피드.
+
+회원들은 방 예약과 경기 시간을 확인하려고 앱을 다시 연다. 캘린더 앱에서 구독할 수 있는 .ics 피드를
+주되, 캘린더 앱은 보통 한 시간마다 같은 주소를 다시 부르므로 매번 새로 만들지 않는다.
+
+- VEVENT는 일정 값(NamedTuple) 그대로를 키로 렌더링 결과를 메모해 두고, 피드를 다시 만들 때는
+  바뀐 일정만 새로 렌더링해 이어 붙인다.
+- 만든 피드는 태그 버전과 함께 워커 메모리에 두고, 예약/대회 변경으로 태그가 무효화됐을 때만 다시 만든다.
+- 본문 해시를 ETag로, 본문이 처음 그 모양이 된 시각을 Last-Modified로 보내므로 바뀐 것이 없으면
+  폴링은 304로 끝난다. 다시 만들었는데 본문이 같으면 Last-Modified도 그대로 둔다.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi.responses import Response
+
+from app.cache import response_cache
+from app.compression import etag_matches, precompressed_response
+from app.config import CALENDAR_EVENT_CACHE_ENTRIES, CALENDAR_FEED_CACHE_ENTRIES, CALENDAR_MAX_AGE_SECONDS
+from app.singleflight import flights
+
+MEDIA_TYPE = "text/calendar; charset=utf-8"
+PRODID = "-//manjang//manjang-be//KO"
+UID_DOMAIN = "manjang"
+# RFC 5545 3.1: 한 줄은 줄바꿈을 빼고 75옥텟을 넘지 않는다.
+_LINE_OCTETS = 75
+
+
+def calendar_tag(user_id: Optional[str] = None) -> str:
+    """예약 피드의 캐시 태그. user_id를 주면 그 회원의 개인 피드."""
+    return f"reservations:calendar:{user_id}" if user_id else "reservations:calendar"
+
+
+class Event(NamedTuple):
+    uid: str
+    starts_at: Any
+    ends_at: Any
+    summary: str
+    description: str = ""
+    location: str = ""
+    updated_at: Any = None
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> bytes:
+    """긴 줄을 75옥텟 단위로 접는다. 이어지는 줄은 공백으로 시작하고, UTF-8 문자 중간에서는 자르지 않는다."""
+    data = line.encode()
+    if len(data) <= _LINE_OCTETS:
+        return data + b"\r\n"
+    parts: List[bytes] = []
+    start, limit = 0, _LINE_OCTETS
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end])
+        # 이어지는 줄은 맨 앞 공백 1옥텟을 뺀 만큼만 담는다.
+        start, limit = end, _LINE_OCTETS - 1
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def utc_stamp(value: Any) -> str:
+    """ISO 문자열/datetime → `20261019T090000Z`. 시간대가 없는 값은 UTC로 본다."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+@lru_cache(maxsize=CALENDAR_EVENT_CACHE_ENTRIES)
+def render_event(event: Event) -> bytes:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event.uid}@{UID_DOMAIN}",
+        # DTSTAMP는 필수다. 피드 본문이 요청 시각에 따라 바뀌지 않도록 일정의 수정 시각을 쓴다.
+        f"DTSTAMP:{utc_stamp(event.updated_at or event.starts_at)}",
+        f"DTSTART:{utc_stamp(event.starts_at)}",
+        f"DTEND:{utc_stamp(event.ends_at)}",
+        f"SUMMARY:{escape_text(event.summary)}",
+    ]
+    if event.description:
+        lines.append(f"DESCRIPTION:{escape_text(event.description)}")
+    if event.location:
+        lines.append(f"LOCATION:{escape_text(event.location)}")
+    if event.updated_at:
+        lines.append(f"LAST-MODIFIED:{utc_stamp(event.updated_at)}")
+    lines.append("END:VEVENT")
+    return b"".join(fold(line) for line in lines)
+
+
+def render_calendar(name: str, events: Iterable[Event]) -> bytes:
+    head = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+        "X-WR-TIMEZONE:Asia/Seoul",
+        # 구독 갱신 주기 힌트 (RFC 7986 REFRESH-INTERVAL, 구형 클라이언트용 X-PUBLISHED-TTL)
+        f"REFRESH-INTERVAL;VALUE=DURATION:PT{CALENDAR_MAX_AGE_SECONDS}S",
+        f"X-PUBLISHED-TTL:PT{CALENDAR_MAX_AGE_SECONDS}S",
+    ]
+    chunks = [fold(line) for line in head]
+    chunks.extend(render_event(event) for event in events)
+    chunks.append(fold("END:VCALENDAR"))
+    return b"".join(chunks)
+
+
+@dataclass
+class Feed:
+    body: bytes
+    etag: str
+    last_modified: datetime
+    # Content-Encoding별 압축본. 처음 요청될 때 한 번만 만든다.
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+
+class FeedStore:
+    """피드 키 → (태그 버전, 피드). 태그 버전이 바뀐 피드만 다시 만든다."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, ...], Feed]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, tags: Sequence[str], build: Callable[[], bytes]) -> Feed:
+        version = response_cache.tag_versions(tags)
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[0] == version:
+                self._entries.move_to_end(key)
+                return hit[1]
+        previous = hit[1] if hit is not None else None
+        # 같은 피드를 동시에 다시 만들지 않도록 병합한다. 무효화 이후 요청이 이전 빌드에 합류하지 않게 버전을 키에 넣는다.
+        flight_key = f"ical:{key}#{'.'.join(map(str, version))}"
+        return flights.do(flight_key, lambda: self._rebuild(key, version, build, previous))
+
+    def _rebuild(self, key: str, version: Tuple[int, ...], build: Callable[[], bytes], previous: Optional[Feed]) -> Feed:
+        body = build()
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        if previous is not None and previous.etag == etag:
+            feed = previous
+        else:
+            feed = Feed(body=body, etag=etag, last_modified=datetime.now(timezone.utc).replace(microsecond=0))
+        with self._lock:
+            self._entries[key] = (version, feed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return feed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+feed_store = FeedStore(CALENDAR_FEED_CACHE_ENTRIES)
+
+
+def _not_modified(feed: Feed, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+    # If-None-Match가 있으면 If-Modified-Since는 보지 않는다 (RFC 9110 13.1.3).
+    if if_none_match:
+        return etag_matches(feed.etag, if_none_match)
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return feed.last_modified <= since
+    return False
+
+
+def feed_response(
+    feed: Feed, if_none_match: Optional[str], if_modified_since: Optional[str], private: bool = False
+) -> Response:
+    """피드 응답. 조건부 요청이 맞으면 본문 없이 304. ETag는 보내는 인코딩마다 다르다."""
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": format_datetime(feed.last_modified, usegmt=True),
+        "Cache-Control": f"{'private' if private else 'public'}, max-age={CALENDAR_MAX_AGE_SECONDS}",
+    }
+    not_modified = _not_modified(feed, if_none_match, if_modified_since)
+    return precompressed_response(feed.body, feed.variants, MEDIA_TYPE, headers, not_modified)
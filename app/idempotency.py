@@ -0,0 +1,358 @@
+"""생성 요청의 Idempotency-Key 처리.
+
+행사장 Wi-Fi가 끊기면 클라이언트는 응답을 받지 못한 POST를 다시 보낸다. 그대로 처리하면
+검증 왕복을 다시 하고, 예약/대회/토론이 두 번 만들어진다. 클라이언트가 `Idempotency-Key`
+헤더를 붙여 보내면 (사용자, 키)마다 첫 응답을 저장해 두고, 같은 키의 재시도에는 DB를
+건드리지 않고 저장한 응답을 그대로 돌려준다(`Idempotent-Replayed: true`).
+
+- 첫 요청이 처리 중일 때 도착한 재시도는 그 결과를 기다렸다가 같은 응답을 받는다.
+  요청 deadline 안에 끝나지 않으면 409와 Retry-After를 돌려준다.
+- 같은 키를 다른 본문(또는 다른 API)에 다시 쓰면 422로 거절한다.
+- 2xx와 4xx 응답은 저장하고, 5xx나 예외로 끝난 요청은 저장하지 않아 재시도가 다시 처리된다.
+- 워커가 여럿일 때(SHARED_CACHE_PATH 설정)는 공유 캐시의 SQLite 파일에 저장해 다른 워커로
+  간 재시도도 같은 응답을 받는다.
+
+헤더가 없는 요청은 지금과 똑같이 처리한다.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Header, HTTPException
+from fastapi.responses import Response
+
+from app.config import (
+    IDEMPOTENCY_ENABLED,
+    IDEMPOTENCY_LOCK_SECONDS,
+    IDEMPOTENCY_MAX_KEYS,
+    IDEMPOTENCY_TTL_SECONDS,
+)
+from app.metrics import idempotency_requests
+from app.resilience import remaining_seconds
+from app.serialization import adapter_for, dumps, serialize
+from app.shared_cache import SharedCacheStore
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# acquire() 결과
+ACQUIRED = "acquired"
+REPLAY = "replay"
+MISMATCH = "mismatch"
+IN_FLIGHT = "in_flight"
+
+# 저장한 응답을 다시 만들 때 옮기지 않는 헤더(본문 길이는 Response가 다시 계산한다)
+_SKIP_HEADERS = {"content-length", "x-cache", "server-timing"}
+# 공유 저장소에서 처리 중인 키를 다시 확인하는 간격
+_POLL_SECONDS = 0.02
+# acquire 몇 번마다 만료 키 정리와 개수 제한을 적용할지
+_PRUNE_EVERY = 32
+
+
+class StoredResponse:
+    """첫 요청의 응답. 재시도에는 이것으로 같은 응답을 다시 만든다."""
+
+    __slots__ = ("status_code", "body", "headers")
+
+    def __init__(self, status_code: int, body: bytes, headers: Dict[str, str]) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers
+
+    def to_response(self, replayed: bool) -> Response:
+        response = Response(content=self.body, status_code=self.status_code, headers=self.headers)
+        if replayed:
+            response.headers[REPLAYED_HEADER] = "true"
+        return response
+
+
+class _Record:
+    __slots__ = ("fingerprint", "response", "expires_at")
+
+    def __init__(self, fingerprint: str, expires_at: float) -> None:
+        self.fingerprint = fingerprint
+        self.response: Optional[StoredResponse] = None
+        self.expires_at = expires_at
+
+
+class IdempotencyStore:
+    """프로세스 내 저장소. 키 수는 max_keys로 제한하고, 오래 쓰지 않은 완료 키부터 내보낸다.
+
+    처리 중인 키는 lock_seconds가 지나면 풀린다(첫 요청이 끝나지 못하고 사라진 경우 대비).
+    """
+
+    def __init__(self, ttl: float, max_keys: int, lock_seconds: float) -> None:
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.lock_seconds = lock_seconds
+        self._records: "OrderedDict[str, _Record]" = OrderedDict()
+        self._cond = threading.Condition()
+
+    def acquire(self, key: str, fingerprint: str, wait: float) -> Tuple[str, Optional[StoredResponse]]:
+        """키를 처리할 권한을 얻거나(ACQUIRED), 저장된 응답(REPLAY)을 받는다.
+
+        다른 요청이 처리 중이면 최대 wait초 동안 끝나기를 기다린다. 그 요청이 저장 없이
+        끝나면 이 요청이 대신 처리 권한을 얻는다.
+        """
+        deadline = time.monotonic() + wait
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                record = self._records.get(key)
+                if record is not None and record.expires_at <= now:
+                    del self._records[key]
+                    record = None
+                if record is None:
+                    self._records[key] = _Record(fingerprint, now + self.lock_seconds)
+                    self._evict_locked()
+                    return ACQUIRED, None
+                if record.fingerprint != fingerprint:
+                    return MISMATCH, None
+                if record.response is not None:
+                    self._records.move_to_end(key)
+                    return REPLAY, record.response
+                if now >= deadline:
+                    return IN_FLIGHT, None
+                self._cond.wait(deadline - now)
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        with self._cond:
+            record = self._records.get(key)
+            if record is not None:
+                record.response = response
+                record.expires_at = time.monotonic() + self.ttl
+                self._records.move_to_end(key)
+            self._cond.notify_all()
+
+    def release(self, key: str) -> None:
+        """저장하지 않고 처리 권한을 놓는다. 기다리던 요청 중 하나가 이어서 처리한다."""
+        with self._cond:
+            record = self._records.get(key)
+            if record is not None and record.response is None:
+                del self._records[key]
+            self._cond.notify_all()
+
+    def _evict_locked(self) -> None:
+        excess = len(self._records) - self.max_keys
+        if excess <= 0:
+            return
+        # 처리 중인 키는 내보내지 않는다. 기다리는 요청이 중복 처리로 이어질 수 있다.
+        for key in [key for key, record in self._records.items() if record.response is not None][:excess]:
+            del self._records[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            pending = sum(1 for record in self._records.values() if record.response is None)
+            return {"backend": "memory", "keys": len(self._records), "in_flight": pending}
+
+
+_SCHEMA = """
+create table if not exists idempotency_keys (
+  key text primary key,
+  fingerprint text not null,
+  status_code integer,
+  headers text,
+  body blob,
+  expires_at real not null
+);
+"""
+
+
+class SharedIdempotencyStore:
+    """공유 캐시 SQLite 파일에 두는 저장소. 워커 프로세스 사이에서 키와 처리 중 표시를 공유한다.
+
+    프로세스 사이에는 조건 변수가 없으므로 처리 중인 키는 짧은 간격으로 다시 읽는다.
+    시각은 프로세스 사이에서 비교할 수 있도록 벽시계 기준이다.
+    """
+
+    def __init__(self, shared: SharedCacheStore, ttl: float, max_keys: int, lock_seconds: float) -> None:
+        self.shared = shared
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.lock_seconds = lock_seconds
+        self._acquires = 0
+        self._count_lock = threading.Lock()
+        shared.connect().executescript(_SCHEMA)
+
+    def acquire(self, key: str, fingerprint: str, wait: float) -> Tuple[str, Optional[StoredResponse]]:
+        deadline = time.monotonic() + wait
+        conn = self.shared.connect()
+        while True:
+            now = time.time()
+            conn.execute("begin immediate")
+            try:
+                row = conn.execute(
+                    "select fingerprint, status_code, headers, body, expires_at from idempotency_keys where key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None or row[4] <= now:
+                    conn.execute(
+                        "insert or replace into idempotency_keys (key, fingerprint, expires_at) values (?, ?, ?)",
+                        (key, fingerprint, now + self.lock_seconds),
+                    )
+                    with self._count_lock:
+                        self._acquires += 1
+                        prune = self._acquires % _PRUNE_EVERY == 0
+                    if prune:
+                        self._prune(conn, now)
+                    conn.execute("commit")
+                    return ACQUIRED, None
+                conn.execute("commit")
+            except BaseException:
+                conn.execute("rollback")
+                raise
+            if row[0] != fingerprint:
+                return MISMATCH, None
+            if row[1] is not None:
+                return REPLAY, StoredResponse(row[1], row[3], json.loads(row[2]))
+            if time.monotonic() >= deadline:
+                return IN_FLIGHT, None
+            time.sleep(_POLL_SECONDS)
+
+    def complete(self, key: str, response: StoredResponse) -> None:
+        self.shared.connect().execute(
+            "update idempotency_keys set status_code = ?, headers = ?, body = ?, expires_at = ?"
+            " where key = ? and status_code is null",
+            (response.status_code, json.dumps(response.headers), response.body, time.time() + self.ttl, key),
+        )
+
+    def release(self, key: str) -> None:
+        self.shared.connect().execute("delete from idempotency_keys where key = ? and status_code is null", (key,))
+
+    def _prune(self, conn: Any, now: float) -> None:
+        conn.execute("delete from idempotency_keys where expires_at <= ?", (now,))
+        # 개수 제한: 만료가 가장 가까운(가장 오래전에 완료한) 키부터 지운다.
+        conn.execute(
+            "delete from idempotency_keys where key in (select key from idempotency_keys"
+            " where status_code is not null order by expires_at"
+            " limit max((select count(*) from idempotency_keys) - ?, 0))",
+            (self.max_keys,),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        keys, pending = self.shared.connect().execute(
+            "select count(*), coalesce(sum(status_code is null), 0) from idempotency_keys"
+        ).fetchone()
+        return {"backend": "shared", "keys": keys, "in_flight": pending}
+
+
+def _open_store() -> Any:
+    from app.cache import response_cache
+
+    if response_cache.shared is not None:
+        return SharedIdempotencyStore(
+            response_cache.shared, IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_LOCK_SECONDS
+        )
+    return IdempotencyStore(IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_LOCK_SECONDS)
+
+
+idempotency_store = _open_store()
+
+
+def fingerprint(route: str, params: Dict[str, Any]) -> str:
+    """같은 키로 같은 요청을 다시 보냈는지 확인하는 값: 라우트와 파싱된 본문/경로 파라미터의 해시."""
+    digest = hashlib.sha256(route.encode())
+    digest.update(dumps({name: params[name] for name in sorted(params)}))
+    return digest.hexdigest()
+
+
+def _store_result(result: Any, adapter: Any, validate: bool) -> Optional[StoredResponse]:
+    if isinstance(result, Response):
+        body = getattr(result, "body", None)
+        if body is None:
+            # 스트리밍 응답은 본문을 저장할 수 없다.
+            return None
+        headers = {name: value for name, value in result.headers.items() if name.lower() not in _SKIP_HEADERS}
+        return StoredResponse(result.status_code, body, headers)
+    return StoredResponse(200, serialize(result, adapter, validate), {"content-type": "application/json"})
+
+
+def _store_error(exc: HTTPException) -> StoredResponse:
+    headers = {"content-type": "application/json", **(exc.headers or {})}
+    return StoredResponse(exc.status_code, dumps({"detail": exc.detail}), headers)
+
+
+def _with_key_header(func: Callable, wrapper: Callable) -> None:
+    # FastAPI가 헤더를 읽어 넘기도록 핸들러 시그니처에 Idempotency-Key 파라미터를 덧붙인다.
+    signature = inspect.signature(func)
+    parameter = inspect.Parameter(
+        "idempotency_key",
+        inspect.Parameter.KEYWORD_ONLY,
+        default=Header(default=None, alias=HEADER, max_length=MAX_KEY_LENGTH),
+        annotation=Optional[str],
+    )
+    wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), parameter])
+
+
+def idempotent(response_model: Any = None, *, user: str = "user_id", validate: bool = True) -> Callable:
+    """생성 핸들러에 Idempotency-Key 처리를 붙이는 데코레이터. 라우터 데코레이터 바로 아래에 붙인다.
+
+    user는 인증된 사용자 id를 받는 파라미터 이름이다. 키는 사용자마다 따로이므로 다른 사용자가
+    같은 키를 써도 서로의 응답을 받지 않는다. 응답은 response_model로 직렬화해 저장하고,
+    저장한 바이트를 그대로 돌려주므로 첫 응답과 재시도 응답이 같다.
+
+        @router.post("", response_model=Debate)
+        @idempotent(Debate, user="admin_id")
+        def create_debate(payload: DebateCreate, admin_id: str = Depends(require_admin)): ...
+    """
+    adapter = adapter_for(response_model) if response_model is not None else None
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            raise TypeError("idempotent은 동기 핸들러에만 붙일 수 있습니다.")
+        route = f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, idempotency_key: Optional[str] = None, **kwargs: Any) -> Any:
+            if not IDEMPOTENCY_ENABLED or not idempotency_key:
+                return func(*args, **kwargs)
+            key = f"{kwargs[user]}:{idempotency_key}"
+            params = {name: value for name, value in kwargs.items() if name != user}
+            remaining = remaining_seconds()
+            wait = IDEMPOTENCY_LOCK_SECONDS if remaining is None else max(0.0, remaining)
+
+            outcome, stored = idempotency_store.acquire(key, fingerprint(route, params), wait)
+            idempotency_requests.inc(outcome)
+            if outcome == REPLAY:
+                return stored.to_response(replayed=True)
+            if outcome == MISMATCH:
+                raise HTTPException(status_code=422, detail="같은 Idempotency-Key를 다른 요청에 다시 사용할 수 없습니다.")
+            if outcome == IN_FLIGHT:
+                raise HTTPException(
+                    status_code=409,
+                    detail="같은 Idempotency-Key의 요청이 아직 처리 중입니다. 잠시 후 다시 시도해주세요.",
+                    headers={"Retry-After": "1"},
+                )
+
+            try:
+                result = func(*args, **kwargs)
+            except HTTPException as exc:
+                if exc.status_code < 500:
+                    idempotency_store.complete(key, _store_error(exc))
+                else:
+                    idempotency_store.release(key)
+                raise
+            except BaseException:
+                idempotency_store.release(key)
+                raise
+            stored = _store_result(result, adapter, validate)
+            if stored is None:
+                idempotency_store.release(key)
+                return result
+            if stored.status_code >= 500:
+                idempotency_store.release(key)
+            else:
+                idempotency_store.complete(key, stored)
+            return stored.to_response(replayed=False)
+
+        _with_key_header(func, wrapper)
+        return wrapper
+
+    return decorator
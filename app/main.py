@@ -1,20 +1,54 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import FastAPI, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from app.config import get_allowed_origins
+from app.compression import CompressionMiddleware
+from app.auth import require_admin, require_auth
+from app.config import METRICS_PUBLIC, METRICS_TOKEN, WARMUP_ENABLED, WARMUP_TIMEOUT_SECONDS, get_allowed_origins
+from app.metrics import MetricsMiddleware, registry
+from app.profiling import ProfilingMiddleware
+from app.repositories import close_repositories
+from app.tracing import TracingMiddleware
+from app.warmup import warm_up
 from app.routers.records import router as records_router
 from app.routers.reservations import router as reservations_router
 from app.routers.debates import router as debates_router
 from app.routers.members import router as members_router
 from app.routers.account import router as account_router
 from app.routers.tournaments import router as tournaments_router
+from app.routers.admin import router as admin_router
+from app.routers.exports import router as exports_router
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="Manjang Backend", version="0.1.0")
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    if WARMUP_ENABLED:
+        # uvicorn은 startup이 끝나야 포트를 열므로, 워밍업이 끝난 뒤 첫 요청을 받는다.
+        try:
+            await asyncio.wait_for(asyncio.to_thread(warm_up), WARMUP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("warm-up exceeded %.1fs; serving requests while it finishes", WARMUP_TIMEOUT_SECONDS)
+    yield
+    close_repositories()
+
 
+app = FastAPI(title="Manjang Backend", version="0.1.0", lifespan=lifespan)
+
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(TracingMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,15 +58,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 마지막에 추가한 미들웨어가 가장 바깥이므로, 압축/CORS까지 포함한 전체 처리 시간을 잰다.
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/health")
 def health_check() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(default=None)) -> PlainTextResponse:
+    # 라우트·테이블 구성과 트래픽이 드러나므로 기본으로 막는다. 스크래퍼는 METRICS_TOKEN, 사람은 관리자 토큰으로 본다.
+    scraper = bool(METRICS_TOKEN) and hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}")
+    if not (METRICS_PUBLIC or scraper):
+        require_admin(require_auth(authorization))
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 app.include_router(records_router, prefix="/records", tags=["records"])
 app.include_router(reservations_router, prefix="/reservations", tags=["reservations"])
 app.include_router(debates_router, prefix="/debates", tags=["debates"])
 app.include_router(members_router, prefix="/members", tags=["members"])
 app.include_router(account_router, prefix="/auth", tags=["auth"])
 app.include_router(tournaments_router, prefix="/tournaments", tags=["tournaments"])
+app.include_router(admin_router, prefix="/admin", tags=["admin"])
+app.include_router(exports_router, prefix="/export", tags=["export"])
@@ -0,0 +1,271 @@
+"""Prometheus 텍스트 형식 메트릭.
+
+외부 의존성 없이 필요한 만큼만 구현한 Counter/Gauge/Histogram과, 라우트별 지연시간/
+상태 코드/동시 처리 수를 기록하는 ASGI 미들웨어, Supabase 호출 계측 헬퍼를 둔다.
+`GET /metrics`가 render()의 결과를 그대로 내보낸다.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}" for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket별 개수..., 합계, 전체 개수]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, list(state)) for labels, state in self._values.items())
+        lines = self.header()
+        for labels, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {_format_number(cumulative)}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, inf)} {_format_number(state[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {state[-2]!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {_format_number(state[-1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        """렌더링할 때마다 호출되어 현재 값을 담은 메트릭을 돌려주는 함수를 등록한다."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(
+    Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+)
+http_latency = registry.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+)
+http_in_flight = registry.register(Gauge("http_requests_in_flight", "HTTP requests currently being served."))
+upstream_calls = registry.register(
+    Counter("upstream_calls_total", "Supabase calls by table, operation and outcome.", ("table", "operation", "status"))
+)
+upstream_latency = registry.register(
+    Histogram(
+        "upstream_call_duration_seconds",
+        "Supabase call latency by table and operation.",
+        ("table", "operation"),
+        buckets=(0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    )
+)
+
+upstream_retries = registry.register(
+    Counter("upstream_retries_total", "Upstream calls retried after a transient error.", ("table", "operation"))
+)
+upstream_timeouts = registry.register(
+    Counter("upstream_timeouts_total", "Upstream calls that timed out.", ("table", "operation"))
+)
+upstream_rejections = registry.register(
+    Counter(
+        "upstream_rejected_total",
+        "Upstream calls or retries not attempted (deadline, circuit_open, retry_budget).",
+        ("reason",),
+    )
+)
+circuit_state = registry.register(
+    Gauge("upstream_circuit_state", "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open).", ("upstream",))
+)
+circuit_transitions = registry.register(
+    Counter("upstream_circuit_transitions_total", "Circuit breaker state changes.", ("upstream", "state"))
+)
+
+idempotency_requests = registry.register(
+    Counter(
+        "idempotency_requests_total",
+        "Requests with an Idempotency-Key by outcome (acquired, replay, mismatch, in_flight).",
+        ("outcome",),
+    )
+)
+
+def record_upstream(table: str, operation: str, seconds: float, ok: bool) -> None:
+    upstream_calls.inc(table, operation, "ok" if ok else "error")
+    upstream_latency.observe(table, operation, value=seconds)
+
+
+def _cache_collector() -> Iterable[_Metric]:
+    # 캐시/요청 병합/압축 카운터는 각 모듈이 이미 세고 있으므로 조회 시점에 옮겨 담는다.
+    from app.cache import response_cache
+    from app.compression import compression_stats
+    from app.singleflight import flights
+
+    cache = response_cache.stats()
+    cache_events = Counter("response_cache_events_total", "Response cache events.", ("event",))
+    for event in ("hits", "misses", "stale_hits", "evictions", "invalidations"):
+        if event in cache:
+            cache_events.inc(event, amount=cache[event])
+    cache_size = Gauge("response_cache_size", "Response cache size.", ("unit",))
+    cache_size.set("entries", value=cache.get("entries", 0))
+    cache_size.set("bytes", value=cache.get("bytes", 0))
+
+    flight = flights.stats()
+    coalesced = Counter("singleflight_calls_total", "Upstream loads executed or coalesced.", ("result",))
+    coalesced.inc("executed", amount=flight["executions"])
+    coalesced.inc("coalesced", amount=flight["coalesced"])
+
+    compression = compression_stats.snapshot()
+    compressed = Counter("compression_bytes_total", "Bytes passed through response compression.", ("direction",))
+    compressed.inc("in", amount=compression["bytes_in"])
+    compressed.inc("out", amount=compression["bytes_out"])
+    return (cache_events, cache_size, coalesced, compressed)
+
+
+registry.register_collector(_cache_collector)
+
+
+def route_label(scope: Scope) -> str:
+    # 라우팅이 끝나면 FastAPI가 scope["route"]에 매칭된 라우트를 남긴다.
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """라우트 템플릿(`/tournaments/{event_id}`) 단위로 지연시간과 상태 코드를 기록한다."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec()
+            route = route_label(scope)
+            method = scope.get("method", "")
+            http_requests.inc(method, route, str(status_code))
+            http_latency.observe(method, route, value=time.perf_counter() - started)
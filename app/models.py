@@ -1,4 +1,4 @@
-from datetime import date, datetime
+from datetime import date, datetime, time
 from typing import List, Optional, Literal
 
 from pydantic import BaseModel, Field
@@ -32,6 +32,17 @@ class DebateParticipant(BaseModel):
     side: Literal["pro", "con"]
 
 
+class DebateRosterEntry(BaseModel):
+    user_id: Optional[str] = None
+    participant_name: Optional[str] = None
+    side: Literal["pro", "con"]
+
+
+class DebateRosterUpdate(BaseModel):
+    participants: List[DebateRosterEntry] = Field(default_factory=list)
+    winner_side: Optional[Literal["pro", "con"]] = None
+
+
 # -----------------------------
 # Reservations (단일 방)
 # -----------------------------
@@ -64,6 +75,11 @@ class ReservationUpdate(BaseModel):
     title: Optional[str] = None
 
 
+class CalendarSubscription(BaseModel):
+    # 개인 예약 iCalendar 피드 경로 (API 주소 뒤에 붙여 캘린더 앱에 구독 URL로 등록)
+    path: str
+
+
 # -----------------------------
 # Members (사전 등록 회원 시스템)
 # -----------------------------
@@ -132,6 +148,8 @@ class PasswordChangeRequest(BaseModel):
 # -----------------------------
 TournamentStatus = Literal["draft", "open", "ongoing", "completed"]
 TournamentStage = Literal["group", "final"]
+# 조 순위 비교 기준 (app.standings 참고)
+TournamentTiebreaker = Literal["points", "wins", "head_to_head", "score_diff", "score_for", "experience"]
 
 
 class TournamentBase(BaseModel):
@@ -144,6 +162,9 @@ class TournamentBase(BaseModel):
     venue: str = ""
     status: TournamentStatus = "draft"
     points_per_win: int = Field(default=1, ge=1, le=10)
+    tiebreakers: List[TournamentTiebreaker] = Field(
+        default_factory=lambda: ["points", "head_to_head", "experience"], min_length=1, max_length=6
+    )
 
 
 class TournamentCreate(TournamentBase):
@@ -160,6 +181,7 @@ class TournamentUpdate(BaseModel):
     venue: Optional[str] = None
     status: Optional[TournamentStatus] = None
     points_per_win: Optional[int] = Field(default=None, ge=1, le=10)
+    tiebreakers: Optional[List[TournamentTiebreaker]] = Field(default=None, min_length=1, max_length=6)
 
 
 class TournamentSummary(TournamentBase):
@@ -182,6 +204,8 @@ class TournamentTeamInput(BaseModel):
 
 
 class TournamentMatchInput(BaseModel):
+    # 다른 경기의 진출 조건(winner:<client_key>, loser:<client_key>)에서 이 경기를 가리킬 때 쓴다.
+    client_key: Optional[str] = None
     stage: TournamentStage = "group"
     round_label: str = ""
     starts_at: datetime
@@ -202,12 +226,135 @@ class TournamentSetup(BaseModel):
     matches: List[TournamentMatchInput] = Field(default_factory=list)
 
 
+class TournamentScheduleVenue(BaseModel):
+    name: str
+    # 한 시간대에 이 장소에서 동시에 치를 수 있는 경기 수
+    capacity: int = Field(default=1, ge=1, le=20)
+
+
+class TournamentScheduleRequest(BaseModel):
+    starts_at: datetime
+    # 한 경기에 잡는 시간 (다음 경기와의 교대 시간 포함)
+    match_minutes: int = Field(default=40, ge=5, le=600)
+    # 한 팀이 경기를 마치고 다음 경기까지 쉬어야 하는 시간
+    rest_minutes: int = Field(default=0, ge=0, le=1440)
+    # 이 시각을 넘겨 끝나는 경기는 다음 날 starts_at과 같은 시각부터 이어서 잡는다.
+    day_ends_at: Optional[time] = None
+    venues: List[TournamentScheduleVenue] = Field(min_length=1, max_length=50)
+    # 조마다 토너먼트에 올라가는 팀 수. 0이면 조별 리그전만 만든다.
+    advance_per_group: int = Field(default=2, ge=0, le=8)
+    third_place_match: bool = False
+
+
+class TournamentBalanceParticipant(BaseModel):
+    user_id: str
+    experience_score: int = Field(default=1, ge=1, le=3)
+    # 비워 두면 회원 정보의 기수/전공을 쓴다 (spread_* 를 켠 경우).
+    generation: Optional[str] = None
+    major: Optional[str] = None
+
+
+class TournamentBalanceRequest(BaseModel):
+    participants: List[TournamentBalanceParticipant] = Field(min_length=2, max_length=1000)
+    team_size: int = Field(default=3, ge=1, le=20)
+    group_count: int = Field(default=1, ge=1, le=26)
+    # 같은 팀에 같은 기수/전공이 몰리지 않게 한다.
+    spread_generation: bool = False
+    spread_major: bool = False
+    # 같은 seed면 같은 결과
+    seed: int = 0
+
+
+class TournamentBalanceStats(BaseModel):
+    team_count: int
+    team_experience_stdev: float
+    team_experience_min: float
+    team_experience_max: float
+    group_experience_range: float
+    duplicate_generation_pairs: int
+    duplicate_major_pairs: int
+    iterations: int
+    improvements: int
+
+
+class TournamentBalanceResult(BaseModel):
+    # PUT /tournaments/{id}/setup의 teams에 그대로 쓸 수 있다.
+    teams: List[TournamentTeamInput]
+    stats: TournamentBalanceStats
+
+
+class TournamentTeamOdds(BaseModel):
+    team_id: str
+    team_name: str
+    group_name: str
+    # [1위 확률, 2위 확률, ...] (조 인원만큼)
+    rank_probabilities: List[float]
+    # 토너먼트 경기가 없으면 None
+    knockout_probability: Optional[float] = None
+    final_probability: Optional[float] = None
+    champion_probability: Optional[float] = None
+
+
+class TournamentOdds(BaseModel):
+    tournament_id: str
+    # 대진/결과 상태의 해시. 같은 version이면 같은 결과다.
+    version: str
+    simulations: int
+    model: Literal["uniform", "rating"]
+    remaining_matches: int
+    teams: List[TournamentTeamOdds]
+
+
 class TournamentMatchResult(BaseModel):
     team_a_score: float = Field(ge=0)
     team_b_score: float = Field(ge=0)
     winner_team_id: Optional[str] = None
 
 
+class MemberTournamentMatch(BaseModel):
+    match_id: str
+    stage: TournamentStage
+    round_label: str = ""
+    starts_at: datetime
+    status: Literal["scheduled", "completed"]
+    # 진출 조건으로만 정해진 상대는 결과가 나오기 전까지 None
+    opponent_team_id: Optional[str] = None
+    opponent_name: Optional[str] = None
+    team_score: Optional[float] = None
+    opponent_score: Optional[float] = None
+    result: Literal["win", "loss", "pending"]
+
+
+class MemberTournamentEntry(BaseModel):
+    tournament_id: str
+    title: str
+    starts_on: date
+    ends_on: date
+    status: TournamentStatus
+    team_id: str
+    team_name: str
+    group_name: str
+    played: int = 0
+    wins: int = 0
+    losses: int = 0
+    score_for: float = 0.0
+    score_against: float = 0.0
+    matches: List[MemberTournamentMatch] = Field(default_factory=list)
+
+
+class MemberTournamentHistory(BaseModel):
+    user_id: str
+    tournament_count: int = 0
+    played: int = 0
+    wins: int = 0
+    losses: int = 0
+    win_rate: float = 0.0
+    score_for: float = 0.0
+    score_against: float = 0.0
+    # 최근 대회부터
+    tournaments: List[MemberTournamentEntry] = Field(default_factory=list)
+
+
 # -----------------------------
 # Legacy Records (for /records router compatibility)
 # -----------------------------
@@ -0,0 +1,328 @@
+"""진행 중인 대회의 몬테카를로 진출 확률.
+
+남은 경기를 한꺼번에 simulations번 뽑아 NumPy 배열 연산으로 조 순위와 토너먼트를 계산한다.
+경기 하나에 대한 난수는 (simulations,) 벡터 하나이고, 조 순위는 시뮬레이션 축을 그대로 둔 채
+np.lexsort로 정렬하므로 파이썬 반복은 경기 수/조 수만큼만 돈다.
+
+- 승률: uniform은 모든 경기 50%, rating은 Elo 레이팅(경력점수로 시작점을 정하고 끝난 경기 결과로 갱신)
+- 조 순위: 대회의 tiebreakers를 그대로 적용한다. head_to_head는 앞 기준까지 동률인 팀끼리의 승수다.
+  남은 경기는 승패만 뽑으므로 score_diff/score_for는 지금까지 끝난 경기 값으로 비교한다.
+- 토너먼트: 진출 조건(조 순위, 앞 경기 승자/패자)을 시뮬레이션마다 풀어 결승 진출/우승 확률을 낸다.
+
+결과는 대진/결과 상태의 해시(version)별로 보관하므로, 같은 상태에서는 다시 시뮬레이션하지 않는다.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from app.standings import GROUP_STAGE, HEAD_TO_HEAD, TIEBREAKERS, TournamentEngine, team_experience
+
+if TYPE_CHECKING:
+    import numpy
+
+ODDS_MODELS = ("uniform", "rating")
+ELO_BASE = 1500.0
+ELO_SCALE = 400.0
+ELO_K = 32.0
+# 경력점수 1점 차이를 레이팅 몇 점으로 볼지
+ELO_PER_EXPERIENCE = 100.0
+
+_MEMO_SIZE = 32
+_BATCH_ELEMENTS = 4_000_000
+_memo: "OrderedDict[Tuple[str, int, str], dict]" = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def snapshot_version(engine: TournamentEngine) -> str:
+    """확률 계산에 쓰는 상태(팀, 경기 결과, 진출 조건, 순위 규칙)의 해시."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(repr((engine.points_per_win, engine.tiebreakers)).encode())
+    for team_id in sorted(engine.team_by_id):
+        team = engine.team_by_id[team_id]
+        digest.update(repr((team_id, team.get("name"), team.get("group_name"), team_experience(team))).encode())
+    for match in engine.matches:
+        digest.update(
+            repr(
+                (
+                    match["id"], match.get("stage"), match.get("group_name"), match.get("status"), match.get("starts_at"),
+                    match.get("team_a_id"), match.get("team_b_id"), match.get("winner_team_id"),
+                    match.get("team_a_score"), match.get("team_b_score"),
+                    match.get("team_a_source_group"), match.get("team_b_source_group"),
+                )
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+def elo_ratings(engine: TournamentEngine) -> Dict[str, float]:
+    """경력점수를 시작점으로, 끝난 경기를 시간순으로 반영한 Elo 레이팅."""
+    experience = {team_id: team_experience(team) for team_id, team in engine.team_by_id.items()}
+    mean = sum(experience.values()) / len(experience) if experience else 0.0
+    ratings = {team_id: ELO_BASE + ELO_PER_EXPERIENCE * (value - mean) for team_id, value in experience.items()}
+    completed = [match for match in engine.matches if match.get("status") == "completed" and match.get("winner_team_id")]
+    for match in sorted(completed, key=lambda match: str(match.get("starts_at") or "")):
+        team_a_id, team_b_id = match.get("team_a_id"), match.get("team_b_id")
+        if team_a_id not in ratings or team_b_id not in ratings:
+            continue
+        expected = 1.0 / (1.0 + 10 ** ((ratings[team_b_id] - ratings[team_a_id]) / ELO_SCALE))
+        actual = 1.0 if match["winner_team_id"] == team_a_id else 0.0
+        ratings[team_a_id] += ELO_K * (actual - expected)
+        ratings[team_b_id] -= ELO_K * (actual - expected)
+    return ratings
+
+
+class _Simulation:
+    def __init__(self, engine: TournamentEngine, simulations: int, model: str, rng: "numpy.random.Generator") -> None:
+        # numpy는 import만 100ms 가까이 걸리고 이 API에서만 쓰므로 처음 계산할 때 불러온다.
+        import numpy as np
+
+        self.np = np
+        self.engine = engine
+        self.n = simulations
+        self.rng = rng
+        self.team_ids = sorted(engine.team_by_id, key=lambda team_id: (
+            engine.team_by_id[team_id].get("group_name") or "", engine.team_by_id[team_id].get("name") or "",
+        ))
+        self.index = {team_id: position for position, team_id in enumerate(self.team_ids)}
+        if model == "rating":
+            ratings = elo_ratings(engine)
+            self.ratings = np.array([ratings[team_id] for team_id in self.team_ids] + [ELO_BASE])
+        else:
+            self.ratings = None
+        # 경기 id → (A팀, B팀, 승자, 패자) 시뮬레이션별 팀 번호 배열. 정해지지 않으면 -1.
+        self.results: Dict[str, Tuple[Any, Any, Any, Any]] = {}
+        # 조 → 순위별 팀 번호 (simulations, 팀 수)
+        self.group_order: Dict[str, Any] = {}
+        self.remaining = 0
+
+    # -----------------------------
+    # 공통
+    # -----------------------------
+    def _constant(self, team_id: Optional[str]) -> "numpy.ndarray":
+        return self.np.full(self.n, self.index.get(team_id, -1) if team_id else -1, dtype=self.np.int32)
+
+    def _a_wins(self, team_a: "numpy.ndarray", team_b: "numpy.ndarray") -> "numpy.ndarray":
+        draws = self.rng.random(self.n)
+        if self.ratings is None:
+            return draws < 0.5
+        # -1(미정)은 마지막 칸(ELO_BASE)을 가리킨다.
+        probability = 1.0 / (1.0 + 10 ** ((self.ratings[team_b] - self.ratings[team_a]) / ELO_SCALE))
+        return draws < probability
+
+    # -----------------------------
+    # 조별 리그
+    # -----------------------------
+    def run_groups(self) -> None:
+        np = self.np
+        engine = self.engine
+        for group_name, teams in engine.groups.items():
+            rows = {row["team_id"]: row for row in engine.standings_by_group.get(group_name, ())}
+            members = sorted(teams, key=lambda team: team["name"])
+            local = {team["id"]: position for position, team in enumerate(members)}
+            k = len(members)
+            # wins[s, t, o]: 시뮬레이션 s에서 t가 o를 이긴 횟수
+            wins = np.zeros((self.n, k, k), dtype=np.int16)
+            global_ids = np.array([self.index[team["id"]] for team in members], dtype=np.int32)
+            for match in engine.group_matches.get(group_name, ()):
+                team_a_id, team_b_id = match.get("team_a_id"), match.get("team_b_id")
+                if team_a_id not in local or team_b_id not in local:
+                    continue
+                a, b = local[team_a_id], local[team_b_id]
+                if match.get("status") == "completed" and match.get("winner_team_id"):
+                    if match["winner_team_id"] not in (team_a_id, team_b_id):
+                        continue
+                    winner, loser = (a, b) if match["winner_team_id"] == team_a_id else (b, a)
+                    wins[:, winner, loser] += 1
+                    self.results[match["id"]] = (
+                        self._constant(team_a_id), self._constant(team_b_id),
+                        self._constant(members[winner]["id"]), self._constant(members[loser]["id"]),
+                    )
+                    continue
+                self.remaining += 1
+                team_a, team_b = self._constant(team_a_id), self._constant(team_b_id)
+                a_wins = self._a_wins(team_a, team_b)
+                wins[:, a, b] += a_wins
+                wins[:, b, a] += ~a_wins
+                self.results[match["id"]] = (
+                    team_a, team_b, np.where(a_wins, team_a, team_b), np.where(a_wins, team_b, team_a)
+                )
+            order = self._rank(wins, [rows.get(team["id"], {}) for team in members])
+            self.group_order[group_name] = global_ids[order]
+
+    def _rank(self, wins: "numpy.ndarray", rows: List[dict]) -> "numpy.ndarray":
+        """조 안에서 순위순 팀 번호 (simulations, k). standings.TournamentEngine._rank와 같은 규칙."""
+        np = self.np
+        k = wins.shape[1]
+        total_wins = wins.sum(axis=2, dtype=np.int32)
+        keys: List[Any] = []
+        for name in self.engine.tiebreakers:
+            if name == HEAD_TO_HEAD:
+                tied = np.ones((self.n, k, k), dtype=bool)
+                for key in keys:
+                    tied &= key[:, :, None] == key[:, None, :]
+                keys.append((wins * tied).sum(axis=2, dtype=np.int32))
+            elif name == "points":
+                keys.append(total_wins * self.engine.points_per_win)
+            elif name == "wins":
+                keys.append(total_wins)
+            else:
+                values = np.array([TIEBREAKERS[name](row) if row else 0.0 for row in rows], dtype=float)
+                keys.append(np.broadcast_to(values, (self.n, k)))
+        # 모든 기준이 같으면 팀명 순 (members가 이미 팀명 순이다)
+        keys.append(np.broadcast_to(-np.arange(k), (self.n, k)))
+        # lexsort는 마지막 키가 1순위이고 오름차순이다.
+        return np.lexsort([-key for key in reversed(keys)], axis=1)
+
+    # -----------------------------
+    # 토너먼트
+    # -----------------------------
+    def _source_team(self, source: Any) -> "numpy.ndarray":
+        if source is None:
+            return self._constant(None)
+        if source.kind == "group":
+            order = self.group_order.get(source.ref)
+            if order is None or not 0 < source.rank <= order.shape[1]:
+                return self._constant(None)
+            return order[:, source.rank - 1]
+        result = self._match(source.ref)
+        if result is None:
+            return self._constant(None)
+        return result[2] if source.kind == "winner" else result[3]
+
+    def _match(self, match_id: str, visiting: Optional[set] = None) -> Optional[Tuple[Any, Any, Any, Any]]:
+        if match_id in self.results:
+            return self.results[match_id]
+        match = self.engine.match_by_id.get(match_id)
+        if match is None:
+            return None
+        visiting = visiting or set()
+        if match_id in visiting:
+            return None
+        visiting.add(match_id)
+        np = self.np
+        source_a, source_b = self.engine.sources[match_id]
+        team_a = self._constant(match["team_a_id"]) if match.get("team_a_id") else self._source_team(source_a)
+        team_b = self._constant(match["team_b_id"]) if match.get("team_b_id") else self._source_team(source_b)
+        if match.get("status") == "completed" and match.get("winner_team_id"):
+            winner = self._constant(match["winner_team_id"])
+            loser = np.where(team_a == winner, team_b, team_a)
+        else:
+            self.remaining += 1
+            a_wins = self._a_wins(team_a, team_b)
+            known = (team_a >= 0) & (team_b >= 0)
+            winner = np.where(known, np.where(a_wins, team_a, team_b), -1)
+            loser = np.where(known, np.where(a_wins, team_b, team_a), -1)
+        self.results[match_id] = (team_a, team_b, winner, loser)
+        return self.results[match_id]
+
+    def final_match(self) -> Optional[str]:
+        """승자로 이어지는 경기가 없는 토너먼트 경기 중 가장 늦은 것 (3·4위전처럼 패자로 이어진 경기는 제외)."""
+        engine = self.engine
+        knockout = [match for match in engine.matches if match.get("stage") != GROUP_STAGE]
+        fed_winner = {
+            source.ref
+            for sources in engine.sources.values()
+            for source in sources
+            if source is not None and source.kind == "winner"
+        }
+        candidates = [
+            match for match in knockout
+            if match["id"] not in fed_winner
+            and not any(source is not None and source.kind == "loser" for source in engine.sources[match["id"]])
+        ]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda match: str(match.get("starts_at") or ""))["id"]
+
+    def run(self) -> dict:
+        """이번 묶음의 횟수: 조별 순위별, 토너먼트 진출/결승/우승. 팀 번호 마지막 칸은 미정 자리다."""
+        np = self.np
+        self.run_groups()
+        teams = len(self.team_ids) + 1
+        rows = np.arange(self.n)
+        counts = {
+            "ranks": {name: np.stack([(order == self.index[team["id"]]).sum(axis=0) for team in self.engine.groups[name]])
+                      for name, order in self.group_order.items()},
+        }
+        knockout = [match for match in self.engine.matches if match.get("stage") != GROUP_STAGE]
+        if knockout:
+            reached = np.zeros((self.n, teams), dtype=bool)
+            for match in knockout:
+                team_a, team_b, _, _ = self._match(match["id"])
+                reached[rows, team_a] = True
+                reached[rows, team_b] = True
+            counts["knockout"] = reached.sum(axis=0)
+        final_id = self.final_match()
+        if final_id is not None:
+            team_a, team_b, winner, _ = self._match(final_id)
+            counts["final"] = np.bincount(team_a, minlength=teams) + np.bincount(team_b, minlength=teams)
+            counts["champion"] = np.bincount(winner, minlength=teams)
+        counts["remaining"] = self.remaining
+        return counts
+
+
+def _batches(engine: TournamentEngine, simulations: int) -> List[int]:
+    # 조별 (시뮬레이션, 팀, 팀) 승수 배열이 이 원소 수를 넘지 않게 나눠 돌린다.
+    largest = max((len(teams) for teams in engine.groups.values()), default=1)
+    size = max(1, min(simulations, _BATCH_ELEMENTS // (largest * largest)))
+    return [min(size, simulations - start) for start in range(0, simulations, size)]
+
+
+def _probabilities(engine: TournamentEngine, totals: dict, simulations: int, index: Dict[str, int]) -> List[dict]:
+    teams = []
+    for group_name in sorted(engine.groups):
+        members = engine.groups[group_name]
+        ranks = totals["ranks"][group_name]
+        for position, team in sorted(enumerate(members), key=lambda item: item[1]["name"]):
+            number = index[team["id"]]
+            probability = lambda name: round(float(totals[name][number]) / simulations, 4) if name in totals else None
+            teams.append(
+                {
+                    "team_id": team["id"],
+                    "team_name": team["name"],
+                    "group_name": group_name,
+                    "rank_probabilities": [round(float(value) / simulations, 4) for value in ranks[position]],
+                    "knockout_probability": probability("knockout"),
+                    "final_probability": probability("final"),
+                    "champion_probability": probability("champion"),
+                }
+            )
+    return teams
+
+
+def simulate_odds(engine: TournamentEngine, simulations: int, model: str = "uniform") -> dict:
+    """조 순위별/토너먼트 진출/결승/우승 확률. 같은 상태(version)면 보관한 결과를 돌려준다."""
+    version = snapshot_version(engine)
+    key = (version, simulations, model)
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+    result = {"version": version, "simulations": simulations, "model": model, "remaining_matches": 0, "teams": []}
+    if engine.team_by_id:
+        import numpy as np
+
+        # 같은 상태면 같은 숫자가 나오도록 version으로 난수 시드를 정한다.
+        rng = np.random.default_rng(int(version, 16))
+        totals: dict = {}
+        index: Dict[str, int] = {}
+        for size in _batches(engine, simulations):
+            simulation = _Simulation(engine, size, model, rng)
+            counts = simulation.run()
+            index = simulation.index
+            result["remaining_matches"] = counts.pop("remaining")
+            for name, value in counts.items():
+                if name == "ranks":
+                    ranks = totals.setdefault("ranks", {})
+                    for group_name, table in value.items():
+                        ranks[group_name] = ranks[group_name] + table if group_name in ranks else table
+                else:
+                    totals[name] = totals[name] + value if name in totals else value
+        result["teams"] = _probabilities(engine, totals, simulations, index)
+    with _memo_lock:
+        _memo[key] = result
+        while len(_memo) > _MEMO_SIZE:
+            _memo.popitem(last=False)
+    return result
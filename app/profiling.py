@@ -0,0 +1,343 @@
+"""운영 중 요청 단위 온디맨드 프로파일링.
+
+재배포 없이 느린 엔드포인트를 들여다보기 위한 장치다. 다음 두 경우에만 동작한다.
+
+- 관리자가 `X-Profile: sample` 또는 `X-Profile: cprofile` 헤더를 붙여 요청한 경우
+  (관리자가 아니면 헤더는 조용히 무시된다)
+- `PROFILE_SAMPLE_RATE` 확률로 뽑힌 일반 요청 (항상 sample 모드)
+
+sample 모드는 별도 스레드가 `PROFILE_INTERVAL_MS`마다 핸들러 스레드의 스택을 읽어
+collapsed stack(flamegraph.pl, speedscope 입력 형식)으로 모으므로 핸들러 자체에는 거의
+부담이 없다. cprofile 모드는 핸들러 스레드에서 cProfile을 켜고 pstats 텍스트를 남긴다.
+결과는 최근 `PROFILE_MAX_RESULTS`개만 링 버퍼에 보관하며 `/admin/profiles`에서 조회한다.
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import itertools
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth import _decode_token, is_admin_user
+from app.config import PROFILE_INTERVAL_MS, PROFILE_MAX_RESULTS, PROFILE_SAMPLE_RATE
+from app.metrics import route_label
+from app.resilience import request_deadline, route_budget
+
+PROFILE_MODES = ("sample", "cprofile")
+
+# 프로파일 하나가 보관하는 서로 다른 스택 수 상한 (메모리 상한)
+_MAX_STACKS = 2000
+_MAX_DEPTH = 128
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_ROOT):
+        filename = os.path.relpath(filename, _ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class Profile:
+    """요청 하나의 프로파일링 상태와 결과."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, mode: str, method: str, path: str, trigger: str) -> None:
+        self.id = next(self._ids)
+        self.mode = mode
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.route = ""
+        self.status: Optional[int] = None
+        self.started_at = datetime.now(timezone.utc)
+        self.duration_ms = 0.0
+        self.samples = 0
+        self.dropped = 0
+        self.stacks: Dict[str, int] = {}
+        self.pstats_text = ""
+        self._lock = threading.Lock()
+
+    def add_stack(self, frames: List[str]) -> None:
+        key = ";".join(reversed(frames))
+        with self._lock:
+            self.samples += 1
+            if key in self.stacks:
+                self.stacks[key] += 1
+            elif len(self.stacks) < _MAX_STACKS:
+                self.stacks[key] = 1
+            else:
+                self.dropped += 1
+
+    def add_pstats(self, profiler: cProfile.Profile) -> None:
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(60)
+        with self._lock:
+            self.pstats_text += out.getvalue()
+
+    def collapsed(self) -> str:
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "mode": self.mode,
+            "trigger": self.trigger,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+            "dropped_samples": self.dropped,
+        }
+
+
+class _Sampler:
+    """등록된 스레드의 스택을 주기적으로 읽는 단일 데몬 스레드."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        # thread id -> (profile, 핸들러 래퍼 프레임). 래퍼보다 바깥 프레임은 기록하지 않는다.
+        self._targets: Dict[int, tuple] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, thread_id: int, profile: Profile, root: FrameType) -> None:
+        with self._lock:
+            self._targets[thread_id] = (profile, root)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def detach(self, thread_id: int) -> None:
+        with self._lock:
+            self._targets.pop(thread_id, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                targets = dict(self._targets)
+            if not targets:
+                self._wake.clear()
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            for thread_id, (profile, root) in targets.items():
+                frame = frames.get(thread_id)
+                stack: List[str] = []
+                while frame is not None and frame is not root:
+                    if len(stack) < _MAX_DEPTH:
+                        stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                # 래퍼 프레임에 닿지 못하면 핸들러가 실행 중이 아닌 순간(async 핸들러가 await 중)이다.
+                if frame is root and stack:
+                    profile.add_stack(stack)
+            time.sleep(self.interval)
+
+
+_sampler = _Sampler(PROFILE_INTERVAL_MS / 1000)
+
+current_profile: ContextVar[Optional[Profile]] = ContextVar("current_profile", default=None)
+
+
+class ProfileStore:
+    def __init__(self, max_results: int) -> None:
+        self._results: Deque[Profile] = deque(maxlen=max_results)
+        self._lock = threading.Lock()
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._results.append(profile)
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._results)]
+
+    def get(self, profile_id: int) -> Profile:
+        with self._lock:
+            for profile in self._results:
+                if profile.id == profile_id:
+                    return profile
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다. 이미 밀려났을 수 있습니다.")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+
+profile_store = ProfileStore(PROFILE_MAX_RESULTS)
+
+
+def _start_cprofile() -> Optional[cProfile.Profile]:
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # 다른 프로파일러가 이미 켜져 있으면 sample 모드로 대신한다.
+        return None
+    return profiler
+
+
+def _run_profiled(profile: Profile, call: Callable[[], Any]) -> Any:
+    profiler = _start_cprofile() if profile.mode == "cprofile" else None
+    if profiler is not None:
+        try:
+            return call()
+        finally:
+            profiler.disable()
+            profile.add_pstats(profiler)
+    thread_id = threading.get_ident()
+    _sampler.attach(thread_id, profile, sys._getframe())
+    try:
+        return call()
+    finally:
+        _sampler.detach(thread_id)
+
+
+def profiled_endpoint(func: Callable) -> Callable:
+    """프로파일링 중인 요청이면 핸들러를 프로파일러 아래에서 실행한다."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            profile = current_profile.get()
+            if profile is None:
+                return await func(*args, **kwargs)
+            # async 핸들러는 이벤트 루프 스레드를 샘플링하므로 await 중인 순간은 기록되지 않고,
+            # cprofile 모드에서는 같은 루프의 다른 요청이 섞일 수 있다.
+            return await _run_profiled_async(profile, func(*args, **kwargs))
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profile = current_profile.get()
+        if profile is None:
+            return func(*args, **kwargs)
+        return _run_profiled(profile, lambda: func(*args, **kwargs))
+
+    return wrapper
+
+
+async def _run_profiled_async(profile: Profile, coro: Any) -> Any:
+    profiler = _start_cprofile() if profile.mode == "cprofile" else None
+    if profiler is not None:
+        try:
+            return await coro
+        finally:
+            profiler.disable()
+            profile.add_pstats(profiler)
+    thread_id = threading.get_ident()
+    _sampler.attach(thread_id, profile, sys._getframe())
+    try:
+        return await coro
+    finally:
+        _sampler.detach(thread_id)
+
+
+class ProfiledRoute(APIRoute):
+    """라우터의 route_class로 지정하면 모든 핸들러에 profiled_endpoint를 씌운다.
+
+    의존성(인증의 role 조회 등)까지 포함해 라우트 예산(@time_budget)으로 요청 deadline도 건다.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any) -> None:
+        super().__init__(path, profiled_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        budget = route_budget(self.endpoint)
+
+        async def handler_with_deadline(request: Any) -> Any:
+            with request_deadline(budget):
+                return await handler(request)
+
+        return handler_with_deadline
+
+
+def _requested_mode(headers: Headers) -> Optional[str]:
+    value = headers.get("x-profile", "").strip().lower()
+    if not value:
+        return None
+    return value if value in PROFILE_MODES else "sample"
+
+
+def _is_admin_request(headers: Headers) -> bool:
+    authorization = headers.get("authorization", "")
+    if not authorization.startswith("Bearer "):
+        return False
+    try:
+        user_id = _decode_token(authorization.removeprefix("Bearer ")).get("sub")
+    except HTTPException:
+        return False
+    return bool(user_id) and is_admin_user(user_id)
+
+
+class ProfilingMiddleware:
+    """프로파일링 대상 요청을 고르고, 끝나면 결과를 링 버퍼에 저장한다."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        mode = _requested_mode(headers)
+        trigger = "header"
+        if mode is not None and not await run_in_threadpool(_is_admin_request, headers):
+            mode = None
+        if mode is None and PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+            mode, trigger = "sample", "sampled"
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(mode, scope.get("method", ""), scope.get("path", ""), trigger)
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                if trigger == "header":
+                    MutableHeaders(scope=message)["X-Profile-Id"] = str(profile.id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            current_profile.reset(token)
+            profile.duration_ms = (time.perf_counter() - started) * 1000
+            profile.route = route_label(scope)
+            profile_store.add(profile)
@@ -0,0 +1,83 @@
+"""데이터 접근 계층.
+
+라우터는 `get_repositories()`가 돌려주는 묶음으로만 테이블에 접근한다. 백엔드는 DATA_BACKEND로
+고른다: `supabase`(기본, PostgREST REST) 또는 `postgres`(asyncpg 직접 연결). auth 계정
+관리(`sb.auth.admin`)는 Supabase API에만 있으므로 백엔드와 무관하게 get_supabase()를 쓴다.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import DATA_BACKEND
+from app.repositories.base import (
+    DebatesRepository,
+    ParticipantsRepository,
+    RecordsRepository,
+    ReservationsRepository,
+    TournamentsRepository,
+    UsersRepository,
+)
+
+
+@dataclass(frozen=True)
+class Repositories:
+    backend: str
+    users: UsersRepository
+    debates: DebatesRepository
+    participants: ParticipantsRepository
+    reservations: ReservationsRepository
+    records: RecordsRepository
+    tournaments: TournamentsRepository
+
+
+_REPOSITORIES: Optional[Repositories] = None
+
+
+def _build(backend: str) -> Repositories:
+    if backend == "supabase":
+        from app.repositories import supabase
+
+        return Repositories(
+            backend=backend,
+            users=supabase.SupabaseUsers(),
+            debates=supabase.SupabaseDebates(),
+            participants=supabase.SupabaseParticipants(),
+            reservations=supabase.SupabaseReservations(),
+            records=supabase.SupabaseRecords(),
+            tournaments=supabase.SupabaseTournaments(),
+        )
+    if backend == "postgres":
+        from app.repositories import postgres
+
+        db = postgres.get_database()
+        return Repositories(
+            backend=backend,
+            users=postgres.PostgresUsers(db),
+            debates=postgres.PostgresDebates(db),
+            participants=postgres.PostgresParticipants(db),
+            reservations=postgres.PostgresReservations(db),
+            records=postgres.PostgresRecords(db),
+            tournaments=postgres.PostgresTournaments(db),
+        )
+    raise RuntimeError(f"알 수 없는 DATA_BACKEND 값입니다: {backend!r} (supabase | postgres)")
+
+
+def get_repositories() -> Repositories:
+    global _REPOSITORIES
+    if _REPOSITORIES is None:
+        _REPOSITORIES = _build(DATA_BACKEND)
+    return _REPOSITORIES
+
+
+def use_backend(backend: str) -> Repositories:
+    """백엔드를 바꿔 끼운다. 벤치마크처럼 한 프로세스에서 두 백엔드를 비교할 때 쓴다."""
+    global _REPOSITORIES
+    _REPOSITORIES = _build(backend)
+    return _REPOSITORIES
+
+
+def close_repositories() -> None:
+    if _REPOSITORIES is not None and _REPOSITORIES.backend == "postgres":
+        from app.repositories.postgres import close_database
+
+        close_database()
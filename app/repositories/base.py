@@ -0,0 +1,171 @@
+"""저장소 인터페이스.
+
+라우터는 이 메서드들로만 데이터에 접근한다. 두 백엔드(Supabase REST, asyncpg 직접 연결)
+모두 PostgREST JSON과 같은 모양의 dict를 돌려준다: uuid는 문자열, 날짜/시각은 ISO 문자열,
+numeric은 숫자. 그래서 라우터의 후처리와 응답 캐시는 백엔드와 무관하게 동작한다.
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
+
+Row = Dict[str, Any]
+
+# 대회 구성 교체 시, 새 팀 id가 정해진 뒤 팀원/경기 행을 만드는 콜백
+SetupChildrenBuilder = Callable[[Dict[str, str]], Tuple[List[Row], List[Row]]]
+
+# 내보내기 키셋 커서: 직전 페이지 마지막 행의 (정렬 키, id). 정렬 키는 ISO 문자열.
+ExportCursor = Tuple[str, str]
+
+
+class UsersRepository(Protocol):
+    def get(self, user_id: str) -> Optional[Row]: ...
+
+    def get_role(self, user_id: str) -> Optional[str]: ...
+
+    def find_email(self, name: str, student_id: str) -> Optional[str]: ...
+
+    def list_profiles(self) -> List[Row]: ...
+
+    def list_all(self) -> List[Row]: ...
+
+    def update(self, user_id: str, changes: Row) -> None: ...
+
+    def debate_stats(self, start: Optional[date], end: Optional[date], after: Optional[str], limit: int) -> List[Row]:
+        """회원 id 순서로 after 다음 limit명의 토론 전적 (user_id, name, generation, major, wins, losses, total).
+
+        start/end(토론일, 양끝 포함)를 주면 그 기간의 토론만 센다. member_debate_stats 함수.
+        """
+        ...
+
+
+class DebatesRepository(Protocol):
+    def list(self, year: Optional[int] = None) -> List[Row]: ...
+
+    def get(self, debate_id: str) -> Optional[Row]: ...
+
+    def list_by_ids(self, debate_ids: Sequence[str]) -> List[Row]: ...
+
+    def winner_sides(self) -> Dict[str, Optional[str]]: ...
+
+    def create(self, data: Row) -> Optional[Row]: ...
+
+    def set_winner(self, debate_id: str, winner_side: str) -> None: ...
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        """(debate_date, id) 순서로 after 다음 limit개의 토론. debate_participants(user_id, participant_name, side) 목록 포함."""
+        ...
+
+
+class ParticipantsRepository(Protocol):
+    def list_for_debate(self, debate_id: str) -> List[Row]: ...
+
+    def list_for_user(self, user_id: str) -> List[Row]: ...
+
+    def list_member_entries(self) -> List[Row]: ...
+
+    def find(self, debate_id: str, user_id: str) -> Optional[Row]: ...
+
+    def sides(self, debate_id: str, user_ids: Sequence[str]) -> List[Row]: ...
+
+    def insert(self, row: Row) -> Optional[Row]: ...
+
+    def update_member(self, debate_id: str, user_id: str, changes: Row) -> Optional[Row]: ...
+
+    def apply_roster(
+        self, debate_id: str, upserts: List[Row], stale_ids: List[int], winner_side: Optional[str]
+    ) -> List[Row]: ...
+
+    def remove(self, debate_id: str, user_id: str) -> List[Row]: ...
+
+
+class ReservationsRepository(Protocol):
+    def list_between(self, start_at: Optional[str], end_at: Optional[str]) -> List[Row]: ...
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        """(starts_at, id) 순서로 after 다음 limit개의 예약. start/end는 시작일(UTC) 기준, 양끝 포함."""
+        ...
+
+    def for_calendar(self, start_at: str, end_at: Optional[str], reserved_by: Optional[str]) -> List[Row]:
+        """캘린더 피드용 예약 (id, reserved_by_name, title, starts_at, ends_at, updated_at). starts_at 오름차순.
+
+        reserved_by를 주면 그 회원의 예약만, end_at이 None이면 start_at 이후 전부.
+        """
+        ...
+
+    def overlapping(self, starts_at: str, ends_at: str, debate_id: Optional[str] = None) -> List[Row]: ...
+
+    def get(self, reservation_id: str) -> Optional[Row]: ...
+
+    def create(self, data: Row) -> Optional[Row]: ...
+
+    def update(self, reservation_id: str, changes: Row) -> Optional[Row]: ...
+
+    def delete(self, reservation_id: str) -> None: ...
+
+
+class RecordsRepository(Protocol):
+    def list(self, category: Optional[str], search: Optional[str], sort: Optional[str]) -> List[Row]: ...
+
+    def get(self, record_id: str) -> Optional[Row]: ...
+
+    def create(self, data: Row) -> Optional[Row]: ...
+
+    def update(self, record_id: str, data: Row) -> Optional[Row]: ...
+
+    def delete(self, record_id: str) -> bool: ...
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        """(date, id) 순서로 after 다음 limit개의 기록."""
+        ...
+
+
+class TournamentsRepository(Protocol):
+    def get(self, event_id: str) -> Optional[Row]: ...
+
+    def list_all(self) -> List[Row]: ...
+
+    def summaries(
+        self, status: Optional[str], start: Optional[date], end: Optional[date], limit: Optional[int], offset: int
+    ) -> List[Row]:
+        """대회 행에 team_count, match_count, completed_match_count를 붙여 starts_on 내림차순으로 반환한다.
+
+        start/end는 기간이 겹치는 대회만 남긴다(ends_on >= start, starts_on <= end). limit이 None이면 전부.
+        """
+        ...
+
+    def teams(self, event_id: str) -> List[Row]: ...
+
+    def team_members(self, team_ids: Sequence[str]) -> List[Row]: ...
+
+    def matches(self, event_id: str) -> List[Row]: ...
+
+    def create(self, data: Row) -> Optional[Row]: ...
+
+    def update(self, event_id: str, changes: Row) -> None: ...
+
+    def replace_setup(self, event_id: str, teams: List[Row], build_children: SetupChildrenBuilder) -> None: ...
+
+    def update_match(self, event_id: str, match_id: str, changes: Row) -> None: ...
+
+    def archive(self, event_id: str) -> Optional[Row]:
+        """완료된 대회의 보관본 (snapshot: 직렬화한 JSON 문자열, etag). 없으면 None."""
+        ...
+
+    def save_archive(self, event_id: str, snapshot: str, etag: str) -> None:
+        """보관본을 넣는다. 이미 있으면(다른 워커가 먼저 보관) 그대로 둔다."""
+        ...
+
+    def delete_archive(self, event_id: str) -> None: ...
+
+    def member_history(self, user_id: str) -> List[Row]:
+        """회원이 속했던 팀마다 그 팀의 경기 한 행씩 (member_tournament_matches 뷰). 경기가 없는 팀은 match_id가 None인 한 행.
+
+        대회 starts_on 내림차순, 경기 starts_at 오름차순.
+        """
+        ...
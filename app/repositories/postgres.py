@@ -0,0 +1,573 @@
+"""asyncpg로 Postgres에 직접 붙는 저장소 구현.
+
+PostgREST를 거치지 않으므로 요청마다 HTTP 왕복과 JSON 변환이 빠지고, 여러 단계의 쓰기를
+한 트랜잭션으로 묶을 수 있다. 라우터는 동기 함수(스레드풀)이므로 전용 이벤트 루프 스레드
+하나에서 커넥션 풀을 돌리고, 호출 스레드는 결과를 기다린다.
+
+SQL은 모듈 상수로 고정해 asyncpg의 커넥션별 prepared statement 캐시가 적중하게 한다.
+동적 컬럼이 필요한 insert/update는 `jsonb_populate_record`로 컬럼 타입 변환을 Postgres에
+맡기므로, 라우터가 넘기는 PostgREST용 JSON 값(ISO 문자열 등)을 그대로 쓸 수 있다.
+"""
+
+import asyncio
+import json
+import re
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.config import (
+    DATABASE_URL,
+    PG_COMMAND_TIMEOUT_SECONDS,
+    PG_POOL_MAX_SIZE,
+    PG_POOL_MIN_SIZE,
+    PG_STATEMENT_CACHE_SIZE,
+    require_env,
+)
+from app.db import timed
+from app.resilience import call_timeout, resilient
+from app.repositories.base import ExportCursor, Row, SetupChildrenBuilder
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _normalize(value: Any) -> Any:
+    # PostgREST JSON과 같은 모양으로 맞춘다.
+    if isinstance(value, datetime) or isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def _row(record: Any) -> Row:
+    return {key: _normalize(value) for key, value in record.items()}
+
+
+def _columns(keys: Sequence[str]) -> str:
+    for key in keys:
+        if not _IDENTIFIER.match(key):
+            raise ValueError(f"허용되지 않는 컬럼 이름입니다: {key!r}")
+    return ",".join(f'"{key}"' for key in keys)
+
+
+def _insert_sql(table: str, keys: Sequence[str], many: bool = False) -> str:
+    cols = _columns(keys)
+    source = "jsonb_populate_recordset" if many else "jsonb_populate_record"
+    return f"insert into public.{table} ({cols}) select {cols} from {source}(null::public.{table}, $1::jsonb) returning *"
+
+
+def _update_sql(table: str, keys: Sequence[str], where: str) -> str:
+    cols = _columns(keys)
+    return (
+        f"update public.{table} set ({cols}) = (select {cols} from jsonb_populate_record(null::public.{table}, $1::jsonb))"
+        f" where {where} returning *"
+    )
+
+
+def _json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _export_queries(select: str, column: str, key_type: str) -> Tuple[str, str]:
+    """내보내기 페이지 SQL: 첫 페이지, ($4, $5) 커서 다음 페이지. ($1, $2는 기간, $3은 limit)
+
+    `$4 is null or ...`로 합치면 generic plan에서 커서 조건이 인덱스 범위 검색이 되지 않으므로 따로 둔다.
+    """
+    order = f" order by {column}, id limit $3"
+    return select + order, f"{select} and ({column}, id) > ($4::text::{key_type}, $5::uuid){order}"
+
+
+def _fetch_export_page(
+    db: "PostgresDatabase", table: str, queries: Tuple[str, str], start: Any, end: Any,
+    after: Optional[ExportCursor], limit: int,
+) -> List[Row]:
+    first, following = queries
+    if after is None:
+        return db.fetch(table, "select", first, start, end, limit)
+    return db.fetch(table, "select", following, start, end, limit, *after)
+
+
+async def _init_connection(conn: Any) -> None:
+    # uuid는 문자열로 주고받는다. (PostgREST 응답과 같은 모양, 파라미터도 str 그대로)
+    await conn.set_type_codec("uuid", encoder=str, decoder=str, schema="pg_catalog", format="text")
+
+
+class PostgresDatabase:
+    """전용 이벤트 루프 스레드 위의 asyncpg 풀. 모든 쿼리는 app.db.timed로 계측한다."""
+
+    def __init__(self, dsn: str) -> None:
+        self._dsn = dsn
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pool: Any = None
+        self._lock = threading.Lock()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """루프 스레드와 풀(min_size개 커넥션)을 만든다. 첫 쿼리 때 자동으로 불린다."""
+        with self._lock:
+            if self._loop is None:
+                import asyncpg
+
+                async def create_pool() -> Any:
+                    # 풀은 자신을 만든 이벤트 루프에 묶이므로 루프 스레드 안에서 만든다.
+                    return await asyncpg.create_pool(
+                        self._dsn,
+                        min_size=PG_POOL_MIN_SIZE,
+                        max_size=PG_POOL_MAX_SIZE,
+                        statement_cache_size=PG_STATEMENT_CACHE_SIZE,
+                        command_timeout=PG_COMMAND_TIMEOUT_SECONDS,
+                        init=_init_connection,
+                    )
+
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="pg-pool", daemon=True).start()
+                self._pool = asyncio.run_coroutine_threadsafe(create_pool(), loop).result()
+                self._loop = loop
+            return self._loop
+
+    def _run(self, table: str, operation: str, work: Callable[[Any], Awaitable[Any]]) -> Any:
+        loop = self.start()
+
+        async def acquire_and_run() -> Any:
+            async with self._pool.acquire() as conn:
+                return await work(conn)
+
+        def attempt() -> Any:
+            # 커넥션 대기까지 포함해 타임아웃을 건다. 시간이 지나면 루프 쪽에서 쿼리를 취소한다.
+            timeout = call_timeout()
+            future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(acquire_and_run(), timeout), loop)
+            return future.result()
+
+        return resilient("postgres", table, operation, lambda: timed(table, operation, attempt))
+
+    def fetch(self, table: str, operation: str, sql: str, *args: Any) -> List[Row]:
+        return [_row(record) for record in self._run(table, operation, lambda conn: conn.fetch(sql, *args))]
+
+    def fetchrow(self, table: str, operation: str, sql: str, *args: Any) -> Optional[Row]:
+        record = self._run(table, operation, lambda conn: conn.fetchrow(sql, *args))
+        return _row(record) if record is not None else None
+
+    def fetchval(self, table: str, operation: str, sql: str, *args: Any) -> Any:
+        return self._run(table, operation, lambda conn: conn.fetchval(sql, *args))
+
+    def transaction(self, table: str, operation: str, work: Callable[[Any], Awaitable[Any]]) -> Any:
+        async def in_transaction(conn: Any) -> Any:
+            async with conn.transaction():
+                return await work(conn)
+
+        return self._run(table, operation, in_transaction)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._pool.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+            self._pool = None
+
+
+_DATABASE: Optional[PostgresDatabase] = None
+
+
+def get_database() -> PostgresDatabase:
+    global _DATABASE
+    if _DATABASE is None:
+        _DATABASE = PostgresDatabase(DATABASE_URL or require_env("DATABASE_URL"))
+    return _DATABASE
+
+
+def close_database() -> None:
+    if _DATABASE is not None:
+        _DATABASE.close()
+
+
+# -----------------------------
+# Users
+# -----------------------------
+_PROFILE_COLUMNS = "id,email,name,student_id,major,generation,role,must_change_password"
+_USER_GET = f"select {_PROFILE_COLUMNS} from public.users where id = $1"
+_USER_ROLE = "select role from public.users where id = $1"
+_USER_EMAIL = "select email from public.users where name = $1 and student_id = $2 limit 1"
+_USER_PROFILES = f"select {_PROFILE_COLUMNS} from public.users order by name"
+_USER_ALL = f"select {_PROFILE_COLUMNS} from public.users"
+_USER_DEBATE_STATS = "select * from public.member_debate_stats($1, $2, $3, $4)"
+
+
+class PostgresUsers:
+    def __init__(self, db: PostgresDatabase) -> None:
+        self.db = db
+
+    def get(self, user_id: str) -> Optional[Row]:
+        return self.db.fetchrow("users", "select", _USER_GET, user_id)
+
+    def get_role(self, user_id: str) -> Optional[str]:
+        return self.db.fetchval("users", "select", _USER_ROLE, user_id)
+
+    def find_email(self, name: str, student_id: str) -> Optional[str]:
+        return self.db.fetchval("users", "select", _USER_EMAIL, name, student_id)
+
+    def list_profiles(self) -> List[Row]:
+        return self.db.fetch("users", "select", _USER_PROFILES)
+
+    def list_all(self) -> List[Row]:
+        return self.db.fetch("users", "select", _USER_ALL)
+
+    def update(self, user_id: str, changes: Row) -> None:
+        self.db.fetch("users", "update", _update_sql("users", list(changes), "id = $2"), _json(changes), user_id)
+
+    def debate_stats(self, start: Optional[date], end: Optional[date], after: Optional[str], limit: int) -> List[Row]:
+        return self.db.fetch("member_debate_stats", "rpc", _USER_DEBATE_STATS, start, end, after, limit)
+
+
+# -----------------------------
+# Debates / participants
+# -----------------------------
+_DEBATE_LIST = (
+    "select * from public.debates where ($1::date is null or debate_date between $1 and $2)"
+    " order by debate_date desc"
+)
+_DEBATE_GET = "select * from public.debates where id = $1"
+_DEBATE_BY_IDS = (
+    "select id,topic_text,debate_date,debate_type,winner_side from public.debates"
+    " where id = any($1::uuid[]) order by debate_date desc"
+)
+_DEBATE_WINNERS = "select id,winner_side from public.debates"
+_DEBATE_SET_WINNER = "update public.debates set winner_side = $2 where id = $1"
+_DEBATE_EXPORT = _export_queries(
+    "select id,debate_date,debate_type,topic_text,winner_side,notes,"
+    " coalesce((select json_agg(json_build_object('user_id', p.user_id, 'participant_name', p.participant_name,"
+    " 'side', p.side) order by p.id) from public.debate_participants p where p.debate_id = d.id), '[]')::text"
+    " as debate_participants"
+    " from public.debates d"
+    " where debate_date >= coalesce($1::date, '-infinity') and debate_date <= coalesce($2::date, 'infinity')",
+    "debate_date",
+    "date",
+)
+
+_PARTICIPANTS_FOR_DEBATE = "select * from public.debate_participants where debate_id = $1"
+_PARTICIPANTS_FOR_USER = "select debate_id,side from public.debate_participants where user_id = $1"
+_PARTICIPANT_MEMBER_ENTRIES = "select user_id,debate_id,side from public.debate_participants where user_id is not null"
+_PARTICIPANT_FIND = "select * from public.debate_participants where debate_id = $1 and user_id = $2"
+_PARTICIPANT_SIDES = (
+    "select user_id,side from public.debate_participants where debate_id = $1 and user_id = any($2::uuid[])"
+)
+_PARTICIPANT_UPDATE_ROSTER = (
+    "update public.debate_participants as dp set side = src.side, participant_name = src.participant_name"
+    " from jsonb_populate_recordset(null::public.debate_participants, $1::jsonb) as src"
+    " where dp.id = src.id returning dp.*"
+)
+_PARTICIPANT_INSERT_ROSTER = _insert_sql(
+    "debate_participants", ["debate_id", "user_id", "participant_name", "side"], many=True
+)
+_PARTICIPANT_DELETE_IDS = "delete from public.debate_participants where id = any($1::bigint[])"
+_PARTICIPANT_REMOVE = "delete from public.debate_participants where debate_id = $1 and user_id = $2 returning *"
+
+
+class PostgresDebates:
+    def __init__(self, db: PostgresDatabase) -> None:
+        self.db = db
+
+    def list(self, year: Optional[int] = None) -> List[Row]:
+        start, end = (date(year, 1, 1), date(year, 12, 31)) if year is not None else (None, None)
+        return self.db.fetch("debates", "select", _DEBATE_LIST, start, end)
+
+    def get(self, debate_id: str) -> Optional[Row]:
+        return self.db.fetchrow("debates", "select", _DEBATE_GET, debate_id)
+
+    def list_by_ids(self, debate_ids: Sequence[str]) -> List[Row]:
+        return self.db.fetch("debates", "select", _DEBATE_BY_IDS, list(debate_ids))
+
+    def winner_sides(self) -> Dict[str, Optional[str]]:
+        return {row["id"]: row["winner_side"] for row in self.db.fetch("debates", "select", _DEBATE_WINNERS)}
+
+    def create(self, data: Row) -> Optional[Row]:
+        return self.db.fetchrow("debates", "insert", _insert_sql("debates", list(data)), _json(data))
+
+    def set_winner(self, debate_id: str, winner_side: str) -> None:
+        self.db.fetch("debates", "update", _DEBATE_SET_WINNER, debate_id, winner_side)
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        rows = _fetch_export_page(self.db, "debates", _DEBATE_EXPORT, start, end, after, limit)
+        for row in rows:
+            row["debate_participants"] = json.loads(row["debate_participants"])
+        return rows
+
+
+class PostgresParticipants:
+    def __init__(self, db: PostgresDatabase) -> None:
+        self.db = db
+
+    def list_for_debate(self, debate_id: str) -> List[Row]:
+        return self.db.fetch("debate_participants", "select", _PARTICIPANTS_FOR_DEBATE, debate_id)
+
+    def list_for_user(self, user_id: str) -> List[Row]:
+        return self.db.fetch("debate_participants", "select", _PARTICIPANTS_FOR_USER, user_id)
+
+    def list_member_entries(self) -> List[Row]:
+        return self.db.fetch("debate_participants", "select", _PARTICIPANT_MEMBER_ENTRIES)
+
+    def find(self, debate_id: str, user_id: str) -> Optional[Row]:
+        return self.db.fetchrow("debate_participants", "select", _PARTICIPANT_FIND, debate_id, user_id)
+
+    def sides(self, debate_id: str, user_ids: Sequence[str]) -> List[Row]:
+        return self.db.fetch("debate_participants", "select", _PARTICIPANT_SIDES, debate_id, list(user_ids))
+
+    def insert(self, row: Row) -> Optional[Row]:
+        return self.db.fetchrow("debate_participants", "insert", _insert_sql("debate_participants", list(row)), _json(row))
+
+    def update_member(self, debate_id: str, user_id: str, changes: Row) -> Optional[Row]:
+        sql = _update_sql("debate_participants", list(changes), "debate_id = $2 and user_id = $3")
+        return self.db.fetchrow("debate_participants", "update", sql, _json(changes), debate_id, user_id)
+
+    def apply_roster(
+        self, debate_id: str, upserts: List[Row], stale_ids: List[int], winner_side: Optional[str]
+    ) -> List[Row]:
+        updates = [row for row in upserts if row.get("id") is not None]
+        inserts = [row for row in upserts if row.get("id") is None]
+
+        async def work(conn: Any) -> List[Any]:
+            saved: List[Any] = []
+            if stale_ids:
+                # 삭제를 먼저 해야 (debate_id, user_id) 유니크 제약에 걸리지 않는다.
+                await conn.execute(_PARTICIPANT_DELETE_IDS, stale_ids)
+            if updates:
+                saved.extend(await conn.fetch(_PARTICIPANT_UPDATE_ROSTER, _json(updates)))
+            if inserts:
+                saved.extend(await conn.fetch(_PARTICIPANT_INSERT_ROSTER, _json(inserts)))
+            if winner_side is not None:
+                await conn.execute(_DEBATE_SET_WINNER, debate_id, winner_side)
+            return saved
+
+        return [_row(record) for record in self.db.transaction("debate_participants", "upsert", work)]
+
+    def remove(self, debate_id: str, user_id: str) -> List[Row]:
+        return self.db.fetch("debate_participants", "delete", _PARTICIPANT_REMOVE, debate_id, user_id)
+
+
+# -----------------------------
+# Reservations
+# -----------------------------
+_RESERVATION_COLUMNS = "id,reserved_by,reserved_by_name,title,starts_at,ends_at,debate_id,allow_simultaneous"
+_RESERVATIONS_BETWEEN = (
+    f"select {_RESERVATION_COLUMNS} from public.reservations"
+    " where ($1::text is null or starts_at >= $1::text::timestamptz)"
+    " and ($2::text is null or starts_at < $2::text::timestamptz)"
+    " order by starts_at"
+)
+_RESERVATIONS_CALENDAR = (
+    "select id,reserved_by_name,title,starts_at,ends_at,updated_at from public.reservations"
+    " where starts_at >= $1::text::timestamptz"
+    " and ($2::text is null or starts_at < $2::text::timestamptz)"
+    " and ($3::uuid is null or reserved_by = $3)"
+    " order by starts_at"
+)
+_RESERVATIONS_OVERLAPPING = (
+    "select id,reserved_by,allow_simultaneous from public.reservations"
+    " where starts_at < $2::text::timestamptz and ends_at > $1::text::timestamptz"
+    " and ($3::uuid is null or debate_id = $3)"
+)
+_RESERVATION_EXPORT = _export_queries(
+    "select id,reserved_by,reserved_by_name,title,starts_at,ends_at,debate_id,allow_simultaneous,created_at"
+    " from public.reservations"
+    " where starts_at >= coalesce($1::timestamptz, '-infinity') and starts_at < coalesce($2::timestamptz, 'infinity')",
+    "starts_at",
+    "timestamptz",
+)
+_RESERVATION_GET = "select * from public.reservations where id = $1"
+_RESERVATION_DELETE = "delete from public.reservations where id = $1"
+
+
+class PostgresReservations:
+    def __init__(self, db: PostgresDatabase) -> None:
+        self.db = db
+
+    def list_between(self, start_at: Optional[str], end_at: Optional[str]) -> List[Row]:
+        return self.db.fetch("reservations", "select", _RESERVATIONS_BETWEEN, start_at, end_at)
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        # 기간은 시작일(UTC) 기준이므로 끝 날짜 다음 날 0시 미만까지
+        start_at = datetime.combine(start, time(), timezone.utc) if start is not None else None
+        end_at = datetime.combine(end + timedelta(days=1), time(), timezone.utc) if end is not None else None
+        return _fetch_export_page(self.db, "reservations", _RESERVATION_EXPORT, start_at, end_at, after, limit)
+
+    def for_calendar(self, start_at: str, end_at: Optional[str], reserved_by: Optional[str]) -> List[Row]:
+        return self.db.fetch("reservations", "select", _RESERVATIONS_CALENDAR, start_at, end_at, reserved_by)
+
+    def overlapping(self, starts_at: str, ends_at: str, debate_id: Optional[str] = None) -> List[Row]:
+        return self.db.fetch("reservations", "select", _RESERVATIONS_OVERLAPPING, starts_at, ends_at, debate_id)
+
+    def get(self, reservation_id: str) -> Optional[Row]:
+        return self.db.fetchrow("reservations", "select", _RESERVATION_GET, reservation_id)
+
+    def create(self, data: Row) -> Optional[Row]:
+        return self.db.fetchrow("reservations", "insert", _insert_sql("reservations", list(data)), _json(data))
+
+    def update(self, reservation_id: str, changes: Row) -> Optional[Row]:
+        sql = _update_sql("reservations", list(changes), "id = $2")
+        return self.db.fetchrow("reservations", "update", sql, _json(changes), reservation_id)
+
+    def delete(self, reservation_id: str) -> None:
+        self.db.fetch("reservations", "delete", _RESERVATION_DELETE, reservation_id)
+
+
+# -----------------------------
+# Records
+# -----------------------------
+_RECORDS_WHERE = (
+    "select * from public.records where ($1::text is null or category = $1)"
+    " and ($2::text is null or title ilike $3 or summary ilike $3 or $2 = any(\"participantNames\"))"
+)
+_RECORDS_LIST = {
+    "date-asc": f"{_RECORDS_WHERE} order by date",
+    "participants-desc": f"{_RECORDS_WHERE} order by participants desc",
+    "title": f"{_RECORDS_WHERE} order by title",
+}
+_RECORDS_LIST_DEFAULT = f"{_RECORDS_WHERE} order by date desc"
+_RECORD_GET = "select * from public.records where id = $1"
+_RECORD_EXPORT = _export_queries(
+    "select * from public.records where date >= coalesce($1::date, '-infinity') and date <= coalesce($2::date, 'infinity')",
+    "date",
+    "date",
+)
+_RECORD_DELETE = "delete from public.records where id = $1 returning id"
+
+
+class PostgresRecords:
+    def __init__(self, db: PostgresDatabase) -> None:
+        self.db = db
+
+    def list(self, category: Optional[str], search: Optional[str], sort: Optional[str]) -> List[Row]:
+        sql = _RECORDS_LIST.get(sort or "", _RECORDS_LIST_DEFAULT)
+        like = f"%{search}%" if search else None
+        return self.db.fetch("records", "select", sql, category or None, search or None, like)
+
+    def get(self, record_id: str) -> Optional[Row]:
+        return self.db.fetchrow("records", "select", _RECORD_GET, record_id)
+
+    def create(self, data: Row) -> Optional[Row]:
+        return self.db.fetchrow("records", "insert", _insert_sql("records", list(data)), _json(data))
+
+    def update(self, record_id: str, data: Row) -> Optional[Row]:
+        return self.db.fetchrow("records", "update", _update_sql("records", list(data), "id = $2"), _json(data), record_id)
+
+    def delete(self, record_id: str) -> bool:
+        return bool(self.db.fetch("records", "delete", _RECORD_DELETE, record_id))
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        return _fetch_export_page(self.db, "records", _RECORD_EXPORT, start, end, after, limit)
+
+
+# -----------------------------
+# Tournaments
+# -----------------------------
+_TOURNAMENT_GET = "select * from public.tournaments where id = $1"
+_TOURNAMENT_LIST = "select * from public.tournaments order by starts_on desc"
+_TOURNAMENT_SUMMARIES = (
+    "select * from public.tournament_summaries where ($1::text is null or status = $1)"
+    " and ($2::date is null or ends_on >= $2) and ($3::date is null or starts_on <= $3)"
+    " order by starts_on desc, id limit $4 offset $5"
+)
+_TOURNAMENT_TEAMS = "select * from public.tournament_teams where tournament_id = $1 order by group_name, seed"
+_TOURNAMENT_TEAM_MEMBERS = (
+    "select m.id, m.team_id, m.user_id, m.experience_score, u.name, u.student_id, u.major, u.generation"
+    " from public.tournament_team_members m left join public.users u on u.id = m.user_id"
+    " where m.team_id = any($1::uuid[])"
+)
+_TOURNAMENT_MATCHES = "select * from public.tournament_matches where tournament_id = $1 order by starts_at"
+_MEMBER_TOURNAMENT_HISTORY = (
+    "select * from public.member_tournament_matches where user_id = $1"
+    " order by starts_on desc, tournament_id, match_starts_at"
+)
+_TOURNAMENT_ARCHIVE = "select snapshot, etag from public.tournament_archives where tournament_id = $1"
+_TOURNAMENT_SAVE_ARCHIVE = (
+    "insert into public.tournament_archives (tournament_id, snapshot, etag) values ($1, $2, $3)"
+    " on conflict (tournament_id) do nothing"
+)
+_TOURNAMENT_DELETE_ARCHIVE = "delete from public.tournament_archives where tournament_id = $1"
+_TOURNAMENT_DELETE_MATCHES = "delete from public.tournament_matches where tournament_id = $1"
+_TOURNAMENT_DELETE_MEMBERS = (
+    "delete from public.tournament_team_members where team_id in"
+    " (select id from public.tournament_teams where tournament_id = $1)"
+)
+_TOURNAMENT_DELETE_TEAMS = "delete from public.tournament_teams where tournament_id = $1"
+_TEAM_COLUMNS = ["tournament_id", "name", "group_name", "seed", "experience_score", "client_key"]
+_MEMBER_COLUMNS = ["team_id", "user_id", "experience_score"]
+_MATCH_COLUMNS = [
+    "id", "tournament_id", "stage", "group_name", "round_label", "starts_at", "venue", "team_a_id", "team_b_id",
+    "team_a_source_group", "team_b_source_group", "winner_team_id", "team_a_score", "team_b_score", "status", "notes",
+]
+_TOURNAMENT_INSERT_TEAMS = _insert_sql("tournament_teams", _TEAM_COLUMNS, many=True)
+_TOURNAMENT_INSERT_MEMBERS = _insert_sql("tournament_team_members", _MEMBER_COLUMNS, many=True)
+_TOURNAMENT_INSERT_MATCHES = _insert_sql("tournament_matches", _MATCH_COLUMNS, many=True)
+
+
+class PostgresTournaments:
+    def __init__(self, db: PostgresDatabase) -> None:
+        self.db = db
+
+    def get(self, event_id: str) -> Optional[Row]:
+        return self.db.fetchrow("tournaments", "select", _TOURNAMENT_GET, event_id)
+
+    def list_all(self) -> List[Row]:
+        return self.db.fetch("tournaments", "select", _TOURNAMENT_LIST)
+
+    def summaries(
+        self, status: Optional[str], start: Optional[date], end: Optional[date], limit: Optional[int], offset: int
+    ) -> List[Row]:
+        return self.db.fetch("tournament_summaries", "select", _TOURNAMENT_SUMMARIES, status, start, end, limit, offset)
+
+    def teams(self, event_id: str) -> List[Row]:
+        return self.db.fetch("tournament_teams", "select", _TOURNAMENT_TEAMS, event_id)
+
+    def team_members(self, team_ids: Sequence[str]) -> List[Row]:
+        return self.db.fetch("tournament_team_members", "select", _TOURNAMENT_TEAM_MEMBERS, list(team_ids))
+
+    def matches(self, event_id: str) -> List[Row]:
+        return self.db.fetch("tournament_matches", "select", _TOURNAMENT_MATCHES, event_id)
+
+    def create(self, data: Row) -> Optional[Row]:
+        return self.db.fetchrow("tournaments", "insert", _insert_sql("tournaments", list(data)), _json(data))
+
+    def update(self, event_id: str, changes: Row) -> None:
+        self.db.fetch("tournaments", "update", _update_sql("tournaments", list(changes), "id = $2"), _json(changes), event_id)
+
+    def replace_setup(self, event_id: str, teams: List[Row], build_children: SetupChildrenBuilder) -> None:
+        async def work(conn: Any) -> None:
+            await conn.execute(_TOURNAMENT_DELETE_MATCHES, event_id)
+            await conn.execute(_TOURNAMENT_DELETE_MEMBERS, event_id)
+            await conn.execute(_TOURNAMENT_DELETE_TEAMS, event_id)
+            team_id_by_key: Dict[str, str] = {}
+            if teams:
+                inserted = await conn.fetch(_TOURNAMENT_INSERT_TEAMS, _json(teams))
+                team_id_by_key = {record["client_key"]: record["id"] for record in inserted}
+            members, matches = build_children(team_id_by_key)
+            if members:
+                await conn.execute(_TOURNAMENT_INSERT_MEMBERS, _json(members))
+            if matches:
+                await conn.execute(_TOURNAMENT_INSERT_MATCHES, _json(matches))
+
+        self.db.transaction("tournament_teams", "replace", work)
+
+    def update_match(self, event_id: str, match_id: str, changes: Row) -> None:
+        sql = _update_sql("tournament_matches", list(changes), "id = $2 and tournament_id = $3")
+        self.db.fetch("tournament_matches", "update", sql, _json(changes), match_id, event_id)
+
+    def archive(self, event_id: str) -> Optional[Row]:
+        return self.db.fetchrow("tournament_archives", "select", _TOURNAMENT_ARCHIVE, event_id)
+
+    def save_archive(self, event_id: str, snapshot: str, etag: str) -> None:
+        self.db.fetch("tournament_archives", "upsert", _TOURNAMENT_SAVE_ARCHIVE, event_id, snapshot, etag)
+
+    def delete_archive(self, event_id: str) -> None:
+        self.db.fetch("tournament_archives", "delete", _TOURNAMENT_DELETE_ARCHIVE, event_id)
+
+    def member_history(self, user_id: str) -> List[Row]:
+        return self.db.fetch("member_tournament_matches", "select", _MEMBER_TOURNAMENT_HISTORY, user_id)
@@ -0,0 +1,421 @@
+"""Supabase REST(PostgREST) 저장소 구현.
+
+라우터에 있던 `sb.table(...)` 체인을 그대로 옮겼다. PostgREST는 요청 하나가 트랜잭션
+하나이므로, 여러 단계로 된 쓰기(명단 교체, 대회 구성 교체)는 원자적이지 않다.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.db import get_supabase
+from app.repositories.base import ExportCursor, Row, SetupChildrenBuilder
+
+PROFILE_COLUMNS = "id,email,name,student_id,major,generation,role,must_change_password"
+RESERVATION_COLUMNS = "id,reserved_by,reserved_by_name,title,starts_at,ends_at,debate_id,allow_simultaneous"
+RESERVATION_CALENDAR_COLUMNS = "id,reserved_by_name,title,starts_at,ends_at,updated_at"
+DEBATE_EXPORT_COLUMNS = (
+    "id,debate_date,debate_type,topic_text,winner_side,notes,debate_participants(user_id,participant_name,side)"
+)
+RESERVATION_EXPORT_COLUMNS = "id,reserved_by,reserved_by_name,title,starts_at,ends_at,debate_id,allow_simultaneous,created_at"
+_RECORD_SORTS = {
+    "date-asc": ("date", False),
+    "participants-desc": ("participants", True),
+    "title": ("title", False),
+}
+
+
+def _first(data) -> Optional[Row]:
+    if not data:
+        return None
+    return data[0] if isinstance(data, list) else data
+
+
+def _export_page(query: Any, column: str, after: Optional[ExportCursor], limit: int) -> List[Row]:
+    """(column, id) 키셋으로 after 다음 limit개. 시각 값의 ':' '+' 같은 예약 문자 때문에 키를 따옴표로 감싼다."""
+    if after is not None:
+        key, last_id = after
+        query = query.or_(f'{column}.gt."{key}",and({column}.eq."{key}",id.gt.{last_id})')
+    return query.order(column).order("id").limit(limit).execute().data or []
+
+
+class SupabaseUsers:
+    def get(self, user_id: str) -> Optional[Row]:
+        resp = get_supabase().table("users").select(PROFILE_COLUMNS).eq("id", user_id).limit(1).execute()
+        return _first(resp.data)
+
+    def get_role(self, user_id: str) -> Optional[str]:
+        resp = get_supabase().table("users").select("role").eq("id", user_id).limit(1).execute()
+        row = _first(resp.data)
+        return row.get("role") if row else None
+
+    def find_email(self, name: str, student_id: str) -> Optional[str]:
+        resp = (
+            get_supabase()
+            .table("users")
+            .select("email")
+            .eq("name", name)
+            .eq("student_id", student_id)
+            .limit(1)
+            .execute()
+        )
+        row = _first(resp.data)
+        return row.get("email") if row else None
+
+    def list_profiles(self) -> List[Row]:
+        return get_supabase().table("users").select(PROFILE_COLUMNS).order("name").execute().data or []
+
+    def list_all(self) -> List[Row]:
+        return get_supabase().table("users").select(PROFILE_COLUMNS).execute().data or []
+
+    def update(self, user_id: str, changes: Row) -> None:
+        get_supabase().table("users").update(changes).eq("id", user_id).execute()
+
+    def debate_stats(self, start: Optional[date], end: Optional[date], after: Optional[str], limit: int) -> List[Row]:
+        params = {
+            "p_start": start.isoformat() if start is not None else None,
+            "p_end": end.isoformat() if end is not None else None,
+            "p_after": after,
+            "p_limit": limit,
+        }
+        return get_supabase().rpc("member_debate_stats", params).execute().data or []
+
+
+class SupabaseDebates:
+    def list(self, year: Optional[int] = None) -> List[Row]:
+        query = get_supabase().table("debates").select("*")
+        if year is not None:
+            query = query.gte("debate_date", f"{year}-01-01").lte("debate_date", f"{year}-12-31")
+        return query.order("debate_date", desc=True).execute().data or []
+
+    def get(self, debate_id: str) -> Optional[Row]:
+        return _first(get_supabase().table("debates").select("*").eq("id", debate_id).limit(1).execute().data)
+
+    def list_by_ids(self, debate_ids: Sequence[str]) -> List[Row]:
+        resp = (
+            get_supabase()
+            .table("debates")
+            .select("id,topic_text,debate_date,debate_type,winner_side")
+            .in_("id", list(debate_ids))
+            .order("debate_date", desc=True)
+            .execute()
+        )
+        return resp.data or []
+
+    def winner_sides(self) -> Dict[str, Optional[str]]:
+        resp = get_supabase().table("debates").select("id,winner_side").execute()
+        return {row["id"]: row.get("winner_side") for row in resp.data or []}
+
+    def create(self, data: Row) -> Optional[Row]:
+        return _first(get_supabase().table("debates").insert(data).execute().data)
+
+    def set_winner(self, debate_id: str, winner_side: str) -> None:
+        get_supabase().table("debates").update({"winner_side": winner_side}).eq("id", debate_id).execute()
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        query = get_supabase().table("debates").select(DEBATE_EXPORT_COLUMNS)
+        if start is not None:
+            query = query.gte("debate_date", start.isoformat())
+        if end is not None:
+            query = query.lte("debate_date", end.isoformat())
+        return _export_page(query, "debate_date", after, limit)
+
+
+class SupabaseParticipants:
+    def list_for_debate(self, debate_id: str) -> List[Row]:
+        return get_supabase().table("debate_participants").select("*").eq("debate_id", debate_id).execute().data or []
+
+    def list_for_user(self, user_id: str) -> List[Row]:
+        resp = get_supabase().table("debate_participants").select("debate_id,side").eq("user_id", user_id).execute()
+        return resp.data or []
+
+    def list_member_entries(self) -> List[Row]:
+        resp = (
+            get_supabase()
+            .table("debate_participants")
+            .select("user_id,debate_id,side")
+            .not_.is_("user_id", "null")
+            .execute()
+        )
+        return resp.data or []
+
+    def find(self, debate_id: str, user_id: str) -> Optional[Row]:
+        resp = (
+            get_supabase()
+            .table("debate_participants")
+            .select("*")
+            .eq("debate_id", debate_id)
+            .eq("user_id", user_id)
+            .limit(1)
+            .execute()
+        )
+        return _first(resp.data)
+
+    def sides(self, debate_id: str, user_ids: Sequence[str]) -> List[Row]:
+        resp = (
+            get_supabase()
+            .table("debate_participants")
+            .select("user_id,side")
+            .eq("debate_id", debate_id)
+            .in_("user_id", list(user_ids))
+            .execute()
+        )
+        return resp.data or []
+
+    def insert(self, row: Row) -> Optional[Row]:
+        return _first(get_supabase().table("debate_participants").insert(row).execute().data)
+
+    def update_member(self, debate_id: str, user_id: str, changes: Row) -> Optional[Row]:
+        resp = (
+            get_supabase()
+            .table("debate_participants")
+            .update(changes)
+            .eq("debate_id", debate_id)
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return _first(resp.data)
+
+    def apply_roster(
+        self, debate_id: str, upserts: List[Row], stale_ids: List[int], winner_side: Optional[str]
+    ) -> List[Row]:
+        # 삭제/갱신/추가/승리 측 기록을 요청 하나(한 트랜잭션)로 보내 중간에 실패해도 명단이 반쯤 바뀌지 않게 한다.
+        params = {
+            "p_debate_id": debate_id,
+            "p_upserts": upserts,
+            "p_stale_ids": stale_ids,
+            "p_winner_side": winner_side,
+        }
+        return get_supabase().rpc("apply_debate_roster", params).execute().data or []
+
+    def remove(self, debate_id: str, user_id: str) -> List[Row]:
+        resp = (
+            get_supabase()
+            .table("debate_participants")
+            .delete()
+            .eq("debate_id", debate_id)
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return resp.data or []
+
+
+class SupabaseReservations:
+    def list_between(self, start_at: Optional[str], end_at: Optional[str]) -> List[Row]:
+        query = get_supabase().table("reservations").select(RESERVATION_COLUMNS)
+        if start_at is not None:
+            query = query.gte("starts_at", start_at)
+        if end_at is not None:
+            query = query.lt("starts_at", end_at)
+        return query.order("starts_at", desc=False).execute().data or []
+
+    def for_calendar(self, start_at: str, end_at: Optional[str], reserved_by: Optional[str]) -> List[Row]:
+        query = get_supabase().table("reservations").select(RESERVATION_CALENDAR_COLUMNS).gte("starts_at", start_at)
+        if end_at is not None:
+            query = query.lt("starts_at", end_at)
+        if reserved_by is not None:
+            query = query.eq("reserved_by", reserved_by)
+        return query.order("starts_at", desc=False).execute().data or []
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        query = get_supabase().table("reservations").select(RESERVATION_EXPORT_COLUMNS)
+        if start is not None:
+            query = query.gte("starts_at", f"{start.isoformat()}T00:00:00Z")
+        if end is not None:
+            query = query.lt("starts_at", f"{(end + timedelta(days=1)).isoformat()}T00:00:00Z")
+        return _export_page(query, "starts_at", after, limit)
+
+    def overlapping(self, starts_at: str, ends_at: str, debate_id: Optional[str] = None) -> List[Row]:
+        query = (
+            get_supabase()
+            .table("reservations")
+            .select("id,reserved_by,allow_simultaneous")
+            .lt("starts_at", ends_at)
+            .gt("ends_at", starts_at)
+        )
+        if debate_id is not None:
+            query = query.eq("debate_id", debate_id)
+        return query.execute().data or []
+
+    def get(self, reservation_id: str) -> Optional[Row]:
+        resp = get_supabase().table("reservations").select("*").eq("id", reservation_id).limit(1).execute()
+        return _first(resp.data)
+
+    def create(self, data: Row) -> Optional[Row]:
+        return _first(get_supabase().table("reservations").insert(data).execute().data)
+
+    def update(self, reservation_id: str, changes: Row) -> Optional[Row]:
+        resp = get_supabase().table("reservations").update(changes).eq("id", reservation_id).execute()
+        return _first(resp.data)
+
+    def delete(self, reservation_id: str) -> None:
+        get_supabase().table("reservations").delete().eq("id", reservation_id).execute()
+
+
+class SupabaseRecords:
+    def list(self, category: Optional[str], search: Optional[str], sort: Optional[str]) -> List[Row]:
+        query = get_supabase().table("records").select("*")
+        if category:
+            query = query.eq("category", category)
+        if search:
+            like = f"%{search}%"
+            query = query.or_(f"title.ilike.{like},summary.ilike.{like},participantNames.cs.{{{search}}}")
+        column, desc = _RECORD_SORTS.get(sort or "", ("date", True))
+        return query.order(column, desc=desc).execute().data or []
+
+    def get(self, record_id: str) -> Optional[Row]:
+        return _first(get_supabase().table("records").select("*").eq("id", record_id).limit(1).execute().data)
+
+    def create(self, data: Row) -> Optional[Row]:
+        return _first(get_supabase().table("records").insert(data).execute().data)
+
+    def update(self, record_id: str, data: Row) -> Optional[Row]:
+        return _first(get_supabase().table("records").update(data).eq("id", record_id).execute().data)
+
+    def delete(self, record_id: str) -> bool:
+        return bool(get_supabase().table("records").delete().eq("id", record_id).execute().data)
+
+    def export_page(
+        self, start: Optional[date], end: Optional[date], after: Optional[ExportCursor], limit: int
+    ) -> List[Row]:
+        query = get_supabase().table("records").select("*")
+        if start is not None:
+            query = query.gte("date", start.isoformat())
+        if end is not None:
+            query = query.lte("date", end.isoformat())
+        return _export_page(query, "date", after, limit)
+
+
+class SupabaseTournaments:
+    def get(self, event_id: str) -> Optional[Row]:
+        return _first(get_supabase().table("tournaments").select("*").eq("id", event_id).limit(1).execute().data)
+
+    def list_all(self) -> List[Row]:
+        return get_supabase().table("tournaments").select("*").order("starts_on", desc=True).execute().data or []
+
+    def summaries(
+        self, status: Optional[str], start: Optional[date], end: Optional[date], limit: Optional[int], offset: int
+    ) -> List[Row]:
+        # 집계는 tournament_summaries 뷰(sql/migrate_20261019_tournament_summaries.sql)가 DB에서 한다.
+        query = get_supabase().table("tournament_summaries").select("*")
+        if status is not None:
+            query = query.eq("status", status)
+        if start is not None:
+            query = query.gte("ends_on", start.isoformat())
+        if end is not None:
+            query = query.lte("starts_on", end.isoformat())
+        query = query.order("starts_on", desc=True).order("id")
+        if limit is not None:
+            query = query.range(offset, offset + limit - 1)
+        elif offset:
+            query = query.offset(offset)
+        return query.execute().data or []
+
+    def teams(self, event_id: str) -> List[Row]:
+        resp = (
+            get_supabase()
+            .table("tournament_teams")
+            .select("*")
+            .eq("tournament_id", event_id)
+            .order("group_name")
+            .order("seed")
+            .execute()
+        )
+        return resp.data or []
+
+    def team_members(self, team_ids: Sequence[str]) -> List[Row]:
+        resp = (
+            get_supabase()
+            .table("tournament_team_members")
+            .select("id,team_id,user_id,experience_score,users(name,student_id,major,generation)")
+            .in_("team_id", list(team_ids))
+            .execute()
+        )
+        members = []
+        for row in resp.data or []:
+            profile = row.pop("users", None) or {}
+            members.append({**row, **profile})
+        return members
+
+    def matches(self, event_id: str) -> List[Row]:
+        resp = (
+            get_supabase()
+            .table("tournament_matches")
+            .select("*")
+            .eq("tournament_id", event_id)
+            .order("starts_at")
+            .execute()
+        )
+        return resp.data or []
+
+    def create(self, data: Row) -> Optional[Row]:
+        return _first(get_supabase().table("tournaments").insert(data).execute().data)
+
+    def update(self, event_id: str, changes: Row) -> None:
+        get_supabase().table("tournaments").update(changes).eq("id", event_id).execute()
+
+    def replace_setup(self, event_id: str, teams: List[Row], build_children: SetupChildrenBuilder) -> None:
+        sb = get_supabase()
+        old_teams = sb.table("tournament_teams").select("id").eq("tournament_id", event_id).execute()
+        old_team_ids = [row["id"] for row in old_teams.data or []]
+        sb.table("tournament_matches").delete().eq("tournament_id", event_id).execute()
+        if old_team_ids:
+            sb.table("tournament_team_members").delete().in_("team_id", old_team_ids).execute()
+        sb.table("tournament_teams").delete().eq("tournament_id", event_id).execute()
+
+        team_id_by_key: Dict[str, str] = {}
+        if teams:
+            inserted = sb.table("tournament_teams").insert(teams).execute()
+            team_id_by_key = {row["client_key"]: row["id"] for row in inserted.data or []}
+        members, matches = build_children(team_id_by_key)
+        if members:
+            sb.table("tournament_team_members").insert(members).execute()
+        if matches:
+            sb.table("tournament_matches").insert(matches).execute()
+
+    def update_match(self, event_id: str, match_id: str, changes: Row) -> None:
+        (
+            get_supabase()
+            .table("tournament_matches")
+            .update(changes)
+            .eq("id", match_id)
+            .eq("tournament_id", event_id)
+            .execute()
+        )
+
+    def archive(self, event_id: str) -> Optional[Row]:
+        resp = (
+            get_supabase()
+            .table("tournament_archives")
+            .select("snapshot,etag")
+            .eq("tournament_id", event_id)
+            .limit(1)
+            .execute()
+        )
+        return _first(resp.data)
+
+    def save_archive(self, event_id: str, snapshot: str, etag: str) -> None:
+        row = {"tournament_id": event_id, "snapshot": snapshot, "etag": etag}
+        get_supabase().table("tournament_archives").upsert(
+            row, on_conflict="tournament_id", ignore_duplicates=True
+        ).execute()
+
+    def delete_archive(self, event_id: str) -> None:
+        get_supabase().table("tournament_archives").delete().eq("tournament_id", event_id).execute()
+
+    def member_history(self, user_id: str) -> List[Row]:
+        # 회원 → 팀 → 경기 조인은 member_tournament_matches 뷰(sql/migrate_20261019_member_tournament_history.sql)가 한다.
+        resp = (
+            get_supabase()
+            .table("member_tournament_matches")
+            .select("*")
+            .eq("user_id", user_id)
+            .order("starts_on", desc=True)
+            .order("tournament_id")
+            .order("match_starts_at")
+            .execute()
+        )
+        return resp.data or []
@@ -0,0 +1,335 @@
+"""upstream 호출의 deadline, 재시도, 재시도 예산, 서킷 브레이커.
+
+- 요청마다 라우트 예산(기본 `REQUEST_DEADLINE_SECONDS`, `@time_budget(s)`로 라우트별 지정)으로
+  deadline을 정하고, 모든 upstream 호출은 남은 시간과 `UPSTREAM_TIMEOUT_SECONDS` 중 작은 값을
+  호출별 타임아웃으로 쓴다. deadline이 지나면 더 호출하지 않고 504로 끝낸다.
+- 조회(select)가 일시적 오류(타임아웃, 연결 실패, 502/503/504)로 실패하면 지터를 준 지수
+  백오프로 다시 시도한다. 재시도는 전역 예산(원 호출 대비 `RETRY_BUDGET_RATIO`)을 넘지 않으므로
+  장애 중에 재시도가 부하를 몇 배로 키우지 않는다.
+- upstream(rest/auth/postgres)별 브레이커가 일시적 오류가 연달아 나면 열려서 한동안 호출 없이
+  바로 503을 낸다. 캐시된 조회는 이때 마지막 정상 응답을 계속 제공한다.
+
+일시적 오류로 최종 실패하면 HTTPException(503/504)으로 바꿔 올리므로, 라우터는 따로 처리하지
+않아도 되고 응답 캐시는 이를 upstream 장애로 본다.
+"""
+
+import contextlib
+import logging
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from app.config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    REQUEST_DEADLINE_SECONDS,
+    RETRY_BACKOFF_BASE_SECONDS,
+    RETRY_BACKOFF_MAX_SECONDS,
+    RETRY_BUDGET_MIN_PER_SECOND,
+    RETRY_BUDGET_RATIO,
+    RETRY_MAX_ATTEMPTS,
+    UPSTREAM_TIMEOUT_SECONDS,
+)
+from app.metrics import circuit_state, circuit_transitions, upstream_rejections, upstream_retries, upstream_timeouts
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 재시도해도 결과가 달라지지 않는 작업
+RETRYABLE_OPERATIONS = frozenset({"select"})
+# 게이트웨이/과부하 응답. 500은 보통 쿼리 자체의 오류라 다시 보내도 같다.
+_TRANSIENT_STATUSES = frozenset({502, 503, 504})
+
+# 요청의 deadline (time.monotonic 기준). 스레드풀로 넘어가는 핸들러에도 복사된다.
+current_deadline: ContextVar[Optional[float]] = ContextVar("current_deadline", default=None)
+
+
+class UpstreamStatusError(Exception):
+    """PostgREST가 5xx로 응답했다. postgrest-py는 상태 코드를 남기지 않으므로 세션에서 먼저 잡는다."""
+
+    def __init__(self, status: int, body: str = "") -> None:
+        super().__init__(f"upstream responded {status}: {body}")
+        self.status = status
+
+
+class UpstreamUnavailable(HTTPException):
+    def __init__(self, retry_after: float = 1.0) -> None:
+        super().__init__(
+            status_code=503,
+            detail="데이터 서버에 일시적으로 연결할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
+
+
+class UpstreamTimeout(HTTPException):
+    def __init__(self, detail: str = "데이터 서버 응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요.") -> None:
+        super().__init__(status_code=504, detail=detail)
+
+
+class DeadlineExceeded(UpstreamTimeout):
+    def __init__(self) -> None:
+        super().__init__("요청 처리 시간이 초과되었습니다.")
+
+
+# -----------------------------
+# Deadline
+# -----------------------------
+def time_budget(seconds: Optional[float]) -> Callable:
+    """라우트의 처리 시간 예산(초)을 지정한다. None이면 deadline을 두지 않는다.
+
+    라우터 데코레이터 바로 아래에 둔다.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        func.time_budget = seconds
+        return func
+
+    return decorator
+
+
+def route_budget(endpoint: Any) -> Optional[float]:
+    return getattr(endpoint, "time_budget", REQUEST_DEADLINE_SECONDS)
+
+
+@contextlib.contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    token = current_deadline.set(None if seconds is None else time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
+
+
+def remaining_seconds() -> Optional[float]:
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout() -> float:
+    """이번 upstream 호출에 줄 타임아웃: 요청의 남은 시간과 호출당 상한 중 작은 값."""
+    remaining = remaining_seconds()
+    if remaining is None:
+        return UPSTREAM_TIMEOUT_SECONDS
+    return max(0.001, min(UPSTREAM_TIMEOUT_SECONDS, remaining))
+
+
+# -----------------------------
+# 재시도 예산
+# -----------------------------
+class RetryBudget:
+    """원 호출마다 ratio개씩 토큰을 적립하고 재시도마다 1개를 쓴다.
+
+    호출이 적을 때도 재시도가 막히지 않도록 초당 min_per_second개는 시간으로 채운다.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, cap: Optional[float] = None) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.cap = cap if cap is not None else max(10.0, min_per_second * 10)
+        self._tokens = self.cap
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.cap, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.cap, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return round(self._tokens, 2)
+
+
+retry_budget = RetryBudget(RETRY_BUDGET_RATIO, RETRY_BUDGET_MIN_PER_SECOND)
+
+
+# -----------------------------
+# 서킷 브레이커
+# -----------------------------
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold번이면 열리고, reset_seconds 뒤 시험 호출 하나를 통과시킨다(half-open).
+
+    시험 호출이 성공하면 닫히고, 실패하면 다시 reset_seconds 동안 열린다.
+    """
+
+    def __init__(self, name: str, threshold: int, reset_seconds: float) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        circuit_state.set(name, value=0)
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("circuit %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+        circuit_state.set(self.name, value=_STATE_VALUES[state])
+        circuit_transitions.inc(self.name, state)
+
+    def allow(self) -> None:
+        """호출해도 되는지 확인한다. 열려 있으면 UpstreamUnavailable을 던진다."""
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.monotonic()
+            if self.state == "open":
+                wait = self._opened_at + self.reset_seconds - now
+                if wait > 0:
+                    upstream_rejections.inc("circuit_open")
+                    raise UpstreamUnavailable(retry_after=wait)
+                self._transition("half_open")
+                self._probing = False
+            if self._probing:
+                upstream_rejections.inc("circuit_open")
+                raise UpstreamUnavailable(retry_after=self.reset_seconds)
+            self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == "half_open" or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                self._transition("open")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            opened_for = time.monotonic() - self._opened_at if self.state != "closed" else 0.0
+            return {"state": self.state, "consecutive_failures": self._failures, "open_seconds": round(opened_for, 2)}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(upstream: str) -> CircuitBreaker:
+    with _breakers_lock:
+        found = _breakers.get(upstream)
+        if found is None:
+            found = _breakers[upstream] = CircuitBreaker(upstream, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+        return found
+
+
+def snapshot() -> Dict[str, Any]:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {
+        "breakers": {name: found.snapshot() for name, found in breakers.items()},
+        "retry_budget_tokens": retry_budget.tokens(),
+    }
+
+
+# -----------------------------
+# 호출
+# -----------------------------
+def classify(exc: BaseException) -> Optional[str]:
+    """일시적 오류면 "timeout" 또는 "unavailable", 아니면 None."""
+    if isinstance(exc, UpstreamStatusError):
+        if exc.status not in _TRANSIENT_STATUSES:
+            return None
+        return "timeout" if exc.status == 504 else "unavailable"
+    if isinstance(exc, TimeoutError):
+        return "timeout"
+    # 드라이버는 이미 import된 경우에만 확인한다 (여기서 import하면 시작 시간이 늘어난다).
+    httpx = sys.modules.get("httpx")
+    if httpx is not None:
+        if isinstance(exc, httpx.TimeoutException):
+            return "timeout"
+        if isinstance(exc, httpx.TransportError):
+            return "unavailable"
+    asyncpg = sys.modules.get("asyncpg")
+    if asyncpg is not None and isinstance(
+        exc, (asyncpg.PostgresConnectionError, asyncpg.CannotConnectNowError, asyncpg.TooManyConnectionsError)
+    ):
+        return "unavailable"
+    if isinstance(exc, ConnectionError):
+        return "unavailable"
+    return None
+
+
+def _backoff(attempt: int) -> float:
+    # full jitter: 같은 순간 실패한 호출들이 같은 시각에 다시 몰리지 않게 한다.
+    return random.uniform(0, min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_BASE_SECONDS * (2**attempt)))
+
+
+def resilient(upstream: str, table: str, operation: str, call: Callable[[], T]) -> T:
+    """deadline 확인 → 브레이커 확인 → 호출. 일시적 오류면 조회에 한해 예산 안에서 재시도한다.
+
+    call은 호출 한 번이며, 타임아웃은 call 안에서 call_timeout()으로 정한다.
+    """
+    circuit = breaker(upstream)
+    retryable = operation in RETRYABLE_OPERATIONS
+    retry_budget.deposit()
+    attempt = 0
+    while True:
+        remaining = remaining_seconds()
+        if remaining is not None and remaining <= 0:
+            upstream_rejections.inc("deadline")
+            raise DeadlineExceeded()
+        circuit.allow()
+        try:
+            result = call()
+        except Exception as exc:
+            kind = classify(exc)
+            if kind is None:
+                # 4xx나 쿼리 오류는 upstream이 정상적으로 응답한 것이다.
+                circuit.record_success()
+                raise
+            circuit.record_failure()
+            if kind == "timeout":
+                upstream_timeouts.inc(table, operation)
+            delay = _backoff(attempt)
+            remaining = remaining_seconds()
+            can_retry = (
+                retryable
+                and attempt + 1 < RETRY_MAX_ATTEMPTS
+                and circuit.state == "closed"
+                and (remaining is None or remaining > delay)
+            )
+            if can_retry and not retry_budget.try_spend():
+                upstream_rejections.inc("retry_budget")
+                can_retry = False
+            if not can_retry:
+                if kind == "timeout":
+                    raise UpstreamTimeout() from exc
+                raise UpstreamUnavailable() from exc
+            upstream_retries.inc(table, operation)
+            logger.info("retrying %s %s after %r (attempt %d)", table, operation, exc, attempt + 2)
+            time.sleep(delay)
+            attempt += 1
+            continue
+        circuit.record_success()
+        return result
@@ -3,8 +3,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from app.auth import require_auth
 from app.db import get_supabase
 from app.models import LoginLookupRequest, LoginLookupResponse, PasswordChangeRequest
+from app.profiling import ProfiledRoute
+from app.repositories import get_repositories
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.post("/login-lookup", response_model=LoginLookupResponse)
@@ -15,16 +17,7 @@ def login_lookup(payload: LoginLookupRequest):
     if not name or not student_id:
         raise HTTPException(status_code=400, detail="이름과 학번을 모두 입력해주세요.")
 
-    sb = get_supabase()
-    resp = (
-        sb.table("users")
-        .select("email")
-        .eq("name", name)
-        .eq("student_id", student_id)
-        .limit(1)
-        .execute()
-    )
-    email = (resp.data[0].get("email") or "").strip() if resp.data else ""
+    email = (get_repositories().users.find_email(name, student_id) or "").strip()
     if not email:
         raise HTTPException(
             status_code=404,
@@ -40,16 +33,16 @@ def change_password(payload: PasswordChangeRequest, user_id: str = Depends(requi
     if len(new_password) < 6:
         raise HTTPException(status_code=400, detail="비밀번호는 최소 6자 이상이어야 합니다.")
 
-    sb = get_supabase()
-    profile = sb.table("users").select("student_id").eq("id", user_id).limit(1).execute()
-    student_id = (profile.data[0].get("student_id") or "").strip() if profile.data else ""
+    users = get_repositories().users
+    profile = users.get(user_id)
+    student_id = ((profile or {}).get("student_id") or "").strip()
     if student_id and new_password == student_id:
         raise HTTPException(status_code=400, detail="초기 비밀번호(학번)와 다른 비밀번호를 사용해주세요.")
 
     try:
-        sb.auth.admin.update_user_by_id(user_id, {"password": new_password})
+        get_supabase().auth.admin.update_user_by_id(user_id, {"password": new_password})
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"비밀번호 변경에 실패했습니다: {exc}")
 
-    sb.table("users").update({"must_change_password": False}).eq("id", user_id).execute()
+    users.update(user_id, {"must_change_password": False})
     return {"ok": True}
@@ -0,0 +1,77 @@
+import os
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.auth import require_admin
+from app.cache import response_cache
+from app.compression import compression_stats
+from app import resilience
+from app.idempotency import idempotency_store
+from app.profiling import ProfiledRoute, profile_store
+from app.singleflight import flights
+from app.warmup import last_report
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/cache")
+def cache_stats(_: str = Depends(require_admin)):
+    """응답 캐시 적중/미스/축출 카운터와 요청 병합 카운터를 반환합니다.
+    카운터는 워커 프로세스별이므로 응답한 워커의 pid를 함께 돌려줍니다.
+    """
+    return {**response_cache.stats(), "singleflight": flights.stats(), "pid": os.getpid()}
+
+
+@router.get("/compression")
+def compression_summary(_: str = Depends(require_admin)):
+    """압축 횟수, 입출력 바이트, 압축 1회당 CPU 시간을 반환합니다."""
+    return compression_stats.snapshot()
+
+
+@router.delete("/cache")
+def clear_cache(_: str = Depends(require_admin)):
+    response_cache.clear()
+    return {"ok": True}
+
+
+@router.get("/upstream")
+def upstream_status(_: str = Depends(require_admin)):
+    """upstream별 서킷 브레이커 상태와 남은 재시도 예산(토큰)을 반환합니다."""
+    return resilience.snapshot()
+
+
+@router.get("/idempotency")
+def idempotency_status(_: str = Depends(require_admin)):
+    """Idempotency-Key 저장소의 키 수와 처리 중인 키 수를 반환합니다."""
+    return idempotency_store.stats()
+
+
+@router.get("/warmup")
+def warmup_report(_: str = Depends(require_admin)):
+    """마지막 시작 워밍업의 단계별 소요 시간(ms)과 실패 내역."""
+    return last_report
+
+
+@router.get("/profiles")
+def list_profiles(_: str = Depends(require_admin)):
+    """보관 중인 요청 프로파일 목록 (최신순)."""
+    return profile_store.list()
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: int, _: str = Depends(require_admin)):
+    profile = profile_store.get(profile_id)
+    return {**profile.summary(), "pstats": profile.pstats_text}
+
+
+@router.get("/profiles/{profile_id}/collapsed", response_class=PlainTextResponse)
+def get_profile_collapsed(profile_id: int, _: str = Depends(require_admin)):
+    """flamegraph.pl / speedscope에 바로 넣을 수 있는 collapsed stack 텍스트."""
+    return profile_store.get(profile_id).collapsed()
+
+
+@router.delete("/profiles")
+def clear_profiles(_: str = Depends(require_admin)):
+    profile_store.clear()
+    return {"ok": True}
@@ -1,51 +1,42 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.auth import require_admin
-from app.db import get_supabase
-from app.models import Debate, DebateCreate, DebateParticipant
+from app.cache import cached, invalidate
+from app.idempotency import idempotent
+from app.models import Debate, DebateCreate, DebateParticipant, DebateRosterUpdate
+from app.profiling import ProfiledRoute
+from app.repositories import get_repositories
+from app.tracing import query_budget
 
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=List[Debate])
+@cached(List[Debate], tags=["debates"])
 def list_debates(year: Optional[int] = Query(default=None)):
-    sb = get_supabase()
-    query = sb.table("debates").select("*")
-    if year is not None:
-        query = (
-            query
-            .gte("debate_date", f"{year}-01-01")
-            .lte("debate_date", f"{year}-12-31")
-        )
-    resp = query.order("debate_date", desc=True).execute()
-    return resp.data or []
+    return get_repositories().debates.list(year)
 
 
 @router.post("", response_model=Debate)
-def create_debate(payload: DebateCreate, _: str = Depends(require_admin)):
-    sb = get_supabase()
-    resp = (
-        sb.table("debates")
-        .insert(payload.model_dump())
-        .select("*")
-        .single()
-        .execute()
-    )
-    if resp.data is None:
+@idempotent(Debate, user="admin_id")
+def create_debate(payload: DebateCreate, admin_id: str = Depends(require_admin)):
+    created = get_repositories().debates.create(payload.model_dump(mode="json"))
+    if created is None:
         raise HTTPException(status_code=500, detail="Failed to create debate")
-    return resp.data
+    invalidate("debates")
+    return created
 
 
 @router.get("/{debate_id}", response_model=Debate)
+@cached(Debate, tags=["debates"])
 def get_debate(debate_id: str):
-    sb = get_supabase()
-    resp = sb.table("debates").select("*").eq("id", debate_id).single().execute()
-    if resp.data is None:
+    debate = get_repositories().debates.get(debate_id)
+    if debate is None:
         raise HTTPException(status_code=404, detail="Debate not found")
-    return resp.data
+    return debate
 
 
 @router.post("/{debate_id}/participants", response_model=DebateParticipant)
@@ -56,65 +47,103 @@ def add_participant(debate_id: str, participant: DebateParticipant, _: str = Dep
     if not participant.user_id and not (participant.participant_name or "").strip():
         raise HTTPException(status_code=400, detail="user_id 또는 participant_name 중 하나는 필요합니다.")
 
-    sb = get_supabase()
+    participants = get_repositories().participants
 
-    if participant.user_id:
-        existing = (
-            sb.table("debate_participants")
-            .select("id")
-            .eq("debate_id", debate_id)
-            .eq("user_id", participant.user_id)
-            .limit(1)
-            .execute()
+    if participant.user_id and participants.find(debate_id, participant.user_id) is not None:
+        refreshed = participants.update_member(
+            debate_id,
+            participant.user_id,
+            {
+                "side": participant.side,
+                "participant_name": (participant.participant_name or "").strip(),
+            },
         )
-        if existing.data:
-            sb.table("debate_participants") \
-                .update({
-                    "side": participant.side,
-                    "participant_name": (participant.participant_name or "").strip(),
-                }) \
-                .eq("debate_id", debate_id) \
-                .eq("user_id", participant.user_id) \
-                .execute()
-            refreshed = (
-                sb.table("debate_participants")
-                .select("*")
-                .eq("debate_id", debate_id)
-                .eq("user_id", participant.user_id)
-                .single()
-                .execute()
-            )
-            return refreshed.data
-
-    resp = (
-        sb.table("debate_participants")
-        .insert({
-            "debate_id": debate_id,
-            "user_id": participant.user_id,
-            "participant_name": (participant.participant_name or "").strip(),
-            "side": participant.side,
-        })
-        .select("*")
-        .single()
-        .execute()
-    )
-    if resp.data is None:
+        invalidate("member-stats")
+        return refreshed
+
+    created = participants.insert({
+        "debate_id": debate_id,
+        "user_id": participant.user_id,
+        "participant_name": (participant.participant_name or "").strip(),
+        "side": participant.side,
+    })
+    if created is None:
         raise HTTPException(status_code=500, detail="Failed to add participant")
-    return resp.data
+    invalidate("member-stats")
+    return created
+
+
+def _roster_key(user_id: Optional[str], participant_name: str) -> Tuple[str, str]:
+    # 회원은 user_id로, 비회원(게스트)은 이름으로 같은 참가자인지 판단한다.
+    return ("user", user_id) if user_id else ("guest", participant_name)
+
+
+@router.put("/{debate_id}/participants", response_model=List[DebateParticipant])
+# 관리자 확인 1 + 토론 확인 1 + 명단 조회 1 + 변경 RPC 1 (명단 크기와 무관)
+@query_budget(4)
+def replace_participants(debate_id: str, payload: DebateRosterUpdate, _: str = Depends(require_admin)):
+    """참가자 명단 전체를 한 번에 저장합니다.
+
+    저장된 명단과 비교해 바뀐 행과 빠진 행만 한 트랜잭션으로 반영합니다.
+    winner_side가 오면 같은 트랜잭션에서 승리 측도 기록합니다.
+    """
+    desired: Dict[Tuple[str, str], dict] = {}
+    for entry in payload.participants:
+        name = (entry.participant_name or "").strip()
+        if not entry.user_id and not name:
+            raise HTTPException(status_code=400, detail="user_id 또는 participant_name 중 하나는 필요합니다.")
+        key = _roster_key(entry.user_id, name)
+        if key in desired:
+            raise HTTPException(status_code=400, detail="같은 참가자가 명단에 중복되어 있습니다.")
+        desired[key] = {
+            "debate_id": debate_id,
+            "user_id": entry.user_id,
+            "participant_name": name,
+            "side": entry.side,
+        }
+
+    repos = get_repositories()
+    if repos.debates.get(debate_id) is None:
+        raise HTTPException(status_code=404, detail="Debate not found")
+    participants = repos.participants
+    existing: Dict[Tuple[str, str], dict] = {}
+    stale_ids: List[int] = []
+    for row in participants.list_for_debate(debate_id):
+        key = _roster_key(row.get("user_id"), (row.get("participant_name") or "").strip())
+        if key in desired and key not in existing:
+            existing[key] = row
+        else:
+            stale_ids.append(row["id"])
+
+    roster: List[dict] = []
+    upserts: List[dict] = []
+    for key, row in desired.items():
+        current = existing.get(key)
+        if current is None:
+            upserts.append(row)
+        elif current.get("side") != row["side"] or (current.get("participant_name") or "") != row["participant_name"]:
+            upserts.append({**row, "id": current["id"]})
+        else:
+            roster.append(current)
+
+    if upserts or stale_ids or payload.winner_side is not None:
+        try:
+            roster.extend(participants.apply_roster(debate_id, upserts, stale_ids, payload.winner_side))
+        finally:
+            # 시간 초과처럼 응답만 잃고 DB에는 반영됐을 수 있으므로 실패해도 캐시는 비운다.
+            if payload.winner_side is not None:
+                invalidate("debates")
+            invalidate("member-stats")
+
+    roster.sort(key=lambda row: (row.get("side") != "pro", row.get("id") or 0))
+    return roster
 
 
 @router.delete("/{debate_id}/participants/{user_id}")
 def remove_participant(debate_id: str, user_id: str, _: str = Depends(require_admin)):
-    sb = get_supabase()
-    resp = (
-        sb.table("debate_participants")
-        .delete()
-        .eq("debate_id", debate_id)
-        .eq("user_id", user_id)
-        .execute()
-    )
-    if resp.data is None:
+    if not get_repositories().participants.remove(debate_id, user_id):
         raise HTTPException(status_code=404, detail="Participant not found")
+    invalidate("member-stats")
     return {"ok": True}
 
 
@@ -122,9 +151,10 @@ def remove_participant(debate_id: str, user_id: str, _: str = Depends(require_ad
 def set_winner(debate_id: str, winner_side: str, _: str = Depends(require_admin)):
     if winner_side not in ("pro", "con"):
         raise HTTPException(status_code=400, detail="winner_side must be 'pro' or 'con'")
-    sb = get_supabase()
-    sb.table("debates").update({"winner_side": winner_side}).eq("id", debate_id).execute()
-    resp = sb.table("debates").select("*").eq("id", debate_id).single().execute()
-    if resp.data is None:
+    debates = get_repositories().debates
+    debates.set_winner(debate_id, winner_side)
+    invalidate("debates", "member-stats")
+    debate = debates.get(debate_id)
+    if debate is None:
         raise HTTPException(status_code=404, detail="Debate not found")
-    return resp.data
+    return debate
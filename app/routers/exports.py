@@ -0,0 +1,43 @@
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.auth import require_admin
+from app.compression import accept_encoding, compress_stream, negotiate
+from app.exports import DATASETS, MEDIA_TYPES, export_chunks
+from app.profiling import ProfiledRoute
+from app.resilience import time_budget
+from app.tracing import query_budget
+
+router = APIRouter(route_class=ProfiledRoute)
+
+
+@router.get("/{dataset}")
+@query_budget(None)
+@time_budget(None)
+def export_dataset(
+    dataset: Literal["debates", "records", "member-stats", "reservations"],
+    format: Literal["csv", "ndjson"] = Query(default="ndjson"),
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+    _: str = Depends(require_admin),
+):
+    """전체 이력을 CSV/NDJSON으로 스트리밍합니다. start/end(포함)를 주면 그 기간만 내보냅니다.
+
+    upstream은 EXPORT_PAGE_SIZE행씩 키셋으로 읽어 바로 흘려보내므로 행 수와 무관하게 메모리 사용량이 일정합니다.
+    member-stats의 기간은 회원별 전적을 집계할 토론 날짜 범위입니다.
+    """
+    if start and end and end < start:
+        raise HTTPException(status_code=400, detail="종료일이 시작일보다 빠릅니다.")
+    chunks = export_chunks(DATASETS[dataset], format, start, end)
+    period = "".join(f"-{value.isoformat()}" for value in (start, end) if value)
+    headers = {"Content-Disposition": f'attachment; filename="manjang-{dataset}{period}.{format}"'}
+    # 압축 미들웨어는 스트리밍 응답을 건드리지 않으므로 여기서 조각 단위로 압축한다.
+    encoding = negotiate(accept_encoding.get())
+    if encoding:
+        chunks = compress_stream(chunks, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["Vary"] = "Accept-Encoding"
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[format], headers=headers)
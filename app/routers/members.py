@@ -3,10 +3,10 @@ import io
 import re
 from typing import Dict, List, Optional, Tuple
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException
 
 from app.auth import require_admin, require_auth
+from app.cache import cached, invalidate
 from app.config import MEMBER_EMAIL_DOMAIN, MEMBER_SHEET_URL
 from app.db import get_supabase
 from app.models import (
@@ -14,10 +14,17 @@ from app.models import (
     MemberStatsRow,
     MemberSyncRequest,
     MemberSyncResult,
+    MemberTournamentEntry,
+    MemberTournamentHistory,
+    MemberTournamentMatch,
     MyDebateItem,
 )
+from app.profiling import ProfiledRoute
+from app.repositories import get_repositories
+from app.resilience import time_budget
+from app.tracing import query_budget
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 STUDENT_ID_PATTERN = re.compile(r"^\d{8}$")
 
@@ -42,6 +49,9 @@ def _to_csv_export_url(sheet_url: str) -> str:
 
 
 def _fetch_sheet_csv(sheet_url: str) -> str:
+    # 시트 동기화는 관리자가 가끔 쓰는 기능이라 httpx는 여기서 import한다.
+    import httpx
+
     export_url = _to_csv_export_url(sheet_url)
     try:
         resp = httpx.get(export_url, follow_redirects=True, timeout=20.0)
@@ -130,6 +140,9 @@ def _parse_member_rows(csv_text: str) -> Tuple[List[Dict[str, str]], List[str]]:
 
 
 @router.post("/sync", response_model=MemberSyncResult)
+# auth API에 일괄 생성이 없어 신규·변경 회원 수만큼 호출하므로 예산을 두지 않는다.
+@query_budget(None)
+@time_budget(60)
 def sync_members(payload: MemberSyncRequest, _: str = Depends(require_admin)):
     """멤버 시트를 읽어 회원 DB를 동기화합니다.
 
@@ -154,11 +167,9 @@ def sync_members(payload: MemberSyncRequest, _: str = Depends(require_admin)):
     rows, errors = _parse_member_rows(csv_text)
 
     sb = get_supabase()
-    existing_resp = (
-        sb.table("users").select("id,student_id,name,major,generation,email").execute()
-    )
+    users = get_repositories().users
     existing_by_sid: Dict[str, dict] = {}
-    for user in existing_resp.data or []:
+    for user in users.list_all():
         sid = (user.get("student_id") or "").strip()
         if sid:
             existing_by_sid[sid] = user
@@ -177,7 +188,7 @@ def sync_members(payload: MemberSyncRequest, _: str = Depends(require_admin)):
                     changes[field] = row[field]
             if changes:
                 try:
-                    sb.table("users").update(changes).eq("id", existing["id"]).execute()
+                    users.update(existing["id"], changes)
                     updated += 1
                 except Exception as exc:
                     errors.append(f"{row['name']}({sid}): 프로필 갱신 실패 - {exc}")
@@ -212,12 +223,15 @@ def sync_members(payload: MemberSyncRequest, _: str = Depends(require_admin)):
                 "generation": row["generation"],
                 "must_change_password": True,
             }
-            sb.table("users").update(profile).eq("id", user_id).execute()
+            users.update(user_id, profile)
             created += 1
             created_names.append(row["name"])
         except Exception as exc:
             errors.append(f"{row['name']}({sid}): 계정 생성 실패 - {exc}")
 
+    if created or updated:
+        invalidate("members")
+
     return MemberSyncResult(
         source=source,
         total_rows=len(rows),
@@ -231,75 +245,49 @@ def sync_members(payload: MemberSyncRequest, _: str = Depends(require_admin)):
 
 @router.get("", response_model=List[MemberProfile])
 def list_members(_: str = Depends(require_admin)):
-    sb = get_supabase()
-    resp = (
-        sb.table("users")
-        .select("id,email,name,student_id,major,generation,role,must_change_password")
-        .order("name")
-        .execute()
-    )
-    return resp.data or []
+    return get_repositories().users.list_profiles()
 
 
 @router.post("/{user_id}/reset-password")
+# 관리자 확인 1 + 회원 조회 1 + 비밀번호 변경 1 + 변경 필요 표시 1
+@query_budget(4)
 def reset_member_password(user_id: str, _: str = Depends(require_admin)):
     """회원 비밀번호를 학번으로 초기화하고, 다음 로그인 시 변경을 강제합니다."""
-    sb = get_supabase()
-    resp = sb.table("users").select("student_id,name").eq("id", user_id).limit(1).execute()
-    if not resp.data:
+    users = get_repositories().users
+    profile = users.get(user_id)
+    if profile is None:
         raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
-    student_id = (resp.data[0].get("student_id") or "").strip()
+    student_id = (profile.get("student_id") or "").strip()
     if len(student_id) < 6:
         raise HTTPException(status_code=400, detail="학번이 6자 미만이라 초기 비밀번호로 사용할 수 없습니다.")
 
     try:
-        sb.auth.admin.update_user_by_id(user_id, {"password": student_id})
+        get_supabase().auth.admin.update_user_by_id(user_id, {"password": student_id})
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"비밀번호 초기화에 실패했습니다: {exc}")
 
-    sb.table("users").update({"must_change_password": True}).eq("id", user_id).execute()
+    users.update(user_id, {"must_change_password": True})
     return {"ok": True}
 
 
 @router.get("/me", response_model=MemberProfile)
 def get_my_profile(user_id: str = Depends(require_auth)):
-    sb = get_supabase()
-    resp = (
-        sb.table("users")
-        .select("id,email,name,student_id,major,generation,role,must_change_password")
-        .eq("id", user_id)
-        .limit(1)
-        .execute()
-    )
-    if not resp.data:
+    profile = get_repositories().users.get(user_id)
+    if profile is None:
         raise HTTPException(status_code=404, detail="회원 정보를 찾을 수 없습니다.")
-    return resp.data[0]
+    return profile
 
 
 @router.get("/me/debates", response_model=List[MyDebateItem])
 def list_my_debates(user_id: str = Depends(require_auth)):
-    sb = get_supabase()
-    part_resp = (
-        sb.table("debate_participants")
-        .select("debate_id,side")
-        .eq("user_id", user_id)
-        .execute()
-    )
-    participations = part_resp.data or []
+    repos = get_repositories()
+    participations = repos.participants.list_for_user(user_id)
     if not participations:
         return []
 
     side_by_debate = {p["debate_id"]: p["side"] for p in participations}
-    debate_resp = (
-        sb.table("debates")
-        .select("id,topic_text,debate_date,debate_type,winner_side")
-        .in_("id", list(side_by_debate.keys()))
-        .order("debate_date", desc=True)
-        .execute()
-    )
-
     items: List[MyDebateItem] = []
-    for debate in debate_resp.data or []:
+    for debate in repos.debates.list_by_ids(list(side_by_debate.keys())):
         side = "con" if side_by_debate.get(debate["id"]) == "con" else "pro"
         winner = debate.get("winner_side")
         if winner not in ("pro", "con"):
@@ -322,23 +310,94 @@ def list_my_debates(user_id: str = Depends(require_auth)):
     return items
 
 
+def _tournament_history(user_id: str, rows: List[dict]) -> MemberTournamentHistory:
+    history = MemberTournamentHistory(user_id=user_id)
+    entries: Dict[Tuple[str, str], MemberTournamentEntry] = {}
+    for row in rows:
+        key = (row["tournament_id"], row["team_id"])
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = MemberTournamentEntry(
+                tournament_id=row["tournament_id"],
+                title=row.get("title") or "",
+                starts_on=row["starts_on"],
+                ends_on=row["ends_on"],
+                status=row["status"],
+                team_id=row["team_id"],
+                team_name=row.get("team_name") or "",
+                group_name=row.get("group_name") or "",
+            )
+        if not row.get("match_id"):
+            continue
+        completed = row.get("match_status") == "completed" and row.get("winner_team_id")
+        if not completed:
+            result = "pending"
+        elif row["winner_team_id"] == row["team_id"]:
+            result = "win"
+        else:
+            result = "loss"
+        entry.matches.append(
+            MemberTournamentMatch(
+                match_id=row["match_id"],
+                stage=row["stage"],
+                round_label=row.get("round_label") or "",
+                starts_at=row["match_starts_at"],
+                status=row["match_status"],
+                opponent_team_id=row.get("opponent_team_id"),
+                opponent_name=row.get("opponent_name"),
+                team_score=row.get("team_score"),
+                opponent_score=row.get("opponent_score"),
+                result=result,
+            )
+        )
+        if completed:
+            entry.played += 1
+            entry.wins += result == "win"
+            entry.losses += result == "loss"
+            entry.score_for += float(row.get("team_score") or 0)
+            entry.score_against += float(row.get("opponent_score") or 0)
+
+    history.tournaments = list(entries.values())
+    history.tournament_count = len({entry.tournament_id for entry in history.tournaments})
+    for entry in history.tournaments:
+        history.played += entry.played
+        history.wins += entry.wins
+        history.losses += entry.losses
+        history.score_for += entry.score_for
+        history.score_against += entry.score_against
+    history.win_rate = round(history.wins / history.played, 4) if history.played else 0.0
+    return history
+
+
+@router.get("/me/tournaments", response_model=MemberTournamentHistory)
+def list_my_tournaments(user_id: str = Depends(require_auth)):
+    return member_tournaments(user_id=user_id)
+
+
+@router.get("/{user_id}/tournaments", response_model=MemberTournamentHistory)
+@cached(MemberTournamentHistory, validate=False, tags=["tournaments"])
+def member_tournaments(user_id: str):
+    """회원의 대회별 팀과 경기 결과, 통산 승/패/득실.
+
+    회원 → 팀 → 경기 조인은 member_tournament_matches 뷰가 한 번에 하고, 대진 저장/결과 입력이
+    tournaments 태그를 무효화한다. 진출 조건으로만 정해진 토너먼트 경기는 결과가 나온 뒤에 나타난다.
+    """
+    repos = get_repositories()
+    rows = repos.tournaments.member_history(user_id)
+    if not rows and repos.users.get(user_id) is None:
+        raise HTTPException(status_code=404, detail="회원 정보를 찾을 수 없습니다.")
+    return _tournament_history(user_id, rows)
+
+
 @router.get("/stats", response_model=List[MemberStatsRow])
+@cached(List[MemberStatsRow], validate=False, tags=["member-stats", "members"])
 def member_stats():
     """회원별 통산 전적. winner_side가 기록된 토론만 승/패로 집계합니다."""
-    sb = get_supabase()
-    users_resp = sb.table("users").select("id,name,generation,major,role").execute()
-    parts_resp = (
-        sb.table("debate_participants")
-        .select("user_id,debate_id,side")
-        .not_.is_("user_id", "null")
-        .execute()
-    )
-    debates_resp = sb.table("debates").select("id,winner_side").execute()
-
-    winner_by_debate = {d["id"]: d.get("winner_side") for d in debates_resp.data or []}
+    repos = get_repositories()
+    winner_by_debate = repos.debates.winner_sides()
 
     stats: Dict[str, MemberStatsRow] = {}
-    for user in users_resp.data or []:
+    for user in repos.users.list_all():
         stats[user["id"]] = MemberStatsRow(
             user_id=user["id"],
             name=(user.get("name") or "").strip() or "이름 미입력",
@@ -346,7 +405,7 @@ def member_stats():
             major=(user.get("major") or "").strip(),
         )
 
-    for part in parts_resp.data or []:
+    for part in repos.participants.list_member_entries():
         row = stats.get(part.get("user_id") or "")
         if row is None:
             continue
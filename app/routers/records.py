@@ -3,68 +3,46 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.auth import require_admin
-from app.db import get_supabase
+from app.cache import cached, invalidate
 from app.models import DebateRecord, DebateRecordCreate
+from app.profiling import ProfiledRoute
+from app.repositories import get_repositories
 
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=List[DebateRecord])
+@cached(List[DebateRecord], tags=["records"])
 def list_records(
     search: Optional[str] = Query(default=None),
     category: Optional[str] = Query(default=None),
     sort: Optional[str] = Query(default="date-desc"),
 ):
-    sb = get_supabase()
-    query = sb.table("records").select("*")
-
-    if category:
-        query = query.eq("category", category)
-
-    if search:
-        like = f"%{search}%"
-        query = query.or_(
-            f"title.ilike.{like},summary.ilike.{like},participantNames.cs.{{{search}}}"
-        )
-
-    if sort == "date-asc":
-        query = query.order("date", desc=False)
-    elif sort == "participants-desc":
-        query = query.order("participants", desc=True)
-    elif sort == "title":
-        query = query.order("title", desc=False)
-    else:
-        query = query.order("date", desc=True)
-
-    resp = query.execute()
-    data = resp.data or []
-    return data
+    return get_repositories().records.list(category, search, sort)
 
 
 @router.post("", response_model=DebateRecord)
 def create_record(payload: DebateRecordCreate, _: str = Depends(require_admin)):
-    sb = get_supabase()
-    resp = sb.table("records").insert(payload.model_dump()).select("*").single().execute()
-    if resp.data is None:
+    created = get_repositories().records.create(payload.model_dump(mode="json"))
+    if created is None:
         raise HTTPException(status_code=500, detail="Failed to create record")
-    return resp.data
+    invalidate("records")
+    return created
 
 
 @router.put("/{record_id}", response_model=DebateRecord)
 def update_record(record_id: str, payload: DebateRecordCreate, _: str = Depends(require_admin)):
-    sb = get_supabase()
-    sb.table("records").update(payload.model_dump()).eq("id", record_id).execute()
-    resp = sb.table("records").select("*").eq("id", record_id).single().execute()
-    if resp.data is None:
+    updated = get_repositories().records.update(record_id, payload.model_dump(mode="json"))
+    invalidate("records")
+    if updated is None:
         raise HTTPException(status_code=404, detail="Record not found")
-    return resp.data
+    return updated
 
 
 @router.delete("/{record_id}")
 def delete_record(record_id: str, _: str = Depends(require_admin)):
-    sb = get_supabase()
-    resp = sb.table("records").delete().eq("id", record_id).execute()
-    if resp.data is None:
+    if not get_repositories().records.delete(record_id):
         raise HTTPException(status_code=404, detail="Record not found")
+    invalidate("records")
     return {"ok": True}
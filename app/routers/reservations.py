@@ -2,20 +2,25 @@ from datetime import date, datetime, timedelta, timezone
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
-from app.auth import is_admin_user, require_auth
-from app.db import get_supabase
+from app.auth import calendar_feed_token, calendar_feed_user, is_admin_user, require_auth
+from app.cache import cached, invalidate, month_tag
+from app.config import CALENDAR_FUTURE_DAYS, CALENDAR_PAST_DAYS
+from app.ical import Event, calendar_tag, feed_response, feed_store, render_calendar
+from app.idempotency import idempotent
 from app.models import (
+    CalendarSubscription,
     Reservation,
     ReservationCreate,
     ReservationCreateResponse,
     ReservationUpdate,
 )
+from app.profiling import ProfiledRoute
+from app.repositories import get_repositories
 
 
-router = APIRouter()
-RESERVATION_SELECT_COLUMNS = "id,reserved_by,reserved_by_name,title,starts_at,ends_at,debate_id,allow_simultaneous"
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("", response_model=List[Reservation])
@@ -24,27 +29,38 @@ def list_reservations(
     end: Optional[date] = Query(default=None),
     date_eq: Optional[date] = Query(default=None, alias="date"),
 ):
-    sb = get_supabase()
-    query = sb.table("reservations").select(RESERVATION_SELECT_COLUMNS)
     if date_eq is not None:
         start = date_eq
         end = date_eq + timedelta(days=1)
 
-    if start is not None:
-        start_at = f"{start.isoformat()}T00:00:00Z"
-        query = query.gte("starts_at", start_at)
+    start_at = f"{start.isoformat()}T00:00:00Z" if start is not None else None
+    end_exclusive = f"{end.isoformat()}T00:00:00Z" if end is not None else None
+    return get_repositories().reservations.list_between(start_at, end_exclusive)
 
-    if end is not None:
-        end_exclusive = f"{end.isoformat()}T00:00:00Z"
-        query = query.lt("starts_at", end_exclusive)
 
-    resp = query.order("starts_at", desc=False).execute()
-    return resp.data or []
+def _month_window_tags(params: dict) -> List[str]:
+    # /month 응답은 전월~익월 3개월을 담으므로 세 달 모두의 태그를 단다.
+    anchor: date = params["date_eq"]
+    first = anchor.replace(day=1)
+    prev_month = (first - timedelta(days=1)).replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    return [month_tag("reservations", month) for month in (prev_month, first, next_month)]
+
+
+def _invalidate_reservation_month(starts_at, reserved_by=None) -> None:
+    if isinstance(starts_at, datetime) and starts_at.tzinfo is not None:
+        starts_at = starts_at.astimezone(timezone.utc)
+    tags = [calendar_tag()]
+    if reserved_by:
+        tags.append(calendar_tag(str(reserved_by)))
+    if starts_at:
+        tags.append(month_tag("reservations", starts_at))
+    invalidate(*tags)
 
 
 @router.get("/month", response_model=List[Reservation])
+@cached(List[Reservation], tags=_month_window_tags)
 def list_reservations_around_month(date_eq: date = Query(alias="date")):
-    sb = get_supabase()
     year = date_eq.year
     month = date_eq.month
 
@@ -65,77 +81,96 @@ def list_reservations_around_month(date_eq: date = Query(alias="date")):
         after_next_year, after_next_month = next_year, next_month + 1
     end_exclusive = datetime(after_next_year, after_next_month, 1, 0, 0, 0, tzinfo=timezone.utc)
 
-    query = (
-        sb.table("reservations")
-        .select(RESERVATION_SELECT_COLUMNS)
-        .gte("starts_at", prev_start.isoformat())
-        .lt("starts_at", end_exclusive.isoformat())
-        .order("starts_at", desc=False)
-    )
-    resp = query.execute()
-    return resp.data or []
-
-
-def _check_overlap(sb, starts_at: datetime, ends_at: datetime) -> bool:
-    overlap = (
-        sb.table("reservations")
-        .select("id")
-        .lt("starts_at", ends_at.isoformat())
-        .gt("ends_at", starts_at.isoformat())
-        .limit(1)
-        .execute()
+    return get_repositories().reservations.list_between(prev_start.isoformat(), end_exclusive.isoformat())
+
+
+def _calendar_start() -> str:
+    # 날짜 단위로 끊어서 같은 날의 폴링은 같은 피드(키)를 받는다.
+    today = datetime.now(timezone.utc).date()
+    return f"{(today - timedelta(days=CALENDAR_PAST_DAYS)).isoformat()}T00:00:00Z"
+
+
+def _reservation_event(row: dict) -> Event:
+    title = row.get("title") or "방 예약"
+    name = row.get("reserved_by_name")
+    return Event(
+        uid=f"reservation-{row['id']}",
+        starts_at=row["starts_at"],
+        ends_at=row["ends_at"],
+        summary=f"{title} ({name})" if name else title,
+        updated_at=row.get("updated_at"),
     )
-    return bool(overlap.data)
 
 
-def _warn_opponent_same_debate(sb, debate_id: UUID, reserved_by: Optional[UUID], starts_at: datetime, ends_at: datetime) -> bool:
+def _reservation_feed(name: str, rows: List[dict]) -> bytes:
+    return render_calendar(name, [_reservation_event(row) for row in rows])
+
+
+@router.get("/calendar.ics")
+def reservations_calendar(
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+):
+    """방 예약 iCalendar 구독 피드 (오늘 기준 CALENDAR_PAST_DAYS일 전 ~ CALENDAR_FUTURE_DAYS일 후)."""
+    start_at = _calendar_start()
+    end_at = f"{(datetime.now(timezone.utc).date() + timedelta(days=CALENDAR_FUTURE_DAYS)).isoformat()}T00:00:00Z"
+
+    def build() -> bytes:
+        return _reservation_feed("방 예약", get_repositories().reservations.for_calendar(start_at, end_at, None))
+
+    feed = feed_store.get(f"reservations:{start_at}", [calendar_tag()], build)
+    return feed_response(feed, if_none_match, if_modified_since)
+
+
+@router.get("/me/calendar", response_model=CalendarSubscription)
+def my_calendar_subscription(user_id: str = Depends(require_auth)):
+    """내 예약 피드의 구독 주소. 캘린더 앱은 인증 헤더를 보낼 수 없으므로 주소에 서명한 토큰을 담는다."""
+    return {"path": f"/reservations/calendar/{calendar_feed_token(user_id)}.ics"}
+
+
+@router.get("/calendar/{token}.ics")
+def my_reservations_calendar(
+    token: str,
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+):
+    """회원 본인 예약의 iCalendar 구독 피드 (CALENDAR_PAST_DAYS일 전 이후 전부)."""
+    user_id = calendar_feed_user(token)
+    start_at = _calendar_start()
+
+    def build() -> bytes:
+        return _reservation_feed("내 방 예약", get_repositories().reservations.for_calendar(start_at, None, user_id))
+
+    feed = feed_store.get(f"reservations:{user_id}:{start_at}", [calendar_tag(user_id)], build)
+    return feed_response(feed, if_none_match, if_modified_since, private=True)
+
+
+def _warn_opponent_same_debate(debate_id: UUID, reserved_by: Optional[UUID], starts_at: datetime, ends_at: datetime) -> bool:
     if not reserved_by:
         return False
 
-    my_side_resp = (
-        sb.table("debate_participants")
-        .select("side")
-        .eq("debate_id", str(debate_id))
-        .eq("user_id", str(reserved_by))
-        .single()
-        .execute()
-    )
-    if not my_side_resp.data:
+    repos = get_repositories()
+    mine = repos.participants.find(str(debate_id), str(reserved_by))
+    if not mine:
         raise HTTPException(status_code=400, detail="해당 토론 참가자만 선택할 수 있습니다.")
-    my_side = my_side_resp.data["side"]
+    my_side = mine["side"]
     opponent_side = "con" if my_side == "pro" else "pro"
 
-    other_resps = (
-        sb.table("reservations")
-        .select("id, reserved_by")
-        .eq("debate_id", str(debate_id))
-        .lt("starts_at", ends_at.isoformat())
-        .gt("ends_at", starts_at.isoformat())
-        .execute()
-    )
-    if not other_resps.data:
-        return False
-
-    user_ids = [row["reserved_by"] for row in other_resps.data]
+    others = repos.reservations.overlapping(starts_at.isoformat(), ends_at.isoformat(), str(debate_id))
+    user_ids = [row["reserved_by"] for row in others if row.get("reserved_by")]
     if not user_ids:
         return False
 
-    parts = (
-        sb.table("debate_participants")
-        .select("user_id, side")
-        .eq("debate_id", debate_id)
-        .in_("user_id", user_ids)
-        .execute()
-    )
-    for p in parts.data or []:
+    for p in repos.participants.sides(str(debate_id), user_ids):
         if p["side"] == opponent_side:
             return True
     return False
 
 
 @router.post("", response_model=ReservationCreateResponse)
+@idempotent(ReservationCreateResponse)
 def create_reservation(payload: ReservationCreate, user_id: str = Depends(require_auth)):
-    sb = get_supabase()
+    reservations = get_repositories().reservations
 
     # 본인 명의 예약인지 확인 (admin은 타인 대리 예약 가능)
     if payload.reserved_by is not None and str(payload.reserved_by) != user_id:
@@ -147,14 +182,7 @@ def create_reservation(payload: ReservationCreate, user_id: str = Depends(requir
         payload = payload.model_copy(update={"reserved_by": UUID(user_id)})
 
     # 동시 예약 허용 검사 (최대 2팀)
-    overlap_resp = (
-        sb.table("reservations")
-        .select("id, allow_simultaneous")
-        .lt("starts_at", payload.ends_at.isoformat())
-        .gt("ends_at", payload.starts_at.isoformat())
-        .execute()
-    )
-    existing = overlap_resp.data or []
+    existing = reservations.overlapping(payload.starts_at.isoformat(), payload.ends_at.isoformat())
 
     if len(existing) >= 2:
         raise HTTPException(status_code=409, detail="이미 해당 시간대에 최대 예약 인원(2팀)이 차 있습니다.")
@@ -169,7 +197,6 @@ def create_reservation(payload: ReservationCreate, user_id: str = Depends(requir
     warn_opponent = False
     if payload.debate_id:
         warn_opponent = _warn_opponent_same_debate(
-            sb,
             payload.debate_id,
             payload.reserved_by,
             payload.starts_at,
@@ -177,51 +204,47 @@ def create_reservation(payload: ReservationCreate, user_id: str = Depends(requir
         )
 
     payload_dict = payload.model_dump(mode="json", exclude_none=True)
-    resp = sb.table("reservations").insert(payload_dict).execute()
-    if not resp.data:
+    created = reservations.create(payload_dict)
+    if not created:
         raise HTTPException(status_code=500, detail="Failed to create reservation")
-    created = resp.data[0] if isinstance(resp.data, list) else resp.data
+    _invalidate_reservation_month(payload.starts_at, payload.reserved_by)
     return {"reservation": created, "warn_opponent_booked": warn_opponent}
 
 
 @router.delete("/{reservation_id}")
 def cancel_reservation(reservation_id: str, user_id: str = Depends(require_auth)):
-    sb = get_supabase()
-    exists = (
-        sb.table("reservations").select("id,reserved_by").eq("id", reservation_id).limit(1).execute()
-    )
-    if not exists.data:
+    reservations = get_repositories().reservations
+    exists = reservations.get(reservation_id)
+    if not exists:
         raise HTTPException(status_code=404, detail="Reservation not found")
 
-    reserved_by = str(exists.data[0].get("reserved_by") or "")
+    reserved_by = str(exists.get("reserved_by") or "")
     if reserved_by != user_id and not is_admin_user(user_id):
         raise HTTPException(status_code=403, detail="본인의 예약만 취소할 수 있습니다.")
 
-    sb.table("reservations").delete().eq("id", reservation_id).execute()
+    reservations.delete(reservation_id)
+    _invalidate_reservation_month(exists.get("starts_at"), exists.get("reserved_by"))
     return {"ok": True, "id": reservation_id}
 
 
 @router.patch("/{reservation_id}", response_model=Reservation)
 def update_reservation(reservation_id: str, payload: ReservationUpdate, user_id: str = Depends(require_auth)):
-    sb = get_supabase()
-
-    exists = (
-        sb.table("reservations").select("id,reserved_by").eq("id", reservation_id).limit(1).execute()
-    )
-    if not exists.data:
+    reservations = get_repositories().reservations
+    exists = reservations.get(reservation_id)
+    if not exists:
         raise HTTPException(status_code=404, detail="Reservation not found")
 
-    reserved_by = str(exists.data[0].get("reserved_by") or "")
+    reserved_by = str(exists.get("reserved_by") or "")
     if reserved_by != user_id and not is_admin_user(user_id):
         raise HTTPException(status_code=403, detail="본인의 예약만 수정할 수 있습니다.")
 
     update_dict = payload.model_dump(exclude_none=True)
     if not update_dict:
-        return exists.data[0]
+        return exists
 
-    sb.table("reservations").update(update_dict).eq("id", reservation_id).execute()
-    # supabase-py 2.x는 update 후 select 체이닝을 지원하지 않으므로 별도 재조회
-    row = sb.table("reservations").select("*").eq("id", reservation_id).limit(1).execute()
-    if not row.data:
+    # update는 갱신된 행을 돌려주므로 별도 재조회가 필요 없다.
+    row = reservations.update(reservation_id, update_dict)
+    _invalidate_reservation_month(exists.get("starts_at"), exists.get("reserved_by"))
+    if not row:
         raise HTTPException(status_code=404, detail="Reservation not found")
-    return row.data[0]
+    return row
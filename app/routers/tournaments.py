@@ -1,20 +1,51 @@
+import json
 from collections import defaultdict
-from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Literal, Optional, Tuple
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 
+from app.archives import Archive, archive_store, archived_response, make_archive
 from app.auth import require_admin
-from app.db import get_supabase
+from app.balancing import Participant, balance_teams
+from app.cache import cached, invalidate
+from app.config import CALENDAR_MATCH_MINUTES, TOURNAMENT_ODDS_MAX_SIMULATIONS, TOURNAMENT_ODDS_SIMULATIONS
+from app.ical import Event, feed_response, feed_store, render_calendar
+from app.idempotency import idempotent
 from app.models import (
+    TournamentBalanceRequest,
+    TournamentBalanceResult,
+    TournamentBalanceStats,
     TournamentCreate,
+    TournamentMatchInput,
     TournamentMatchResult,
+    TournamentOdds,
+    TournamentScheduleRequest,
     TournamentSetup,
+    TournamentStatus,
     TournamentSummary,
+    TournamentTeamInput,
+    TournamentTeamMemberInput,
     TournamentUpdate,
 )
+from app.odds import simulate_odds
+from app.profiling import ProfiledRoute
+from app.repositories import get_repositories
+from app.scheduler import assign_slots, group_fixtures, knockout_fixtures, slot_clock
+from app.serialization import fast_json
+from app.standings import (
+    GROUP_STAGE,
+    Source,
+    TournamentEngine,
+    find_cycle,
+    format_source,
+    parse_source,
+    team_experience,
+)
+from app.tracing import query_budget
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 KOREA_TIMEZONE = timezone(timedelta(hours=9))
 
 
@@ -36,212 +67,251 @@ def _utc_iso(value: datetime) -> str:
     return aware.astimezone(timezone.utc).isoformat()
 
 
-def _team_experience(team: dict) -> float:
-    members = team.get("members") or []
-    if members:
-        return round(sum(float(member.get("experience_score") or 1) for member in members) / len(members), 2)
-    return float(team.get("experience_score") or 0)
-
-
-def _build_standings(event: dict, teams: List[dict], matches: List[dict]) -> List[dict]:
-    points_per_win = int(event.get("points_per_win") or 1)
-    teams_by_group: Dict[str, List[dict]] = defaultdict(list)
-    for team in teams:
-        teams_by_group[team.get("group_name") or "미배정"].append(team)
-
-    result: List[dict] = []
-    for group_name in sorted(teams_by_group.keys()):
-        group_teams = teams_by_group[group_name]
-        rows: Dict[str, dict] = {}
-        for team in group_teams:
-            rows[team["id"]] = {
-                "team_id": team["id"],
-                "team_name": team["name"],
-                "group_name": group_name,
-                "played": 0,
-                "wins": 0,
-                "losses": 0,
-                "points": 0,
-                "head_to_head_wins": 0,
-                "experience_score": _team_experience(team),
-            }
-
-        completed = []
-        for match in matches:
-            if match.get("stage") != "group" or match.get("group_name") != group_name:
-                continue
-            if match.get("status") != "completed" or not match.get("winner_team_id"):
-                continue
-            team_a_id = match.get("team_a_id")
-            team_b_id = match.get("team_b_id")
-            if team_a_id not in rows or team_b_id not in rows:
-                continue
-            completed.append(match)
-            winner_id = match["winner_team_id"]
-            loser_id = team_b_id if winner_id == team_a_id else team_a_id
-            rows[team_a_id]["played"] += 1
-            rows[team_b_id]["played"] += 1
-            rows[winner_id]["wins"] += 1
-            rows[winner_id]["points"] += points_per_win
-            rows[loser_id]["losses"] += 1
-
-        # 같은 승점을 가진 팀끼리의 미니리그 승수를 상대 전적 값으로 사용한다.
-        tied_by_points: Dict[int, List[str]] = defaultdict(list)
-        for row in rows.values():
-            tied_by_points[row["points"]].append(row["team_id"])
-        for tied_ids in tied_by_points.values():
-            if len(tied_ids) < 2:
-                continue
-            tied_set = set(tied_ids)
-            for match in completed:
-                if match.get("team_a_id") in tied_set and match.get("team_b_id") in tied_set:
-                    rows[match["winner_team_id"]]["head_to_head_wins"] += 1
-
-        ordered = sorted(
-            rows.values(),
-            key=lambda row: (
-                -row["points"],
-                -row["head_to_head_wins"],
-                row["experience_score"],
-                row["team_name"],
-            ),
-        )
-        for index, row in enumerate(ordered, start=1):
-            row["rank"] = index
-            result.append(row)
-    return result
-
-
-def _event_snapshot(event_id: str) -> dict:
-    sb = get_supabase()
-    event_resp = sb.table("tournaments").select("*").eq("id", event_id).limit(1).execute()
-    if not event_resp.data:
+def _load_event(event_id: str) -> Tuple[dict, TournamentEngine]:
+    tournaments = get_repositories().tournaments
+    event = tournaments.get(event_id)
+    if not event:
         raise HTTPException(status_code=404, detail="대회를 찾을 수 없습니다.")
-    event = event_resp.data[0]
-
-    team_resp = (
-        sb.table("tournament_teams")
-        .select("*")
-        .eq("tournament_id", event_id)
-        .order("group_name")
-        .order("seed")
-        .execute()
-    )
-    teams = team_resp.data or []
+
+    teams = tournaments.teams(event_id)
     team_by_id = {team["id"]: team for team in teams}
 
     if teams:
-        member_resp = (
-            sb.table("tournament_team_members")
-            .select("id,team_id,user_id,experience_score,users(id,name,student_id,major,generation)")
-            .in_("team_id", list(team_by_id.keys()))
-            .execute()
-        )
-        for member in member_resp.data or []:
-            profile = member.pop("users", None) or {}
-            member["name"] = profile.get("name") or "회원"
-            member["student_id"] = profile.get("student_id") or ""
-            member["major"] = profile.get("major") or ""
-            member["generation"] = profile.get("generation") or ""
+        for member in tournaments.team_members(list(team_by_id.keys())):
+            member["name"] = member.get("name") or "회원"
+            member["student_id"] = member.get("student_id") or ""
+            member["major"] = member.get("major") or ""
+            member["generation"] = member.get("generation") or ""
             team = team_by_id.get(member.get("team_id"))
             if team is not None:
                 team.setdefault("members", []).append(member)
     for team in teams:
         team.setdefault("members", [])
-        team["experience_score"] = _team_experience(team)
-
-    match_resp = (
-        sb.table("tournament_matches")
-        .select("*")
-        .eq("tournament_id", event_id)
-        .order("starts_at")
-        .execute()
-    )
-    matches = match_resp.data or []
-    standings = _build_standings(event, teams, matches)
-    winner_by_group = {
-        row["group_name"]: row["team_id"] for row in standings if row.get("rank") == 1
-    }
-
-    for match in matches:
-        resolved_a = match.get("team_a_id") or winner_by_group.get(match.get("team_a_source_group"))
-        resolved_b = match.get("team_b_id") or winner_by_group.get(match.get("team_b_source_group"))
-        match["resolved_team_a_id"] = resolved_a
-        match["resolved_team_b_id"] = resolved_b
-        match["team_a_name"] = (
-            (team_by_id.get(resolved_a) or {}).get("name")
-            or (f"{match.get('team_a_source_group')}조 1위" if match.get("team_a_source_group") else "미정")
-        )
-        match["team_b_name"] = (
-            (team_by_id.get(resolved_b) or {}).get("name")
-            or (f"{match.get('team_b_source_group')}조 1위" if match.get("team_b_source_group") else "미정")
-        )
-        match["winner_team_name"] = (team_by_id.get(match.get("winner_team_id")) or {}).get("name")
+        team["experience_score"] = team_experience(team)
 
+    matches = tournaments.matches(event_id)
     event["teams"] = teams
     event["matches"] = matches
-    event["standings"] = standings
+    return event, TournamentEngine(event, teams, matches)
+
+
+def _snapshot(event: dict, engine: TournamentEngine) -> dict:
+    for match in event["matches"]:
+        engine.decorate(match)
+    event["standings"] = engine.standings()
     event["progress"] = {
-        "total": len(matches),
-        "completed": sum(1 for match in matches if match.get("status") == "completed"),
+        "total": len(event["matches"]),
+        "completed": sum(1 for match in event["matches"] if match.get("status") == "completed"),
     }
     return event
 
 
+def _event_snapshot(event_id: str) -> dict:
+    return _snapshot(*_load_event(event_id))
+
+
+def _match_ids(payload: TournamentSetup) -> List[str]:
+    """경기마다 id를 미리 정하고, 진출 조건(조 순위, 앞 경기 승자/패자)이 풀 수 있는지 확인한다.
+
+    경기 id를 먼저 정해야 winner:/loser: 조건의 client_key를 저장할 id로 바꿔 쓸 수 있다.
+    """
+    match_keys = [(match.client_key or "").strip() for match in payload.matches]
+    named = [key for key in match_keys if key]
+    if len(named) != len(set(named)):
+        raise HTTPException(status_code=400, detail="경기 식별값이 중복되었습니다.")
+    index_by_key = {key: index for index, key in enumerate(match_keys) if key}
+    group_sizes: Dict[str, int] = defaultdict(int)
+    for team in payload.teams:
+        group_sizes[team.group_name.strip()] += 1
+
+    dependencies: Dict[str, List[str]] = {}
+    for index, match in enumerate(payload.matches):
+        parents = []
+        for text in (match.team_a_source_group, match.team_b_source_group):
+            source = parse_source(text)
+            if source is None:
+                continue
+            if source.kind == "group":
+                if not 0 < source.rank <= group_sizes.get(source.ref, 0):
+                    raise HTTPException(status_code=400, detail=f"진출 조건 '{text}'의 조 또는 순위가 없습니다.")
+            elif source.ref not in index_by_key:
+                raise HTTPException(status_code=400, detail=f"진출 조건 '{text}'이(가) 가리키는 경기가 없습니다.")
+            else:
+                parents.append(str(index_by_key[source.ref]))
+        dependencies[str(index)] = parents
+    if find_cycle(dependencies) is not None:
+        raise HTTPException(status_code=400, detail="경기 진출 조건이 서로를 참조하고 있습니다.")
+    return [str(uuid4()) for _ in payload.matches]
+
+
+def _stored_source(text: Optional[str], id_by_key: Dict[str, str]) -> Optional[str]:
+    source = parse_source(text)
+    if source is None:
+        return None
+    if source.kind != "group":
+        source = Source(source.kind, id_by_key[source.ref])
+    return format_source(source)
+
+
+def _load_archive(event_id: str) -> Optional[Archive]:
+    row = get_repositories().tournaments.archive(event_id)
+    return Archive(body=row["snapshot"].encode(), etag=row["etag"]) if row else None
+
+
+def _archive(event_id: str) -> Optional[Archive]:
+    return archive_store.get(event_id, lambda: _load_archive(event_id))
+
+
+def _freeze(event_id: str, snapshot: dict) -> Archive:
+    """완료된 대회의 스냅샷을 보관본으로 저장하고, 실제로 저장된 보관본을 돌려준다.
+
+    여러 워커가 같은 대회를 동시에 보관하면 먼저 들어간 것만 남는다(archived_at이 달라 본문과 ETag도 다르다).
+    모든 워커가 같은 ETag를 주도록 저장한 뒤 다시 읽은 보관본을 쓴다.
+    """
+    snapshot["archived_at"] = _utc_iso(datetime.now(timezone.utc))
+    archive = make_archive(snapshot)
+    get_repositories().tournaments.save_archive(event_id, archive.body.decode(), archive.etag)
+    return _load_archive(event_id) or archive
+
+
+def _ensure_open(event: dict) -> None:
+    if event.get("status") == "completed":
+        raise HTTPException(
+            status_code=409, detail="완료된 대회는 수정할 수 없습니다. 대회 상태를 바꿔 다시 연 뒤 수정해주세요."
+        )
+
+
+def _invalidate_event(event_id: str) -> None:
+    invalidate("tournaments", f"tournament:{event_id}")
+
+
 @router.get("", response_model=List[TournamentSummary])
-def list_tournaments():
-    sb = get_supabase()
-    events_resp = sb.table("tournaments").select("*").order("starts_on", desc=True).execute()
-    events = events_resp.data or []
-    if not events:
-        return []
-
-    event_ids = [event["id"] for event in events]
-    teams_resp = sb.table("tournament_teams").select("tournament_id").in_("tournament_id", event_ids).execute()
-    matches_resp = (
-        sb.table("tournament_matches")
-        .select("tournament_id,status")
-        .in_("tournament_id", event_ids)
-        .execute()
-    )
-    team_counts: Dict[str, int] = defaultdict(int)
-    match_counts: Dict[str, int] = defaultdict(int)
-    completed_counts: Dict[str, int] = defaultdict(int)
-    for row in teams_resp.data or []:
-        team_counts[row["tournament_id"]] += 1
-    for row in matches_resp.data or []:
-        event_id = row["tournament_id"]
-        match_counts[event_id] += 1
-        if row.get("status") == "completed":
-            completed_counts[event_id] += 1
-    for event in events:
-        event["team_count"] = team_counts[event["id"]]
-        event["match_count"] = match_counts[event["id"]]
-        event["completed_match_count"] = completed_counts[event["id"]]
-    return events
+@cached(List[TournamentSummary], tags=["tournaments"])
+def list_tournaments(
+    status: Optional[TournamentStatus] = Query(default=None),
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+):
+    """대회 목록. 팀/경기 수는 tournament_summaries 뷰가 DB에서 세어 준다.
+
+    start/end를 주면 그 기간과 겹치는 대회만, limit/offset을 주면 최신순으로 그만큼만 반환한다.
+    """
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="종료일은 시작일보다 빠를 수 없습니다.")
+    return get_repositories().tournaments.summaries(status, start, end, limit, offset)
 
 
 @router.post("")
+# 관리자 확인 1 + 생성 1 + 새 대회 읽기 4
+@query_budget(6)
+@idempotent(user="admin_id")
 def create_tournament(payload: TournamentCreate, admin_id: str = Depends(require_admin)):
     if payload.ends_on < payload.starts_on:
         raise HTTPException(status_code=400, detail="종료일은 시작일보다 빠를 수 없습니다.")
     data = payload.model_dump(mode="json")
     data["title"] = _clean_required(payload.title, "대회명")
     data["created_by"] = admin_id
-    sb = get_supabase()
-    resp = sb.table("tournaments").insert(data).execute()
-    created = (resp.data or [None])[0]
+    created = get_repositories().tournaments.create(data)
     if not created:
         raise HTTPException(status_code=500, detail="대회를 만들지 못했습니다.")
-    return _event_snapshot(created["id"])
+    _invalidate_event(created["id"])
+    return fast_json(_event_snapshot(created["id"]))
 
 
 @router.get("/{event_id}")
-def get_tournament(event_id: str):
-    return _event_snapshot(event_id)
+# 보관본 조회 1 + 대회 읽기 4 + 처음 완료된 대회를 보관하고 저장된 보관본 다시 읽기 2
+@query_budget(7)
+def get_tournament(event_id: str, if_none_match: Optional[str] = Header(default=None)):
+    """대회 스냅샷. 완료된 대회는 저장해 둔 보관본을 ETag/Cache-Control과 함께 그대로 돌려준다."""
+    archive = _archive(event_id)
+    if archive is not None:
+        return archived_response(archive, if_none_match)
+    return tournament_snapshot(event_id=event_id)
+
+
+@cached(tags=lambda params: [f"tournament:{params['event_id']}", "members"])
+def tournament_snapshot(event_id: str):
+    event, engine = _load_event(event_id)
+    snapshot = _snapshot(event, engine)
+    if event.get("status") == "completed":
+        # 보관본이 생기기 전에 완료된 대회는 처음 조회할 때 한 번 보관한다.
+        archive_store.put(event_id, _freeze(event_id, snapshot))
+    return snapshot
+
+
+def _score(value) -> str:
+    number = float(value)
+    return str(int(number)) if number.is_integer() else f"{number:g}"
+
+
+def _match_event(event: dict, match: dict) -> Event:
+    starts_at = datetime.fromisoformat(match["starts_at"]) if isinstance(match["starts_at"], str) else match["starts_at"]
+    label = match.get("round_label") or (f"{match['group_name']}조" if match.get("group_name") else "")
+    summary = f"{match['team_a_name']} vs {match['team_b_name']}"
+    description = [event["title"]]
+    if match.get("status") == "completed" and match.get("team_a_score") is not None:
+        description.append(
+            f"결과: {match['team_a_name']} {_score(match['team_a_score'])} : {_score(match['team_b_score'])} {match['team_b_name']}"
+        )
+        if match.get("winner_team_name"):
+            description.append(f"승리: {match['winner_team_name']}")
+    if match.get("notes"):
+        description.append(match["notes"])
+    return Event(
+        uid=f"tournament-match-{match['id']}",
+        starts_at=starts_at,
+        ends_at=starts_at + timedelta(minutes=CALENDAR_MATCH_MINUTES),
+        summary=f"[{label}] {summary}" if label else summary,
+        description="\n".join(description),
+        location=match.get("venue") or "",
+        updated_at=match.get("updated_at"),
+    )
+
+
+@router.get("/{event_id}/calendar.ics")
+# GET /tournaments/{id}와 같은 경로로 스냅샷을 만든다.
+@query_budget(7)
+def get_tournament_calendar(
+    event_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+):
+    """대회 경기 일정 iCalendar 구독 피드. 대진이 풀린 경기는 팀명, 아직이면 진출 조건(예: A조 1위)으로 표시한다."""
+
+    def build() -> bytes:
+        archive = _archive(event_id)
+        snapshot = json.loads(archive.body) if archive is not None else _event_snapshot(event_id)
+        events = [_match_event(snapshot, match) for match in snapshot["matches"]]
+        return render_calendar(f"{snapshot['title']} 경기 일정", events)
+
+    tag = f"tournament:{event_id}"
+    return feed_response(feed_store.get(tag, [tag], build), if_none_match, if_modified_since)
+
+
+@router.get("/{event_id}/odds", response_model=TournamentOdds)
+# 대회 읽기 4
+@query_budget(4)
+@cached(TournamentOdds, tags=lambda params: [f"tournament:{params['event_id']}"])
+def get_tournament_odds(
+    event_id: str,
+    simulations: Optional[int] = Query(default=None, ge=1000, le=TOURNAMENT_ODDS_MAX_SIMULATIONS),
+    model: Literal["uniform", "rating"] = Query(default="uniform"),
+):
+    """남은 경기를 몬테카를로로 돌린 조 순위별/결승 진출/우승 확률.
+
+    model=uniform은 모든 경기를 50%로, rating은 경력점수와 끝난 경기 결과로 만든 Elo 레이팅으로 승률을 정한다.
+    결과는 대진/결과 상태(version)마다 한 번만 계산한다.
+    """
+    _, engine = _load_event(event_id)
+    result = simulate_odds(engine, simulations or TOURNAMENT_ODDS_SIMULATIONS, model)
+    return {"tournament_id": event_id, **result}
 
 
 @router.patch("/{event_id}")
+# 관리자 확인 1 + 대회 조회·갱신 2 + 다시 읽기 4 + 보관(저장·다시 읽기 2) 또는 다시 열 때 보관본 삭제 1
+@query_budget(9)
 def update_tournament(event_id: str, payload: TournamentUpdate, _: str = Depends(require_admin)):
     changes = payload.model_dump(exclude_none=True, mode="json")
     if "title" in changes:
@@ -250,14 +320,39 @@ def update_tournament(event_id: str, payload: TournamentUpdate, _: str = Depends
     ends_on = changes.get("ends_on")
     if starts_on and ends_on and ends_on < starts_on:
         raise HTTPException(status_code=400, detail="종료일은 시작일보다 빠를 수 없습니다.")
-    if changes:
-        get_supabase().table("tournaments").update(changes).eq("id", event_id).execute()
-    return _event_snapshot(event_id)
+    if not changes:
+        return fast_json(_event_snapshot(event_id))
+
+    tournaments = get_repositories().tournaments
+    event = tournaments.get(event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="대회를 찾을 수 없습니다.")
+    was_completed = event.get("status") == "completed"
+    status = changes.get("status", event.get("status"))
+    if was_completed and status == "completed":
+        if set(changes) != {"status"}:
+            _ensure_open(event)
+        return fast_json(_event_snapshot(event_id))
+    tournaments.update(event_id, changes)
+    if was_completed:
+        # 관리자가 다시 열었다: 보관본을 지우고, 다시 완료하면 새로 만든다.
+        tournaments.delete_archive(event_id)
+    _invalidate_event(event_id)
+    archive_store.forget(event_id)
+    snapshot = _event_snapshot(event_id)
+    if status == "completed":
+        archive_store.put(event_id, _freeze(event_id, snapshot))
+    return fast_json(snapshot)
 
 
 @router.put("/{event_id}/setup")
+# 관리자 확인 1 + 대회·기존 팀 조회 2 + 자식 삭제 3 + 팀·팀원·경기 insert 3 + 다시 읽기 4 (팀·경기 수와 무관)
+@query_budget(13)
 def replace_tournament_setup(event_id: str, payload: TournamentSetup, _: str = Depends(require_admin)):
-    _event_snapshot(event_id)
+    event = get_repositories().tournaments.get(event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="대회를 찾을 수 없습니다.")
+    _ensure_open(event)
     keys = [team.client_key.strip() for team in payload.teams]
     if any(not key for key in keys) or len(keys) != len(set(keys)):
         raise HTTPException(status_code=400, detail="팀 식별값이 비어 있거나 중복되었습니다.")
@@ -279,16 +374,13 @@ def replace_tournament_setup(event_id: str, payload: TournamentSetup, _: str = D
     member_ids = [member.user_id for team in payload.teams for member in team.members]
     if len(member_ids) != len(set(member_ids)):
         raise HTTPException(status_code=400, detail="한 참가자를 여러 팀에 중복 등록할 수 없습니다.")
+    match_ids = _match_ids(payload)
+    match_id_by_key = {
+        match.client_key.strip(): match_id
+        for match, match_id in zip(payload.matches, match_ids)
+        if match.client_key and match.client_key.strip()
+    }
 
-    sb = get_supabase()
-    old_teams = sb.table("tournament_teams").select("id").eq("tournament_id", event_id).execute()
-    old_team_ids = [row["id"] for row in old_teams.data or []]
-    sb.table("tournament_matches").delete().eq("tournament_id", event_id).execute()
-    if old_team_ids:
-        sb.table("tournament_team_members").delete().in_("team_id", old_team_ids).execute()
-    sb.table("tournament_teams").delete().eq("tournament_id", event_id).execute()
-
-    team_id_by_key: Dict[str, str] = {}
     team_payloads = [
         {
             "tournament_id": event_id,
@@ -302,63 +394,214 @@ def replace_tournament_setup(event_id: str, payload: TournamentSetup, _: str = D
         }
         for index, team in enumerate(payload.teams)
     ]
-    if team_payloads:
-        inserted = sb.table("tournament_teams").insert(team_payloads).execute()
-        team_id_by_key = {row["client_key"]: row["id"] for row in inserted.data or []}
 
-    member_payloads = []
-    for team in payload.teams:
-        team_id = team_id_by_key.get(team.client_key)
-        if not team_id:
-            continue
-        for member in team.members:
-            member_payloads.append(
+    def build_children(team_id_by_key: Dict[str, str]) -> Tuple[List[dict], List[dict]]:
+        member_payloads = []
+        for team in payload.teams:
+            team_id = team_id_by_key.get(team.client_key)
+            if not team_id:
+                continue
+            for member in team.members:
+                member_payloads.append(
+                    {
+                        "team_id": team_id,
+                        "user_id": member.user_id,
+                        "experience_score": member.experience_score,
+                    }
+                )
+
+        match_payloads = []
+        group_by_key = {team.client_key: team.group_name.strip() for team in payload.teams}
+        for match, match_id in zip(payload.matches, match_ids):
+            team_a_id = team_id_by_key.get(match.team_a_key or "")
+            team_b_id = team_id_by_key.get(match.team_b_key or "")
+            match_payloads.append(
                 {
-                    "team_id": team_id,
-                    "user_id": member.user_id,
-                    "experience_score": member.experience_score,
+                    "id": match_id,
+                    "tournament_id": event_id,
+                    "stage": match.stage,
+                    "group_name": group_by_key.get(match.team_a_key or "") if match.stage == GROUP_STAGE else None,
+                    "round_label": match.round_label.strip(),
+                    "starts_at": _utc_iso(match.starts_at),
+                    "venue": match.venue.strip(),
+                    "team_a_id": team_a_id,
+                    "team_b_id": team_b_id,
+                    "team_a_source_group": _stored_source(match.team_a_source_group, match_id_by_key),
+                    "team_b_source_group": _stored_source(match.team_b_source_group, match_id_by_key),
+                    "winner_team_id": team_id_by_key.get(match.winner_team_key or ""),
+                    "team_a_score": match.team_a_score,
+                    "team_b_score": match.team_b_score,
+                    "status": match.status,
+                    "notes": match.notes.strip(),
                 }
             )
-    if member_payloads:
-        sb.table("tournament_team_members").insert(member_payloads).execute()
+        return member_payloads, match_payloads
 
-    match_payloads = []
-    group_by_key = {team.client_key: team.group_name.strip() for team in payload.teams}
-    for match in payload.matches:
-        team_a_id = team_id_by_key.get(match.team_a_key or "")
-        team_b_id = team_id_by_key.get(match.team_b_key or "")
-        match_payloads.append(
-            {
-                "tournament_id": event_id,
-                "stage": match.stage,
-                "group_name": group_by_key.get(match.team_a_key or "") if match.stage == "group" else None,
-                "round_label": match.round_label.strip(),
-                "starts_at": _utc_iso(match.starts_at),
-                "venue": match.venue.strip(),
-                "team_a_id": team_a_id,
-                "team_b_id": team_b_id,
-                "team_a_source_group": match.team_a_source_group,
-                "team_b_source_group": match.team_b_source_group,
-                "winner_team_id": team_id_by_key.get(match.winner_team_key or ""),
-                "team_a_score": match.team_a_score,
-                "team_b_score": match.team_b_score,
-                "status": match.status,
-                "notes": match.notes.strip(),
-            }
+    get_repositories().tournaments.replace_setup(event_id, team_payloads, build_children)
+    _invalidate_event(event_id)
+    return fast_json(_event_snapshot(event_id))
+
+
+@router.post("/{event_id}/teams/balance", response_model=TournamentBalanceResult)
+def balance_tournament_teams(event_id: str, payload: TournamentBalanceRequest, _: str = Depends(require_admin)):
+    """참가자를 팀 평균 경력점수가 고르게 팀과 조로 나눈다. 저장하지 않고 미리보기만 반환한다.
+
+    반환한 teams를 PUT /tournaments/{id}/setup의 teams로 보내면 확정된다.
+    """
+    repos = get_repositories()
+    if not repos.tournaments.get(event_id):
+        raise HTTPException(status_code=404, detail="대회를 찾을 수 없습니다.")
+    user_ids = [participant.user_id for participant in payload.participants]
+    if len(user_ids) != len(set(user_ids)):
+        raise HTTPException(status_code=400, detail="한 참가자를 여러 번 등록할 수 없습니다.")
+
+    participants = [
+        Participant(
+            user_id=participant.user_id,
+            experience=participant.experience_score,
+            generation=(participant.generation or "").strip() or None,
+            major=(participant.major or "").strip() or None,
         )
-    if match_payloads:
-        sb.table("tournament_matches").insert(match_payloads).execute()
-    return _event_snapshot(event_id)
+        for participant in payload.participants
+    ]
+    spread = [name for name, enabled in (("generation", payload.spread_generation), ("major", payload.spread_major)) if enabled]
+    if any(getattr(participant, name) is None for participant in participants for name in spread):
+        profiles = {user["id"]: user for user in repos.users.list_all()}
+        for participant in participants:
+            profile = profiles.get(participant.user_id) or {}
+            for name in spread:
+                if getattr(participant, name) is None:
+                    setattr(participant, name, (profile.get(name) or "").strip() or None)
+
+    balance = balance_teams(
+        participants,
+        payload.team_size,
+        payload.group_count,
+        spread_generation=payload.spread_generation,
+        spread_major=payload.spread_major,
+        seed=payload.seed,
+    )
+    group_names = [chr(ord("A") + index) for index in range(payload.group_count)]
+    order = sorted(range(len(balance.teams)), key=lambda index: balance.groups[index])
+    stats = balance.stats
+    return TournamentBalanceResult(
+        teams=[
+            TournamentTeamInput(
+                client_key=f"team-{number}",
+                name=f"{number}팀",
+                group_name=group_names[balance.groups[index]],
+                members=[
+                    TournamentTeamMemberInput(user_id=member.user_id, experience_score=member.experience)
+                    for member in balance.teams[index]
+                ],
+            )
+            for number, index in enumerate(order, start=1)
+        ],
+        stats=TournamentBalanceStats(
+            team_count=len(balance.teams),
+            team_experience_stdev=round(stats["team_experience_stdev"], 4),
+            team_experience_min=round(stats["team_experience_min"], 2),
+            team_experience_max=round(stats["team_experience_max"], 2),
+            group_experience_range=round(stats["group_experience_range"], 4),
+            duplicate_generation_pairs=stats["duplicate_generation_pairs"],
+            duplicate_major_pairs=stats["duplicate_major_pairs"],
+            iterations=balance.iterations,
+            improvements=balance.improvements,
+        ),
+    )
+
+
+@router.post("/{event_id}/schedule/generate", response_model=TournamentSetup)
+# 관리자 확인 1 + 대회·팀·팀원 조회 3
+@query_budget(4)
+def generate_schedule(event_id: str, payload: TournamentScheduleRequest, _: str = Depends(require_admin)):
+    """저장된 팀으로 조별 리그전과 토너먼트 경기를 만들고 시간대/장소를 배정한다.
+
+    저장하지 않고 미리보기만 반환한다. 반환값을 그대로 PUT /tournaments/{id}/setup에 보내면 확정된다.
+    """
+    tournaments = get_repositories().tournaments
+    if not tournaments.get(event_id):
+        raise HTTPException(status_code=404, detail="대회를 찾을 수 없습니다.")
+    teams = tournaments.teams(event_id)
+    if len(teams) < 2:
+        raise HTTPException(status_code=400, detail="일정을 만들려면 두 팀 이상 등록해주세요.")
+    venues = [(venue.name.strip(), venue.capacity) for venue in payload.venues]
+    if any(not name for name, _ in venues):
+        raise HTTPException(status_code=400, detail="경기 장소 이름을 입력해주세요.")
+    first_end = payload.starts_at + timedelta(minutes=payload.match_minutes)
+    if payload.day_ends_at is not None and first_end > datetime.combine(
+        payload.starts_at.date(), payload.day_ends_at, tzinfo=payload.starts_at.tzinfo
+    ):
+        raise HTTPException(status_code=400, detail="첫 경기가 하루 마감 시각을 넘깁니다.")
+
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for team in teams:
+        groups[team["group_name"]].append(team["client_key"])
+    smallest = min(len(keys) for keys in groups.values())
+    if payload.advance_per_group > smallest:
+        raise HTTPException(
+            status_code=400,
+            detail=f"조별 진출 팀 수({payload.advance_per_group})가 가장 작은 조의 팀 수({smallest})보다 많습니다.",
+        )
+
+    fixtures, keys_by_group = group_fixtures(groups)
+    if payload.advance_per_group:
+        fixtures += knockout_fixtures(list(groups), keys_by_group, payload.advance_per_group, payload.third_place_match)
+    try:
+        scheduled = assign_slots(
+            fixtures,
+            venues,
+            slot_clock(payload.starts_at, payload.match_minutes, payload.day_ends_at),
+            payload.match_minutes,
+            payload.rest_minutes,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    members: Dict[str, List[TournamentTeamMemberInput]] = defaultdict(list)
+    for member in tournaments.team_members([team["id"] for team in teams]):
+        members[member["team_id"]].append(
+            TournamentTeamMemberInput(user_id=member["user_id"], experience_score=member.get("experience_score") or 1)
+        )
+    return TournamentSetup(
+        teams=[
+            TournamentTeamInput(
+                client_key=team["client_key"],
+                name=team["name"],
+                group_name=team["group_name"],
+                members=members[team["id"]],
+            )
+            for team in teams
+        ],
+        matches=[
+            TournamentMatchInput(
+                client_key=fixture.key,
+                stage=fixture.stage,
+                round_label=fixture.round_label,
+                starts_at=fixture.starts_at,
+                venue=fixture.venue,
+                team_a_key=fixture.team_a,
+                team_b_key=fixture.team_b,
+                team_a_source_group=fixture.source_a,
+                team_b_source_group=fixture.source_b,
+            )
+            for fixture in scheduled
+        ],
+    )
 
 
 @router.patch("/{event_id}/matches/{match_id}/result")
+# 관리자 확인 1 + 대회 읽기 4 + 경기 갱신 1
+@query_budget(6)
 def set_match_result(
     event_id: str,
     match_id: str,
     payload: TournamentMatchResult,
     _: str = Depends(require_admin),
 ):
-    snapshot = _event_snapshot(event_id)
+    event, engine = _load_event(event_id)
+    _ensure_open(event)
+    snapshot = _snapshot(event, engine)
     match = next((item for item in snapshot["matches"] if item["id"] == match_id), None)
     if not match:
         raise HTTPException(status_code=404, detail="경기를 찾을 수 없습니다.")
@@ -373,8 +616,8 @@ def set_match_result(
     elif payload.team_b_score > payload.team_a_score:
         winner_id = team_b_id
     else:
-        exp_a = _team_experience(team_by_id[team_a_id])
-        exp_b = _team_experience(team_by_id[team_b_id])
+        exp_a = team_experience(team_by_id[team_a_id])
+        exp_b = team_experience(team_by_id[team_b_id])
         if exp_a < exp_b:
             winner_id = team_a_id
         elif exp_b < exp_a:
@@ -387,14 +630,16 @@ def set_match_result(
                 detail="점수와 평균 경력점수가 모두 같습니다. 승리 팀을 직접 선택해주세요.",
             )
 
-    get_supabase().table("tournament_matches").update(
-        {
-            "team_a_id": team_a_id,
-            "team_b_id": team_b_id,
-            "team_a_score": payload.team_a_score,
-            "team_b_score": payload.team_b_score,
-            "winner_team_id": winner_id,
-            "status": "completed",
-        }
-    ).eq("id", match_id).eq("tournament_id", event_id).execute()
-    return _event_snapshot(event_id)
+    changes = {
+        "team_a_id": team_a_id,
+        "team_b_id": team_b_id,
+        "team_a_score": payload.team_a_score,
+        "team_b_score": payload.team_b_score,
+        "winner_team_id": winner_id,
+        "status": "completed",
+    }
+    get_repositories().tournaments.update_match(event_id, match_id, changes)
+    _invalidate_event(event_id)
+    # 다시 불러오지 않고, 결과가 바뀐 조와 그 뒤에 이어지는 경기만 다시 계산한다.
+    engine.apply_result(match_id, changes)
+    return fast_json(_snapshot(event, engine))
@@ -0,0 +1,263 @@
+"""대회 일정 생성: 조별 리그전과 토너먼트 대진을 만들고 시간대/장소를 배정한다.
+
+조별 리그전은 원형(circle) 방식으로 라운드를 나누고, 토너먼트는 조 순위(`A`, `B:2`)와
+앞 경기 승자(`winner:<경기 키>`)를 진출 조건으로 하는 대진표를 만든다. 참가 팀 수가 2의
+거듭제곱이 아니면 상위 시드가 부전승으로 다음 라운드에 올라간다.
+
+배정은 시간대를 앞에서부터 채우는 우선순위 탐욕 배정이다. 시간대마다 아직 배정되지 않은
+경기를 (라운드, 조) 순서로 보며 다음 조건을 모두 만족하는 경기만 넣는다.
+
+- 한 시간대에 한 팀은 한 경기만
+- 장소별 동시 경기 수(capacity)를 넘지 않음
+- 팀은 앞 경기가 끝나고 rest_minutes가 지나야 다음 경기
+- 진출 조건이 기대는 경기(조 전체 또는 앞 경기)가 끝나고 rest_minutes가 지나야 시작
+
+경기마다 시간대를 한 번씩만 훑으므로 경기 수 F, 시간대 수 S에 대해 O(S·F)다.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.standings import GROUP_STAGE, Source, format_source
+
+KNOCKOUT_STAGE = "final"
+
+
+@dataclass
+class Fixture:
+    key: str
+    stage: str
+    round_label: str
+    # 배정 우선순위: (라운드, 조 순서)
+    order: Tuple[int, int]
+    team_a: Optional[str] = None
+    team_b: Optional[str] = None
+    source_a: Optional[str] = None
+    source_b: Optional[str] = None
+    # 먼저 끝나야 하는 경기 키
+    after: List[str] = field(default_factory=list)
+    starts_at: Optional[datetime] = None
+    venue: str = ""
+
+    @property
+    def teams(self) -> Tuple[str, ...]:
+        return tuple(team for team in (self.team_a, self.team_b) if team)
+
+
+class _Entry:
+    """토너먼트 대진표의 한 자리: 진출 조건과, 그 조건이 정해지려면 끝나야 하는 경기들."""
+
+    __slots__ = ("source", "group", "after")
+
+    def __init__(self, source: str, group: Optional[str], after: Sequence[str]) -> None:
+        self.source = source
+        self.group = group
+        self.after = list(after)
+
+
+def round_robin(teams: Sequence[str]) -> List[List[Tuple[str, str]]]:
+    """원형 방식 라운드 로빈. 라운드마다 모든 팀이 많아야 한 경기씩 치른다 (홀수면 한 팀은 쉰다)."""
+    seats: List[Optional[str]] = list(teams)
+    if len(seats) % 2:
+        seats.append(None)
+    rounds = []
+    for _ in range(len(seats) - 1):
+        half = len(seats) // 2
+        pairs = [(seats[index], seats[-1 - index]) for index in range(half)]
+        rounds.append([(a, b) for a, b in pairs if a is not None and b is not None])
+        seats = [seats[0], seats[-1], *seats[1:-1]]
+    return rounds
+
+
+def group_fixtures(groups: Dict[str, List[str]]) -> Tuple[List[Fixture], Dict[str, List[str]]]:
+    """조별 리그전 경기와, 조마다 그 조의 경기 키 목록을 만든다."""
+    fixtures: List[Fixture] = []
+    keys_by_group: Dict[str, List[str]] = {}
+    for group_index, (group, teams) in enumerate(groups.items()):
+        keys_by_group[group] = []
+        number = 0
+        for round_index, pairs in enumerate(round_robin(teams)):
+            for team_a, team_b in pairs:
+                number += 1
+                fixture = Fixture(
+                    key=f"G{group_index + 1}-{number}",
+                    stage=GROUP_STAGE,
+                    round_label=f"{group}조",
+                    order=(round_index, group_index),
+                    team_a=team_a,
+                    team_b=team_b,
+                )
+                fixtures.append(fixture)
+                keys_by_group[group].append(fixture.key)
+    return fixtures, keys_by_group
+
+
+def _bracket_order(size: int) -> List[int]:
+    """시드 번호를 대진표 위치 순서로 (1번 시드와 2번 시드는 결승에서야 만난다)."""
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+def _round_name(size: int) -> str:
+    return {2: "결승", 4: "4강"}.get(size, f"{size}강")
+
+
+def _separate_groups(pairs: List[List[Optional[_Entry]]]) -> None:
+    """첫 라운드에서 같은 조 팀끼리 만나면 다른 경기의 아래쪽 자리와 바꾼다."""
+    for pair in pairs:
+        if not all(pair) or pair[0].group != pair[1].group:
+            continue
+        for other in pairs:
+            if other is pair or not all(other):
+                continue
+            if other[0].group != pair[1].group and pair[0].group != other[1].group:
+                pair[1], other[1] = other[1], pair[1]
+                break
+
+
+def knockout_fixtures(
+    groups: Sequence[str],
+    keys_by_group: Dict[str, List[str]],
+    advance: int,
+    third_place: bool = False,
+) -> List[Fixture]:
+    """조마다 상위 advance팀이 올라가는 토너먼트. 조 1위들이 앞 시드, 그다음 2위들 순이다."""
+    entries = [
+        _Entry(format_source(Source("group", group, rank)), group, keys_by_group.get(group, ()))
+        for rank in range(1, advance + 1)
+        for group in groups
+    ]
+    if len(entries) < 2:
+        return []
+    size = 1
+    while size < len(entries):
+        size *= 2
+    slots: List[Optional[_Entry]] = [entries[seed - 1] if seed <= len(entries) else None for seed in _bracket_order(size)]
+    pairs = [[slots[index], slots[index + 1]] for index in range(0, size, 2)]
+    _separate_groups(pairs)
+
+    fixtures: List[Fixture] = []
+    round_index = 0
+    semifinals: List[Fixture] = []
+    while len(pairs) >= 1:
+        label = _round_name(len(pairs) * 2)
+        advancing: List[Optional[_Entry]] = []
+        played = sum(1 for pair in pairs if all(pair))
+        number = 0
+        for pair in pairs:
+            if not all(pair):
+                # 부전승: 상대가 없는 자리는 그대로 다음 라운드로
+                advancing.append(pair[0] or pair[1])
+                continue
+            entry_a, entry_b = pair
+            number += 1
+            fixture = Fixture(
+                key=f"KO{len(pairs) * 2}-{number}",
+                stage=KNOCKOUT_STAGE,
+                round_label=label if played == 1 else f"{label} {number}경기",
+                order=(1000 + round_index, number),
+                source_a=entry_a.source,
+                source_b=entry_b.source,
+                after=[*entry_a.after, *entry_b.after],
+            )
+            fixtures.append(fixture)
+            advancing.append(_Entry(format_source(Source("winner", fixture.key)), None, [fixture.key]))
+        if len(pairs) == 2:
+            semifinals = [fixture for fixture in fixtures if fixture.order[0] == 1000 + round_index]
+        if len(pairs) == 1:
+            break
+        pairs = [[advancing[index], advancing[index + 1]] for index in range(0, len(advancing), 2)]
+        round_index += 1
+
+    if third_place and len(semifinals) == 2:
+        third = Fixture(
+            key="KO-3rd",
+            stage=KNOCKOUT_STAGE,
+            round_label="3·4위전",
+            order=(1000 + round_index, 0),
+            source_a=format_source(Source("loser", semifinals[0].key)),
+            source_b=format_source(Source("loser", semifinals[1].key)),
+            after=[semifinals[0].key, semifinals[1].key],
+        )
+        # 결승은 3·4위전 다음에 치른다.
+        fixtures[-1].after.append(third.key)
+        fixtures.insert(len(fixtures) - 1, third)
+    return fixtures
+
+
+def slot_clock(starts_at: datetime, match_minutes: int, day_ends_at: Optional[time] = None) -> Callable[[int], datetime]:
+    """시간대 번호 → 시작 시각. day_ends_at을 넘기는 시간대는 다음 날 같은 시작 시각부터 이어진다."""
+    step = timedelta(minutes=match_minutes)
+    if day_ends_at is None:
+        return lambda index: starts_at + step * index
+    day_end = datetime.combine(starts_at.date(), day_ends_at, tzinfo=starts_at.tzinfo)
+    per_day = max(1, (day_end - starts_at) // step)
+    return lambda index: starts_at + timedelta(days=index // per_day) + step * (index % per_day)
+
+
+def assign_slots(
+    fixtures: List[Fixture],
+    venues: Iterable[Tuple[str, int]],
+    clock: Callable[[int], datetime],
+    match_minutes: int,
+    rest_minutes: int = 0,
+) -> List[Fixture]:
+    """fixtures에 starts_at과 venue를 채워 시간순으로 반환한다. 조건을 만족하는 경기가 영영 없으면 ValueError."""
+    venue_slots = [name for name, capacity in venues for _ in range(capacity)]
+    if not venue_slots:
+        raise ValueError("경기를 치를 장소가 없습니다.")
+    length = timedelta(minutes=match_minutes)
+    rest = timedelta(minutes=rest_minutes)
+    pending = sorted(fixtures, key=lambda fixture: fixture.order)
+    scheduled: List[Fixture] = []
+    ends: Dict[str, datetime] = {}
+    free_at: Dict[str, datetime] = {}
+    # 쉬는 시간이 길어도 이만큼 빈 시간대가 이어지면 더 기다려도 배정할 수 없다.
+    idle_limit = rest_minutes // max(1, match_minutes) + 2
+    slot = idle = 0
+    while pending:
+        start = clock(slot)
+        busy: Set[str] = set()
+        placed: List[Fixture] = []
+        waiting: List[Fixture] = []
+        for fixture in pending:
+            if len(placed) < len(venue_slots) and _ready(fixture, start, busy, free_at, ends, rest):
+                placed.append(fixture)
+                busy.update(fixture.teams)
+            else:
+                waiting.append(fixture)
+        for fixture, venue in zip(placed, venue_slots):
+            scheduled.append(fixture)
+            fixture.starts_at = start
+            fixture.venue = venue
+            ends[fixture.key] = start + length
+            for team in fixture.teams:
+                free_at[team] = start + length + rest
+        idle = 0 if placed else idle + 1
+        if idle > idle_limit:
+            raise ValueError("조건을 만족하는 일정을 만들 수 없습니다.")
+        pending = waiting
+        slot += 1
+    return scheduled
+
+
+def _ready(
+    fixture: Fixture,
+    start: datetime,
+    busy: Set[str],
+    free_at: Dict[str, datetime],
+    ends: Dict[str, datetime],
+    rest: timedelta,
+) -> bool:
+    for team in fixture.teams:
+        if team in busy or free_at.get(team, start) > start:
+            return False
+    for key in fixture.after:
+        end = ends.get(key)
+        if end is None or end + rest > start:
+            return False
+    return True
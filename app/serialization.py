@@ -0,0 +1,78 @@
+"""응답 JSON 직렬화 빠른 경로.
+
+FastAPI 기본 경로는 response_model 검증 → jsonable_encoder → json.dumps를 거친다.
+우리가 직접 만든 데이터(대회 스냅샷 dict, MemberStatsRow 목록, 컬럼을 지정해 읽은
+예약 목록)는 다시 검증할 필요가 없으므로, 미리 만들어 둔 TypeAdapter와 orjson으로
+바로 바이트를 만든다. orjson이 없으면 표준 json으로 동작한다.
+"""
+
+import json
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson은 requirements에 포함되어 있다.
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """검증 없이 바로 JSON 바이트로 직렬화한다."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(
+        jsonable_encoder(value),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def adapter_for(response_model: Any) -> TypeAdapter:
+    """response_model별 TypeAdapter를 한 번만 만들어 재사용한다."""
+    return TypeAdapter(response_model)
+
+
+def _is_model_data(value: Any) -> bool:
+    # 직접 만든 목록은 원소 타입이 같으므로 첫 원소만 본다.
+    # (pydantic 모델의 isinstance는 메타클래스 때문에 원소마다 검사하기엔 느리다.)
+    if isinstance(value, list):
+        return bool(value) and isinstance(value[0], BaseModel)
+    return isinstance(value, BaseModel)
+
+
+def serialize(value: Any, adapter: Optional[TypeAdapter] = None, validate: bool = True) -> bytes:
+    """response_model 규칙에 맞춰 JSON 바이트로 직렬화한다.
+
+    validate=False는 우리가 직접 만든 데이터에만 쓴다. 이미 모델 인스턴스라면
+    adapter로 직렬화만 하고, dict 목록이라면 orjson으로 그대로 내보낸다.
+    """
+    if adapter is None:
+        return dumps(value)
+    if validate:
+        return adapter.dump_json(adapter.validate_python(value))
+    if _is_model_data(value):
+        return adapter.dump_json(value)
+    return dumps(value)
+
+
+def fast_json(value: Any, response_model: Any = None, validate: bool = False) -> Response:
+    """핸들러에서 Response를 바로 돌려주어 FastAPI의 재검증/인코딩을 건너뛴다."""
+    adapter = adapter_for(response_model) if response_model is not None else None
+    return Response(content=serialize(value, adapter, validate), media_type="application/json")
@@ -0,0 +1,97 @@
+"""운영 실행 진입점: `python -m app.server`.
+
+워커 프로세스 수는 WEB_CONCURRENCY(숫자 또는 auto)로 정한다. auto는 컨테이너에 실제로
+할당된 CPU 수(cgroup CPU 쿼터, CPU affinity)를 따른다. 워커가 2개 이상이면 공유 캐시
+파일을 만들어 SHARED_CACHE_PATH로 워커들에게 넘기고, 종료할 때 지운다
+(SHARED_CACHE_ENABLED=false면 워커마다 따로 캐시한다).
+
+워커가 여럿일 때는 uvicorn 감독 프로세스가 죽은 워커를 다시 띄우며, 시그널로 제어한다.
+
+- SIGHUP: 워커를 하나씩 정상 종료(처리 중 요청 완료 대기)하고 새로 띄운다. 그동안 나머지 워커가 요청을 받는다.
+- SIGTTIN / SIGTTOU: 워커를 하나 늘리거나 줄인다.
+- SIGTERM / SIGINT: 모든 워커를 GRACEFUL_SHUTDOWN_SECONDS 안에서 정상 종료한다.
+"""
+
+import math
+import os
+import tempfile
+from typing import Optional
+
+import uvicorn
+
+from app.config import GRACEFUL_SHUTDOWN_SECONDS, SHARED_CACHE_ENABLED, SHARED_CACHE_PATH, WEB_CONCURRENCY, get_env
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    # cgroup v2: "max 100000" 또는 "200000 100000"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as fp:
+            quota, period = fp.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1: 쿼터가 -1이면 제한 없음
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as fp:
+            quota_us = int(fp.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as fp:
+            period_us = int(fp.read())
+        return None if quota_us <= 0 else quota_us / period_us
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus() -> int:
+    """이 프로세스가 실제로 쓸 수 있는 CPU 수. os.cpu_count()는 호스트 전체를 세므로 쓰지 않는다."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def worker_count(value: str = WEB_CONCURRENCY) -> int:
+    if value.strip().lower() == "auto":
+        return available_cpus()
+    return max(1, int(value))
+
+
+def _shared_cache_path() -> str:
+    # /dev/shm은 메모리 위 파일시스템이라 디스크 I/O가 없다.
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"manjang-cache-{os.getpid()}.sqlite3")
+
+
+def _remove_shared_files(path: str) -> None:
+    for suffix in ("", "-wal", "-shm", ".seq"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def main() -> None:
+    workers = worker_count()
+    created_path: Optional[str] = None
+    if workers > 1 and SHARED_CACHE_ENABLED and not SHARED_CACHE_PATH:
+        created_path = _shared_cache_path()
+        # 워커는 새 인터프리터로 app.main을 import하므로 환경변수로 넘긴다.
+        os.environ["SHARED_CACHE_PATH"] = created_path
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=get_env("HOST", "0.0.0.0"),
+            port=int(get_env("PORT", "8080")),
+            workers=workers,
+            timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
+        )
+    finally:
+        if created_path:
+            _remove_shared_files(created_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""같은 호스트의 워커 프로세스들이 함께 쓰는 캐시 저장소와 무효화 채널.
+
+uvicorn을 워커 여러 개로 띄우면 프로세스마다 ResponseCache가 따로 생기므로, 한 워커가
+계산한 응답을 다른 워커가 다시 계산하고, 한 워커에서 일어난 무효화가 다른 워커에 전해지지
+않는다. 이 모듈은 로컬 파일(기본은 /dev/shm) 위의 SQLite(WAL)를 2차 캐시로 쓰고,
+무효화를 순번이 붙은 로그로 남겨 다른 워커가 따라 적용하게 한다.
+
+무효화 로그의 최신 순번은 mmap한 8바이트 파일에도 적어 두므로, 요청마다 하는 "새 무효화가
+있나" 확인은 SQLite를 거치지 않고 메모리 읽기 한 번으로 끝난다.
+"""
+
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 무효화 로그 보관 기간. 이보다 오래 동기화하지 않은 워커는 로컬 캐시를 통째로 비운다.
+_LOG_RETENTION_SECONDS = 600.0
+# put 몇 번마다 만료 항목 정리와 개수 제한을 적용할지
+_PRUNE_EVERY = 32
+# 전체 비우기를 뜻하는 무효화 로그 값
+CLEAR_ALL = "*"
+
+_SCHEMA = """
+create table if not exists entries (
+  key text primary key,
+  body blob not null,
+  tags text not null,
+  created_at real not null,
+  fresh_until real not null,
+  stale_until real not null
+);
+create table if not exists entry_tags (
+  tag text not null,
+  key text not null,
+  primary key (tag, key)
+) without rowid;
+create index if not exists entry_tags_key on entry_tags (key);
+create table if not exists invalidations (
+  seq integer primary key autoincrement,
+  tags text not null,
+  created_at real not null
+);
+"""
+
+
+class SharedEntry:
+    """공유 저장소에서 읽은 항목. 시각은 프로세스 사이에서 비교할 수 있도록 벽시계(time.time) 기준이다."""
+
+    __slots__ = ("body", "tags", "created_at", "fresh_until", "stale_until")
+
+    def __init__(self, body: bytes, tags: List[str], created_at: float, fresh_until: float, stale_until: float) -> None:
+        self.body = body
+        self.tags = tags
+        self.created_at = created_at
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class SharedCacheStore:
+    """SQLite 파일 하나 + 순번 파일 하나. 스레드마다 커넥션을 따로 연다."""
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._puts = 0
+        self._hits = 0
+        self._stats_lock = threading.Lock()
+        with self.connect() as conn:
+            conn.executescript(_SCHEMA)
+        self._seq_map = self._open_seq_file(path + ".seq")
+
+    @staticmethod
+    def _open_seq_file(path: str) -> mmap.mmap:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(fd).st_size < 8:
+                os.ftruncate(fd, 8)
+            return mmap.mmap(fd, 8)
+        finally:
+            os.close(fd)
+
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: 트랜잭션은 아래에서 begin immediate로 직접 연다.
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("pragma journal_mode=wal")
+            # 캐시라서 전원이 나가면 사라져도 된다. 커밋마다 fsync하지 않는다.
+            conn.execute("pragma synchronous=off")
+            self._local.conn = conn
+        return conn
+
+    # -----------------------------
+    # 무효화 채널
+    # -----------------------------
+    def latest_seq(self) -> int:
+        """마지막 무효화 순번. mmap 읽기 한 번이라 요청마다 불러도 된다."""
+        return struct.unpack_from("<q", self._seq_map)[0]
+
+    def changes_since(self, seq: int) -> Tuple[int, List[Optional[List[str]]]]:
+        """seq 이후의 무효화를 (마지막 순번, 태그 목록들)로 반환한다. None은 전체 비우기다.
+
+        로그가 이미 정리되어 빠진 구간이 있으면 무엇이 바뀌었는지 알 수 없으므로 전체 비우기 하나를 돌려준다.
+        """
+        conn = self.connect()
+        rows = conn.execute("select seq, tags from invalidations where seq > ? order by seq", (seq,)).fetchall()
+        if not rows:
+            return seq, []
+        changes: List[Optional[List[str]]] = []
+        if rows[0][0] != seq + 1:
+            changes.append(None)
+        for _, tags in rows:
+            decoded = json.loads(tags)
+            changes.append(None if decoded == CLEAR_ALL else decoded)
+        return rows[-1][0], changes
+
+    def publish(self, tags: Optional[Sequence[str]]) -> int:
+        """태그(None이면 전체)를 가진 공유 항목을 지우고 무효화 로그에 남긴다. 새 순번을 반환한다."""
+        now = time.time()
+        conn = self.connect()
+        conn.execute("begin immediate")
+        try:
+            if tags is None:
+                conn.execute("delete from entries")
+                conn.execute("delete from entry_tags")
+            else:
+                marks = ",".join("?" * len(tags))
+                keys = [row[0] for row in conn.execute(f"select key from entry_tags where tag in ({marks})", list(tags))]
+                conn.executemany("delete from entries where key = ?", [(key,) for key in keys])
+                conn.executemany("delete from entry_tags where key = ?", [(key,) for key in keys])
+            cursor = conn.execute(
+                "insert into invalidations (tags, created_at) values (?, ?)",
+                (json.dumps(CLEAR_ALL if tags is None else list(tags)), now),
+            )
+            seq = cursor.lastrowid
+            conn.execute("delete from invalidations where created_at < ?", (now - _LOG_RETENTION_SECONDS,))
+            # 쓰기 잠금을 쥔 채로 적으므로 순번 파일의 값은 항상 커진다.
+            struct.pack_into("<q", self._seq_map, 0, seq)
+            conn.execute("commit")
+        except BaseException:
+            conn.execute("rollback")
+            raise
+        return seq
+
+    # -----------------------------
+    # 항목
+    # -----------------------------
+    def get(self, key: str) -> Optional[SharedEntry]:
+        row = self.connect().execute(
+            "select body, tags, created_at, fresh_until, stale_until from entries where key = ?", (key,)
+        ).fetchone()
+        if row is None or row[4] <= time.time():
+            return None
+        with self._stats_lock:
+            self._hits += 1
+        return SharedEntry(row[0], json.loads(row[1]), row[2], row[3], row[4])
+
+    def put(self, key: str, body: bytes, tags: Sequence[str], soft_ttl: float, hard_ttl: float, synced_seq: int) -> bool:
+        """항목을 저장한다. synced_seq 이후 아직 적용하지 않은 무효화가 있으면 오래된 값일 수 있으므로 저장하지 않는다."""
+        now = time.time()
+        conn = self.connect()
+        conn.execute("begin immediate")
+        try:
+            latest = conn.execute("select coalesce(max(seq), 0) from invalidations").fetchone()[0]
+            if latest > synced_seq:
+                conn.execute("rollback")
+                return False
+            conn.execute("delete from entry_tags where key = ?", (key,))
+            conn.execute(
+                "insert or replace into entries (key, body, tags, created_at, fresh_until, stale_until)"
+                " values (?, ?, ?, ?, ?, ?)",
+                (key, body, json.dumps(list(tags)), now, now + soft_ttl, now + max(soft_ttl, hard_ttl)),
+            )
+            conn.executemany("insert or ignore into entry_tags (tag, key) values (?, ?)", [(tag, key) for tag in tags])
+            with self._stats_lock:
+                self._puts += 1
+                prune = self._puts % _PRUNE_EVERY == 0
+            if prune:
+                self._prune(conn, now)
+            conn.execute("commit")
+        except BaseException:
+            conn.execute("rollback")
+            raise
+        return True
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("delete from entries where stale_until <= ?", (now,))
+        # 개수 제한: 가장 오래전에 만든 항목부터 지운다.
+        conn.execute(
+            "delete from entries where key in (select key from entries order by created_at"
+            " limit max((select count(*) from entries) - ?, 0))",
+            (self.max_entries,),
+        )
+        conn.execute("delete from entry_tags where key not in (select key from entries)")
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self.connect().execute("select count(*), coalesce(sum(length(body)), 0) from entries").fetchone()
+        with self._stats_lock:
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "hits": self._hits,
+                "stores": self._puts,
+                "invalidation_seq": self.latest_seq(),
+            }
+
+
+def open_shared_store(path: Optional[str], max_entries: int) -> Optional[SharedCacheStore]:
+    return SharedCacheStore(path, max_entries) if path else None
@@ -0,0 +1,104 @@
+"""동일 키 요청 병합(single-flight).
+
+대회 결과가 올라오면 관중 수백 명이 동시에 새로고침하면서 같은 스냅샷 계산을
+동시에 시작한다. 같은 키로 이미 진행 중인 계산이 있으면 새로 시작하지 않고
+그 결과를 함께 받는다. 스레드풀(동기 핸들러)과 이벤트 루프(비동기 핸들러)를
+모두 지원한다.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[Tuple[int, str], "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """fn()을 실행하거나, 같은 key의 진행 중인 실행이 끝나길 기다려 결과를 공유한다."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """do()의 비동기 버전. 이벤트 루프별로 진행 중인 Future를 공유한다."""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self._lock:
+            future = self._async_calls.get(flight_key)
+            if future is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                future = loop.create_future()
+                self._async_calls[flight_key] = future
+                self._executions += 1
+                leader = True
+        if not leader:
+            # shield: 기다리던 요청 하나가 취소되어도 공유 결과는 취소되지 않는다.
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            # 아무도 기다리지 않은 경우 "exception was never retrieved" 경고를 막는다.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._async_calls.pop(flight_key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+
+flights = SingleFlight()
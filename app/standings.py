@@ -0,0 +1,317 @@
+"""대회 조별 순위와 토너먼트 대진 계산.
+
+경기 행의 `team_a_source_group` / `team_b_source_group`에는 팀이 정해지지 않은 자리의 진출 조건을 적는다.
+
+- `A` 또는 `A:1`: A조 1위 (예전 데이터는 조 이름만 적혀 있다)
+- `B:2`: B조 2위
+- `winner:<경기 id>` / `loser:<경기 id>`: 앞 경기의 승자 / 패자
+
+조 순위는 대회의 `tiebreakers` 순서대로 비교한다. 앞 기준에서 동률인 팀끼리만 다음 기준으로 가르며,
+`head_to_head`는 그 시점에 동률인 팀들끼리의 경기 승수(미니리그)다. 모든 기준이 같으면 팀명 순이다.
+
+TournamentEngine은 경기를 한 번 훑어 조별/의존 관계 색인을 만들고, 경기 결과 하나가 바뀌면
+그 경기의 조 순위와 그 결과에 기대는 경기들만 다시 계산한다.
+"""
+
+from collections import defaultdict, deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+GROUP_STAGE = "group"
+UNASSIGNED_GROUP = "미배정"
+WINNER_PREFIX = "winner:"
+LOSER_PREFIX = "loser:"
+
+# 경력점수는 낮은 팀이 앞선다 (경험이 적은 팀에게 유리하게).
+TIEBREAKERS: Dict[str, Callable[[dict], float]] = {
+    "points": lambda row: row["points"],
+    "wins": lambda row: row["wins"],
+    "score_diff": lambda row: row["score_diff"],
+    "score_for": lambda row: row["score_for"],
+    "experience": lambda row: -row["experience_score"],
+}
+HEAD_TO_HEAD = "head_to_head"
+TIEBREAKER_NAMES = (*TIEBREAKERS, HEAD_TO_HEAD)
+DEFAULT_TIEBREAKERS = ("points", HEAD_TO_HEAD, "experience")
+
+
+class Source(NamedTuple):
+    """진출 조건. kind는 group/winner/loser, ref는 조 이름 또는 경기 id."""
+
+    kind: str
+    ref: str
+    rank: int = 1
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        # 이 조건이 기대는 대상: 조 순위 또는 경기 결과
+        return ("group" if self.kind == "group" else "match", self.ref)
+
+
+def parse_source(text: Optional[str]) -> Optional[Source]:
+    if not text or not text.strip():
+        return None
+    text = text.strip()
+    for kind, prefix in (("winner", WINNER_PREFIX), ("loser", LOSER_PREFIX)):
+        if text.startswith(prefix):
+            return Source(kind, text[len(prefix):].strip())
+    group, sep, rank = text.rpartition(":")
+    if sep and group.strip() and rank.strip().isdigit():
+        return Source("group", group.strip(), int(rank))
+    return Source("group", text)
+
+
+def format_source(source: Source) -> str:
+    if source.kind == "group":
+        return source.ref if source.rank == 1 else f"{source.ref}:{source.rank}"
+    return f"{WINNER_PREFIX if source.kind == 'winner' else LOSER_PREFIX}{source.ref}"
+
+
+def tiebreaker_chain(value: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """대회의 tiebreakers 값을 정리한다. 알 수 없는 이름과 중복은 버리고, 남는 기준이 없으면 기본값.
+
+    빈 기준으로 순위를 매기면 승점과 무관하게 팀명 순이 되므로 빈 값도 기본값으로 바꾼다.
+    """
+    if value is None:
+        return DEFAULT_TIEBREAKERS
+    chain: List[str] = []
+    for name in value:
+        if name in TIEBREAKER_NAMES and name not in chain:
+            chain.append(name)
+    return tuple(chain) or DEFAULT_TIEBREAKERS
+
+
+def find_cycle(dependencies: Dict[str, Sequence[str]]) -> Optional[str]:
+    """경기 → 앞 경기 의존 관계에서 순환에 걸린 경기 하나를 찾는다. 없으면 None."""
+    state: Dict[str, int] = {}
+
+    def visit(node: str) -> Optional[str]:
+        state[node] = 1
+        for parent in dependencies.get(node, ()):
+            if state.get(parent) == 1:
+                return parent
+            if parent not in state:
+                found = visit(parent)
+                if found is not None:
+                    return found
+        state[node] = 2
+        return None
+
+    for node in dependencies:
+        if node not in state:
+            found = visit(node)
+            if found is not None:
+                return found
+    return None
+
+
+def team_experience(team: dict) -> float:
+    members = team.get("members") or []
+    if members:
+        return round(sum(float(member.get("experience_score") or 1) for member in members) / len(members), 2)
+    return float(team.get("experience_score") or 0)
+
+
+def _score(value: Optional[float]) -> float:
+    return float(value) if value is not None else 0.0
+
+
+class TournamentEngine:
+    def __init__(self, event: dict, teams: List[dict], matches: List[dict]) -> None:
+        self.points_per_win = int(event.get("points_per_win") or 1)
+        self.tiebreakers = tiebreaker_chain(event.get("tiebreakers"))
+        self.team_by_id = {team["id"]: team for team in teams}
+        self.groups: Dict[str, List[dict]] = defaultdict(list)
+        for team in teams:
+            self.groups[team.get("group_name") or UNASSIGNED_GROUP].append(team)
+
+        self.matches = matches
+        self.match_by_id: Dict[str, dict] = {}
+        self.group_matches: Dict[str, List[dict]] = defaultdict(list)
+        self.sources: Dict[str, Tuple[Optional[Source], Optional[Source]]] = {}
+        # ("group", 조) / ("match", 경기 id) → 그 결과로 팀이 정해지는 경기 id들
+        self.dependents: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        for match in matches:
+            self._index(match)
+
+        self.standings_by_group: Dict[str, List[dict]] = {name: self._group_standings(name) for name in self.groups}
+        self.resolved: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        for match in matches:
+            self._resolve(match["id"], set())
+
+    def _index(self, match: dict) -> None:
+        self.match_by_id[match["id"]] = match
+        if match.get("stage") == GROUP_STAGE:
+            self.group_matches[match.get("group_name")].append(match)
+        sources = (parse_source(match.get("team_a_source_group")), parse_source(match.get("team_b_source_group")))
+        self.sources[match["id"]] = sources
+        for source in sources:
+            if source is not None:
+                self.dependents[source.key].add(match["id"])
+
+    # -----------------------------
+    # 조별 순위
+    # -----------------------------
+    def _group_standings(self, group_name: str) -> List[dict]:
+        rows: Dict[str, dict] = {}
+        for team in self.groups[group_name]:
+            rows[team["id"]] = {
+                "team_id": team["id"],
+                "team_name": team["name"],
+                "group_name": group_name,
+                "played": 0,
+                "wins": 0,
+                "losses": 0,
+                "points": 0,
+                "score_for": 0.0,
+                "score_against": 0.0,
+                "score_diff": 0.0,
+                "head_to_head_wins": 0,
+                "experience_score": team_experience(team),
+            }
+
+        completed = []
+        for match in self.group_matches.get(group_name, ()):
+            if match.get("status") != "completed" or not match.get("winner_team_id"):
+                continue
+            team_a_id = match.get("team_a_id")
+            team_b_id = match.get("team_b_id")
+            if team_a_id not in rows or team_b_id not in rows:
+                continue
+            completed.append(match)
+            winner_id = match["winner_team_id"]
+            loser_id = team_b_id if winner_id == team_a_id else team_a_id
+            score_a, score_b = _score(match.get("team_a_score")), _score(match.get("team_b_score"))
+            for team_id, scored, conceded in ((team_a_id, score_a, score_b), (team_b_id, score_b, score_a)):
+                row = rows[team_id]
+                row["played"] += 1
+                row["score_for"] += scored
+                row["score_against"] += conceded
+                row["score_diff"] += scored - conceded
+            rows[winner_id]["wins"] += 1
+            rows[winner_id]["points"] += self.points_per_win
+            rows[loser_id]["losses"] += 1
+
+        ordered = self._rank(list(rows.values()), self.tiebreakers, completed)
+        for index, row in enumerate(ordered, start=1):
+            row["rank"] = index
+        return ordered
+
+    def _rank(self, rows: List[dict], chain: Sequence[str], completed: List[dict]) -> List[dict]:
+        if len(rows) <= 1 or not chain:
+            return sorted(rows, key=lambda row: row["team_name"])
+        name, rest = chain[0], chain[1:]
+        if name == HEAD_TO_HEAD:
+            tied = {row["team_id"] for row in rows}
+            wins: Dict[str, int] = defaultdict(int)
+            for match in completed:
+                if match.get("team_a_id") in tied and match.get("team_b_id") in tied:
+                    wins[match["winner_team_id"]] += 1
+            for row in rows:
+                row["head_to_head_wins"] = wins[row["team_id"]]
+            value: Callable[[dict], float] = lambda row: row["head_to_head_wins"]
+        else:
+            value = TIEBREAKERS[name]
+        buckets: Dict[float, List[dict]] = defaultdict(list)
+        for row in rows:
+            buckets[value(row)].append(row)
+        ordered: List[dict] = []
+        for key in sorted(buckets, reverse=True):
+            ordered.extend(self._rank(buckets[key], rest, completed))
+        return ordered
+
+    def standings(self) -> List[dict]:
+        return [row for name in sorted(self.standings_by_group) for row in self.standings_by_group[name]]
+
+    def _ranked_ids(self, group_name: str) -> List[str]:
+        return [row["team_id"] for row in self.standings_by_group.get(group_name, ())]
+
+    # -----------------------------
+    # 대진 (진출 조건 풀기)
+    # -----------------------------
+    def _resolve(self, match_id: str, visiting: Set[str]) -> Tuple[Optional[str], Optional[str]]:
+        if match_id in self.resolved:
+            return self.resolved[match_id]
+        if match_id in visiting:
+            # 순환 참조는 풀지 않는다.
+            return None, None
+        visiting.add(match_id)
+        match = self.match_by_id[match_id]
+        source_a, source_b = self.sources[match_id]
+        resolved = (
+            match.get("team_a_id") or self._source_team(source_a, visiting),
+            match.get("team_b_id") or self._source_team(source_b, visiting),
+        )
+        visiting.discard(match_id)
+        self.resolved[match_id] = resolved
+        return resolved
+
+    def _source_team(self, source: Optional[Source], visiting: Set[str]) -> Optional[str]:
+        if source is None:
+            return None
+        if source.kind == "group":
+            ranked = self._ranked_ids(source.ref)
+            return ranked[source.rank - 1] if 0 < source.rank <= len(ranked) else None
+        previous = self.match_by_id.get(source.ref)
+        if previous is None or previous.get("status") != "completed" or not previous.get("winner_team_id"):
+            return None
+        winner_id = previous["winner_team_id"]
+        if source.kind == "winner":
+            return winner_id
+        team_a_id, team_b_id = self._resolve(previous["id"], visiting)
+        if winner_id == team_a_id:
+            return team_b_id
+        if winner_id == team_b_id:
+            return team_a_id
+        return None
+
+    def source_label(self, source: Optional[Source]) -> str:
+        if source is None:
+            return "미정"
+        if source.kind == "group":
+            return f"{source.ref}조 {source.rank}위"
+        previous = self.match_by_id.get(source.ref) or {}
+        label = previous.get("round_label") or "이전 경기"
+        return f"{label} {'승자' if source.kind == 'winner' else '패자'}"
+
+    def decorate(self, match: dict) -> dict:
+        """응답용 필드(resolved_team_*_id, 팀명, 승리 팀명)를 채운다."""
+        resolved_a, resolved_b = self._resolve(match["id"], set())
+        source_a, source_b = self.sources[match["id"]]
+        match["resolved_team_a_id"] = resolved_a
+        match["resolved_team_b_id"] = resolved_b
+        match["team_a_name"] = (self.team_by_id.get(resolved_a) or {}).get("name") or self.source_label(source_a)
+        match["team_b_name"] = (self.team_by_id.get(resolved_b) or {}).get("name") or self.source_label(source_b)
+        match["winner_team_name"] = (self.team_by_id.get(match.get("winner_team_id")) or {}).get("name")
+        return match
+
+    # -----------------------------
+    # 증분 갱신
+    # -----------------------------
+    def apply_result(self, match_id: str, changes: dict) -> Set[str]:
+        """경기 하나의 변경을 반영한다. 그 경기의 조 순위와, 결과에 기대는 경기들의 대진만 다시 계산한다.
+
+        다시 푼 경기 id들을 반환한다.
+        """
+        match = self.match_by_id[match_id]
+        match.update(changes)
+        dirty: List[Tuple[str, str]] = [("match", match_id)]
+        group_name = match.get("group_name") if match.get("stage") == GROUP_STAGE else None
+        if group_name in self.groups:
+            before = self._ranked_ids(group_name)
+            self.standings_by_group[group_name] = self._group_standings(group_name)
+            if self._ranked_ids(group_name) != before:
+                dirty.append(("group", group_name))
+
+        affected = {match_id}
+        queue = deque(dirty)
+        while queue:
+            key = queue.popleft()
+            for dependent in self.dependents.get(key, ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    queue.append(("match", dependent))
+        for dependent in affected:
+            self.resolved.pop(dependent, None)
+        for dependent in affected:
+            self._resolve(dependent, set())
+        return affected
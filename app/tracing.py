@@ -0,0 +1,206 @@
+"""요청 단위 upstream 호출 추적.
+
+요청마다 Supabase 호출을 순서대로 모아서
+
+- `Server-Timing` 헤더로 호출별 소요 시간을 내려주고,
+- 라우트 예산(기본 `QUERY_BUDGET`, `@query_budget(n)`으로 라우트별 지정)을 넘거나
+  같은 테이블/작업이 반복되면(N+1 의심) 구조화된 경고 로그를 남긴다.
+
+테스트에서는 `assert_num_queries`로 엔드포인트별 호출 수를 고정해 회귀를 잡는다.
+
+    with assert_num_queries(3):
+        client.post("/reservations", json=...)
+"""
+
+import contextlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import QUERY_BUDGET, QUERY_REPEAT_THRESHOLD, SERVER_TIMING_ENABLED
+from app.metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+# Server-Timing 헤더가 너무 길어지지 않도록 호출별 항목은 이 개수까지만 싣는다.
+_MAX_TIMING_ENTRIES = 20
+
+
+@dataclass
+class UpstreamCall:
+    table: str
+    operation: str
+    seconds: float
+    ok: bool
+
+
+@dataclass
+class RequestTrace:
+    calls: List[UpstreamCall] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, call: UpstreamCall) -> None:
+        with self.lock:
+            self.calls.append(call)
+
+    def snapshot(self) -> List[UpstreamCall]:
+        with self.lock:
+            return list(self.calls)
+
+
+# 스레드풀로 넘어가는 핸들러/의존성에도 컨텍스트가 복사되므로 같은 trace 객체에 쌓인다.
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+_listeners: List[Callable[[UpstreamCall], None]] = []
+_listeners_lock = threading.Lock()
+
+
+def record_call(table: str, operation: str, seconds: float, ok: bool) -> None:
+    call = UpstreamCall(table, operation, seconds, ok)
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add(call)
+    if _listeners:
+        with _listeners_lock:
+            listeners = list(_listeners)
+        for listener in listeners:
+            listener(call)
+
+
+def query_budget(limit: Optional[int]) -> Callable:
+    """라우트의 upstream 호출 예산을 지정한다. None이면 예산 검사를 하지 않는다.
+
+    라우터 데코레이터 바로 아래에 둔다.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        func.query_budget = limit
+        return func
+
+    return decorator
+
+
+def _budget_for(scope: Scope) -> Optional[int]:
+    endpoint = getattr(scope.get("route"), "endpoint", None)
+    return getattr(endpoint, "query_budget", QUERY_BUDGET)
+
+
+def server_timing(calls: List[UpstreamCall], total: float) -> str:
+    entries = [f'db;dur={sum(call.seconds for call in calls) * 1000:.1f};desc="{len(calls)} upstream calls"']
+    for index, call in enumerate(calls[:_MAX_TIMING_ENTRIES], start=1):
+        entries.append(f'q{index};dur={call.seconds * 1000:.1f};desc="{call.table} {call.operation}"')
+    entries.append(f"app;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def repeated_calls(calls: List[UpstreamCall]) -> Dict[str, int]:
+    counts = Counter(f"{call.table}.{call.operation}" for call in calls)
+    return {name: count for name, count in counts.most_common() if count >= QUERY_REPEAT_THRESHOLD}
+
+
+def _check_budget(scope: Scope, calls: List[UpstreamCall]) -> None:
+    budget = _budget_for(scope)
+    if budget is None:
+        return
+    repeated = repeated_calls(calls)
+    if len(calls) <= budget and not repeated:
+        return
+    logger.warning(
+        "upstream query budget %s: %s",
+        "exceeded" if len(calls) > budget else "repeated calls",
+        json.dumps(
+            {
+                "method": scope.get("method"),
+                "route": route_label(scope),
+                "calls": len(calls),
+                "budget": budget,
+                "repeated": repeated,
+                "upstream_ms": round(sum(call.seconds for call in calls) * 1000, 1),
+            },
+            ensure_ascii=False,
+        ),
+    )
+
+
+class TracingMiddleware:
+    """요청마다 RequestTrace를 열고, 응답 헤더에 Server-Timing을 붙인다 (SERVER_TIMING_ENABLED 또는 관리자 프로파일 요청)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = current_trace.set(trace)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                # 테이블 이름과 호출별 시간이 드러나므로 기본으로는 관리자가 X-Profile로 요청한 응답에만 붙인다.
+                # (X-Profile-Id는 안쪽 ProfilingMiddleware가 관리자 헤더 요청에만 붙인다)
+                if SERVER_TIMING_ENABLED or "x-profile-id" in headers:
+                    headers.append("Server-Timing", server_timing(trace.snapshot(), time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_trace.reset(token)
+            _check_budget(scope, trace.snapshot())
+
+
+@dataclass
+class QueryLog:
+    calls: List[UpstreamCall] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.calls)
+
+    def by_operation(self) -> Dict[Tuple[str, str], int]:
+        return dict(Counter((call.table, call.operation) for call in self.calls))
+
+    def describe(self) -> str:
+        return ", ".join(f"{table}.{operation}×{count}" for (table, operation), count in self.by_operation().items())
+
+
+@contextlib.contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+    """블록 안에서 일어난 모든 upstream 호출을 모은다 (TestClient의 다른 스레드 포함)."""
+    log = QueryLog()
+    lock = threading.Lock()
+
+    def listener(call: UpstreamCall) -> None:
+        with lock:
+            log.calls.append(call)
+
+    with _listeners_lock:
+        _listeners.append(listener)
+    try:
+        yield log
+    finally:
+        with _listeners_lock:
+            _listeners.remove(listener)
+
+
+@contextlib.contextmanager
+def assert_num_queries(expected: int, exact: bool = True) -> Iterator[QueryLog]:
+    """블록 안의 upstream 호출 수를 검사한다. exact=False면 expected 이하인지만 본다."""
+    with capture_queries() as log:
+        yield log
+    ok = log.count == expected if exact else log.count <= expected
+    if not ok:
+        bound = "" if exact else "at most "
+        raise AssertionError(f"expected {bound}{expected} upstream calls, got {log.count}: {log.describe()}")
@@ -0,0 +1,124 @@
+"""시작 시 워밍업.
+
+Cloud Run 콜드 스타트 직후 첫 요청이 클라이언트 생성, TLS 핸드셰이크, 첫 JWT 검증,
+빈 캐시 비용을 모두 떠안지 않도록 lifespan 시작 단계에서 미리 치른다. 워밍업이 실패해도
+서버는 뜨며, 각 단계의 소요 시간은 로그와 `GET /admin/warmup`으로 확인할 수 있다.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+KOREA_TIMEZONE = timezone(timedelta(hours=9))
+# 대회 당일에 관전자가 몰리는 상태
+_ACTIVE_TOURNAMENT_STATUSES = ("open", "ongoing")
+
+# 마지막 워밍업 결과: 단계별 소요 시간(ms)과 실패 메시지
+last_report: Dict[str, Any] = {}
+
+
+def _step(report: Dict[str, Any], name: str, func: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    try:
+        return func()
+    except Exception as exc:
+        report["errors"][name] = repr(exc)
+        logger.warning("warm-up step %s failed: %r", name, exc)
+        return None
+    finally:
+        report["steps"][name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def _open_client() -> None:
+    from app.repositories import get_repositories
+
+    if get_repositories().backend == "postgres":
+        from app.repositories.postgres import get_database
+
+        get_database().start()
+    else:
+        from app.db import get_supabase
+
+        get_supabase()
+
+
+def _warm_jwt() -> None:
+    import jwt
+
+    from app.auth import _ALGORITHM, _AUDIENCE, _decode_token
+    from app.config import SUPABASE_JWT_SECRET
+
+    if not SUPABASE_JWT_SECRET:
+        return
+    token = jwt.encode({"sub": "warmup", "aud": _AUDIENCE, "exp": int(time.time()) + 60}, SUPABASE_JWT_SECRET, _ALGORITHM)
+    _decode_token(token)
+
+
+def _prime_roles() -> int:
+    from app.auth import remember_roles
+    from app.repositories import get_repositories
+
+    users = get_repositories().users.list_all()
+    remember_roles({user["id"]: user.get("role") for user in users})
+    return len(users)
+
+
+def _prime_reservations(today: date) -> None:
+    from app.routers.reservations import list_reservations_around_month
+
+    list_reservations_around_month(date_eq=today.replace(day=1))
+
+
+def _active_events(events: List[Dict[str, Any]], today: date) -> List[str]:
+    active = []
+    for event in events:
+        if event.get("status") in _ACTIVE_TOURNAMENT_STATUSES:
+            active.append(event["id"])
+            continue
+        starts_on, ends_on = event.get("starts_on"), event.get("ends_on")
+        if starts_on and ends_on and starts_on <= today.isoformat() <= ends_on:
+            active.append(event["id"])
+    return active
+
+
+def _prime_tournaments(today: date) -> int:
+    from app.repositories import get_repositories
+    from app.routers.tournaments import list_tournaments, tournament_snapshot
+
+    # 직접 부를 때는 Query 기본값이 채워지지 않으므로 첫 화면의 파라미터를 그대로 넘긴다.
+    list_tournaments(status=None, start=None, end=None, limit=None, offset=0)
+    event_ids = _active_events(get_repositories().tournaments.list_all(), today)
+    for event_id in event_ids:
+        tournament_snapshot(event_id=event_id)
+    return len(event_ids)
+
+
+def warm_up(today: Optional[date] = None) -> Dict[str, Any]:
+    """클라이언트를 만들고, 커넥션을 열고, 자주 쓰는 캐시를 채운다. 동기 함수라 스레드에서 돌린다."""
+    today = today or datetime.now(KOREA_TIMEZONE).date()
+    report: Dict[str, Any] = {"started_at": datetime.now(timezone.utc).isoformat(), "steps": {}, "errors": {}}
+    started = time.perf_counter()
+
+    _step(report, "client", _open_client)
+    _step(report, "jwt", _warm_jwt)
+    # 캐시 채우기는 서로 독립이라 동시에 돌린다. 동시에 나가는 요청들이 커넥션 풀에
+    # 커넥션을 여러 개 미리 열어 두는 효과도 있다.
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="warmup") as pool:
+        futures = {
+            "roles": pool.submit(_step, report, "roles", _prime_roles),
+            "reservations": pool.submit(_step, report, "reservations", lambda: _prime_reservations(today)),
+            "tournaments": pool.submit(_step, report, "tournaments", lambda: _prime_tournaments(today)),
+        }
+        counts = {name: future.result() for name, future in futures.items()}
+
+    report["primed_roles"] = counts["roles"] or 0
+    report["primed_tournaments"] = counts["tournaments"] or 0
+    report["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    last_report.clear()
+    last_report.update(report)
+    logger.info("warm-up finished in %.1fms: %s", report["total_ms"], report["steps"])
+    return report
@@ -0,0 +1,134 @@
+"""완료된 대회 보관본 벤치마크와 동작 확인.
+
+가짜 PostgREST 위에서 완료된 대회 조회를 보관본(한 번 저장한 JSON 그대로) 경로와, 응답 캐시 없이 매번
+스냅샷을 계산하는 경로로 비교한다. 이어서 관리자의 완료/재개 흐름을 확인한다.
+
+- 보관 전에 완료된 대회는 처음 조회할 때 보관되고, 이후 조회는 upstream 호출 없이 ETag/Cache-Control과 함께 응답
+- If-None-Match가 맞으면 304
+- 완료된 대회의 대진 저장/결과 입력/정보 수정은 409, 상태를 바꿔 다시 열면 보관본이 지워지고 수정 가능
+- 다시 완료하면 바뀐 결과로 보관본을 새로 만들고 ETag가 바뀜
+
+    python -m bench.archives --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import List
+
+from bench.datasets import build_dataset
+from bench.endpoints import JWT_SECRET, Endpoint, make_token, run_endpoint
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+failures: List[str] = []
+
+
+def expect(condition: bool, message: str) -> None:
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def print_row(result: dict) -> None:
+    print(
+        f"{result['endpoint']:<34} {result['rps']:>8.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}"
+        f" {result['errors']:>6} {result['upstream_per_request']:>7.2f}",
+        flush=True,
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+
+    dataset = build_dataset(args.scale, args.seed)
+    backend = FakePostgrest(dataset.tables, delay=args.latency_ms / 1000).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    from app.cache import response_cache
+    from app.main import app
+
+    admin = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    event_id = dataset.tournament_ids[0]
+    path = f"/tournaments/{event_id}"
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            first = await client.get(path)
+            expect(first.status_code == 200 and first.json()["status"] == "completed", "완료된 대회 첫 조회")
+            expect(len(backend.tables.get("tournament_archives", [])) == 1, "첫 조회 때 보관본 저장")
+            second = await client.get(path)
+            etag = second.headers.get("etag")
+            expect(second.headers.get("x-cache") == "ARCHIVE" and bool(etag), f"보관본 응답 (ETag {etag})")
+            expect("no-cache" in second.headers.get("cache-control", ""), f"Cache-Control: {second.headers.get('cache-control')}")
+            expect(second.json() == first.json(), "보관본과 처음 계산한 스냅샷이 같음")
+            not_modified = await client.get(path, headers={"If-None-Match": etag})
+            expect(not_modified.status_code == 304 and not not_modified.content, f"If-None-Match → {not_modified.status_code}")
+
+            print(f"\n{'endpoint':<34} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6} {'calls':>7}")
+            response_cache.enabled = False
+            archived = await run_endpoint(
+                client, Endpoint("GET completed (archive)", "GET", lambda i: path), args.requests, args.concurrency, 5
+            )
+            print_row(archived)
+            live_id = dataset.tournament_ids[-1]
+            live = await run_endpoint(
+                client, Endpoint("GET ongoing (no cache)", "GET", lambda i: f"/tournaments/{live_id}"),
+                args.requests, args.concurrency, 5,
+            )
+            print_row(live)
+            response_cache.enabled = True
+            expect(archived["upstream_per_request"] == 0, f"보관본 조회는 upstream 호출 없음 ({archived['upstream_per_request']:.2f})")
+
+            print("\n완료/재개")
+            snapshot = first.json()
+            match = next(match for match in snapshot["matches"] if match.get("resolved_team_a_id") and match.get("resolved_team_b_id"))
+            result_path = f"{path}/matches/{match['id']}/result"
+            response = await client.patch(result_path, json={"team_a_score": 99, "team_b_score": 1}, headers=admin)
+            expect(response.status_code == 409, f"완료된 대회 결과 입력 → {response.status_code}")
+            response = await client.put(f"{path}/setup", json={"teams": []}, headers=admin)
+            expect(response.status_code == 409, f"완료된 대회 대진 저장 → {response.status_code}")
+            response = await client.patch(path, json={"title": "바뀐 이름"}, headers=admin)
+            expect(response.status_code == 409, f"완료된 대회 정보 수정 → {response.status_code}")
+            response = await client.patch(path, json={"status": "completed"}, headers=admin)
+            expect(response.status_code == 200, f"이미 완료된 대회를 다시 완료 → {response.status_code}")
+
+            response = await client.patch(path, json={"status": "ongoing"}, headers=admin)
+            expect(response.status_code == 200, f"다시 열기 → {response.status_code}")
+            expect(not backend.tables.get("tournament_archives"), "다시 열면 보관본 삭제")
+            reopened = await client.get(path)
+            expect(reopened.headers.get("x-cache") != "ARCHIVE", f"다시 연 대회는 계산한 스냅샷 ({reopened.headers.get('x-cache')})")
+            response = await client.patch(result_path, json={"team_a_score": 99, "team_b_score": 1}, headers=admin)
+            expect(response.status_code == 200, f"다시 연 대회 결과 입력 → {response.status_code}")
+
+            response = await client.patch(path, json={"status": "completed"}, headers=admin)
+            expect(response.status_code == 200, f"다시 완료 → {response.status_code}")
+            frozen = await client.get(path)
+            expect(frozen.headers.get("x-cache") == "ARCHIVE", "다시 완료하면 보관본 응답")
+            expect(frozen.headers.get("etag") != etag, "결과가 바뀌어 ETag도 바뀜")
+            changed = next(item for item in frozen.json()["matches"] if item["id"] == match["id"])
+            expect(changed["team_a_score"] == 99, "보관본에 바뀐 결과 반영")
+            stored = json.loads(backend.tables["tournament_archives"][0]["snapshot"])
+            expect(stored == frozen.json(), "저장된 보관본 그대로 응답")
+    finally:
+        backend.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="medium")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="가짜 PostgREST 왕복 지연")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""팀 자동 편성 벤치마크: 팀 평균 경력점수 고르기 vs 시간.
+
+참가자 수별로 세 방법을 비교한다.
+
+- random: 섞어서 앞에서부터 자름 (사람이 대충 나누는 경우)
+- greedy: 경력점수가 높은 사람부터 평균이 가장 낮은 팀에 (국소 탐색 없음)
+- search: greedy + swap 국소 탐색 (app.balancing 기본값)
+
+--spread를 주면 기수/전공이 겹치지 않게 하는 조건도 켠다. 같은 seed로 두 번 돌린 결과가 같은지,
+search가 greedy보다 나쁘지 않은지, 200명이 1초 안에 끝나는지 확인하고 어긋나면 0이 아닌 코드로 끝난다.
+--api는 가짜 PostgREST 위에서 POST /teams/balance 결과를 PUT /setup으로 확정해 본다.
+
+    python -m bench.balance --participants 60 200 500 1000 --spread
+    python -m bench.balance --api
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+from app.balancing import Balance, Participant, balance_teams, duplicate_pairs, team_sizes
+from bench.endpoints import JWT_SECRET, make_token
+
+MAJORS = ("철학", "법학", "경영", "컴퓨터공학", "국어국문", "사학", "정치외교", "경제", "사회", "심리")
+
+failures: List[str] = []
+
+
+def expect(condition: bool, message: str) -> None:
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def make_participants(count: int, seed: int) -> List[Participant]:
+    rng = random.Random(seed)
+    return [
+        Participant(
+            user_id=f"u{index}",
+            # 신입이 많고 경력자가 적은 분포
+            experience=rng.choices((1, 2, 3), weights=(5, 3, 2))[0],
+            generation=f"{rng.randint(20, 29)}기",
+            major=rng.choice(MAJORS),
+        )
+        for index in range(count)
+    ]
+
+
+def summary(teams: List[List[Participant]]) -> Dict[str, float]:
+    averages = [sum(member.experience for member in team) / len(team) for team in teams]
+    mean = sum(averages) / len(averages)
+    return {
+        "stdev": (sum((average - mean) ** 2 for average in averages) / len(averages)) ** 0.5,
+        "range": max(averages) - min(averages),
+        "generation": duplicate_pairs(teams, "generation"),
+        "major": duplicate_pairs(teams, "major"),
+    }
+
+
+def random_split(participants: List[Participant], team_size: int, seed: int) -> List[List[Participant]]:
+    order = list(participants)
+    random.Random(seed).shuffle(order)
+    teams, start = [], 0
+    for size in team_sizes(len(order), team_size):
+        teams.append(order[start : start + size])
+        start += size
+    return teams
+
+
+def run_quality(args: argparse.Namespace) -> None:
+    print(f"team_size={args.team_size} groups={args.groups} spread={'on' if args.spread else 'off'}")
+    print(f"{'n':>5} {'method':<8} {'ms':>8} {'stdev':>7} {'range':>6} {'gen dup':>8} {'major dup':>10} {'group range':>12}")
+    for count in args.participants:
+        participants = make_participants(count, args.seed)
+        options = {"spread_generation": args.spread, "spread_major": args.spread, "seed": args.seed}
+        runs: Dict[str, Balance] = {}
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        teams = random_split(participants, args.team_size, args.seed)
+        timings["random"] = (time.perf_counter() - started) * 1000
+        for name, extra in (("greedy", {"max_iterations": 0}), ("search", {})):
+            started = time.perf_counter()
+            runs[name] = balance_teams(participants, args.team_size, args.groups, **options, **extra)
+            timings[name] = (time.perf_counter() - started) * 1000
+        rows = [("random", summary(teams), None)]
+        rows += [(name, summary(run.teams), run.stats["group_experience_range"]) for name, run in runs.items()]
+        for name, stats, group_range in rows:
+            print(
+                f"{count:>5} {name:<8} {timings[name]:>8.1f} {stats['stdev']:>7.4f} {stats['range']:>6.2f}"
+                f" {stats['generation']:>8} {stats['major']:>10} {'-' if group_range is None else f'{group_range:.4f}':>12}",
+                flush=True,
+            )
+        again = balance_teams(participants, args.team_size, args.groups, **options)
+        same = [[m.user_id for m in team] for team in again.teams] == [[m.user_id for m in team] for team in runs["search"].teams]
+        expect(same and again.groups == runs["search"].groups, f"{count}명: 같은 seed면 같은 결과")
+        expect(runs["search"].stats["cost"] <= runs["greedy"].stats["cost"] + 1e-9, f"{count}명: search 비용 ≤ greedy 비용")
+        if count <= 200:
+            expect(timings["search"] < 1000, f"{count}명: {timings['search']:.0f}ms < 1초")
+
+
+async def run_api(args: argparse.Namespace) -> None:
+    import httpx
+
+    from bench.datasets import build_dataset
+    from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+    count = args.participants[0] if args.participants[0] <= 200 else 60
+    dataset = build_dataset("small", args.seed, tournaments=1, teams=4, members=count + 10)
+    backend = FakePostgrest(dataset.tables, delay=1 / 1000).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    from app.main import app
+
+    headers = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    event_id = dataset.tournament_ids[0]
+    rng = random.Random(args.seed)
+    # 기수/전공은 비워 회원 정보에서 채우게 한다.
+    body = {
+        "participants": [
+            {"user_id": user_id, "experience_score": rng.choice((1, 1, 2, 3))} for user_id in dataset.member_ids[:count]
+        ],
+        "team_size": args.team_size,
+        "group_count": args.groups,
+        "spread_generation": True,
+        "spread_major": True,
+        "seed": args.seed,
+    }
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            print(f"\nAPI ({count}명)")
+            started = time.perf_counter()
+            response = await client.post(f"/tournaments/{event_id}/teams/balance", json=body, headers=headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            expect(response.status_code == 200, f"편성 ({response.status_code}, {elapsed:.1f}ms)")
+            result = response.json()
+            print(f"  stats: {result['stats']}")
+            members = [member["user_id"] for team in result["teams"] for member in team["members"]]
+            expect(sorted(members) == sorted(dataset.member_ids[:count]), "모든 참가자가 한 팀에만")
+            again = await client.post(f"/tournaments/{event_id}/teams/balance", json=body, headers=headers)
+            expect(again.json() == result, "같은 seed면 같은 응답")
+            duplicate = {**body, "participants": body["participants"] + body["participants"][:1]}
+            response = await client.post(f"/tournaments/{event_id}/teams/balance", json=duplicate, headers=headers)
+            expect(response.status_code == 400, f"중복 참가자는 400 ({response.status_code})")
+            response = await client.put(f"/tournaments/{event_id}/setup", json={"teams": result["teams"]}, headers=headers)
+            expect(response.status_code == 200, f"편성 결과를 그대로 확정 ({response.status_code})")
+    finally:
+        backend.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, nargs="+", default=[60, 200, 500, 1000])
+    parser.add_argument("--team-size", type=int, default=3)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--spread", action="store_true", help="기수/전공 겹침 줄이기 켜기")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--api", action="store_true", help="가짜 PostgREST 위에서 편성/확정 API도 확인")
+    args = parser.parse_args()
+
+    run_quality(args)
+    if args.api:
+        asyncio.run(run_api(args))
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""iCalendar 피드 벤치마크와 동작 확인.
+
+가짜 PostgREST 위에서 캘린더 앱의 폴링(한 시간마다 If-None-Match를 붙여 같은 주소를 다시 부름)을
+흉내 내어, 바뀐 것이 없을 때 304와 upstream 호출 0으로 끝나는지 확인하고 처리량을 잰다.
+
+- 피드 형식: CRLF 줄바꿈, 75옥텟 줄 접기, VEVENT 수가 기간 안의 예약/대회 경기 수와 같음
+- If-None-Match / If-Modified-Since → 304
+- 예약이 생기면 ETag가 바뀌고, 새 예약의 VEVENT 하나만 새로 렌더링
+- 개인 피드는 본인 예약만, 서명이 틀린 주소는 404
+- 경기 결과를 입력하면 대회 피드의 ETag가 바뀌고 결과가 설명에 들어감
+
+    python -m bench.calendar --requests 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from bench.datasets import build_dataset
+from bench.endpoints import JWT_SECRET, Endpoint, make_token, run_endpoint
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+failures: List[str] = []
+
+
+def expect(condition: bool, message: str) -> None:
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def print_row(result: dict) -> None:
+    print(
+        f"{result['endpoint']:<40} {result['rps']:>8.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}"
+        f" {result['errors']:>6} {result['upstream_per_request']:>7.2f}",
+        flush=True,
+    )
+
+
+def unfold(body: bytes) -> List[str]:
+    return body.decode().replace("\r\n ", "").split("\r\n")
+
+
+def check_format(body: bytes, label: str) -> None:
+    lines = body.split(b"\r\n")
+    expect(body.startswith(b"BEGIN:VCALENDAR\r\n") and body.endswith(b"END:VCALENDAR\r\n"), f"{label}: VCALENDAR로 감쌈")
+    expect(all(len(line) <= 75 for line in lines), f"{label}: 모든 줄이 75옥텟 이하")
+    expect(b"\n" not in body.replace(b"\r\n", b""), f"{label}: CRLF 줄바꿈만 사용")
+
+
+def in_window(row: dict, start: datetime, end: datetime) -> bool:
+    return start <= datetime.fromisoformat(row["starts_at"]) < end
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+
+    dataset = build_dataset(args.scale, args.seed)
+    backend = FakePostgrest(dataset.tables, delay=args.latency_ms / 1000).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    from app.config import CALENDAR_FUTURE_DAYS, CALENDAR_PAST_DAYS
+    from app.ical import render_event
+    from app.main import app
+    from app.tracing import capture_queries
+
+    admin = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    member_id = dataset.member_ids[0]
+    member = {"Authorization": f"Bearer {make_token(member_id)}"}
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start, end = today - timedelta(days=CALENDAR_PAST_DAYS), today + timedelta(days=CALENDAR_FUTURE_DAYS)
+    path = "/reservations/calendar.ics"
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            print("방 예약 피드")
+            first = await client.get(path)
+            expect(first.status_code == 200, f"GET {path} → {first.status_code}")
+            expect(first.headers.get("content-type", "").startswith("text/calendar"), f"Content-Type: {first.headers.get('content-type')}")
+            check_format(first.content, "예약 피드")
+            expected = sum(1 for row in backend.tables["reservations"] if in_window(row, start, end))
+            expect(first.content.count(b"BEGIN:VEVENT") == expected, f"VEVENT {first.content.count(b'BEGIN:VEVENT')}개 = 기간 안 예약 {expected}개")
+            etag, last_modified = first.headers.get("etag"), first.headers.get("last-modified")
+            with capture_queries() as log:
+                by_etag = await client.get(path, headers={"If-None-Match": etag})
+                by_date = await client.get(path, headers={"If-Modified-Since": last_modified})
+            expect(by_etag.status_code == 304 and not by_etag.content, f"If-None-Match → {by_etag.status_code}")
+            expect(by_date.status_code == 304, f"If-Modified-Since → {by_date.status_code}")
+            expect(log.count == 0, f"다시 부를 때 upstream 호출 없음 ({log.count})")
+            gzipped = await client.get(path, headers={"Accept-Encoding": "gzip"})
+            expect(gzipped.headers.get("content-encoding") == "gzip" and gzipped.content == first.content, "gzip 압축본")
+
+            renders = render_event.cache_info().misses
+            starts_at = today + timedelta(days=1, hours=args.seed % 5)
+            created = await client.post(
+                "/reservations",
+                json={"starts_at": starts_at.isoformat(), "ends_at": (starts_at + timedelta(minutes=30)).isoformat(),
+                      "title": "캘린더, 확인; 예약"},
+                headers=member,
+            )
+            expect(created.status_code == 200, f"예약 생성 → {created.status_code}")
+            changed = await client.get(path, headers={"If-None-Match": etag})
+            expect(changed.status_code == 200 and changed.headers.get("etag") != etag, f"예약이 생기면 새 ETag로 200 ({changed.status_code})")
+            expect(changed.content.count(b"BEGIN:VEVENT") == expected + 1, "새 예약이 피드에 들어감")
+            expect(render_event.cache_info().misses - renders == 1, f"새로 렌더링한 VEVENT {render_event.cache_info().misses - renders}개")
+            expect("SUMMARY:캘린더\\, 확인\\; 예약" in " ".join(unfold(changed.content)), "SUMMARY의 쉼표/세미콜론 이스케이프")
+
+            print("\n개인 피드")
+            subscription = await client.get("/reservations/me/calendar", headers=member)
+            personal_path = subscription.json()["path"]
+            personal = await client.get(personal_path)
+            mine = sum(1 for row in backend.tables["reservations"]
+                       if row.get("reserved_by") == member_id and datetime.fromisoformat(row["starts_at"]) >= start)
+            expect(personal.status_code == 200 and "private" in personal.headers.get("cache-control", ""), f"개인 피드 → {personal.status_code}")
+            expect(personal.content.count(b"BEGIN:VEVENT") == mine, f"본인 예약 {mine}개만")
+            tampered = personal_path.replace(".ics", "x.ics")
+            expect((await client.get(tampered)).status_code == 404, "서명이 틀린 주소 → 404")
+            other = make_token(dataset.member_ids[1])
+            other_path = (await client.get("/reservations/me/calendar", headers={"Authorization": f"Bearer {other}"})).json()["path"]
+            expect(other_path != personal_path, "회원마다 다른 주소")
+
+            print("\n대회 피드")
+            event_id = dataset.tournament_ids[-1]
+            tournament_path = f"/tournaments/{event_id}/calendar.ics"
+            feed = await client.get(tournament_path)
+            matches = [row for row in backend.tables["tournament_matches"] if row["tournament_id"] == event_id]
+            expect(feed.status_code == 200 and feed.content.count(b"BEGIN:VEVENT") == len(matches), f"경기 {len(matches)}개")
+            check_format(feed.content, "대회 피드")
+            snapshot = (await client.get(f"/tournaments/{event_id}")).json()
+            match = next(item for item in snapshot["matches"] if item.get("resolved_team_a_id") and item.get("resolved_team_b_id"))
+            response = await client.patch(
+                f"/tournaments/{event_id}/matches/{match['id']}/result", json={"team_a_score": 77, "team_b_score": 3}, headers=admin
+            )
+            expect(response.status_code == 200, f"결과 입력 → {response.status_code}")
+            updated = await client.get(tournament_path, headers={"If-None-Match": feed.headers.get("etag")})
+            expect(updated.status_code == 200, f"결과가 바뀌면 200 ({updated.status_code})")
+            expect(any("77 : 3" in line for line in unfold(updated.content)), "설명에 경기 결과")
+            completed = dataset.tournament_ids[0]
+            archived = await client.get(f"/tournaments/{completed}/calendar.ics")
+            expect(archived.status_code == 200 and b"BEGIN:VEVENT" in archived.content, "완료된 대회는 보관본으로 피드 생성")
+            expect((await client.get("/tournaments/00000000-0000-0000-0000-000000000000/calendar.ics")).status_code == 404, "없는 대회 → 404")
+
+            print(f"\n{'endpoint':<40} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6} {'calls':>7}")
+            month = dataset.anchor.replace(day=1)
+            etag = (await client.get(path)).headers["etag"]
+            rows = [
+                (Endpoint("GET /reservations/month", "GET", lambda i: f"/reservations/month?date={month.isoformat()}"), {}),
+                (Endpoint("GET calendar.ics", "GET", lambda i: path), {}),
+                (Endpoint("GET calendar.ics (If-None-Match)", "GET", lambda i: path), {"If-None-Match": etag}),
+            ]
+            for endpoint, headers in rows:
+                client.headers.update(headers)
+                print_row(await run_endpoint(client, endpoint, args.requests, args.concurrency, 5))
+                for name in headers:
+                    client.headers.pop(name)
+    finally:
+        backend.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="medium")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="가짜 PostgREST 왕복 지연")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
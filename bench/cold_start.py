@@ -0,0 +1,146 @@
+"""콜드 스타트 측정: import 시간과 첫 응답까지의 시간.
+
+1) 새 인터프리터에서 `import app.main`에 걸리는 시간을 여러 번 재고, `-X importtime`으로
+   app.main이 직접 import하는 모듈 중 시간이 가장 많이 드는 것을 보여준다.
+2) 가짜 PostgREST를 띄우고 uvicorn 프로세스를 새로 시작해, 프로세스 시작 → 포트 열림 →
+   각 경로의 첫 응답/두 번째 응답까지의 시간을 워밍업을 끈 경우와 켠 경우로 비교한다.
+
+    python -m bench.cold_start --runs 5 --latency-ms 20
+"""
+
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from bench.datasets import build_dataset
+from bench.endpoints import JWT_SECRET, make_token
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+ROOT = Path(__file__).resolve().parent.parent
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _python(args: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def measure_imports(runs: int, env: Dict[str, str], top: int) -> None:
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    samples = [float(_python(["-c", code], env).stdout.strip()) * 1000 for _ in range(runs)]
+    print(f"import app.main: median {statistics.median(samples):.1f}ms  min {min(samples):.1f}ms  ({runs} runs)")
+
+    stderr = _python(["-X", "importtime", "-c", "import app.main"], env).stderr
+    roots: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        cumulative, indent, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        # app.main 한 줄이 들여쓰기 1칸이고, app.main이 직접 import한 모듈이 3칸이다.
+        if indent == 3:
+            roots[module] = roots.get(module, 0) + cumulative
+    print(f"{'imported by app.main':<32} {'cumulative ms':>14}")
+    for package, micros in sorted(roots.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<32} {micros / 1000:>14.1f}")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.05):
+                return
+        except OSError:
+            time.sleep(0.005)
+    raise TimeoutError(f"uvicorn did not open port {port}")
+
+
+def first_responses(env: Dict[str, str], paths: List[Tuple[str, Dict[str, str]]]) -> Dict[str, float]:
+    import httpx
+
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        _wait_for_port(port, started + 60)
+        timings = {"port open": (time.perf_counter() - started) * 1000}
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+            for path, headers in paths:
+                for attempt in ("1st", "2nd"):
+                    began = time.perf_counter()
+                    response = client.get(path, headers=headers)
+                    response.raise_for_status()
+                    timings[f"{attempt} {path.split('?')[0][:40]}"] = (time.perf_counter() - began) * 1000
+        timings["total to last response"] = (time.perf_counter() - started) * 1000
+        return timings
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="반복 횟수 (중앙값을 보고)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="가짜 PostgREST 왕복 지연 (리전 간 RTT 흉내)")
+    parser.add_argument("--top", type=int, default=12, help="import 시간 상위 몇 개를 보여줄지")
+    args = parser.parse_args()
+
+    dataset = build_dataset("small", 7)
+    backend = FakePostgrest(dataset.tables, delay=args.latency_ms / 1000).start()
+    env = {
+        **os.environ,
+        "SUPABASE_URL": backend.url,
+        "SUPABASE_SERVICE_ROLE_KEY": FAKE_SERVICE_KEY,
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "PYTHONPATH": str(ROOT),
+    }
+    admin = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    month = date.today().replace(day=1).isoformat()
+    ongoing = next(
+        (event["id"] for event in dataset.tables["tournaments"] if event["status"] == "ongoing"),
+        dataset.tournament_ids[-1],
+    )
+    paths = [
+        ("/health", {}),
+        (f"/tournaments/{ongoing}", {}),
+        (f"/reservations/month?date={month}", {}),
+        ("/admin/cache", admin),
+    ]
+
+    try:
+        measure_imports(args.runs, env, args.top)
+        print()
+        results: Dict[str, List[Dict[str, float]]] = {}
+        for label, enabled in (("warm-up off", "false"), ("warm-up on", "true")):
+            run_env = {**env, "WARMUP_ENABLED": enabled}
+            results[label] = [first_responses(run_env, paths) for _ in range(args.runs)]
+    finally:
+        backend.stop()
+
+    keys = list(results["warm-up off"][0])
+    print(f"{'median ms':<46} {'warm-up off':>12} {'warm-up on':>12}")
+    for key in keys:
+        off = statistics.median(run[key] for run in results["warm-up off"])
+        on = statistics.median(run[key] for run in results["warm-up on"])
+        print(f"{key:<46} {off:>12.1f} {on:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
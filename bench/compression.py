@@ -0,0 +1,113 @@
+"""응답 압축 측정: 인코딩별 전송 바이트와 요청당 CPU 비용.
+
+1) 대표 페이로드를 인코딩/레벨별로 압축해 크기와 압축 시간을 잰다.
+2) 가짜 PostgREST에 붙은 앱으로 GET /tournaments/{id}를 반복 호출하며
+   Accept-Encoding별 전송 바이트와 요청당 CPU 시간을 잰다. 캐시에 압축본을
+   보관하는 경우와, 캐시를 끄고 미들웨어가 매번 압축하는 경우를 비교한다.
+
+    python -m bench.compression --requests 300
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+from bench.serialization import member_stats_payload, reservations_payload, snapshot_payload
+
+EVENT_ID = "00000000-0000-0000-0000-0000000000c1"
+
+
+def _event_tables(rng: random.Random, teams: int = 16, matches: int = 64) -> dict:
+    team_rows = [
+        {"id": f"team-{i}", "tournament_id": EVENT_ID, "name": f"팀 {i}", "group_name": "ABCD"[i % 4],
+         "seed": i, "experience_score": 2}
+        for i in range(teams)
+    ]
+    start = datetime(2026, 10, 19, 1, tzinfo=timezone.utc)
+    match_rows = [
+        {"id": f"match-{i}", "tournament_id": EVENT_ID, "stage": "group", "group_name": "ABCD"[i % 4],
+         "round_label": f"{i // 4 + 1}라운드", "starts_at": (start + timedelta(minutes=30 * i)).isoformat(),
+         "venue": "대강당", "team_a_id": f"team-{i % teams}", "team_b_id": f"team-{(i + 4) % teams}",
+         "team_a_score": rng.randint(50, 100), "team_b_score": rng.randint(50, 100),
+         "winner_team_id": f"team-{i % teams}", "status": "completed", "notes": ""}
+        for i in range(matches)
+    ]
+    member_rows = [
+        {"id": i, "team_id": f"team-{i % teams}", "user_id": f"user-{i}", "experience_score": rng.randint(1, 3)}
+        for i in range(teams * 3)
+    ]
+    return {
+        "tournaments": [{"id": EVENT_ID, "title": "가을 토너먼트", "points_per_win": 1, "status": "ongoing"}],
+        "tournament_teams": team_rows,
+        "tournament_team_members": member_rows,
+        "tournament_matches": match_rows,
+    }
+
+
+def payload_table(rng: random.Random) -> None:
+    from app.compression import compress, supported_encodings
+    from app.serialization import dumps
+
+    payloads = [
+        ("event snapshot", dumps(snapshot_payload(rng))),
+        ("member stats", dumps(member_stats_payload(rng))),
+        ("reservations 3 months", dumps(reservations_payload(rng))),
+    ]
+    print(f"{'payload':<24} {'encoding':<12} {'bytes':>8} {'ratio':>7} {'ms':>8}")
+    for label, body in payloads:
+        print(f"{label:<24} {'identity':<12} {len(body):>8} {1:>7.3f} {0:>8.3f}")
+        for encoding in supported_encodings():
+            for stored in (False, True):
+                started = time.perf_counter()
+                for _ in range(20):
+                    out = compress(body, encoding, stored=stored)
+                elapsed = (time.perf_counter() - started) / 20
+                name = f"{encoding}/{'stored' if stored else 'dynamic'}"
+                print(f"{label:<24} {name:<12} {len(out):>8} {len(out) / len(body):>7.3f} {elapsed * 1000:>8.3f}")
+    print()
+
+
+def end_to_end(requests: int) -> None:
+    from fastapi.testclient import TestClient
+
+    from app.cache import response_cache
+    from app.main import app
+
+    client = TestClient(app)
+    print(f"{'mode':<28} {'accept-encoding':<16} {'wire bytes':>10} {'cpu ms/req':>11}")
+    for cache_enabled in (True, False):
+        response_cache.enabled = cache_enabled
+        response_cache.clear()
+        mode = "cache (precompressed)" if cache_enabled else "no cache (compress each)"
+        for accept in ("identity", "gzip", "br"):
+            client.get(f"/tournaments/{EVENT_ID}", headers={"Accept-Encoding": accept})
+            wire = 0
+            cpu_started = time.process_time()
+            for _ in range(requests):
+                response = client.get(f"/tournaments/{EVENT_ID}", headers={"Accept-Encoding": accept})
+                wire += response.num_bytes_downloaded
+            cpu = (time.process_time() - cpu_started) / requests
+            print(f"{mode:<28} {accept:<16} {wire // requests:>10} {cpu * 1000:>11.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    backend = FakePostgrest(_event_tables(rng)).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+
+    payload_table(rng)
+    end_to_end(args.requests)
+    backend.stop()
+
+
+if __name__ == "__main__":
+    main()
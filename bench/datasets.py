@@ -0,0 +1,257 @@
+"""벤치마크용 시드 고정 합성 데이터셋.
+
+같은 시드와 규모면 항상 같은 행이 나온다. 스키마는 sql/schema.sql을 따른다.
+
+    dataset = build_dataset("medium", seed=7)
+    backend = FakePostgrest(dataset.tables)
+"""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+Row = Dict[str, Any]
+
+# 규모별 행 수: 회원, 토론, 토론 기록, 예약(기준일 앞뒤 6개월), 대회, 대회당 팀 수
+SCALES: Dict[str, Dict[str, int]] = {
+    "small": {"members": 60, "debates": 40, "records": 30, "reservations": 200, "tournaments": 2, "teams": 8},
+    "medium": {"members": 300, "debates": 200, "records": 150, "reservations": 1500, "tournaments": 4, "teams": 16},
+    "large": {"members": 1500, "debates": 1000, "records": 600, "reservations": 8000, "tournaments": 10, "teams": 32},
+}
+
+ANCHOR = date(2026, 10, 19)
+_SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+_GIVEN = ["민준", "서연", "도윤", "지우", "하준", "서윤", "시우", "지민", "예준", "수아", "주원", "하은"]
+_MAJORS = ["경영학과", "법학과", "철학과", "정치외교학과", "경제학과", "컴퓨터학부", "국어국문학과"]
+_TOPICS = ["기본소득 도입", "사형제 폐지", "대학 등록금 무상화", "원자력 발전 확대", "SNS 실명제", "주 4일제"]
+_CATEGORIES = ["정치", "경제", "사회", "과학", "교육"]
+
+
+@dataclass
+class Dataset:
+    scale: str
+    seed: int
+    tables: Dict[str, List[Row]]
+    admin_id: str
+    member_ids: List[str]
+    debate_ids: List[str]
+    tournament_ids: List[str]
+    # login-lookup에 쓸 (이름, 학번)
+    credentials: List[tuple] = field(default_factory=list)
+    anchor: date = ANCHOR
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _users(rng: random.Random, count: int) -> List[Row]:
+    rows = []
+    for index in range(count):
+        student_id = f"20{rng.randint(18, 26)}{index:05d}"
+        rows.append(
+            {
+                "id": _uuid(rng),
+                "email": f"{student_id}@member.manjang.site",
+                "name": rng.choice(_SURNAMES) + rng.choice(_GIVEN),
+                "student_id": student_id,
+                "major": rng.choice(_MAJORS),
+                "generation": f"{rng.randint(1, 20)}기",
+                "role": "admin" if index < 3 else "member",
+                "must_change_password": False,
+                "created_at": "2026-03-02T00:00:00+00:00",
+            }
+        )
+    return rows
+
+
+def _debates(rng: random.Random, count: int, users: List[Row]) -> tuple:
+    debates, participants, serial = [], [], 0
+    for index in range(count):
+        debate_id = _uuid(rng)
+        roster = rng.sample(users, k=min(len(users), rng.choice((2, 4, 6, 8))))
+        names = [user["name"] for user in roster]
+        debates.append(
+            {
+                "id": debate_id,
+                "topic_text": rng.choice(_TOPICS),
+                "debate_date": (ANCHOR - timedelta(days=rng.randint(0, 365))).isoformat(),
+                "debate_type": rng.choice(("자유토론", "SSU토론")),
+                "participant_names": names,
+                "winner_side": rng.choice(("pro", "con", None)),
+                "notes": None,
+                "created_by": users[0]["id"],
+            }
+        )
+        for position, user in enumerate(roster):
+            serial += 1
+            participants.append(
+                {
+                    "id": serial,
+                    "debate_id": debate_id,
+                    "user_id": user["id"],
+                    "participant_name": user["name"],
+                    "side": "pro" if position % 2 == 0 else "con",
+                }
+            )
+    return debates, participants
+
+
+def _records(rng: random.Random, count: int, users: List[Row]) -> List[Row]:
+    rows = []
+    for index in range(count):
+        names = [user["name"] for user in rng.sample(users, k=min(len(users), 4))]
+        topic = rng.choice(_TOPICS)
+        rows.append(
+            {
+                "id": _uuid(rng),
+                "title": f"{topic} #{index}",
+                "category": rng.choice(_CATEGORIES),
+                "date": (ANCHOR - timedelta(days=rng.randint(0, 720))).isoformat(),
+                "summary": f"{topic}에 대한 찬반 토론 요약입니다. " * 4,
+                "keyPoints": [f"논점 {n}" for n in range(1, 4)],
+                "conclusion": "결론: 추가 논의가 필요하다.",
+                "participants": len(names),
+                "participantNames": names,
+                "inserted_at": "2026-03-02T00:00:00+00:00",
+            }
+        )
+    return rows
+
+
+def _reservations(rng: random.Random, count: int, users: List[Row], debates: List[Row]) -> List[Row]:
+    # 기준일 앞뒤 6개월, 하루 9~21시 사이 1~3시간짜리 예약
+    rows = []
+    start = datetime(ANCHOR.year, ANCHOR.month, 1, tzinfo=timezone.utc) - timedelta(days=183)
+    for _ in range(count):
+        owner = rng.choice(users)
+        starts_at = start + timedelta(days=rng.randint(0, 366), hours=rng.randint(0, 12))
+        starts_at = starts_at.replace(hour=9 + starts_at.hour % 12)
+        rows.append(
+            {
+                "id": _uuid(rng),
+                "reserved_by": owner["id"],
+                "reserved_by_name": owner["name"],
+                "title": "토론 연습",
+                "starts_at": starts_at.isoformat(),
+                "ends_at": (starts_at + timedelta(hours=rng.randint(1, 3))).isoformat(),
+                "debate_id": rng.choice(debates)["id"] if debates and rng.random() < 0.3 else None,
+                "allow_simultaneous": rng.random() < 0.5,
+                "created_at": "2026-03-02T00:00:00+00:00",
+            }
+        )
+    return rows
+
+
+def _tournaments(rng: random.Random, count: int, teams_per_event: int, users: List[Row]) -> Dict[str, List[Row]]:
+    events, teams, members, matches = [], [], [], []
+    member_serial = 0
+    for index in range(count):
+        event_id = _uuid(rng)
+        starts_on = ANCHOR - timedelta(days=30 * (count - index - 1))
+        events.append(
+            {
+                "id": event_id,
+                "title": f"{2026 - index // 4}년 {index % 4 + 1}차 토너먼트",
+                "topic": rng.choice(_TOPICS),
+                "description": "",
+                "debate_format": "자유토론",
+                "starts_on": starts_on.isoformat(),
+                "ends_on": (starts_on + timedelta(days=1)).isoformat(),
+                "venue": "대강당",
+                "status": "ongoing" if index == count - 1 else "completed",
+                "points_per_win": 1,
+                "created_by": users[0]["id"],
+                "created_at": "2026-03-02T00:00:00+00:00",
+            }
+        )
+        groups = "ABCD"[: max(1, teams_per_event // 4)]
+        event_teams = []
+        roster = rng.sample(users, k=min(len(users), teams_per_event * 3))
+        for team_index in range(teams_per_event):
+            team = {
+                "id": _uuid(rng),
+                "tournament_id": event_id,
+                "client_key": f"t{team_index}",
+                "name": f"팀 {team_index + 1}",
+                "group_name": groups[team_index % len(groups)],
+                "seed": team_index // len(groups),
+                "experience_score": 0,
+            }
+            event_teams.append(team)
+            for user in roster[team_index * 3 : team_index * 3 + 3]:
+                member_serial += 1
+                members.append(
+                    {
+                        "id": member_serial,
+                        "team_id": team["id"],
+                        "user_id": user["id"],
+                        "experience_score": rng.randint(1, 3),
+                    }
+                )
+        teams.extend(event_teams)
+        kickoff = datetime(starts_on.year, starts_on.month, starts_on.day, 1, tzinfo=timezone.utc)
+        slot = 0
+        for group in groups:
+            group_teams = [team for team in event_teams if team["group_name"] == group]
+            for a_index, team_a in enumerate(group_teams):
+                for team_b in group_teams[a_index + 1 :]:
+                    completed = events[-1]["status"] == "completed" or rng.random() < 0.5
+                    score_a, score_b = rng.randint(50, 100), rng.randint(50, 100)
+                    matches.append(
+                        {
+                            "id": _uuid(rng),
+                            "tournament_id": event_id,
+                            "stage": "group",
+                            "group_name": group,
+                            "round_label": f"{group}조",
+                            "starts_at": (kickoff + timedelta(minutes=40 * slot)).isoformat(),
+                            "venue": "대강당",
+                            "team_a_id": team_a["id"],
+                            "team_b_id": team_b["id"],
+                            "team_a_source_group": None,
+                            "team_b_source_group": None,
+                            "team_a_score": score_a if completed else None,
+                            "team_b_score": score_b if completed else None,
+                            "winner_team_id": (team_a if score_a >= score_b else team_b)["id"] if completed else None,
+                            "status": "completed" if completed else "scheduled",
+                            "notes": "",
+                        }
+                    )
+                    slot += 1
+    return {
+        "tournaments": events,
+        "tournament_teams": teams,
+        "tournament_team_members": members,
+        "tournament_matches": matches,
+    }
+
+
+def build_dataset(scale: str = "small", seed: int = 7, **overrides: int) -> Dataset:
+    """scale의 크기로 데이터셋을 만든다. overrides로 일부 크기만 바꿀 수 있다(예: tournaments=300)."""
+    if scale not in SCALES:
+        raise ValueError(f"unknown scale {scale!r}; choose from {', '.join(SCALES)}")
+    sizes = {**SCALES[scale], **overrides}
+    rng = random.Random(f"{scale}:{seed}")
+    users = _users(rng, sizes["members"])
+    debates, participants = _debates(rng, sizes["debates"], users)
+    tables: Dict[str, List[Row]] = {
+        "users": users,
+        "debates": debates,
+        "debate_participants": participants,
+        "records": _records(rng, sizes["records"], users),
+        "reservations": _reservations(rng, sizes["reservations"], users, debates),
+        **_tournaments(rng, sizes["tournaments"], sizes["teams"], users),
+    }
+    return Dataset(
+        scale=scale,
+        seed=seed,
+        tables=tables,
+        admin_id=users[0]["id"],
+        member_ids=[user["id"] for user in users[3:]],
+        debate_ids=[debate["id"] for debate in debates],
+        tournament_ids=[event["id"] for event in tables["tournaments"]],
+        credentials=[(user["name"], user["student_id"]) for user in users],
+    )
@@ -0,0 +1,217 @@
+"""엔드포인트별 처리량/지연시간 벤치마크 (오프라인).
+
+시드 고정 합성 데이터셋을 가짜 PostgREST/auth 서버에 올리고, 실제 supabase-py 클라이언트로
+붙은 앱을 httpx ASGITransport로 호출한다. 엔드포인트마다 요청 수, 처리량, p50/p95/p99,
+오류 수, 요청당 upstream 호출 수를 출력한다.
+
+    python -m bench.endpoints --scale medium --latency-ms 5 --jitter-ms 5
+    python -m bench.endpoints --scale large --no-cache --only tournaments --json result.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import jwt
+
+from bench.datasets import SCALES, Dataset, build_dataset
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+JWT_SECRET = "bench-jwt-secret"
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    path: Callable[[int], str]
+    token: Optional[str] = None
+    body: Optional[Callable[[int], Any]] = None
+
+
+def make_token(user_id: str) -> str:
+    payload = {"sub": user_id, "aud": "authenticated", "exp": int(time.time()) + 3600}
+    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def endpoints(dataset: Dataset) -> List[Endpoint]:
+    admin = make_token(dataset.admin_id)
+    member_id = dataset.member_ids[0]
+    member = make_token(member_id)
+    tables = dataset.tables
+    debate_id = dataset.debate_ids[0]
+    event_id = dataset.tournament_ids[-1]
+    month = dataset.anchor.replace(day=1)
+    roster = [row for row in tables["debate_participants"] if row["debate_id"] == debate_id]
+    match = next(row for row in tables["tournament_matches"] if row["tournament_id"] == event_id)
+    name, student_id = dataset.credentials[5]
+    # 대회 팀에 속한 회원 (회원별 대회 전적)
+    player_id = tables["tournament_team_members"][0]["user_id"]
+    # 예약 생성은 기존 예약과 겹치지 않는 미래 구간에 3시간 간격으로 넣는다.
+    slot_base = datetime(dataset.anchor.year + 2, 1, 1, 9, tzinfo=timezone.utc)
+
+    def reservation(i: int) -> Dict[str, Any]:
+        starts_at = slot_base + timedelta(hours=3 * i)
+        return {"starts_at": starts_at.isoformat(), "ends_at": (starts_at + timedelta(hours=2)).isoformat(),
+                "title": "벤치마크 예약"}
+
+    def roster_update(i: int) -> Dict[str, Any]:
+        entries = [{"user_id": row["user_id"], "side": row["side"]} for row in roster]
+        if i % 2:
+            entries = [{**entry, "side": "con" if entry["side"] == "pro" else "pro"} for entry in entries]
+        return {"participants": entries, "winner_side": "pro" if i % 2 else "con"}
+
+    return [
+        Endpoint("GET /health", "GET", lambda i: "/health"),
+        Endpoint("GET /records", "GET", lambda i: "/records"),
+        Endpoint("GET /records?search", "GET", lambda i: f"/records?search={name}"),
+        Endpoint("GET /debates", "GET", lambda i: "/debates"),
+        Endpoint("GET /debates/{id}", "GET", lambda i: f"/debates/{debate_id}"),
+        Endpoint("PUT /debates/{id}/participants", "PUT", lambda i: f"/debates/{debate_id}/participants",
+                 admin, roster_update),
+        Endpoint("GET /members", "GET", lambda i: "/members", admin),
+        Endpoint("GET /members/me", "GET", lambda i: "/members/me", member),
+        Endpoint("GET /members/me/debates", "GET", lambda i: "/members/me/debates", member),
+        Endpoint("GET /members/stats", "GET", lambda i: "/members/stats"),
+        Endpoint("GET /members/{id}/tournaments", "GET", lambda i: f"/members/{player_id}/tournaments"),
+        Endpoint("GET /members/me/tournaments", "GET", lambda i: "/members/me/tournaments", make_token(player_id)),
+        Endpoint("POST /auth/login-lookup", "POST", lambda i: "/auth/login-lookup", None,
+                 lambda i: {"name": name, "student_id": student_id}),
+        Endpoint("GET /reservations", "GET",
+                 lambda i: f"/reservations?start={month.isoformat()}&end={(month + timedelta(days=31)).isoformat()}"),
+        Endpoint("GET /reservations/month", "GET", lambda i: f"/reservations/month?date={month.isoformat()}"),
+        Endpoint("POST /reservations", "POST", lambda i: "/reservations", member, reservation),
+        Endpoint("GET /reservations/calendar.ics", "GET", lambda i: "/reservations/calendar.ics"),
+        Endpoint("GET /tournaments", "GET", lambda i: "/tournaments"),
+        Endpoint("GET /tournaments/{id}", "GET", lambda i: f"/tournaments/{event_id}"),
+        Endpoint("GET /tournaments/{id}/calendar.ics", "GET", lambda i: f"/tournaments/{event_id}/calendar.ics"),
+        Endpoint("PATCH /tournaments/{id}/matches/{id}/result", "PATCH",
+                 lambda i: f"/tournaments/{event_id}/matches/{match['id']}/result", admin,
+                 lambda i: {"team_a_score": 60 + i % 30, "team_b_score": 70}),
+    ]
+
+
+async def run_endpoint(client: Any, endpoint: Endpoint, requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    from app.tracing import capture_queries
+
+    headers = {"Authorization": f"Bearer {endpoint.token}"} if endpoint.token else {}
+    counter = iter(range(10**9))
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    async def one(record: bool) -> None:
+        i = next(counter)
+        body = endpoint.body(i) if endpoint.body else None
+        started = time.perf_counter()
+        response = await client.request(endpoint.method, endpoint.path(i), headers=headers, json=body)
+        if record:
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    for _ in range(warmup):
+        await one(record=False)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited() -> None:
+        async with semaphore:
+            await one(record=True)
+
+    with capture_queries() as log:
+        started = time.perf_counter()
+        await asyncio.gather(*(limited() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if status >= 400)
+    return {
+        "endpoint": endpoint.name,
+        "requests": requests,
+        "rps": requests / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "errors": errors,
+        "statuses": statuses,
+        "upstream_per_request": log.count / requests if requests else 0.0,
+    }
+
+
+async def run(args: argparse.Namespace, dataset: Dataset) -> List[Dict[str, Any]]:
+    import httpx
+
+    from app.cache import response_cache
+    from app.main import app
+
+    response_cache.enabled = not args.no_cache
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in endpoints(dataset):
+            if args.only and not any(token in endpoint.name for token in args.only):
+                continue
+            response_cache.clear()
+            result = await run_endpoint(client, endpoint, args.requests, args.concurrency, args.warmup)
+            results.append(result)
+            print(
+                f"{result['endpoint']:<46} {result['rps']:>8.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}"
+                f" {result['p99_ms']:>8.2f} {result['errors']:>6} {result['upstream_per_request']:>7.2f}",
+                flush=True,
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트당 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="가짜 백엔드 기본 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="기본 지연에 더할 균등분포 지연의 최댓값")
+    parser.add_argument("--no-cache", action="store_true", help="응답 캐시를 끄고 측정")
+    parser.add_argument("--only", nargs="*", help="이름에 이 문자열이 들어간 엔드포인트만")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args()
+
+    dataset = build_dataset(args.scale, args.seed)
+    backend = FakePostgrest(
+        dataset.tables, delay=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=args.seed
+    ).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+
+    sizes = ", ".join(f"{name}={len(rows)}" for name, rows in dataset.tables.items())
+    print(f"scale={args.scale} seed={args.seed} latency={args.latency_ms}ms+U(0,{args.jitter_ms})ms "
+          f"concurrency={args.concurrency} cache={'off' if args.no_cache else 'on'}")
+    print(f"rows: {sizes}")
+    print(f"{'endpoint':<46} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} {'calls':>7}")
+    try:
+        results = asyncio.run(run(args, dataset))
+    finally:
+        backend.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fp:
+            json.dump({"args": vars(args), "results": results}, fp, ensure_ascii=False, indent=2)
+    sys.exit(1 if any(result["errors"] == result["requests"] for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
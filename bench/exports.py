@@ -0,0 +1,395 @@
+"""대량 내보내기(GET /export/{dataset}) 동작 확인과 100만 행 벤치마크.
+
+가짜 PostgREST 위에서 작은 페이지(EXPORT_PAGE_SIZE)로 여러 번 나눠 읽게 한 뒤, 내보낸 결과가 원본과
+같은지 확인한다.
+
+- 모든 데이터셋 × CSV/NDJSON: 행 수, (정렬 키, id) 순서, 빠진 행/중복 행 없음
+- 토론은 참가자 포함, member-stats는 GET /members/stats와 같은 전적
+- start/end 기간 필터, end < start → 400, 회원 → 403
+- gzip 스트림을 풀면 압축하지 않은 본문과 같음
+
+--dsn을 주면 같은 데이터셋을 Postgres에도 올려 두 백엔드의 결과가 같은지 확인하고, 벤치 DB에
+합성 행을 (기본 100만 개씩) 더 넣은 뒤 실제 uvicorn 서버로 스트리밍해 처리량과 최대 RSS 증가량을 잰다.
+httpx의 ASGITransport는 응답 전체를 모아 돌려주므로 메모리 측정에는 실제 TCP 연결을 쓴다.
+기간을 35일로 좁혀 (100만 행 기준) 1% 남짓인 내보내기와 최대 RSS 증가량이 비슷하면 메모리가 행 수와 무관하다는 뜻이다.
+
+    python -m bench.exports
+    python -m bench.exports --dsn postgresql://postgres@localhost/postgres --rows 1000000
+    python -m bench.exports --dsn ... --compare-list   # GET /records(목록 API로 전부 읽기)와 비교
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from bench.datasets import build_dataset
+from bench.endpoints import JWT_SECRET, make_token
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+from bench.repositories import _with_database, prepare_database
+
+DATASETS = ("debates", "records", "member-stats", "reservations")
+SORT_KEYS = {"debates": "debate_date", "records": "date", "reservations": "starts_at"}
+# 작은 데이터셋도 여러 페이지로 나뉘도록 페이지 크기를 줄인다 (app 임포트 전에 정해야 한다).
+TEST_PAGE_SIZE = 37
+
+failures: List[str] = []
+
+
+def expect(condition: bool, message: str) -> None:
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def parse_ndjson(body: bytes) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+
+def parse_csv(body: bytes) -> List[Dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+
+
+def ordered(rows: List[Dict[str, Any]], key: Optional[str]) -> bool:
+    from bench.fake_postgrest import _compare_key
+
+    keys = [(_compare_key(row[key]) if key else "", row.get("id") or row.get("user_id")) for row in rows]
+    return all(left < right for left, right in zip(keys, keys[1:]))
+
+
+async def check_exports(client: Any, backend: FakePostgrest, admin: Dict[str, str], member: Dict[str, str]) -> Dict[str, Any]:
+    tables = backend.tables
+    debates = tables["debates"]
+    expected_counts = {
+        "debates": len(debates),
+        "records": len(tables["records"]),
+        "member-stats": len(tables["users"]),
+        "reservations": len(tables["reservations"]),
+    }
+    exported: Dict[str, Any] = {}
+    for name in DATASETS:
+        print(f"\n{name}")
+        response = await client.get(f"/export/{name}", headers=admin)
+        expect(response.status_code == 200, f"NDJSON → {response.status_code}")
+        expect(response.headers.get("content-type", "").startswith("application/x-ndjson"), "Content-Type: application/x-ndjson")
+        rows = parse_ndjson(response.content)
+        exported[name] = rows
+        expect(len(rows) == expected_counts[name], f"{len(rows)}행 = 원본 {expected_counts[name]}행")
+        ids = [row.get("id") or row.get("user_id") for row in rows]
+        expect(len(set(ids)) == len(ids), "중복 행 없음")
+        expect(ordered(rows, SORT_KEYS.get(name)), "(정렬 키, id) 순서")
+        as_csv = await client.get(f"/export/{name}", params={"format": "csv"}, headers=admin)
+        expect(as_csv.content.startswith("﻿".encode()), "CSV는 UTF-8 BOM으로 시작")
+        expect("attachment" in as_csv.headers.get("content-disposition", ""), "Content-Disposition: attachment")
+        csv_rows = parse_csv(as_csv.content)
+        expect([row.get("id") or row.get("user_id") for row in csv_rows] == ids, "CSV와 NDJSON의 행 순서가 같음")
+
+    participants: Dict[str, int] = {}
+    for part in tables["debate_participants"]:
+        participants[part["debate_id"]] = participants.get(part["debate_id"], 0) + 1
+    print("\n내용")
+    expect(
+        all(len(row["participants"]) == participants.get(row["id"], 0) for row in exported["debates"]),
+        "토론마다 참가자 수가 원본과 같음",
+    )
+    stats = {row["user_id"]: row for row in (await client.get("/members/stats")).json()}
+    expect(
+        all(row == stats[row["user_id"]] for row in exported["member-stats"]),
+        "member-stats가 GET /members/stats와 같음",
+    )
+    csv_debates = parse_csv((await client.get("/export/debates", params={"format": "csv"}, headers=admin)).content)
+    expect(
+        all(int(row["participant_count"]) == participants.get(row["id"], 0) for row in csv_debates),
+        "CSV participant_count",
+    )
+
+    print("\n기간 필터")
+    start, end = date(2026, 3, 1), date(2026, 6, 30)
+    params = {"start": start.isoformat(), "end": end.isoformat()}
+    filtered = parse_ndjson((await client.get("/export/debates", params=params, headers=admin)).content)
+    wanted = sum(1 for row in debates if start.isoformat() <= row["debate_date"] <= end.isoformat())
+    expect(len(filtered) == wanted, f"토론 {len(filtered)}행 = 기간 안 {wanted}행")
+    reservations = parse_ndjson((await client.get("/export/reservations", params=params, headers=admin)).content)
+    wanted = sum(1 for row in tables["reservations"] if start.isoformat() <= row["starts_at"][:10] <= end.isoformat())
+    expect(len(reservations) == wanted, f"예약 {len(reservations)}행 = 기간 안 {wanted}행 (end 포함)")
+    windowed = parse_ndjson((await client.get("/export/member-stats", params=params, headers=admin)).content)
+    expect(
+        sum(row["total"] for row in windowed) < sum(row["total"] for row in exported["member-stats"]),
+        "member-stats 기간 필터는 기간 안 토론만 집계",
+    )
+    response = await client.get("/export/records", params={"start": "2026-06-01", "end": "2026-01-01"}, headers=admin)
+    expect(response.status_code == 400, f"end < start → {response.status_code}")
+
+    print("\n압축/권한")
+    plain = await client.get("/export/reservations", params={"format": "csv"}, headers=admin)
+    zipped = await client.get(
+        "/export/reservations", params={"format": "csv"}, headers={**admin, "Accept-Encoding": "gzip"}
+    )
+    # httpx가 Content-Encoding을 보고 풀어 주므로 풀린 본문을 그대로 비교한다.
+    expect(zipped.headers.get("content-encoding") == "gzip", f"Content-Encoding: {zipped.headers.get('content-encoding')}")
+    expect(zipped.content == plain.content, "gzip 스트림을 풀면 원본과 같음")
+    expect((await client.get("/export/records", headers=member)).status_code == 403, "회원 → 403")
+    expect((await client.get("/export/users", headers=admin)).status_code == 422, "없는 데이터셋 → 422")
+    return exported
+
+
+async def compare_backends(client: Any, admin: Dict[str, str], fake: Dict[str, Any]) -> None:
+    from app.repositories import use_backend
+
+    print("\nPostgres 백엔드")
+    use_backend("postgres")
+    for name in DATASETS:
+        rows = parse_ndjson((await client.get(f"/export/{name}", headers=admin)).content)
+        same_order = [row.get("id") or row.get("user_id") for row in rows] == [
+            row.get("id") or row.get("user_id") for row in fake[name]
+        ]
+        expect(same_order, f"{name}: 가짜 PostgREST와 같은 행, 같은 순서 ({len(rows)}행)")
+    stats = parse_ndjson((await client.get("/export/member-stats", headers=admin)).content)
+    expect(stats == fake["member-stats"], "member-stats 값이 같음")
+    filtered = parse_ndjson((await client.get("/export/reservations", params={"start": "2026-03-01", "end": "2026-06-30"}, headers=admin)).content)
+    fake_filtered = [
+        row for row in fake["reservations"] if "2026-03-01" <= row["starts_at"][:10] <= "2026-06-30"
+    ]
+    expect(len(filtered) == len(fake_filtered), f"예약 기간 필터 {len(filtered)}행 = {len(fake_filtered)}행")
+
+
+SYNTHETIC_SQL = [
+    (
+        "reservations",
+        """
+        insert into public.reservations (reserved_by, reserved_by_name, title, starts_at, ends_at, allow_simultaneous)
+        select u.ids[1 + g % array_length(u.ids, 1)], '회원 ' || (g % 500), '합성 예약 #' || g,
+               timestamptz '2016-01-01 00:00+00' + g * interval '5 minutes',
+               timestamptz '2016-01-01 00:30+00' + g * interval '5 minutes', true
+        from generate_series(1, $1) g, (select array_agg(id) as ids from public.users) u
+        """,
+    ),
+    (
+        "records",
+        """
+        insert into public.records (title, category, date, summary, "keyPoints", conclusion, participants, "participantNames")
+        select '합성 기록 #' || g, (array['사회','경제','정치','과학'])[1 + g % 4], date '2016-01-01' + (g % 3650),
+               '합성 토론 요약입니다. 찬반 논점을 정리했습니다.', array['논점 1','논점 2','논점 3'],
+               '결론: 추가 논의가 필요하다.', 4, array['김하나','이두리','박세나','최네리']
+        from generate_series(1, $1) g
+        """,
+    ),
+    (
+        "debates",
+        """
+        insert into public.debates (id, topic_text, debate_date, winner_side, notes)
+        select ('00000000-0000-4000-8000-' || lpad(to_hex(g), 12, '0'))::uuid, '합성 토론 #' || g,
+               date '2016-01-01' + (g % 3650), (array['pro','con'])[1 + g % 2]::public.debate_side, null
+        from generate_series(1, $1 / 4) g
+        """,
+    ),
+    (
+        "debate_participants",
+        """
+        insert into public.debate_participants (debate_id, user_id, participant_name, side)
+        select ('00000000-0000-4000-8000-' || lpad(to_hex(g), 12, '0'))::uuid,
+               u.ids[1 + (g * 4 + k) % array_length(u.ids, 1)], '참가자 ' || k,
+               (array['pro','con'])[1 + k % 2]::public.debate_side
+        from generate_series(1, $1 / 4) g, generate_series(0, 3) k, (select array_agg(id) as ids from public.users) u
+        """,
+    ),
+]
+
+
+async def seed_synthetic(dsn: str, rows: int) -> None:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        for table, sql in SYNTHETIC_SQL:
+            started = time.perf_counter()
+            status = await conn.execute(sql, rows)
+            print(f"  {table:<20} {status.split()[-1]:>9}행 ({time.perf_counter() - started:.1f}s)", flush=True)
+        await conn.execute("analyze")
+    finally:
+        await conn.close()
+
+
+def current_rss() -> int:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class RssSampler:
+    """측정 구간의 최대 RSS를 잰다. ru_maxrss는 프로세스 전체의 최댓값이라 구간별 비교에 쓸 수 없다."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.baseline = self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "RssSampler":
+        self.baseline = self.peak = current_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+    @property
+    def delta_mb(self) -> float:
+        return (self.peak - self.baseline) / 1e6
+
+
+def start_server() -> Tuple[Any, str]:
+    import uvicorn
+
+    from app.main import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def stream(client: Any, path: str, params: Dict[str, str], headers: Dict[str, str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    lines = size = 0
+    # httpx는 기본으로 Accept-Encoding: gzip을 보내므로, 줄 수를 세려면 identity를 명시한다.
+    headers = {"Accept-Encoding": "identity", **headers}
+    with RssSampler() as rss:
+        with client.stream("GET", path, params=params, headers=headers) as response:
+            for chunk in response.iter_raw():
+                size += len(chunk)
+                lines += chunk.count(b"\n")
+        status = response.status_code
+    seconds = time.perf_counter() - started
+    return {"status": status, "lines": lines, "bytes": size, "seconds": seconds, "rss_mb": rss.delta_mb}
+
+
+def print_result(label: str, result: Dict[str, Any], rows: int) -> None:
+    print(
+        f"{label:<40} {rows:>9} {result['seconds']:>7.2f} {rows / result['seconds']:>10.0f}"
+        f" {result['bytes'] / 1e6 / result['seconds']:>7.1f} {result['rss_mb']:>8.1f}",
+        flush=True,
+    )
+
+
+def run_benchmark(base_url: str, admin: Dict[str, str], compare_list: bool) -> None:
+    import httpx
+
+    print(f"\n{'export':<40} {'rows':>9} {'seconds':>7} {'rows/s':>10} {'MB/s':>7} {'peak MB':>8}")
+    cases = [
+        ("reservations ndjson", "/export/reservations", {}),
+        ("reservations csv", "/export/reservations", {"format": "csv"}),
+        ("reservations ndjson (35일)", "/export/reservations", {"start": "2016-01-01", "end": "2016-02-04"}),
+        ("records ndjson", "/export/records", {}),
+        ("records csv", "/export/records", {"format": "csv"}),
+        ("debates ndjson (참가자 포함)", "/export/debates", {}),
+        ("member-stats csv", "/export/member-stats", {"format": "csv"}),
+    ]
+    with httpx.Client(base_url=base_url, timeout=None) as client:
+        for label, path, params in cases:
+            result = stream(client, path, params, admin)
+            # CSV는 헤더 한 줄을 뺀다.
+            rows = result["lines"] - (params.get("format") == "csv")
+            expect(result["status"] == 200, f"{label} → {result['status']}")
+            print_result(label, result, rows)
+        result = stream(client, "/export/reservations", {}, {**admin, "Accept-Encoding": "gzip"})
+        print(
+            f"{'reservations ndjson (gzip)':<40} {'-':>9} {result['seconds']:>7.2f} {'-':>10}"
+            f" {result['bytes'] / 1e6 / result['seconds']:>7.1f} {result['rss_mb']:>8.1f}",
+            flush=True,
+        )
+        if compare_list:
+            started = time.perf_counter()
+            with RssSampler() as rss:
+                response = client.get("/records", params={"sort": "date-asc"})
+            seconds = time.perf_counter() - started
+            # 목록 API는 전체를 한 번에 읽으므로 행이 많으면 upstream 타임아웃(504)으로 끝날 수 있다.
+            rows = f"{len(response.json()):>9}" if response.status_code == 200 else f"{'HTTP ' + str(response.status_code):>9}"
+            print(
+                f"{'GET /records (목록 API)':<40} {rows} {seconds:>7.2f} {'-':>10}"
+                f" {len(response.content) / 1e6 / seconds:>7.1f} {rss.delta_mb:>8.1f}",
+                flush=True,
+            )
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+
+    dataset = build_dataset(args.scale, args.seed)
+    backend = FakePostgrest(dataset.tables, delay=args.latency_ms / 1000).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    os.environ["EXPORT_PAGE_SIZE"] = str(TEST_PAGE_SIZE)
+    bench_dsn = None
+    if args.dsn:
+        bench_dsn = await prepare_database(args.dsn, args.database, dataset)
+        os.environ["DATABASE_URL"] = bench_dsn
+    from app.main import app
+    from app.repositories import use_backend
+
+    admin = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    member = {"Authorization": f"Bearer {make_token(dataset.member_ids[0])}"}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            exported = await check_exports(client, backend, admin, member)
+            if bench_dsn:
+                await compare_backends(client, admin, exported)
+    finally:
+        backend.stop()
+    if not bench_dsn:
+        return
+
+    print(f"\n합성 행 추가 ({args.rows}행씩, {_with_database(args.dsn, args.database)})")
+    await seed_synthetic(bench_dsn, args.rows)
+    from app import exports
+
+    # 대량 벤치마크는 운영 기본값(또는 --page-size)으로 읽는다.
+    exports.EXPORT_PAGE_SIZE = args.page_size
+    use_backend("postgres")
+    server, base_url = start_server()
+    try:
+        await asyncio.to_thread(run_benchmark, base_url, admin, args.compare_list)
+    finally:
+        server.should_exit = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="medium")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="가짜 PostgREST 왕복 지연")
+    parser.add_argument("--dsn", help="벤치 DB를 만들 권한이 있는 Postgres 접속 문자열 (주면 백엔드 비교와 대량 벤치마크)")
+    parser.add_argument("--database", default="manjang_bench", help="새로 만들 벤치 전용 데이터베이스 이름")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="예약/기록에 더할 합성 행 수 (토론은 1/4, 참가자 4명씩)")
+    parser.add_argument("--page-size", type=int, default=1000, help="대량 벤치마크의 EXPORT_PAGE_SIZE")
+    parser.add_argument("--compare-list", action="store_true", help="GET /records로 전부 읽는 경우와 메모리 비교")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
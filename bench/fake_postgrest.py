@@ -0,0 +1,680 @@
+"""로컬 가짜 PostgREST + GoTrue admin 서버.
+
+실제 supabase-py 클라이언트가 HTTP로 붙을 수 있도록 같은 프로세스의 스레드에서
+stdlib HTTP 서버를 띄운다. 메모리의 테이블을 읽고 쓰며, 라우터가 쓰는 질의만 구현한다.
+
+- 필터: eq/neq/gt/gte/lt/lte/in/is/like/ilike/cs, not.*, or=(...)
+- order(여러 컬럼, desc/nullslast), limit/offset(range), 컬럼 선택과 한 단계 embedded select
+  (`users(id,name)` 처럼 `<단수형>_id` 외래키 또는 역방향 1:N)
+- insert/upsert(on_conflict, Prefer: resolution/missing)/update/delete, `.single()`
+- `rpc/<이름>`: `backend.rpcs`에 등록한 파이썬 함수(기본으로 sql/schema.sql의 함수를 흉내낸다)
+- 읽기 전용 뷰: `backend.views`에 등록한 파이썬 함수(기본으로 sql/schema.sql의 뷰를 흉내낸다)
+- `auth/v1/admin/users`: create_user, update_user_by_id, get_user_by_id
+  (create_user는 실제 트리거처럼 public.users 행도 만든다)
+
+지연(`delay` + 균등분포 `jitter`)과 장애(`fail_status`)를 주입할 수 있다.
+
+    backend = FakePostgrest({"debates": [...]}, delay=0.01).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    backend.fail_status = 503   # 이후 모든 요청이 503
+    backend.delay = 2.0         # 이후 모든 요청이 2초 지연
+"""
+
+import fnmatch
+import itertools
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+# create_client는 JWT 형식의 키만 받는다.
+FAKE_SERVICE_KEY = "fake.service.key"
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "columns", "on_conflict"}
+
+# bigserial 기본키를 쓰는 테이블 (나머지는 uuid)
+SERIAL_TABLES = {"debate_participants", "tournament_team_members"}
+
+Row = Dict[str, Any]
+
+
+def _coerce(value: str) -> Any:
+    if value == "null":
+        return None
+    if value in ("true", "false"):
+        return value == "true"
+    return value
+
+
+def _as_timestamp(value: str) -> Optional[float]:
+    if len(value) < 10 or value[4] != "-" or value[7] != "-":
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _compare_key(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value)
+    # 'Z'와 '+00:00' 표기가 섞여도 시각 순서대로 비교되도록 타임스탬프는 숫자로 바꾼다.
+    timestamp = _as_timestamp(text)
+    return timestamp if timestamp is not None else text
+
+
+def _like(actual: Any, pattern: str, case_sensitive: bool) -> bool:
+    pattern = pattern.replace("%", "*")
+    if case_sensitive:
+        return fnmatch.fnmatchcase(str(actual), pattern)
+    return fnmatch.fnmatchcase(str(actual).lower(), pattern.lower())
+
+
+def _matches(row: Row, column: str, expression: str) -> bool:
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, raw = expression.partition(".")
+    if len(raw) > 1 and raw[0] == raw[-1] == '"':
+        # or=(...) 안에서 쉼표/점이 든 값은 큰따옴표로 감싼다 (예: starts_at.gt."2026-10-19T09:00:00+00:00")
+        raw = raw[1:-1]
+    actual = row.get(column)
+    if op == "in":
+        options = [item.strip().strip('"') for item in raw.strip("()").split(",") if item.strip()]
+        result = actual is not None and str(actual) in options
+    elif op == "is":
+        result = actual is _coerce(raw)
+    elif actual is None:
+        result = False
+    elif op == "eq":
+        result = str(actual) == raw if not isinstance(actual, bool) else actual == _coerce(raw)
+    elif op == "neq":
+        result = str(actual) != raw
+    elif op in ("like", "ilike"):
+        result = _like(actual, raw, case_sensitive=op == "like")
+    elif op == "cs":
+        wanted = [item.strip().strip('"') for item in raw.strip("{}").split(",") if item.strip()]
+        result = all(item in (actual or []) for item in wanted)
+    elif op in ("gt", "gte", "lt", "lte"):
+        left, right = _compare_key(actual), _compare_key(raw)
+        if isinstance(left, (int, float)) and not isinstance(right, (int, float)):
+            right = float(raw)
+        result = {
+            "gt": left > right,
+            "gte": left >= right,
+            "lt": left < right,
+            "lte": left <= right,
+        }[op]
+    else:
+        raise ValueError(f"unsupported operator: {op}")
+    return not result if negate else result
+
+
+def _split_top_level(text: str) -> List[str]:
+    parts, depth, current = [], 0, ""
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += char in "({"
+        depth -= char in ")}"
+        current += char
+    if current:
+        parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _matches_logic(row: Row, operator: str, raw: str) -> bool:
+    """or=(a.eq.1,b.ilike.*x*) / and=(...) 조건. 중첩된 or(...)/and(...)도 처리한다."""
+    results = []
+    for clause in _split_top_level(raw.strip()[1:-1]):
+        if clause.startswith(("or(", "and(")):
+            name, _, rest = clause.partition("(")
+            results.append(_matches_logic(row, name, "(" + rest))
+            continue
+        column, _, expression = clause.partition(".")
+        results.append(_matches(row, column, expression))
+    return any(results) if operator == "or" else all(results)
+
+
+def _singular(table: str) -> str:
+    return table[:-1] if table.endswith("s") else table
+
+
+def _prefer(header: Optional[str]) -> Dict[str, str]:
+    values: Dict[str, str] = {}
+    for part in (header or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            values[name] = value
+    return values
+
+
+def _tournament_summaries(backend: "FakePostgrest") -> List[Row]:
+    # public.tournament_summaries 뷰: 대회 행 + 팀/경기/완료 경기 수
+    teams: Dict[str, int] = {}
+    matches: Dict[str, List[int]] = {}
+    for row in backend.tables.get("tournament_teams", []):
+        teams[row["tournament_id"]] = teams.get(row["tournament_id"], 0) + 1
+    for row in backend.tables.get("tournament_matches", []):
+        counts = matches.setdefault(row["tournament_id"], [0, 0])
+        counts[0] += 1
+        counts[1] += row.get("status") == "completed"
+    rows = []
+    for event in backend.tables.get("tournaments", []):
+        match_count, completed = matches.get(event["id"], (0, 0))
+        rows.append(
+            {**event, "team_count": teams.get(event["id"], 0), "match_count": match_count,
+             "completed_match_count": completed}
+        )
+    return rows
+
+
+def _member_tournament_matches(backend: "FakePostgrest") -> List[Row]:
+    # public.member_tournament_matches 뷰: 회원 × 팀 × 그 팀의 경기 (경기가 없으면 경기 컬럼이 None인 한 행)
+    events = {row["id"]: row for row in backend.tables.get("tournaments", [])}
+    teams = {row["id"]: row for row in backend.tables.get("tournament_teams", [])}
+    matches_by_team: Dict[str, List[Row]] = {}
+    for match in backend.tables.get("tournament_matches", []):
+        for key in ("team_a_id", "team_b_id"):
+            if match.get(key):
+                matches_by_team.setdefault(match[key], []).append(match)
+    rows = []
+    for member in backend.tables.get("tournament_team_members", []):
+        team = teams.get(member["team_id"])
+        event = events.get(team["tournament_id"]) if team else None
+        if event is None:
+            continue
+        base = {
+            "user_id": member["user_id"], "tournament_id": event["id"], "title": event["title"],
+            "starts_on": event["starts_on"], "ends_on": event["ends_on"], "status": event["status"],
+            "team_id": team["id"], "team_name": team["name"], "group_name": team["group_name"],
+        }
+        empty = dict.fromkeys(
+            ("match_id", "stage", "round_label", "match_starts_at", "match_status", "opponent_team_id",
+             "opponent_name", "team_score", "opponent_score", "winner_team_id")
+        )
+        team_matches = [match for match in matches_by_team.get(team["id"], []) if match["tournament_id"] == event["id"]]
+        if not team_matches:
+            rows.append({**base, **empty})
+        for match in team_matches:
+            side_a = match.get("team_a_id") == team["id"]
+            opponent = teams.get(match.get("team_b_id" if side_a else "team_a_id")) or {}
+            rows.append(
+                {
+                    **base,
+                    "match_id": match["id"], "stage": match.get("stage"), "round_label": match.get("round_label"),
+                    "match_starts_at": match.get("starts_at"), "match_status": match.get("status"),
+                    "opponent_team_id": opponent.get("id"), "opponent_name": opponent.get("name"),
+                    "team_score": match.get("team_a_score" if side_a else "team_b_score"),
+                    "opponent_score": match.get("team_b_score" if side_a else "team_a_score"),
+                    "winner_team_id": match.get("winner_team_id"),
+                }
+            )
+    return rows
+
+
+VIEWS: Dict[str, Callable[["FakePostgrest"], List[Row]]] = {
+    "tournament_summaries": _tournament_summaries,
+    "member_tournament_matches": _member_tournament_matches,
+}
+
+
+def _member_debate_stats(backend: "FakePostgrest", params: Dict[str, Any]) -> List[Row]:
+    # public.member_debate_stats 함수: id 순 회원 한 페이지 × 기간 안 토론 전적
+    start, end, after = params.get("p_start"), params.get("p_end"), params.get("p_after")
+    winners = {
+        row["id"]: row.get("winner_side")
+        for row in backend.tables.get("debates", [])
+        if (start is None or row["debate_date"] >= start) and (end is None or row["debate_date"] <= end)
+    }
+    users = sorted(
+        (row for row in backend.tables.get("users", []) if after is None or row["id"] > after), key=lambda row: row["id"]
+    )[: params.get("p_limit", 1000)]
+    stats = {
+        row["id"]: {"user_id": row["id"], "name": row.get("name"), "generation": row.get("generation"),
+                    "major": row.get("major"), "wins": 0, "losses": 0, "total": 0}
+        for row in users
+    }
+    for part in backend.tables.get("debate_participants", []):
+        row = stats.get(part.get("user_id"))
+        if row is None or part["debate_id"] not in winners:
+            continue
+        winner = winners[part["debate_id"]]
+        row["total"] += 1
+        row["wins"] += winner is not None and winner == part.get("side")
+        row["losses"] += winner is not None and winner != part.get("side")
+    return list(stats.values())
+
+
+def _apply_debate_roster(backend: "FakePostgrest", params: Dict[str, Any]) -> List[Row]:
+    # public.apply_debate_roster 함수: 삭제 → 갱신 → 추가 → 승리 측 기록 (backend.lock 안이라 한 번에 반영된다)
+    debate_id = params["p_debate_id"]
+    stale = set(params.get("p_stale_ids") or [])
+    participants = backend.tables.setdefault("debate_participants", [])
+    participants[:] = [row for row in participants if not (row["debate_id"] == debate_id and row["id"] in stale)]
+    by_id = {row["id"]: row for row in participants if row["debate_id"] == debate_id}
+    saved: List[Row] = []
+    upserts = params.get("p_upserts") or []
+    for change in upserts:
+        row = by_id.get(change.get("id")) if change.get("id") is not None else None
+        if row is not None:
+            row.update(side=change["side"], participant_name=change["participant_name"])
+            saved.append(row)
+    inserts = [
+        {"debate_id": debate_id, "user_id": change.get("user_id"), "participant_name": change.get("participant_name") or "",
+         "side": change["side"]}
+        for change in upserts if change.get("id") is None
+    ]
+    saved.extend(backend.insert("debate_participants", inserts))
+    if params.get("p_winner_side") is not None:
+        backend.update("debates", [("id", f"eq.{debate_id}")], {"winner_side": params["p_winner_side"]})
+    return [dict(row) for row in saved]
+
+
+RPCS: Dict[str, Callable[["FakePostgrest", Dict[str, Any]], Any]] = {
+    "member_debate_stats": _member_debate_stats,
+    "apply_debate_roster": _apply_debate_roster,
+}
+
+
+class _Server(ThreadingHTTPServer):
+    # socketserver 기본 backlog(5)로는 동시 요청이 몰릴 때 연결이 리셋되어 장애처럼 보인다.
+    request_queue_size = 128
+
+
+class FakePostgrest:
+    def __init__(
+        self,
+        tables: Optional[Dict[str, List[Row]]] = None,
+        delay: float = 0.0,
+        jitter: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.tables: Dict[str, List[Row]] = tables or {}
+        self.fail_status: Optional[int] = None
+        # 다음 N개 요청만 fail_next_status로 실패시킨다 (일시적 오류 흉내)
+        self.fail_next = 0
+        self.fail_next_status = 503
+        self.delay = delay
+        self.jitter = jitter
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.rpcs: Dict[str, Callable[["FakePostgrest", Dict[str, Any]], Any]] = dict(RPCS)
+        self.views: Dict[str, Callable[["FakePostgrest"], List[Row]]] = dict(VIEWS)
+        self.auth_users: Dict[str, Row] = {}
+        self._random = random.Random(seed)
+        self._serial = itertools.count(self._max_serial() + 1)
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def load(self, tables: Dict[str, List[Row]]) -> None:
+        """테이블을 통째로 바꾼다. bigserial 순번도 새 테이블의 최댓값 다음부터 다시 센다."""
+        with self.lock:
+            self.tables = tables
+            self._serial = itertools.count(self._max_serial() + 1)
+
+    def _max_serial(self) -> int:
+        ids = [row.get("id") for table in SERIAL_TABLES for row in self.tables.get(table, [])]
+        return max([value for value in ids if isinstance(value, int)], default=0)
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "call start() first"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakePostgrest":
+        backend = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.backend = backend
+        self._server = _Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="fake-postgrest", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def latency(self) -> float:
+        if not self.jitter:
+            return self.delay
+        with self.lock:
+            return self.delay + self._random.uniform(0, self.jitter)
+
+    # ---- query evaluation -------------------------------------------------
+    def select(self, table: str, params: List[tuple]) -> List[Row]:
+        rows = self.filter(table, params)
+        query = dict(params)
+        for clause in reversed((query.get("order") or "").split(",")):
+            if not clause:
+                continue
+            column, *modifiers = clause.split(".")
+            descending = "desc" in modifiers
+            # PostgREST 기본: asc는 NULL이 뒤, desc는 NULL이 앞
+            nulls_last = "nullslast" in modifiers or ("nullsfirst" not in modifiers and not descending)
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: _compare_key(row.get(column)), reverse=descending)
+            rows = present + missing if nulls_last else missing + present
+        offset = int(query.get("offset") or 0)
+        limit = query.get("limit")
+        rows = rows[offset : offset + int(limit)] if limit is not None else rows[offset:]
+        return [self.project(table, row, query.get("select") or "*") for row in rows]
+
+    def filter(self, table: str, params: List[tuple]) -> List[Row]:
+        view = self.views.get(table)
+        rows = view(self) if view is not None else list(self.tables.get(table, []))
+        for column, expression in params:
+            if column in _RESERVED_PARAMS:
+                continue
+            if column in ("or", "and"):
+                rows = [row for row in rows if _matches_logic(row, column, expression)]
+            else:
+                rows = [row for row in rows if _matches(row, column, expression)]
+        return rows
+
+    def project(self, table: str, row: Row, select: str) -> Row:
+        result: Row = {}
+        for item in _split_top_level(select):
+            if item == "*":
+                result.update(row)
+            elif "(" in item:
+                name, _, columns = item.partition("(")
+                alias, _, relation = name.rpartition(":")
+                relation = relation.split("!")[0]
+                result[alias or relation] = self._embed(table, row, relation, columns[:-1])
+            else:
+                alias, _, column = item.rpartition(":")
+                result[alias or column] = row.get(column)
+        return result
+
+    def _embed(self, table: str, row: Row, relation: str, columns: str) -> Any:
+        singular = _singular(relation)
+        for fk in (f"{singular}_id", f"{singular.rsplit('_', 1)[-1]}_id"):
+            if fk in row:
+                target = next((r for r in self.tables.get(relation, []) if r.get("id") == row[fk]), None)
+                return self.project(relation, target, columns) if target is not None else None
+        # 역방향 1:N (debates → debate_participants)
+        back_fk = f"{_singular(table)}_id"
+        children = [child for child in self.tables.get(relation, []) if child.get(back_fk) == row.get("id")]
+        return [self.project(relation, child, columns) for child in children]
+
+    # ---- writes -----------------------------------------------------------
+    def _defaults(self, table: str, row: Row) -> Row:
+        row = dict(row)
+        if row.get("id") is None:
+            row["id"] = next(self._serial) if table in SERIAL_TABLES else str(uuid.uuid4())
+        return row
+
+    def insert(self, table: str, rows: List[Row]) -> List[Row]:
+        stored = [self._defaults(table, row) for row in rows]
+        self.tables.setdefault(table, []).extend(stored)
+        return stored
+
+    def upsert(self, table: str, rows: List[Row], on_conflict: str, merge: bool) -> List[Row]:
+        keys = [column.strip() for column in (on_conflict or "id").split(",")]
+        existing = self.tables.setdefault(table, [])
+        result = []
+        for row in rows:
+            match = None
+            if all(row.get(key) is not None for key in keys):
+                match = next((r for r in existing if all(str(r.get(k)) == str(row[k]) for k in keys)), None)
+            if match is None:
+                stored = self._defaults(table, row)
+                existing.append(stored)
+                result.append(stored)
+            elif merge:
+                match.update(row)
+                result.append(match)
+            else:
+                result.append(match)
+        return result
+
+    def update(self, table: str, params: List[tuple], changes: Row) -> List[Row]:
+        matched = self.filter(table, params)
+        for row in matched:
+            row.update(changes)
+        return matched
+
+    def delete(self, table: str, params: List[tuple]) -> List[Row]:
+        matched = self.filter(table, params)
+        ids = {id(row) for row in matched}
+        self.tables[table] = [row for row in self.tables.get(table, []) if id(row) not in ids]
+        return matched
+
+    # ---- auth admin ---------------------------------------------------------
+    def create_auth_user(self, attributes: Row) -> Row:
+        user_id = str(uuid.uuid4())
+        now = datetime.now(timezone.utc).isoformat()
+        metadata = attributes.get("user_metadata") or {}
+        user = {
+            "id": user_id,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": attributes.get("email"),
+            "app_metadata": {"provider": "email"},
+            "user_metadata": metadata,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.auth_users[user_id] = user
+        # auth.users → public.users 동기화 트리거 흉내
+        self.insert(
+            "users",
+            [
+                {
+                    "id": user_id,
+                    "email": attributes.get("email"),
+                    "name": metadata.get("name") or (attributes.get("email") or "").split("@")[0],
+                    "student_id": metadata.get("student_id") or metadata.get("sid") or f"unknown-{user_id}",
+                    "major": metadata.get("major") or "미입력",
+                    "generation": metadata.get("generation") or "",
+                    "role": "member",
+                    "must_change_password": False,
+                }
+            ],
+        )
+        return user
+
+    def update_auth_user(self, user_id: str, attributes: Row) -> Optional[Row]:
+        user = self.auth_users.get(user_id)
+        if user is None:
+            profile = next((row for row in self.tables.get("users", []) if row.get("id") == user_id), None)
+            if profile is None:
+                return None
+            user = self.auth_users[user_id] = {
+                "id": user_id,
+                "aud": "authenticated",
+                "email": profile.get("email"),
+                "app_metadata": {"provider": "email"},
+                "user_metadata": {},
+                "created_at": profile.get("created_at") or datetime.now(timezone.utc).isoformat(),
+            }
+        if attributes.get("user_metadata"):
+            user["user_metadata"].update(attributes["user_metadata"])
+        user["updated_at"] = datetime.now(timezone.utc).isoformat()
+        return user
+
+
+class _Handler(BaseHTTPRequestHandler):
+    backend: FakePostgrest
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        # 헤더와 본문이 따로 나가므로 Nagle + delayed ACK로 40ms씩 밀리지 않게 한다.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - BaseHTTPRequestHandler API
+        pass
+
+    def _reply(self, status: int, payload: Any) -> None:
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 타임아웃으로 먼저 끊은 경우
+            pass
+
+    def _reply_rows(self, rows: List[Row], status: int = 200) -> None:
+        if "vnd.pgrst.object" in (self.headers.get("Accept") or ""):
+            if len(rows) != 1:
+                self._reply(406, {"message": "JSON object requested, multiple (or no) rows returned",
+                                  "details": f"The result contains {len(rows)} rows", "code": "PGRST116"})
+                return
+            self._reply(status, rows[0])
+            return
+        if "return=minimal" in (self.headers.get("Prefer") or ""):
+            self._reply(204 if status == 200 else status, None)
+            return
+        self._reply(status, rows)
+
+    def _read_body(self) -> Any:
+        # supabase-py는 GET에도 빈 JSON 본문을 보내므로 keep-alive를 위해 항상 읽는다.
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw) if raw.strip() else None
+
+    def _route(self) -> Optional[Tuple[str, str, List[tuple]]]:
+        self.body = self._read_body()
+        backend = self.backend
+        with backend.lock:
+            backend.requests += 1
+        latency = backend.latency()
+        if latency:
+            time.sleep(latency)
+        with backend.lock:
+            status = backend.fail_status
+            if not status and backend.fail_next > 0:
+                backend.fail_next -= 1
+                status = backend.fail_next_status
+        if status:
+            self._reply(status, {"message": "injected failure", "code": str(status)})
+            return None
+        parts = urlsplit(self.path)
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        for prefix in ("/rest/v1/", "/auth/v1/"):
+            if parts.path.startswith(prefix):
+                return prefix.strip("/").split("/")[0], unquote(parts.path[len(prefix):]), params
+        self._reply(404, {"message": f"unknown path {parts.path}"})
+        return None
+
+    def do_GET(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        routed = self._route()
+        if routed is None:
+            return
+        service, path, params = routed
+        if service == "auth":
+            self._auth("GET", path)
+            return
+        with self.backend.lock:
+            rows = self.backend.select(path, params)
+        self._reply_rows(rows)
+
+    def do_POST(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        routed = self._route()
+        if routed is None:
+            return
+        service, path, params = routed
+        if service == "auth":
+            self._auth("POST", path)
+            return
+        backend = self.backend
+        if path.startswith("rpc/"):
+            fn = backend.rpcs.get(path[4:])
+            if fn is None:
+                self._reply(404, {"message": f"Could not find the function {path[4:]}", "code": "PGRST202"})
+                return
+            with backend.lock:
+                result = fn(backend, self.body or {})
+            self._reply(200, result)
+            return
+        rows = self.body if isinstance(self.body, list) else [self.body or {}]
+        prefer = _prefer(self.headers.get("Prefer"))
+        with backend.lock:
+            if "resolution" in prefer:
+                stored = backend.upsert(
+                    path, rows, dict(params).get("on_conflict", "id"), merge=prefer["resolution"] == "merge-duplicates"
+                )
+            else:
+                stored = backend.insert(path, rows)
+            stored = [backend.project(path, row, dict(params).get("select") or "*") for row in stored]
+        self._reply_rows(stored, status=201)
+
+    def do_PATCH(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        routed = self._route()
+        if routed is None:
+            return
+        _, table, params = routed
+        with self.backend.lock:
+            rows = self.backend.update(table, params, self.body or {})
+            rows = [self.backend.project(table, row, dict(params).get("select") or "*") for row in rows]
+        self._reply_rows(rows)
+
+    def do_DELETE(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        routed = self._route()
+        if routed is None:
+            return
+        _, table, params = routed
+        with self.backend.lock:
+            rows = self.backend.delete(table, params)
+        self._reply_rows(rows)
+
+    def do_PUT(self) -> None:  # noqa: N802 - BaseHTTPRequestHandler API
+        routed = self._route()
+        if routed is None:
+            return
+        service, path, _ = routed
+        if service != "auth":
+            self._reply(405, {"message": "PUT is not supported"})
+            return
+        self._auth("PUT", path)
+
+    def _auth(self, method: str, path: str) -> None:
+        backend = self.backend
+        if not path.startswith("admin/users"):
+            self._reply(404, {"msg": f"unsupported auth path {path}"})
+            return
+        user_id = path[len("admin/users/"):] if path.startswith("admin/users/") else ""
+        with backend.lock:
+            if method == "POST" and not user_id:
+                email = (self.body or {}).get("email")
+                if any(row.get("email") == email for row in backend.tables.get("users", [])):
+                    self._reply(422, {"msg": "A user with this email address has already been registered",
+                                      "error_code": "email_exists"})
+                    return
+                self._reply(200, backend.create_auth_user(self.body or {}))
+                return
+            if method == "PUT" and user_id:
+                user = backend.update_auth_user(user_id, self.body or {})
+            elif method == "GET" and user_id:
+                user = backend.auth_users.get(user_id)
+            else:
+                user = None
+        if user is None:
+            self._reply(404, {"msg": "User not found", "error_code": "user_not_found"})
+            return
+        self._reply(200, user)
@@ -0,0 +1,317 @@
+"""실제 피크를 흉내 내는 asyncio 부하 생성기.
+
+목표 도착률(초당 세션 수)로 포아송 도착을 만들어 시나리오의 세션을 시작한다(open model).
+응답이 느려져도 도착은 밀리지 않으므로, 지연시간은 세션이 예정된 시각부터 잰다
+(coordinated omission 방지). 요청 종류별 지연시간 히스토그램, 상태 코드, 오류율을 출력한다.
+
+시나리오
+
+- semester-start: 학기 초 로그인. login-lookup → /members/me → /members/me/debates
+- reservation-rush: 달력이 열릴 때의 예약 경쟁. /reservations/month → POST /reservations
+  (같은 인기 시간대를 노리므로 409는 정상 응답으로 센다)
+- tournament-day: 대회 당일 관전자 폴링. GET /tournaments/{id}를 반복, 가끔 관리자 결과 입력
+- mixed: 위 세 가지를 4:3:3으로 섞음
+
+대상
+
+    # 로컬: 합성 데이터셋 + 가짜 백엔드에 붙은 앱을 ASGITransport로 호출
+    python -m bench.loadgen --scenario tournament-day --rate 50 --duration 30 --scale medium
+
+    # 배포된 서버: 토큰과 식별자를 직접 넘긴다
+    python -m bench.loadgen --url https://api.example.com --scenario mixed --rate 10 \\
+        --member-token "$MEMBER_JWT" --admin-token "$ADMIN_JWT" --event-id <uuid> \\
+        --login-name 홍길동 --login-student-id 20261234
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from bench.endpoints import JWT_SECRET, make_token, percentile
+
+# 정상 응답으로 보는 상태 코드 (예약 경쟁의 409 등)
+_EXPECTED = {200, 201, 204, 409}
+
+_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+@dataclass
+class Target:
+    member_tokens: List[str]
+    admin_token: Optional[str]
+    event_id: Optional[str]
+    match_ids: List[str]
+    logins: List[tuple]
+    month: date
+
+
+@dataclass
+class Recorder:
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: Dict[str, Dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    sessions_started: int = 0
+    sessions_dropped: int = 0
+
+    def record(self, name: str, seconds: float, status: str) -> None:
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+
+
+class Session:
+    """세션 하나. 단계마다 예정 시각 기준 지연시간을 기록한다."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, scheduled: float, rng: random.Random) -> None:
+        self.client = client
+        self.recorder = recorder
+        self.scheduled = scheduled
+        self.rng = rng
+
+    async def call(self, name: str, method: str, path: str, token: Optional[str] = None, body: Any = None) -> Any:
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        # 첫 단계는 예정 시각부터, 이후 단계는 직전 단계가 끝난 시각(생각 시간 포함)부터 잰다.
+        started = min(self.scheduled, time.perf_counter())
+        try:
+            response = await self.client.request(method, path, headers=headers, json=body)
+            status = str(response.status_code)
+        except httpx.HTTPError as exc:
+            response, status = None, type(exc).__name__
+        self.recorder.record(name, time.perf_counter() - started, status)
+        self.scheduled = math.inf
+        return response
+
+    async def think(self, low: float, high: float) -> None:
+        await asyncio.sleep(self.rng.uniform(low, high))
+
+
+async def semester_start(session: Session, target: Target) -> None:
+    name, student_id = session.rng.choice(target.logins)
+    await session.call("POST /auth/login-lookup", "POST", "/auth/login-lookup",
+                       body={"name": name, "student_id": student_id})
+    await session.think(0.5, 2.0)
+    token = session.rng.choice(target.member_tokens)
+    await session.call("GET /members/me", "GET", "/members/me", token)
+    await session.call("GET /members/me/debates", "GET", "/members/me/debates", token)
+
+
+async def reservation_rush(session: Session, target: Target) -> None:
+    token = session.rng.choice(target.member_tokens)
+    await session.call("GET /reservations/month", "GET", f"/reservations/month?date={target.month.isoformat()}")
+    await session.think(0.2, 1.0)
+    # 다음 달 첫 주 저녁 인기 시간대(하루 2칸)에 몰린다.
+    first = (target.month.replace(day=28) + timedelta(days=4)).replace(day=1)
+    day = first + timedelta(days=session.rng.randint(0, 6))
+    hour = session.rng.choice((18, 20))
+    starts_at = datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+    body = {
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=2)).isoformat(),
+        "title": "토론 연습",
+        "allow_simultaneous": session.rng.random() < 0.5,
+    }
+    await session.call("POST /reservations", "POST", "/reservations", token, body)
+
+
+async def tournament_day(session: Session, target: Target) -> None:
+    if target.event_id is None:
+        raise SystemExit("tournament-day 시나리오에는 --event-id가 필요합니다.")
+    for _ in range(session.rng.randint(3, 8)):
+        await session.call("GET /tournaments/{id}", "GET", f"/tournaments/{target.event_id}")
+        await session.think(2.0, 5.0)
+    if target.admin_token and target.match_ids and session.rng.random() < 0.05:
+        match_id = session.rng.choice(target.match_ids)
+        await session.call(
+            "PATCH match result", "PATCH", f"/tournaments/{target.event_id}/matches/{match_id}/result",
+            target.admin_token, {"team_a_score": session.rng.randint(50, 100), "team_b_score": session.rng.randint(50, 100)},
+        )
+
+
+SCENARIOS: Dict[str, List[tuple]] = {
+    "semester-start": [(semester_start, 1)],
+    "reservation-rush": [(reservation_rush, 1)],
+    "tournament-day": [(tournament_day, 1)],
+    "mixed": [(semester_start, 4), (reservation_rush, 3), (tournament_day, 3)],
+}
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    target: Target,
+    scenario: str,
+    rate: float,
+    duration: float,
+    max_sessions: int,
+    seed: int,
+) -> Recorder:
+    rng = random.Random(seed)
+    flows = SCENARIOS[scenario]
+    weights = [weight for _, weight in flows]
+    recorder = Recorder()
+    running: set = set()
+    started = time.perf_counter()
+    next_arrival = started
+
+    while True:
+        next_arrival += rng.expovariate(rate)
+        if next_arrival - started > duration:
+            break
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        recorder.sessions_started += 1
+        if len(running) >= max_sessions:
+            # 클라이언트 자원 한도. 서버가 아니라 부하 생성기가 밀린 것이므로 따로 센다.
+            recorder.sessions_dropped += 1
+            continue
+        flow = rng.choices([fn for fn, _ in flows], weights)[0]
+        session = Session(client, recorder, next_arrival, random.Random(rng.random()))
+        task = asyncio.create_task(flow(session, target))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+    return recorder
+
+
+def _histogram(latencies: List[float]) -> str:
+    counts = [0] * (len(_BUCKETS_MS) + 1)
+    for value in latencies:
+        ms = value * 1000
+        index = next((i for i, bound in enumerate(_BUCKETS_MS) if ms <= bound), len(_BUCKETS_MS))
+        counts[index] += 1
+    total = len(latencies) or 1
+    lines = []
+    for index, count in enumerate(counts):
+        if not count:
+            continue
+        label = f"<= {_BUCKETS_MS[index]}ms" if index < len(_BUCKETS_MS) else f"> {_BUCKETS_MS[-1]}ms"
+        lines.append(f"      {label:>10} {count:>7} {'#' * max(1, round(40 * count / total))}")
+    return "\n".join(lines)
+
+
+def report(recorder: Recorder, elapsed: float, show_histogram: bool) -> Dict[str, Any]:
+    print(f"\nsessions started={recorder.sessions_started} dropped(client limit)={recorder.sessions_dropped} "
+          f"elapsed={elapsed:.1f}s")
+    print(f"{'request':<26} {'count':>7} {'req/s':>7} {'err %':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8}  statuses")
+    summary: Dict[str, Any] = {}
+    for name in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[name])
+        statuses = dict(recorder.statuses[name])
+        errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) not in _EXPECTED)
+        row = {
+            "count": len(values),
+            "rps": len(values) / elapsed if elapsed else 0.0,
+            "error_rate": errors / len(values) if values else 0.0,
+            "p50_ms": percentile(values, 0.50) * 1000,
+            "p95_ms": percentile(values, 0.95) * 1000,
+            "p99_ms": percentile(values, 0.99) * 1000,
+            "max_ms": values[-1] * 1000 if values else 0.0,
+            "statuses": statuses,
+        }
+        summary[name] = row
+        status_text = " ".join(f"{status}:{count}" for status, count in sorted(statuses.items()))
+        print(f"{name:<26} {row['count']:>7} {row['rps']:>7.1f} {row['error_rate'] * 100:>6.2f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}  {status_text}")
+        if show_histogram:
+            print(_histogram(values))
+    return summary
+
+
+def _local_target(args: argparse.Namespace) -> tuple:
+    from bench.datasets import build_dataset
+    from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+    dataset = build_dataset(args.scale, args.seed)
+    backend = FakePostgrest(
+        dataset.tables, delay=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=args.seed
+    ).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+
+    from app.main import app
+
+    event_id = dataset.tournament_ids[-1]
+    target = Target(
+        member_tokens=[make_token(user_id) for user_id in dataset.member_ids[:200]],
+        admin_token=make_token(dataset.admin_id),
+        event_id=event_id,
+        match_ids=[row["id"] for row in dataset.tables["tournament_matches"] if row["tournament_id"] == event_id],
+        logins=dataset.credentials,
+        month=dataset.anchor.replace(day=1),
+    )
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadgen", timeout=args.timeout)
+    return target, client, backend
+
+
+def _remote_target(args: argparse.Namespace) -> tuple:
+    if not args.member_token:
+        raise SystemExit("--url 대상에는 --member-token이 필요합니다.")
+    target = Target(
+        member_tokens=args.member_token,
+        admin_token=args.admin_token,
+        event_id=args.event_id,
+        match_ids=args.match_id or [],
+        logins=[(args.login_name, args.login_student_id)] if args.login_name else [("없는회원", "00000000")],
+        month=date.today().replace(day=1),
+    )
+    limits = httpx.Limits(max_connections=args.max_sessions, max_keepalive_connections=args.max_sessions)
+    client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits)
+    return target, client, None
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    target, client, backend = _remote_target(args) if args.url else _local_target(args)
+    started = time.perf_counter()
+    try:
+        async with client:
+            recorder = await drive(client, target, args.scenario, args.rate, args.duration, args.max_sessions, args.seed)
+    finally:
+        if backend is not None:
+            backend.stop()
+    return report(recorder, time.perf_counter() - started, args.histogram)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--rate", type=float, default=20.0, help="초당 세션 도착 수 (포아송)")
+    parser.add_argument("--duration", type=float, default=30.0, help="도착을 만드는 시간(초)")
+    parser.add_argument("--max-sessions", type=int, default=1000, help="동시에 진행할 수 있는 최대 세션 수")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--histogram", action="store_true", help="요청 종류별 지연시간 히스토그램 출력")
+    parser.add_argument("--json", help="요약을 JSON 파일로도 저장")
+    local = parser.add_argument_group("로컬 대상 (기본)")
+    local.add_argument("--scale", choices=("small", "medium", "large"), default="medium")
+    local.add_argument("--latency-ms", type=float, default=5.0)
+    local.add_argument("--jitter-ms", type=float, default=5.0)
+    remote = parser.add_argument_group("배포된 서버 대상")
+    remote.add_argument("--url")
+    remote.add_argument("--member-token", action="append", help="여러 번 지정하면 세션마다 골라 쓴다")
+    remote.add_argument("--admin-token")
+    remote.add_argument("--event-id")
+    remote.add_argument("--match-id", action="append")
+    remote.add_argument("--login-name")
+    remote.add_argument("--login-student-id")
+    args = parser.parse_args()
+
+    summary = asyncio.run(main_async(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fp:
+            json.dump({"args": vars(args), "summary": summary}, fp, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""대회 진출 확률 벤치마크: NumPy 일괄 시뮬레이션의 정확도와 속도.
+
+1. 정확도: 작은 대회(조 2개 × 4팀, 준결승/결승)의 남은 경기 결과를 전부 나열해 TournamentEngine으로
+   순위/대진을 풀어 정확한 확률을 구하고, app.odds의 시뮬레이션 결과와 비교한다 (uniform, rating 모두).
+2. 속도: 조 수를 늘린 대회에서 시뮬레이션 횟수별 계산 시간. 같은 상태를 다시 물으면 보관한 결과를 쓰는지도 본다.
+
+--api는 가짜 PostgREST 위에서 일정을 확정한 대회에 GET /odds를 호출하고, 결과를 입력하면 version이
+바뀌는지 확인한다. 어긋나면 0이 아닌 코드로 끝난다.
+
+    python -m bench.odds --groups 2 8 32 --simulations 10000 50000 200000
+    python -m bench.odds --api
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from app import odds
+from app.odds import elo_ratings, simulate_odds
+from app.scheduler import assign_slots, group_fixtures, knockout_fixtures, slot_clock
+from app.standings import GROUP_STAGE, TournamentEngine
+from bench.endpoints import JWT_SECRET, make_token
+
+KST = timezone(timedelta(hours=9))
+STARTS_AT = datetime(2031, 3, 1, 9, tzinfo=KST)
+
+failures: List[str] = []
+
+
+def expect(condition: bool, message: str) -> None:
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def build(groups: int, group_size: int, completed: float, seed: int) -> Tuple[dict, List[dict], List[dict]]:
+    """조별 리그 + 조 상위 2팀 토너먼트. 조 경기 중 completed 비율만큼 결과를 채운다."""
+    rng = random.Random(seed)
+    names = [chr(ord("A") + index) if index < 26 else f"Z{index}" for index in range(groups)]
+    members = {name: [f"{name}{number}" for number in range(1, group_size + 1)] for name in names}
+    fixtures, keys_by_group = group_fixtures(members)
+    fixtures += knockout_fixtures(names, keys_by_group, 2)
+    fixtures = assign_slots(fixtures, [("1관", max(1, groups))], slot_clock(STARTS_AT, 40), 40)
+    group_of = {key: name for name, keys in keys_by_group.items() for key in keys}
+    teams = [
+        {"id": team, "name": f"{team}팀", "group_name": name, "experience_score": rng.choice((1.0, 1.5, 2.0, 2.5, 3.0))}
+        for name, ids in members.items()
+        for team in ids
+    ]
+    matches = []
+    for fixture in fixtures:
+        match = {
+            "id": fixture.key, "stage": fixture.stage, "group_name": group_of.get(fixture.key),
+            "round_label": fixture.round_label, "status": "scheduled", "starts_at": fixture.starts_at.isoformat(),
+            "team_a_id": fixture.team_a, "team_b_id": fixture.team_b,
+            "team_a_source_group": fixture.source_a, "team_b_source_group": fixture.source_b,
+            "team_a_score": None, "team_b_score": None, "winner_team_id": None,
+        }
+        matches.append(match)
+    group_matches = [match for match in matches if match["stage"] == GROUP_STAGE]
+    for match in group_matches[: int(len(group_matches) * completed)]:
+        score_a, score_b = rng.sample(range(0, 6), 2)
+        match.update(
+            status="completed", team_a_score=score_a, team_b_score=score_b,
+            winner_team_id=match["team_a_id"] if score_a > score_b else match["team_b_id"],
+        )
+    event = {"points_per_win": 3, "tiebreakers": ["points", "head_to_head", "score_diff", "experience"]}
+    return event, teams, matches
+
+
+def exact(event: dict, teams: List[dict], matches: List[dict], model: str) -> Dict[str, dict]:
+    """남은 경기 결과를 모두 나열한 정확한 확률. 남은 조 경기는 점수 없이 승패만 정한다 (시뮬레이션과 같은 가정)."""
+    base = TournamentEngine(event, teams, [dict(match) for match in matches])
+    ratings = elo_ratings(base)
+    remaining = [match["id"] for match in matches if match["status"] != "completed"]
+    knockout = [match["id"] for match in matches if match["stage"] != GROUP_STAGE]
+    final_id = knockout[-1]
+    table = {team["id"]: {"ranks": [0.0] * 4, "knockout": 0.0, "final": 0.0, "champion": 0.0} for team in teams}
+
+    def win_probability(team_a: str, team_b: str) -> float:
+        if model == "uniform":
+            return 0.5
+        return 1.0 / (1.0 + 10 ** ((ratings[team_b] - ratings[team_a]) / odds.ELO_SCALE))
+
+    for outcome in itertools.product((True, False), repeat=len(remaining)):
+        engine = TournamentEngine(event, teams, [dict(match) for match in matches])
+        weight = 1.0
+        for match_id, a_wins in zip(remaining, outcome):
+            team_a, team_b = engine._resolve(match_id, set())
+            probability = win_probability(team_a, team_b)
+            weight *= probability if a_wins else 1 - probability
+            engine.apply_result(match_id, {
+                "team_a_id": team_a, "team_b_id": team_b, "status": "completed",
+                "winner_team_id": team_a if a_wins else team_b,
+            })
+        for rows in engine.standings_by_group.values():
+            for row in rows:
+                table[row["team_id"]]["ranks"][row["rank"] - 1] += weight
+        for team in {team for match_id in knockout for team in engine._resolve(match_id, set())}:
+            table[team]["knockout"] += weight
+        for team in engine._resolve(final_id, set()):
+            table[team]["final"] += weight
+        table[engine.match_by_id[final_id]["winner_team_id"]]["champion"] += weight
+    return table
+
+
+def run_accuracy(args: argparse.Namespace) -> None:
+    event, teams, matches = build(2, 4, 0.34, args.seed)
+    remaining = sum(1 for match in matches if match["status"] != "completed")
+    print(f"정확도: 조 2개 × 4팀, 남은 경기 {remaining}개 ({2 ** remaining}가지), 시뮬레이션 {args.check_simulations}회")
+    for model in odds.ODDS_MODELS:
+        expected = exact(event, teams, matches, model)
+        result = simulate_odds(TournamentEngine(event, teams, [dict(match) for match in matches]), args.check_simulations, model)
+        worst = 0.0
+        for team in result["teams"]:
+            want = expected[team["team_id"]]
+            pairs = list(zip(team["rank_probabilities"], want["ranks"]))
+            pairs += [(team[f"{name}_probability"], want[name]) for name in ("knockout", "final", "champion")]
+            worst = max(worst, *(abs(got - value) for got, value in pairs))
+        expect(result["remaining_matches"] == remaining, f"{model}: 남은 경기 수 {result['remaining_matches']}")
+        expect(worst < 0.01, f"{model}: 정확한 확률과의 최대 차이 {worst:.4f} < 0.01")
+
+
+def run_speed(args: argparse.Namespace) -> None:
+    print(f"\n{'groups':>6} {'teams':>6} {'matches':>8} {'sims':>8} {'ms':>9} {'memo ms':>8}")
+    for groups in args.groups:
+        event, teams, matches = build(groups, 4, 0.5, args.seed)
+        for simulations in args.simulations:
+            engine = TournamentEngine(event, teams, [dict(match) for match in matches])
+            odds._memo.clear()
+            started = time.perf_counter()
+            first = simulate_odds(engine, simulations)
+            elapsed = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            again = simulate_odds(TournamentEngine(event, teams, [dict(match) for match in matches]), simulations)
+            memo = (time.perf_counter() - started) * 1000
+            print(f"{groups:>6} {len(teams):>6} {len(matches):>8} {simulations:>8} {elapsed:>9.1f} {memo:>8.2f}", flush=True)
+            expect(again is first, f"{groups}조 {simulations}회: 같은 상태는 보관한 결과")
+            champion = sum(team["champion_probability"] for team in first["teams"])
+            expect(abs(champion - 1) < 0.01, f"{groups}조 {simulations}회: 우승 확률 합 {champion:.4f}")
+
+
+async def run_api(args: argparse.Namespace) -> None:
+    import httpx
+
+    from bench.datasets import build_dataset
+    from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+    dataset = build_dataset("small", args.seed, tournaments=1, teams=4, members=8 * 3 + 10)
+    backend = FakePostgrest(dataset.tables, delay=1 / 1000).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    from app.main import app
+
+    headers = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    event_id = dataset.tournament_ids[0]
+    users = iter(dataset.member_ids)
+    roster = {
+        "teams": [
+            {"client_key": f"{group}{number}", "name": f"{group}조 {number}팀", "group_name": group,
+             "members": [{"user_id": next(users)} for _ in range(3)]}
+            for group in ("A", "B")
+            for number in range(1, 5)
+        ],
+    }
+    schedule = {"starts_at": STARTS_AT.isoformat(), "venues": [{"name": "1관", "capacity": 2}]}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            print("\nAPI (조 2개 × 4팀)")
+            await client.put(f"/tournaments/{event_id}/setup", json=roster, headers=headers)
+            preview = await client.post(f"/tournaments/{event_id}/schedule/generate", json=schedule, headers=headers)
+            response = await client.put(f"/tournaments/{event_id}/setup", json=preview.json(), headers=headers)
+            expect(response.status_code == 200, f"일정 확정 ({response.status_code})")
+            snapshot = response.json()
+
+            started = time.perf_counter()
+            response = await client.get(f"/tournaments/{event_id}/odds", params={"model": "rating"})
+            elapsed = (time.perf_counter() - started) * 1000
+            expect(response.status_code == 200, f"확률 ({response.status_code}, {elapsed:.1f}ms)")
+            before = response.json()
+            expect(before["remaining_matches"] == len(snapshot["matches"]), f"남은 경기 {before['remaining_matches']}")
+            first_place = sum(team["rank_probabilities"][0] for team in before["teams"])
+            expect(abs(first_place - 2) < 0.01, f"조 1위 확률 합 {first_place:.4f} (조 2개)")
+            response = await client.get(f"/tournaments/{event_id}/odds", params={"simulations": 10})
+            expect(response.status_code == 422, f"너무 적은 시뮬레이션 횟수는 거절 ({response.status_code})")
+
+            match = next(match for match in snapshot["matches"] if match["stage"] == GROUP_STAGE)
+            response = await client.patch(
+                f"/tournaments/{event_id}/matches/{match['id']}/result",
+                json={"team_a_score": 3, "team_b_score": 1}, headers=headers,
+            )
+            expect(response.status_code == 200, f"결과 입력 ({response.status_code})")
+            after = (await client.get(f"/tournaments/{event_id}/odds", params={"model": "rating"})).json()
+            expect(after["version"] != before["version"], "결과를 입력하면 version이 바뀜")
+            expect(after["remaining_matches"] == before["remaining_matches"] - 1, "남은 경기가 하나 줄어듦")
+            winner = next(team for team in after["teams"] if team["team_id"] == match["team_a_id"])
+            expect(winner["rank_probabilities"][-1] < 0.5, f"이긴 팀의 꼴찌 확률 {winner['rank_probabilities'][-1]}")
+    finally:
+        backend.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--simulations", type=int, nargs="+", default=[10000, 50000, 200000])
+    parser.add_argument("--check-simulations", type=int, default=200000, help="정확도 비교에 쓸 시뮬레이션 횟수")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--api", action="store_true", help="가짜 PostgREST 위에서 확률 API도 확인")
+    args = parser.parse_args()
+
+    run_accuracy(args)
+    run_speed(args)
+    if args.api:
+        asyncio.run(run_api(args))
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""저장소 백엔드 비교 벤치마크: Supabase REST vs asyncpg 직접 연결.
+
+같은 시드 데이터셋을 (1) 가짜 PostgREST 서버와 (2) 실제 Postgres에 올리고, bench.endpoints의
+엔드포인트 목록을 두 백엔드로 번갈아 측정한다. Postgres에는 벤치 전용 데이터베이스를 새로
+만들고 auth 스키마를 흉내낸 뒤 sql/schema.sql을 그대로 적용한다.
+
+    python -m bench.repositories --dsn postgresql://postgres@localhost/postgres
+    python -m bench.repositories --dsn ... --postgrest-url http://localhost:3000 --service-key ...
+
+가짜 PostgREST는 실제 PostgREST보다 훨씬 가볍다(메모리 dict, --latency-ms로 왕복 지연만
+흉내). 실제 비교가 필요하면 같은 데이터베이스를 바라보는 PostgREST를 띄우고
+--postgrest-url을 준다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlsplit, urlunsplit
+
+from bench.datasets import SCALES, Dataset, build_dataset
+from bench.endpoints import JWT_SECRET, endpoints, run_endpoint
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "sql" / "schema.sql"
+
+# Supabase가 제공하는 auth 스키마 중 schema.sql이 참조하는 부분만 만든다.
+AUTH_BOOTSTRAP = """
+create schema if not exists auth;
+create table if not exists auth.users (
+  id uuid primary key,
+  email text,
+  raw_user_meta_data jsonb not null default '{}'::jsonb
+);
+"""
+
+# 시드 순서: 외래키 부모 먼저
+SEED_ORDER = [
+    "users",
+    "debates",
+    "debate_participants",
+    "records",
+    "reservations",
+    "tournaments",
+    "tournament_teams",
+    "tournament_team_members",
+    "tournament_matches",
+]
+SERIAL_TABLES = ("debate_participants", "tournament_team_members")
+
+
+def _with_database(dsn: str, database: str) -> str:
+    parts = urlsplit(dsn)
+    return urlunsplit((parts.scheme, parts.netloc, f"/{database}", parts.query, parts.fragment))
+
+
+async def prepare_database(dsn: str, database: str, dataset: Dataset) -> str:
+    import asyncpg
+
+    admin = await asyncpg.connect(dsn)
+    try:
+        await admin.execute(f'drop database if exists "{database}" with (force)')
+        await admin.execute(f'create database "{database}"')
+    finally:
+        await admin.close()
+
+    bench_dsn = _with_database(dsn, database)
+    conn = await asyncpg.connect(bench_dsn)
+    try:
+        await conn.execute(AUTH_BOOTSTRAP)
+        schema = SCHEMA_PATH.read_text(encoding="utf-8")
+        if not await conn.fetchval("select 1 from pg_available_extensions where name = 'pgcrypto'"):
+            # gen_random_uuid()는 PG13부터 코어에 있으므로 contrib 없는 빌드에서는 확장 설치만 건너뛴다.
+            schema = schema.replace("create extension if not exists pgcrypto;", "")
+        await conn.execute(schema)
+        async with conn.transaction():
+            # 시드 행은 id/타임스탬프까지 정해져 있으므로 트리거와 외래키 검사를 건너뛴다.
+            await conn.execute("set local session_replication_role = replica")
+            users = dataset.tables["users"]
+            await conn.execute(
+                "insert into auth.users (id, email) select id, email"
+                " from jsonb_populate_recordset(null::auth.users, $1::jsonb)",
+                json.dumps([{"id": user["id"], "email": user["email"]} for user in users]),
+            )
+            for table in SEED_ORDER:
+                rows = dataset.tables.get(table) or []
+                if not rows:
+                    continue
+                columns = ",".join(f'"{key}"' for key in rows[0])
+                await conn.execute(
+                    f"insert into public.{table} ({columns}) select {columns}"
+                    f" from jsonb_populate_recordset(null::public.{table}, $1::jsonb)",
+                    json.dumps(rows, ensure_ascii=False),
+                )
+            for table in SERIAL_TABLES:
+                await conn.execute(
+                    f"select setval(pg_get_serial_sequence('public.{table}', 'id'),"
+                    f" coalesce((select max(id) from public.{table}), 0) + 1, false)"
+                )
+        await conn.execute("analyze")
+    finally:
+        await conn.close()
+    return bench_dsn
+
+
+async def run(args: argparse.Namespace, dataset: Dataset) -> Dict[str, List[Dict[str, Any]]]:
+    import httpx
+
+    from app.cache import response_cache
+    from app.main import app
+    from app.repositories import close_repositories, use_backend
+
+    response_cache.enabled = args.cache
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for backend in args.backends:
+            use_backend(backend)
+            print(f"\n[{backend}]")
+            print(f"{'endpoint':<46} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6} {'calls':>7}")
+            results[backend] = []
+            for endpoint in endpoints(dataset):
+                if args.only and not any(token in endpoint.name for token in args.only):
+                    continue
+                response_cache.clear()
+                result = await run_endpoint(client, endpoint, args.requests, args.concurrency, args.warmup)
+                results[backend].append(result)
+                print(
+                    f"{result['endpoint']:<46} {result['rps']:>8.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}"
+                    f" {result['p99_ms']:>8.2f} {result['errors']:>6} {result['upstream_per_request']:>7.2f}",
+                    flush=True,
+                )
+    close_repositories()
+    return results
+
+
+def compare(results: Dict[str, List[Dict[str, Any]]]) -> None:
+    if "supabase" not in results or "postgres" not in results:
+        return
+    rest = {row["endpoint"]: row for row in results["supabase"]}
+    print(f"\n{'endpoint':<46} {'REST p50':>9} {'PG p50':>9} {'speedup':>8}")
+    for row in results["postgres"]:
+        base = rest.get(row["endpoint"])
+        if base is None:
+            continue
+        speedup = base["p50_ms"] / row["p50_ms"] if row["p50_ms"] else 0.0
+        print(f"{row['endpoint']:<46} {base['p50_ms']:>9.2f} {row['p50_ms']:>9.2f} {speedup:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", required=True, help="벤치 DB를 만들 권한이 있는 Postgres 접속 문자열")
+    parser.add_argument("--database", default="manjang_bench", help="새로 만들 벤치 전용 데이터베이스 이름")
+    parser.add_argument("--postgrest-url", help="같은 DB를 바라보는 실제 PostgREST 주소 (없으면 가짜 서버)")
+    parser.add_argument("--service-key", help="--postgrest-url용 service role 키")
+    parser.add_argument("--backends", nargs="+", choices=("supabase", "postgres"), default=["supabase", "postgres"])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트당 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="가짜 PostgREST 왕복 지연")
+    parser.add_argument("--cache", action="store_true", help="응답 캐시를 켠 채 측정 (기본은 끔)")
+    parser.add_argument("--only", nargs="*", help="이름에 이 문자열이 들어간 엔드포인트만")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args()
+
+    dataset = build_dataset(args.scale, args.seed)
+    bench_dsn = asyncio.run(prepare_database(args.dsn, args.database, dataset))
+    print(f"postgres: seeded {args.database} (scale={args.scale} seed={args.seed})")
+
+    backend = None
+    if args.postgrest_url:
+        os.environ["SUPABASE_URL"] = args.postgrest_url
+        os.environ["SUPABASE_SERVICE_ROLE_KEY"] = args.service_key or ""
+    else:
+        # 가짜 서버는 자체 사본을 쓰므로 쓰기 엔드포인트의 결과가 Postgres 쪽과 섞이지 않는다.
+        backend = FakePostgrest(build_dataset(args.scale, args.seed).tables, delay=args.latency_ms / 1000).start()
+        os.environ["SUPABASE_URL"] = backend.url
+        os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    os.environ["DATABASE_URL"] = bench_dsn
+
+    try:
+        results = asyncio.run(run(args, dataset))
+    finally:
+        if backend is not None:
+            backend.stop()
+    compare(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fp:
+            json.dump({"args": vars(args), "results": results}, fp, ensure_ascii=False, indent=2)
+    failed = any(row["errors"] == row["requests"] for rows in results.values() for row in rows)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""일정 생성 벤치마크: 조별 리그전 + 토너먼트 경기 생성과 시간대/장소 배정.
+
+팀 수별로 app.scheduler의 생성/배정 시간을 재고, 만든 일정이 제약을 지키는지 확인한다.
+
+- 한 시간대에 한 팀은 한 경기만, 장소별 동시 경기 수 이하
+- 팀의 연속 경기 사이에 rest_minutes 이상
+- 진출 조건이 기대는 경기(조 전체, 앞 경기)가 끝나고 rest_minutes 이후에 시작
+- day_ends_at을 넘겨 끝나는 경기가 없음
+
+--api를 주면 가짜 PostgREST 위에서 팀만 등록한 대회에 POST /schedule/generate를 호출하고,
+받은 미리보기를 PUT /setup으로 그대로 확정해 본다. 어긋나면 0이 아닌 코드로 끝난다.
+
+    python -m bench.schedule --teams 64 256 1024 --venues 4
+    python -m bench.schedule --api
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from datetime import time as clock_time
+from typing import Dict, List, Optional
+
+from app.scheduler import Fixture, assign_slots, group_fixtures, knockout_fixtures, slot_clock
+from app.standings import parse_source
+from bench.endpoints import JWT_SECRET, make_token
+
+KST = timezone(timedelta(hours=9))
+STARTS_AT = datetime(2031, 3, 1, 9, tzinfo=KST)
+
+failures: List[str] = []
+
+
+def expect(condition: bool, message: str) -> None:
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def groups_for(teams: int, group_size: int) -> Dict[str, List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for index in range(teams):
+        name = f"{index // group_size + 1}"
+        groups.setdefault(name, []).append(f"t{index}")
+    return groups
+
+
+def violations(
+    fixtures: List[Fixture],
+    capacity: Dict[str, int],
+    match_minutes: int,
+    rest_minutes: int,
+    day_ends_at: Optional[clock_time],
+) -> List[str]:
+    problems: List[str] = []
+    length = timedelta(minutes=match_minutes)
+    rest = timedelta(minutes=rest_minutes)
+    by_key = {fixture.key: fixture for fixture in fixtures}
+    per_slot: Dict[tuple, int] = defaultdict(int)
+    team_times: Dict[str, List[datetime]] = defaultdict(list)
+    for fixture in fixtures:
+        if fixture.starts_at is None:
+            problems.append(f"{fixture.key}: 시간 미배정")
+            continue
+        per_slot[(fixture.starts_at, fixture.venue)] += 1
+        for team in fixture.teams:
+            team_times[team].append(fixture.starts_at)
+        for key in fixture.after:
+            if by_key[key].starts_at + length + rest > fixture.starts_at:
+                problems.append(f"{fixture.key}: 앞 경기 {key}보다 먼저 시작")
+        if day_ends_at is not None and (fixture.starts_at + length).timetz() > day_ends_at.replace(tzinfo=KST):
+            problems.append(f"{fixture.key}: 하루 마감 시각 초과")
+    for (start, venue), count in per_slot.items():
+        if count > capacity[venue]:
+            problems.append(f"{venue} {start}: {count}경기 동시 진행")
+    for team, starts in team_times.items():
+        starts.sort()
+        for previous, current in zip(starts, starts[1:]):
+            if current < previous + length + rest:
+                problems.append(f"{team}: {previous} → {current} 쉬는 시간 부족")
+    return problems
+
+
+def generate(teams: int, args: argparse.Namespace) -> List[Fixture]:
+    fixtures, keys_by_group = group_fixtures(groups_for(teams, args.group_size))
+    fixtures += knockout_fixtures(list(keys_by_group), keys_by_group, args.advance, third_place=True)
+    venues = [(f"{index + 1}관", args.capacity) for index in range(args.venues)]
+    return assign_slots(fixtures, venues, slot_clock(STARTS_AT, args.match_minutes, args.day_ends_at),
+                        args.match_minutes, args.rest_minutes)
+
+
+def run_scheduler(args: argparse.Namespace) -> None:
+    capacity = {f"{index + 1}관": args.capacity for index in range(args.venues)}
+    print(f"{'teams':>6} {'matches':>8} {'ms':>9} {'days':>5} {'last match':>22}")
+    for teams in args.teams:
+        started = time.perf_counter()
+        fixtures = generate(teams, args)
+        elapsed = (time.perf_counter() - started) * 1000
+        last = max(fixture.starts_at for fixture in fixtures)
+        days = (last.date() - STARTS_AT.date()).days + 1
+        print(f"{teams:>6} {len(fixtures):>8} {elapsed:>9.2f} {days:>5} {last.isoformat():>22}", flush=True)
+        problems = violations(fixtures, capacity, args.match_minutes, args.rest_minutes, args.day_ends_at)
+        expect(not problems, f"{teams}팀 제약 위반 {len(problems)}건 {problems[:3]}")
+
+
+async def run_api(args: argparse.Namespace) -> None:
+    import httpx
+
+    from bench.datasets import build_dataset
+    from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+    teams = args.teams[0]
+    dataset = build_dataset("small", 7, tournaments=1, teams=4, members=teams * 3 + 10)
+    backend = FakePostgrest(dataset.tables, delay=1 / 1000).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    from app.main import app
+
+    headers = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    event_id = dataset.tournament_ids[0]
+    users = iter(dataset.member_ids)
+    roster = {
+        "teams": [
+            {"client_key": key, "name": f"{group}조 {key}", "group_name": group,
+             "members": [{"user_id": next(users)} for _ in range(3)]}
+            for group, keys in groups_for(teams, args.group_size).items()
+            for key in keys
+        ],
+    }
+    request = {
+        "starts_at": STARTS_AT.isoformat(),
+        "match_minutes": args.match_minutes,
+        "rest_minutes": args.rest_minutes,
+        "day_ends_at": args.day_ends_at.isoformat() if args.day_ends_at else None,
+        "venues": [{"name": f"{index + 1}관", "capacity": args.capacity} for index in range(args.venues)],
+        "advance_per_group": args.advance,
+        "third_place_match": True,
+    }
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            print(f"\nAPI ({teams}팀)")
+            response = await client.put(f"/tournaments/{event_id}/setup", json=roster, headers=headers)
+            expect(response.status_code == 200, f"팀 등록 ({response.status_code})")
+            too_many = {**request, "advance_per_group": args.group_size + 1}
+            response = await client.post(f"/tournaments/{event_id}/schedule/generate", json=too_many, headers=headers)
+            expect(response.status_code in (400, 422), f"조 인원보다 많은 진출 팀 수는 거절 ({response.status_code})")
+            started = time.perf_counter()
+            response = await client.post(f"/tournaments/{event_id}/schedule/generate", json=request, headers=headers)
+            elapsed = (time.perf_counter() - started) * 1000
+            expect(response.status_code == 200, f"일정 생성 ({response.status_code}, {elapsed:.1f}ms)")
+            preview = response.json()
+            expect(backend.tables["tournament_matches"] == [] or all(
+                row["tournament_id"] != event_id for row in backend.tables["tournament_matches"]
+            ), "미리보기는 저장하지 않음")
+            response = await client.put(f"/tournaments/{event_id}/setup", json=preview, headers=headers)
+            expect(response.status_code == 200, f"미리보기를 그대로 확정 ({response.status_code})")
+            snapshot = response.json()
+            expect(len(snapshot["matches"]) == len(preview["matches"]), f"경기 {len(snapshot['matches'])}건 저장")
+            first_round = [match for match in snapshot["matches"] if match["stage"] == "final"][:1]
+            expect(bool(first_round) and parse_source(first_round[0]["team_a_source_group"]) is not None,
+                   f"토너먼트 자리 표시: {first_round[0]['team_a_name'] if first_round else '-'}")
+    finally:
+        backend.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, nargs="+", default=[64, 256, 1024])
+    parser.add_argument("--group-size", type=int, default=4)
+    parser.add_argument("--advance", type=int, default=2, help="조별 토너먼트 진출 팀 수")
+    parser.add_argument("--venues", type=int, default=4)
+    parser.add_argument("--capacity", type=int, default=1, help="장소별 동시 경기 수")
+    parser.add_argument("--match-minutes", type=int, default=40)
+    parser.add_argument("--rest-minutes", type=int, default=40)
+    parser.add_argument("--day-ends-at", type=clock_time.fromisoformat, default=clock_time(21))
+    parser.add_argument("--api", action="store_true", help="가짜 PostgREST 위에서 생성/확정 API도 확인 (--teams 첫 값)")
+    args = parser.parse_args()
+
+    run_scheduler(args)
+    if args.api:
+        asyncio.run(run_api(args))
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
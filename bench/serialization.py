@@ -0,0 +1,179 @@
+"""응답 직렬화 마이크로 벤치마크.
+
+대표 페이로드(대회 스냅샷, 회원 통계, 3개월 예약 목록)마다 세 경로를 비교한다.
+
+- fastapi: response_model 검증 + jsonable_encoder + json.dumps (FastAPI 기본 경로)
+- validated: 미리 만든 TypeAdapter로 검증 + dump_json (캐시 기본 경로)
+- fast: 검증 없이 dump_json/orjson (validate=False, fast_json)
+
+    python -m bench.serialization --repeat 200
+"""
+
+import argparse
+import json
+import random
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models import MemberStatsRow, Reservation
+from app.serialization import adapter_for, serialize
+
+
+def _fastapi_path(value: Any, response_model: Optional[Any]) -> bytes:
+    if response_model is not None:
+        adapter = adapter_for(response_model)
+        value = adapter.dump_python(adapter.validate_python(value), mode="json")
+    return json.dumps(jsonable_encoder(value), ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def snapshot_payload(rng: random.Random, teams: int = 16, matches: int = 64) -> Dict[str, Any]:
+    team_rows = []
+    for index in range(teams):
+        members = [
+            {
+                "id": index * 10 + m,
+                "team_id": f"team-{index}",
+                "user_id": f"user-{index}-{m}",
+                "experience_score": rng.randint(1, 3),
+                "name": f"회원{index}-{m}",
+                "student_id": f"2026{index:02d}{m:02d}",
+                "major": "경영학과",
+                "generation": f"{rng.randint(1, 20)}기",
+            }
+            for m in range(3)
+        ]
+        team_rows.append(
+            {
+                "id": f"team-{index}",
+                "name": f"팀 {index}",
+                "group_name": "ABCD"[index % 4],
+                "seed": index,
+                "experience_score": 2.0,
+                "members": members,
+            }
+        )
+    start = datetime(2026, 10, 19, 1, tzinfo=timezone.utc)
+    match_rows = [
+        {
+            "id": f"match-{index}",
+            "stage": "group",
+            "group_name": "ABCD"[index % 4],
+            "round_label": f"{index // 4 + 1}라운드",
+            "starts_at": (start + timedelta(minutes=30 * index)).isoformat(),
+            "venue": "대강당",
+            "team_a_id": f"team-{index % teams}",
+            "team_b_id": f"team-{(index + 4) % teams}",
+            "resolved_team_a_id": f"team-{index % teams}",
+            "resolved_team_b_id": f"team-{(index + 4) % teams}",
+            "team_a_name": f"팀 {index % teams}",
+            "team_b_name": f"팀 {(index + 4) % teams}",
+            "team_a_score": rng.randint(50, 100),
+            "team_b_score": rng.randint(50, 100),
+            "winner_team_id": f"team-{index % teams}",
+            "winner_team_name": f"팀 {index % teams}",
+            "status": "completed",
+            "notes": "",
+        }
+        for index in range(matches)
+    ]
+    standings = [
+        {
+            "team_id": team["id"],
+            "team_name": team["name"],
+            "group_name": team["group_name"],
+            "played": 3,
+            "wins": rng.randint(0, 3),
+            "losses": rng.randint(0, 3),
+            "points": rng.randint(0, 3),
+            "head_to_head_wins": 0,
+            "experience_score": 2.0,
+            "rank": index % 4 + 1,
+        }
+        for index, team in enumerate(team_rows)
+    ]
+    return {
+        "id": "event-1",
+        "title": "가을 토너먼트",
+        "teams": team_rows,
+        "matches": match_rows,
+        "standings": standings,
+        "progress": {"total": matches, "completed": matches},
+    }
+
+
+def member_stats_payload(rng: random.Random, members: int = 300) -> List[MemberStatsRow]:
+    rows = []
+    for index in range(members):
+        wins, losses = rng.randint(0, 20), rng.randint(0, 20)
+        rows.append(
+            MemberStatsRow(
+                user_id=f"user-{index}",
+                name=f"회원{index}",
+                generation=f"{rng.randint(1, 20)}기",
+                major="경영학과",
+                wins=wins,
+                losses=losses,
+                total=wins + losses,
+                win_rate=round(wins / (wins + losses), 4) if wins + losses else 0.0,
+            )
+        )
+    return rows
+
+
+def reservations_payload(rng: random.Random, rows: int = 600) -> List[Dict[str, Any]]:
+    start = datetime(2026, 9, 1, tzinfo=timezone.utc)
+    result = []
+    for index in range(rows):
+        starts_at = start + timedelta(hours=rng.randint(0, 24 * 90))
+        result.append(
+            {
+                "id": f"00000000-0000-0000-0000-{index:012d}",
+                "reserved_by": f"00000000-0000-0000-0001-{index:012d}",
+                "reserved_by_name": f"회원{index}",
+                "title": "토론 연습",
+                "starts_at": starts_at.isoformat(),
+                "ends_at": (starts_at + timedelta(hours=2)).isoformat(),
+                "debate_id": None,
+                "allow_simultaneous": bool(index % 2),
+            }
+        )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    cases = [
+        ("event snapshot (16 teams, 64 matches)", snapshot_payload(rng), None),
+        ("member stats (300 rows)", member_stats_payload(rng), List[MemberStatsRow]),
+        ("reservations, 3 months (600 rows)", reservations_payload(rng), List[Reservation]),
+    ]
+    print(f"{'payload':<40} {'path':<10} {'bytes':>8} {'us/op':>10} {'speedup':>8} {'same':>5}")
+    for label, payload, model in cases:
+        adapter = adapter_for(model) if model is not None else None
+        paths: Dict[str, Callable[[], bytes]] = {
+            "fastapi": lambda: _fastapi_path(payload, model),
+            "validated": lambda: serialize(payload, adapter, validate=True),
+            "fast": lambda: serialize(payload, adapter, validate=False),
+        }
+        baseline = None
+        expected = None
+        for name, fn in paths.items():
+            body = fn()
+            # same: FastAPI 기본 경로와 응답 바이트가 같은지 (다르면 그 경로는 응답 형식을 바꾼다)
+            expected = expected if expected is not None else json.loads(body)
+            seconds = min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat
+            baseline = baseline or seconds
+            same = "yes" if json.loads(body) == expected else "NO"
+            print(f"{label:<40} {name:<10} {len(body):>8} {seconds * 1e6:>10.1f} {baseline / seconds:>7.1f}x {same:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""동시 관중 수가 늘어도 upstream QPS가 일정한지 확인하는 부하 테스트.
+
+GET /tournaments/{id}를 N명이 동시에 요청하는 burst를 여러 번 보내고, 가짜
+Supabase 클라이언트가 실제로 받은 쿼리 수를 센다. 응답 캐시는 끄고
+single-flight 병합만 측정한다.
+
+    python -m bench.singleflight_load --clients 1 10 50 200 --bursts 5
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://fake.local")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "fake")
+
+import httpx  # noqa: E402
+
+from app.cache import response_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.repositories import supabase as supabase_repositories  # noqa: E402
+from app.singleflight import flights  # noqa: E402
+
+EVENT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, backend, table):
+        self._backend = backend
+        self._table = table
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return self._backend.execute(self._table)
+
+
+class FakeSupabase:
+    """테이블별 고정 데이터를 돌려주고, 호출 수를 세며, 지연을 흉내낸다."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        teams = [
+            {"id": f"team-{i}", "name": f"팀 {i}", "group_name": "AB"[i % 2], "seed": i, "experience_score": 1}
+            for i in range(8)
+        ]
+        matches = [
+            {
+                "id": f"match-{i}",
+                "stage": "group",
+                "group_name": teams[i]["group_name"],
+                "team_a_id": teams[i]["id"],
+                "team_b_id": teams[(i + 2) % 8]["id"],
+                "winner_team_id": teams[i]["id"] if i % 3 else None,
+                "status": "completed" if i % 3 else "scheduled",
+                "starts_at": "2026-10-19T01:00:00+00:00",
+            }
+            for i in range(8)
+        ]
+        self.tables = {
+            "tournaments": [{"id": EVENT_ID, "title": "가을 토너먼트", "points_per_win": 1}],
+            "tournament_teams": teams,
+            "tournament_team_members": [],
+            "tournament_matches": matches,
+        }
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def execute(self, table):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return _Response([dict(row) for row in self.tables.get(table, [])])
+
+
+async def _burst(client: httpx.AsyncClient, clients: int) -> None:
+    responses = await asyncio.gather(*(client.get(f"/tournaments/{EVENT_ID}") for _ in range(clients)))
+    failed = [r.status_code for r in responses if r.status_code != 200]
+    if failed:
+        raise RuntimeError(f"unexpected status codes: {failed[:5]}")
+
+
+async def run(client_counts, bursts: int, latency: float) -> None:
+    fake = FakeSupabase(latency)
+    supabase_repositories.get_supabase = lambda: fake
+    response_cache.enabled = False
+
+    transport = httpx.ASGITransport(app=app)
+    print(f"{'clients':>8} {'requests':>9} {'upstream':>9} {'req/s':>9} {'upstream q/s':>13} {'coalesced':>10}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for clients in client_counts:
+            calls_before = fake.calls
+            coalesced_before = flights.stats()["coalesced"]
+            started = time.perf_counter()
+            for _ in range(bursts):
+                await _burst(client, clients)
+            elapsed = time.perf_counter() - started
+            upstream = fake.calls - calls_before
+            coalesced = flights.stats()["coalesced"] - coalesced_before
+            requests = clients * bursts
+            print(
+                f"{clients:>8} {requests:>9} {upstream:>9} {requests / elapsed:>9.1f}"
+                f" {upstream / elapsed:>13.1f} {coalesced:>10}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated upstream latency per query (s)")
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.bursts, args.latency))
+
+
+if __name__ == "__main__":
+    main()
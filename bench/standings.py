@@ -0,0 +1,353 @@
+"""조별 순위/대진 엔진 벤치마크: 64팀 대회 (4팀씩 16개 조 리그전 + 32강 토너먼트).
+
+- legacy: 이전 _build_standings (조마다 경기 전체를 훑음, 조 1위 자리표시만 풂)
+- engine: TournamentEngine을 새로 만들고 모든 경기의 대진과 순위를 채움 (GET /tournaments/{id})
+- incremental: 경기 결과 하나를 apply_result로 반영하고 응답을 다시 만듦 (PATCH .../result)
+
+엔진 순위가 이전 계산과 같은지 확인한다. 증분 갱신 = 새로 만든 엔진 검사는 tests/test_standings.py에 있다.
+--api를 주면 가짜 PostgREST 위에서 같은 대진을 PUT /setup으로 만들고 결과 입력 API로 결승까지
+진행해 본다. 어긋나면 0이 아닌 코드로 끝난다.
+
+    python -m bench.standings --groups 16 --iterations 200
+    python -m bench.standings --api
+"""
+
+import argparse
+import asyncio
+import copy
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.standings import TournamentEngine, team_experience
+from bench.endpoints import JWT_SECRET, make_token, percentile
+
+KICKOFF = datetime(2031, 3, 1, 1, tzinfo=timezone.utc)
+ROUND_NAMES = {2: "결승"}
+
+failures: List[str] = []
+
+
+def expect(condition: bool, message: str) -> None:
+    print(f"  {'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def group_names(count: int) -> List[str]:
+    return [chr(ord("A") + index) for index in range(count)]
+
+
+def build_event(groups: int, seed: int) -> Tuple[dict, List[dict], List[dict]]:
+    """조별 리그 + 각 조 1·2위가 올라가는 토너먼트. 경기는 모두 예정 상태로 만든다."""
+    rng = random.Random(seed)
+    event = {"id": str(uuid.uuid4()), "points_per_win": 1, "tiebreakers": ["points", "head_to_head", "experience"]}
+    teams: List[dict] = []
+    matches: List[dict] = []
+
+    def add_match(stage: str, label: str, **fields: Any) -> dict:
+        match = {
+            "id": str(uuid.uuid4()),
+            "tournament_id": event["id"],
+            "stage": stage,
+            "group_name": None,
+            "round_label": label,
+            "starts_at": (KICKOFF + timedelta(minutes=40 * len(matches))).isoformat(),
+            "team_a_id": None,
+            "team_b_id": None,
+            "team_a_source_group": None,
+            "team_b_source_group": None,
+            "team_a_score": None,
+            "team_b_score": None,
+            "winner_team_id": None,
+            "status": "scheduled",
+            **fields,
+        }
+        matches.append(match)
+        return match
+
+    names = group_names(groups)
+    for group in names:
+        group_teams = []
+        for seat in range(4):
+            team = {
+                "id": str(uuid.uuid4()),
+                "client_key": f"{group}{seat}",
+                "name": f"{group}조 {seat + 1}팀",
+                "group_name": group,
+                "members": [{"experience_score": rng.randint(1, 3)} for _ in range(3)],
+            }
+            team["experience_score"] = team_experience(team)
+            group_teams.append(team)
+        teams.extend(group_teams)
+        for a_index, team_a in enumerate(group_teams):
+            for team_b in group_teams[a_index + 1 :]:
+                add_match("group", f"{group}조", group_name=group, team_a_id=team_a["id"], team_b_id=team_b["id"])
+
+    # 토너먼트 첫 라운드: A1-B2, B1-A2, C1-D2, ...
+    previous = []
+    for index in range(0, groups, 2):
+        first, second = names[index], names[index + 1]
+        opening = f"{groups * 2}강"
+        previous.append(add_match("final", opening, team_a_source_group=first, team_b_source_group=f"{second}:2"))
+        previous.append(add_match("final", opening, team_a_source_group=second, team_b_source_group=f"{first}:2"))
+    while len(previous) > 1:
+        label = ROUND_NAMES.get(len(previous), f"{len(previous)}강")
+        if len(previous) == 2:
+            add_match("final", "3·4위전",
+                      team_a_source_group=f"loser:{previous[0]['id']}", team_b_source_group=f"loser:{previous[1]['id']}")
+        previous = [
+            add_match("final", label,
+                      team_a_source_group=f"winner:{previous[index]['id']}",
+                      team_b_source_group=f"winner:{previous[index + 1]['id']}")
+            for index in range(0, len(previous), 2)
+        ]
+    return event, teams, matches
+
+
+def legacy_standings(event: dict, teams: List[dict], matches: List[dict]) -> List[dict]:
+    """이전 routers/tournaments.py의 _build_standings."""
+    points_per_win = int(event.get("points_per_win") or 1)
+    teams_by_group: Dict[str, List[dict]] = defaultdict(list)
+    for team in teams:
+        teams_by_group[team.get("group_name") or "미배정"].append(team)
+
+    result: List[dict] = []
+    for group_name in sorted(teams_by_group.keys()):
+        rows: Dict[str, dict] = {}
+        for team in teams_by_group[group_name]:
+            rows[team["id"]] = {
+                "team_id": team["id"], "team_name": team["name"], "group_name": group_name,
+                "played": 0, "wins": 0, "losses": 0, "points": 0, "head_to_head_wins": 0,
+                "experience_score": team_experience(team),
+            }
+        completed = []
+        for match in matches:
+            if match.get("stage") != "group" or match.get("group_name") != group_name:
+                continue
+            if match.get("status") != "completed" or not match.get("winner_team_id"):
+                continue
+            team_a_id, team_b_id = match.get("team_a_id"), match.get("team_b_id")
+            if team_a_id not in rows or team_b_id not in rows:
+                continue
+            completed.append(match)
+            winner_id = match["winner_team_id"]
+            loser_id = team_b_id if winner_id == team_a_id else team_a_id
+            rows[team_a_id]["played"] += 1
+            rows[team_b_id]["played"] += 1
+            rows[winner_id]["wins"] += 1
+            rows[winner_id]["points"] += points_per_win
+            rows[loser_id]["losses"] += 1
+        tied_by_points: Dict[int, List[str]] = defaultdict(list)
+        for row in rows.values():
+            tied_by_points[row["points"]].append(row["team_id"])
+        for tied_ids in tied_by_points.values():
+            if len(tied_ids) < 2:
+                continue
+            tied_set = set(tied_ids)
+            for match in completed:
+                if match.get("team_a_id") in tied_set and match.get("team_b_id") in tied_set:
+                    rows[match["winner_team_id"]]["head_to_head_wins"] += 1
+        ordered = sorted(
+            rows.values(),
+            key=lambda row: (-row["points"], -row["head_to_head_wins"], row["experience_score"], row["team_name"]),
+        )
+        for index, row in enumerate(ordered, start=1):
+            row["rank"] = index
+            result.append(row)
+    return result
+
+
+def legacy_snapshot(event: dict, teams: List[dict], matches: List[dict]) -> List[dict]:
+    standings = legacy_standings(event, teams, matches)
+    group_winner = {row["group_name"]: row["team_id"] for row in standings if row["rank"] == 1}
+    for match in matches:
+        match["resolved_team_a_id"] = match.get("team_a_id") or group_winner.get(match.get("team_a_source_group"))
+        match["resolved_team_b_id"] = match.get("team_b_id") or group_winner.get(match.get("team_b_source_group"))
+    return standings
+
+
+def engine_snapshot(event: dict, teams: List[dict], matches: List[dict]) -> TournamentEngine:
+    engine = TournamentEngine(event, teams, matches)
+    for match in matches:
+        engine.decorate(match)
+    engine.standings()
+    return engine
+
+
+def play(rng: random.Random, team_a_id: str, team_b_id: str) -> dict:
+    score_a, score_b = rng.randint(50, 100), rng.randint(50, 100)
+    return {
+        "team_a_id": team_a_id,
+        "team_b_id": team_b_id,
+        "team_a_score": score_a,
+        "team_b_score": score_b,
+        "winner_team_id": team_a_id if score_a >= score_b else team_b_id,
+        "status": "completed",
+    }
+
+
+def order(standings: List[dict]) -> List[Tuple[str, str, int]]:
+    return [(row["group_name"], row["team_id"], row["rank"]) for row in standings]
+
+
+def measure(call: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {"p50_ms": percentile(timings, 0.50) * 1000, "p95_ms": percentile(timings, 0.95) * 1000}
+
+
+def run_engine(args: argparse.Namespace) -> None:
+    event, teams, matches = build_event(args.groups, args.seed)
+    rng = random.Random(args.seed)
+    # 조별 리그 절반을 끝낸 상태에서 잰다.
+    for match in matches:
+        if match["stage"] == "group" and rng.random() < 0.5:
+            match.update(play(rng, match["team_a_id"], match["team_b_id"]))
+    print(f"event: {len(teams)} teams, {len(matches)} matches, {args.groups} groups")
+
+    print("1. 기본 동률 기준에서 엔진 순위 = 이전 계산")
+    expect(order(TournamentEngine(event, teams, matches).standings()) == order(legacy_standings(event, teams, matches)),
+           "조별 순위가 같음")
+
+    pending = [match for match in matches if match["stage"] == "group" and match["status"] != "completed"]
+    target = pending[0] if pending else matches[0]
+    engine = engine_snapshot(event, teams, matches)
+
+    def incremental() -> None:
+        engine.apply_result(target["id"], play(rng, target["team_a_id"], target["team_b_id"]))
+        for match in matches:
+            engine.decorate(match)
+        engine.standings()
+
+    print(f"\n{'method':<14} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, call in (
+        ("legacy", lambda: legacy_snapshot(event, teams, matches)),
+        ("engine", lambda: engine_snapshot(event, teams, matches)),
+        ("incremental", incremental),
+    ):
+        result = measure(call, args.iterations)
+        print(f"{name:<14} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f}", flush=True)
+
+
+async def run_api(args: argparse.Namespace) -> None:
+    import httpx
+
+    from bench.datasets import build_dataset
+    from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+    dataset = build_dataset("small", args.seed, tournaments=1, teams=4, members=args.groups * 4 * 3 + 10)
+    backend = FakePostgrest(dataset.tables, delay=args.latency_ms / 1000).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    from app.main import app
+    headers = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    event_id = dataset.tournament_ids[0]
+    _, teams, matches = build_event(args.groups, args.seed)
+    key_by_id = {team["id"]: team["client_key"] for team in teams}
+    users = iter(dataset.member_ids)
+    setup = {
+        "teams": [
+            {"client_key": team["client_key"], "name": team["name"], "group_name": team["group_name"],
+             "members": [{"user_id": next(users), "experience_score": member["experience_score"]}
+                         for member in team["members"]]}
+            for team in teams
+        ],
+        "matches": [
+            {
+                "client_key": match["id"],
+                "stage": match["stage"],
+                "round_label": match["round_label"],
+                "starts_at": match["starts_at"],
+                "team_a_key": key_by_id.get(match["team_a_id"]),
+                "team_b_key": key_by_id.get(match["team_b_id"]),
+                "team_a_source_group": match["team_a_source_group"],
+                "team_b_source_group": match["team_b_source_group"],
+            }
+            for match in matches
+        ],
+    }
+    rng = random.Random(args.seed)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            print("\n2. API: PUT /setup 검증")
+            cyclic = copy.deepcopy(setup)
+            cyclic["matches"][-1]["team_a_source_group"] = f"winner:{cyclic['matches'][-1]['client_key']}"
+            response = await client.put(f"/tournaments/{event_id}/setup", json=cyclic, headers=headers)
+            expect(response.status_code == 400, f"자기 자신을 가리키는 진출 조건은 400 ({response.status_code})")
+            broken = copy.deepcopy(setup)
+            broken["matches"][-1]["team_b_source_group"] = "A:9"
+            response = await client.put(f"/tournaments/{event_id}/setup", json=broken, headers=headers)
+            expect(response.status_code == 400, f"없는 순위는 400 ({response.status_code})")
+            response = await client.put(f"/tournaments/{event_id}/setup", json=setup, headers=headers)
+            expect(response.status_code == 200, f"대진 저장 ({response.status_code})")
+
+            print("3. API: 결과를 넣으며 결승까지 진행")
+            snapshot = response.json()
+            timings: List[float] = []
+            while True:
+                ready = [
+                    match for match in snapshot["matches"]
+                    if match["status"] != "completed" and match["resolved_team_a_id"] and match["resolved_team_b_id"]
+                ]
+                if not ready:
+                    break
+                match = ready[0]
+                result = play(rng, match["resolved_team_a_id"], match["resolved_team_b_id"])
+                started = time.perf_counter()
+                response = await client.patch(
+                    f"/tournaments/{event_id}/matches/{match['id']}/result",
+                    json={"team_a_score": result["team_a_score"], "team_b_score": result["team_b_score"],
+                          "winner_team_id": result["winner_team_id"]},
+                    headers=headers,
+                )
+                timings.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    expect(False, f"결과 입력 실패 {response.status_code}: {response.text[:200]}")
+                    return
+                snapshot = response.json()
+            response = await client.get(f"/tournaments/{event_id}", headers=headers)
+            fresh = response.json()
+            expect(snapshot["progress"]["completed"] == len(matches), f"모든 경기 완료 ({snapshot['progress']})")
+            expect(
+                [(m["id"], m["resolved_team_a_id"], m["resolved_team_b_id"]) for m in snapshot["matches"]]
+                == [(m["id"], m["resolved_team_a_id"], m["resolved_team_b_id"]) for m in fresh["matches"]],
+                "결과 입력 응답의 대진 = 다시 불러온 대진",
+            )
+            timings.sort()
+            print(f"  PATCH result p50 {percentile(timings, 0.5) * 1000:.1f}ms p95 {percentile(timings, 0.95) * 1000:.1f}ms")
+    finally:
+        backend.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=16, help="조 수 (짝수, 조당 4팀)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--api", action="store_true", help="가짜 PostgREST 위에서 대진 저장/결과 입력 API도 확인")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="--api: 가짜 PostgREST 왕복 지연")
+    args = parser.parse_args()
+    if args.groups < 2 or args.groups % 2:
+        parser.error("--groups는 2 이상의 짝수여야 합니다.")
+
+    run_engine(args)
+    if args.api:
+        asyncio.run(run_api(args))
+    print(f"\n{len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
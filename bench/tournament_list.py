@@ -0,0 +1,171 @@
+"""대회 목록 집계 벤치마크: 파이썬에서 세던 이전 방식 vs tournament_summaries 뷰.
+
+대회가 수백 개, 경기가 수천 개 쌓인 데이터셋을 만들어 GET /tournaments가 쓰는 저장소 호출을
+백엔드별로 잰다.
+
+- legacy: 대회 전체 + 모든 팀/경기 행(tournament_id, status)을 받아 파이썬 dict로 센다
+  (postgres 백엔드는 대회 목록 + unnest 상관 서브쿼리).
+- view: tournament_summaries 뷰에서 대회 전체를 읽는다.
+- view page: 같은 뷰에서 최신 20개만 읽는다(limit=20).
+
+두 방식의 개수가 다르면 0이 아닌 코드로 끝난다.
+
+    python -m bench.tournament_list --events 300 --teams 16 --latency-ms 2
+    python -m bench.tournament_list --dsn postgresql://postgres@localhost/postgres --backends supabase postgres
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+from bench.datasets import SCALES, build_dataset
+from bench.endpoints import JWT_SECRET, percentile
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+PAGE_SIZE = 20
+# 이전 postgres 백엔드의 집계 쿼리
+_LEGACY_LIST = "select * from public.tournaments order by starts_on desc"
+_LEGACY_COUNTS = (
+    "select e.id as tournament_id,"
+    " (select count(*) from public.tournament_teams t where t.tournament_id = e.id) as team_count,"
+    " (select count(*) from public.tournament_matches m where m.tournament_id = e.id) as match_count,"
+    " (select count(*) from public.tournament_matches m where m.tournament_id = e.id and m.status = 'completed')"
+    " as completed_match_count"
+    " from unnest($1::uuid[]) as e(id)"
+)
+
+Counts = Dict[str, Tuple[int, int, int]]
+
+
+def legacy_supabase() -> Tuple[Counts, int]:
+    from app.db import get_supabase
+
+    sb = get_supabase()
+    events = sb.table("tournaments").select("*").order("starts_on", desc=True).execute().data or []
+    ids = [event["id"] for event in events]
+    teams = sb.table("tournament_teams").select("tournament_id").in_("tournament_id", ids).execute().data or []
+    matches = (
+        sb.table("tournament_matches").select("tournament_id,status").in_("tournament_id", ids).execute().data or []
+    )
+    counts: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+    for row in teams:
+        counts[row["tournament_id"]][0] += 1
+    for row in matches:
+        counts[row["tournament_id"]][1] += 1
+        counts[row["tournament_id"]][2] += row.get("status") == "completed"
+    return {event["id"]: tuple(counts[event["id"]]) for event in events}, len(events) + len(teams) + len(matches)
+
+
+def legacy_postgres() -> Tuple[Counts, int]:
+    from app.repositories.postgres import get_database
+
+    db = get_database()
+    events = db.fetch("tournaments", "select", _LEGACY_LIST)
+    rows = db.fetch("tournaments", "select", _LEGACY_COUNTS, [event["id"] for event in events])
+    counts = {row["tournament_id"]: (row["team_count"], row["match_count"], row["completed_match_count"]) for row in rows}
+    return {event["id"]: counts[event["id"]] for event in events}, len(events) + len(rows)
+
+
+def from_view(limit: Any) -> Callable[[], Tuple[Counts, int]]:
+    def run() -> Tuple[Counts, int]:
+        from app.repositories import get_repositories
+
+        rows = get_repositories().tournaments.summaries(None, None, None, limit, 0)
+        counts = {row["id"]: (row["team_count"], row["match_count"], row["completed_match_count"]) for row in rows}
+        return counts, len(rows)
+
+    return run
+
+
+def measure(call: Callable[[], Tuple[Counts, int]], iterations: int, warmup: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        call()
+    timings: List[float] = []
+    counts: Counts = {}
+    transferred = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        counts, transferred = call()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "counts": counts,
+        "rows": transferred,
+        "p50_ms": percentile(timings, 0.50) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+    }
+
+
+def run_backend(backend: str, args: argparse.Namespace) -> bool:
+    from app.repositories import use_backend
+
+    use_backend(backend)
+    legacy = legacy_supabase if backend == "supabase" else legacy_postgres
+    print(f"\n[{backend}]")
+    print(f"{'method':<14} {'p50 ms':>9} {'p95 ms':>9} {'upstream rows':>14} {'events':>7}")
+    results = {}
+    for name, call in (("legacy", legacy), ("view", from_view(None)), ("view page", from_view(PAGE_SIZE))):
+        result = measure(call, args.iterations, args.warmup)
+        results[name] = result
+        print(
+            f"{name:<14} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['rows']:>14} {len(result['counts']):>7}",
+            flush=True,
+        )
+    legacy_counts = results["legacy"]["counts"]
+    same = results["view"]["counts"] == legacy_counts and all(
+        legacy_counts.get(event_id) == counts for event_id, counts in results["view page"]["counts"].items()
+    )
+    speedup = results["legacy"]["p50_ms"] / results["view"]["p50_ms"] if results["view"]["p50_ms"] else 0.0
+    print(f"counts match: {'yes' if same else 'NO'}  view vs legacy: {speedup:.2f}x")
+    return same
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=300, help="대회 수")
+    parser.add_argument("--teams", type=int, default=16, help="대회당 팀 수 (4개 조 리그전)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="회원 등 나머지 테이블 크기")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="가짜 PostgREST 왕복 지연")
+    parser.add_argument("--dsn", help="postgres 백엔드용: 벤치 DB를 만들 권한이 있는 접속 문자열")
+    parser.add_argument("--database", default="manjang_bench_tournaments")
+    parser.add_argument("--backends", nargs="+", choices=("supabase", "postgres"), default=["supabase"])
+    args = parser.parse_args()
+
+    dataset = build_dataset(args.scale, args.seed, tournaments=args.events, teams=args.teams)
+    tables = dataset.tables
+    print(
+        f"dataset: {len(tables['tournaments'])} events, {len(tables['tournament_teams'])} teams,"
+        f" {len(tables['tournament_matches'])} matches"
+    )
+    backend = FakePostgrest(tables, delay=args.latency_ms / 1000).start()
+    os.environ["SUPABASE_URL"] = backend.url
+    os.environ["SUPABASE_SERVICE_ROLE_KEY"] = FAKE_SERVICE_KEY
+    os.environ["SUPABASE_JWT_SECRET"] = JWT_SECRET
+    if "postgres" in args.backends:
+        if not args.dsn:
+            parser.error("--backends postgres에는 --dsn이 필요합니다.")
+        from bench.repositories import prepare_database
+
+        os.environ["DATABASE_URL"] = asyncio.run(prepare_database(args.dsn, args.database, dataset))
+
+    ok = True
+    try:
+        for name in args.backends:
+            ok = run_backend(name, args) and ok
+    finally:
+        from app.repositories import close_repositories
+
+        close_repositories()
+        backend.stop()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""워커 수에 따른 처리량 비교: `python -m app.server`를 워커 1..N개로 띄워 같은 부하를 건다.
+
+가짜 PostgREST를 띄우고, 워커 수마다 서버 프로세스를 새로 시작해 조회 위주 부하(대회 관전,
+예약 달력, 기록/토론 목록)를 --duration초 동안 건다. 부하 생성기는 --clients개 프로세스로
+나눠 돌려 클라이언트 쪽이 먼저 병목이 되지 않게 한다. 공유 캐시를 켠 경우와 끈 경우를 함께
+재서, 워커 간 캐시 공유가 upstream 호출 수를 얼마나 줄이는지도 보여준다.
+
+부하가 끝나면 관리자 결과 입력 직후 새 커넥션으로 대회 상세를 여러 번 조회해, 다른 워커가
+오래된 응답을 내주지 않는지(무효화 전파) 확인한다.
+
+    python -m bench.workers --workers 1 2 4 --duration 10 --clients 4 --latency-ms 5
+
+CPU가 워커 수보다 적은 머신에서는 처리량이 늘지 않는다. 워커 수만큼 코어가 있는 곳에서 잰다.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from bench.datasets import SCALES, Dataset, build_dataset
+from bench.endpoints import JWT_SECRET, make_token, percentile
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def read_paths(dataset: Dataset) -> List[str]:
+    month = dataset.anchor.replace(day=1)
+    event_id = dataset.tournament_ids[-1]
+    return [
+        f"/tournaments/{event_id}",
+        f"/tournaments/{event_id}",
+        "/tournaments",
+        f"/reservations/month?date={month.isoformat()}",
+        f"/reservations?start={month.isoformat()}&end={(month + timedelta(days=31)).isoformat()}",
+        "/records",
+        "/debates",
+        "/members/stats",
+    ]
+
+
+def _client_process(base_url: str, paths: List[str], concurrency: int, duration: float, queue: Any) -> None:
+    import httpx
+
+    async def run() -> Dict[str, Any]:
+        latencies: List[float] = []
+        errors = 0
+        deadline = time.perf_counter() + duration
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+
+            async def worker(offset: int) -> None:
+                nonlocal errors
+                i = offset
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        response = await client.get(paths[i % len(paths)])
+                        if response.status_code >= 400:
+                            errors += 1
+                    except httpx.HTTPError:
+                        errors += 1
+                    latencies.append(time.perf_counter() - started)
+                    i += 1
+
+            await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+        return {"latencies": latencies, "errors": errors}
+
+    queue.put(asyncio.run(run()))
+
+
+def drive(base_url: str, paths: List[str], clients: int, concurrency: int, duration: float) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    procs = [
+        context.Process(target=_client_process, args=(base_url, paths, concurrency, duration, queue))
+        for _ in range(clients)
+    ]
+    started = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    results = [queue.get() for _ in procs]
+    elapsed = time.perf_counter() - started
+    for proc in procs:
+        proc.join()
+    latencies = sorted(value for result in results for value in result["latencies"])
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "errors": sum(result["errors"] for result in results),
+    }
+
+
+def check_invalidation(base_url: str, dataset: Dataset, rounds: int, reads: int) -> Dict[str, int]:
+    """결과 입력 직후 새 커넥션(→ 매번 다른 워커일 수 있음)으로 읽어 옛 점수가 보이는지 센다."""
+    import httpx
+
+    event_id = dataset.tournament_ids[-1]
+    admin = {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+    stale = 0
+    checked = 0
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        detail = client.get(f"/tournaments/{event_id}").json()
+        match = next(
+            (item for item in detail["matches"] if item.get("resolved_team_a_id") and item.get("resolved_team_b_id")),
+            None,
+        )
+        if match is None:
+            return {"checked": 0, "stale": 0}
+        for round_no in range(rounds):
+            score = 40 + round_no
+            response = client.patch(
+                f"/tournaments/{event_id}/matches/{match['id']}/result",
+                headers=admin,
+                json={"team_a_score": score, "team_b_score": 99},
+            )
+            response.raise_for_status()
+            for _ in range(reads):
+                # keep-alive를 쓰지 않아야 요청이 여러 워커로 흩어진다.
+                body = httpx.get(f"{base_url}/tournaments/{event_id}", headers={"Connection": "close"}).json()
+                current = next(item for item in body["matches"] if item["id"] == match["id"])
+                checked += 1
+                if current.get("team_a_score") != score:
+                    stale += 1
+    return {"checked": checked, "stale": stale}
+
+
+def run_server(env: Dict[str, str], workers: int, shared: bool, args: argparse.Namespace, dataset: Dataset,
+               backend: FakePostgrest) -> Dict[str, Any]:
+    import httpx
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    run_env = {
+        **env,
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "WEB_CONCURRENCY": str(workers),
+        "SHARED_CACHE_ENABLED": "true" if shared else "false",
+    }
+    proc = subprocess.Popen([sys.executable, "-m", "app.server"], cwd=ROOT, env=run_env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.perf_counter() + 60
+        while True:
+            try:
+                if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.perf_counter() > deadline or proc.poll() is not None:
+                raise RuntimeError(f"server with {workers} workers did not start")
+            time.sleep(0.1)
+        # 모든 워커가 워밍업을 마치고 요청을 받을 때까지 기다린다.
+        time.sleep(args.settle)
+        upstream_before = backend.requests
+        result = drive(base_url, read_paths(dataset), args.clients, args.concurrency, args.duration)
+        result["upstream"] = backend.requests - upstream_before
+        result.update(check_invalidation(base_url, dataset, args.invalidation_rounds, args.invalidation_reads))
+        return result
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shared", choices=("on", "off", "both"), default="both", help="워커 간 공유 캐시")
+    parser.add_argument("--clients", type=int, default=max(2, os.cpu_count() or 2), help="부하 생성 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="클라이언트 프로세스당 동시 요청 수")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--settle", type=float, default=2.0, help="서버가 뜬 뒤 측정 전 대기 시간(초)")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="가짜 PostgREST 왕복 지연")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--invalidation-rounds", type=int, default=5)
+    parser.add_argument("--invalidation-reads", type=int, default=8)
+    args = parser.parse_args()
+
+    dataset = build_dataset(args.scale, args.seed)
+    backend = FakePostgrest(build_dataset(args.scale, args.seed).tables, delay=args.latency_ms / 1000).start()
+    env = {
+        **os.environ,
+        "SUPABASE_URL": backend.url,
+        "SUPABASE_SERVICE_ROLE_KEY": FAKE_SERVICE_KEY,
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "PYTHONPATH": str(ROOT),
+    }
+    modes = {"on": [True], "off": [False], "both": [False, True]}[args.shared]
+
+    rows: List[Dict[str, Any]] = []
+    baseline: Optional[float] = None
+    print(f"{'workers':>7} {'shared':>6} {'req/s':>9} {'scale':>6} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}"
+          f" {'upstream':>8} {'stale reads':>12}")
+    try:
+        for shared in modes:
+            for workers in args.workers:
+                result = run_server(env, workers, shared, args, dataset, backend)
+                if workers == args.workers[0]:
+                    baseline = result["rps"]
+                scaling = result["rps"] / baseline if baseline else 0.0
+                rows.append({"workers": workers, "shared": shared, **result})
+                print(
+                    f"{workers:>7} {'on' if shared else 'off':>6} {result['rps']:>9.1f} {scaling:>5.2f}x"
+                    f" {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['errors']:>6} {result['upstream']:>8}"
+                    f" {result['stale']:>5}/{result['checked']:<6}",
+                    flush=True,
+                )
+    finally:
+        backend.stop()
+
+    stale = sum(row["stale"] for row in rows if row["shared"] or row["workers"] == 1)
+    sys.exit(1 if stale else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+begin;
+
+-- PUT /debates/{id}/participants: 바뀐 명단을 한 트랜잭션으로 반영한다.
+-- 빠진 행 삭제 → 기존 행(id 있음) 갱신 → 신규 행 추가 → 승리 측 기록 순이며, 하나라도 실패하면 모두 되돌린다.
+-- 삭제를 먼저 해야 (debate_id, user_id) 유니크 제약에 걸리지 않는다.
+create or replace function public.apply_debate_roster(
+  p_debate_id uuid,
+  p_upserts jsonb default '[]',
+  p_stale_ids bigint[] default '{}',
+  p_winner_side public.debate_side default null
+)
+returns setof public.debate_participants
+language plpgsql
+as $$
+begin
+  delete from public.debate_participants where debate_id = p_debate_id and id = any(p_stale_ids);
+  return query
+    update public.debate_participants as dp
+    set side = src.side, participant_name = src.participant_name
+    from jsonb_populate_recordset(null::public.debate_participants, p_upserts) as src
+    where src.id is not null and dp.id = src.id and dp.debate_id = p_debate_id
+    returning dp.*;
+  return query
+    insert into public.debate_participants (debate_id, user_id, participant_name, side)
+    select p_debate_id, src.user_id, src.participant_name, src.side
+    from jsonb_populate_recordset(null::public.debate_participants, p_upserts) as src
+    where src.id is null
+    returning *;
+  if p_winner_side is not null then
+    update public.debates set winner_side = p_winner_side where id = p_debate_id;
+  end if;
+end;
+$$;
+
+commit;
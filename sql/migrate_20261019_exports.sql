@@ -0,0 +1,48 @@
+begin;
+
+-- GET /export/{dataset}: 정렬 키 + id 키셋으로 페이지를 나눠 읽으므로 (정렬 키, id) 인덱스를 둔다.
+create index if not exists idx_debates_date_id on public.debates(debate_date, id);
+create index if not exists idx_records_date_id on public.records(date, id);
+create index if not exists idx_reservations_starts_at_id on public.reservations(starts_at, id);
+
+-- 회원별 토론 전적을 id 순서로 p_limit명씩 집계한다 (p_after 다음 회원부터).
+-- 기간(p_start ~ p_end, 토론일 기준)을 줄 수 있어 뷰 대신 함수로 둔다. winner_side가 기록된 토론만 승/패로 센다.
+create or replace function public.member_debate_stats(
+  p_start date default null,
+  p_end date default null,
+  p_after uuid default null,
+  p_limit int default 1000
+)
+returns table (user_id uuid, name text, generation text, major text, wins int, losses int, total int)
+language sql
+stable
+as $$
+  with page as (
+    select id, name, generation, major
+    from public.users
+    where p_after is null or id > p_after
+    order by id
+    limit p_limit
+  ),
+  -- 회원마다 따로 세면 토론 테이블을 회원 수만큼 다시 읽으므로, 페이지 전체를 한 번에 묶어 센다.
+  stats as (
+    select
+      p.user_id,
+      (count(*) filter (where d.winner_side = p.side))::int as wins,
+      (count(*) filter (where d.winner_side is not null and d.winner_side <> p.side))::int as losses,
+      count(*)::int as total
+    from public.debate_participants p
+    join public.debates d on d.id = p.debate_id
+    where p.user_id in (select id from page)
+      and (p_start is null or d.debate_date >= p_start)
+      and (p_end is null or d.debate_date <= p_end)
+    group by p.user_id
+  )
+  select u.id, u.name, u.generation, u.major,
+         coalesce(s.wins, 0), coalesce(s.losses, 0), coalesce(s.total, 0)
+  from page u
+  left join stats s on s.user_id = u.id
+  order by u.id;
+$$;
+
+commit;
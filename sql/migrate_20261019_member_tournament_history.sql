@@ -0,0 +1,41 @@
+begin;
+
+-- 회원별 대회 전적(GET /members/{id}/tournaments)을 쿼리 한 번으로 읽는다.
+-- 회원이 속한 팀마다 그 팀이 치르는(team_a_id/team_b_id가 그 팀인) 경기 한 행씩이고,
+-- 경기가 없는 팀은 경기 컬럼이 null인 한 행이다. 진출 조건으로만 정해진 토너먼트 경기는
+-- 결과를 입력해 팀 id가 채워진 뒤에 나타난다.
+create or replace view public.member_tournament_matches
+with (security_invoker = true) as
+select
+  mem.user_id,
+  e.id as tournament_id,
+  e.title,
+  e.starts_on,
+  e.ends_on,
+  e.status,
+  t.id as team_id,
+  t.name as team_name,
+  t.group_name,
+  m.id as match_id,
+  m.stage,
+  m.round_label,
+  m.starts_at as match_starts_at,
+  m.status as match_status,
+  o.id as opponent_team_id,
+  o.name as opponent_name,
+  case when m.team_a_id = t.id then m.team_a_score else m.team_b_score end as team_score,
+  case when m.team_a_id = t.id then m.team_b_score else m.team_a_score end as opponent_score,
+  m.winner_team_id
+from public.tournament_team_members mem
+join public.tournament_teams t on t.id = mem.team_id
+join public.tournaments e on e.id = t.tournament_id
+left join public.tournament_matches m
+  on m.tournament_id = t.tournament_id and (m.team_a_id = t.id or m.team_b_id = t.id)
+left join public.tournament_teams o
+  on o.id = case when m.team_a_id = t.id then m.team_b_id else m.team_a_id end;
+
+-- 팀 → 경기 조인을 인덱스로 찾는다 (team_a/team_b 각각 비트맵 OR).
+create index if not exists idx_tournament_matches_team_a on public.tournament_matches(team_a_id);
+create index if not exists idx_tournament_matches_team_b on public.tournament_matches(team_b_id);
+
+commit;
@@ -0,0 +1,15 @@
+begin;
+
+-- 완료된 대회의 스냅샷 보관본. 대회를 completed로 바꿀 때 API가 한 번 만들어 넣고,
+-- 관리자가 다시 열면(completed가 아닌 상태로 바꾸면) 지운다.
+-- snapshot은 응답 본문 JSON을 그대로 담아 조회 때 파싱/직렬화 없이 돌려준다.
+create table if not exists public.tournament_archives (
+  tournament_id uuid primary key references public.tournaments(id) on delete cascade,
+  snapshot text not null,
+  etag text not null,
+  archived_at timestamptz not null default now()
+);
+
+alter table public.tournament_archives enable row level security;
+
+commit;
@@ -0,0 +1,31 @@
+begin;
+
+-- 대회 목록(GET /tournaments)의 팀/경기/완료 경기 수를 DB에서 센다.
+-- 행사마다 lateral 서브쿼리로 세므로 limit을 주면 반환하는 행사만 센다.
+-- e.* 는 뷰를 만들 때 펼쳐지므로 tournaments에 컬럼을 추가하면 뷰를 다시 만들어야 한다.
+create or replace view public.tournament_summaries
+with (security_invoker = true) as
+select
+  e.*,
+  t.team_count,
+  m.match_count,
+  m.completed_match_count
+from public.tournaments e
+cross join lateral (
+  select count(*)::int as team_count
+  from public.tournament_teams
+  where tournament_id = e.id
+) t
+cross join lateral (
+  select
+    count(*)::int as match_count,
+    (count(*) filter (where status = 'completed'))::int as completed_match_count
+  from public.tournament_matches
+  where tournament_id = e.id
+) m;
+
+-- 경기 수 집계를 인덱스만으로 끝낸다. (tournament_id) 단일 인덱스는 이 인덱스가 대신한다.
+create index if not exists idx_tournament_matches_event_status on public.tournament_matches(tournament_id, status);
+drop index if exists public.idx_tournament_matches_event;
+
+commit;
@@ -0,0 +1,37 @@
+begin;
+
+-- 조 순위 동률 처리 순서. 앞 기준에서 동률인 팀끼리만 다음 기준으로 비교한다.
+-- (points, wins, head_to_head, score_diff, score_for, experience)
+alter table public.tournaments
+  add column if not exists tiebreakers text[] not null default '{points,head_to_head,experience}';
+
+-- 토너먼트 경기의 진출 조건은 기존 team_*_source_group 컬럼에 그대로 적는다.
+--   'A'            A조 1위
+--   'B:2'          B조 2위
+--   'winner:<id>'  <id> 경기 승자
+--   'loser:<id>'   <id> 경기 패자
+
+-- 뷰의 e.* 는 만들 때 펼쳐지므로 새 컬럼이 보이도록 다시 만든다.
+drop view if exists public.tournament_summaries;
+create view public.tournament_summaries
+with (security_invoker = true) as
+select
+  e.*,
+  t.team_count,
+  m.match_count,
+  m.completed_match_count
+from public.tournaments e
+cross join lateral (
+  select count(*)::int as team_count
+  from public.tournament_teams
+  where tournament_id = e.id
+) t
+cross join lateral (
+  select
+    count(*)::int as match_count,
+    (count(*) filter (where status = 'completed'))::int as completed_match_count
+  from public.tournament_matches
+  where tournament_id = e.id
+) m;
+
+commit;
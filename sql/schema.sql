@@ -279,6 +279,7 @@ create table if not exists public.tournaments (
   venue text not null default '',
   status text not null default 'draft' check (status in ('draft', 'open', 'ongoing', 'completed')),
   points_per_win int not null default 1 check (points_per_win between 1 and 10),
+  tiebreakers text[] not null default '{points,head_to_head,experience}',
   created_by uuid references public.users(id) on delete set null,
   created_at timestamptz not null default now(),
   updated_at timestamptz not null default now(),
@@ -330,6 +331,7 @@ create table if not exists public.tournament_matches (
   venue text not null default '',
   team_a_id uuid references public.tournament_teams(id) on delete set null,
   team_b_id uuid references public.tournament_teams(id) on delete set null,
+  -- 진출 조건: 'A'(A조 1위), 'B:2'(B조 2위), 'winner:<경기 id>', 'loser:<경기 id>'
   team_a_source_group text,
   team_b_source_group text,
   team_a_score numeric(8,2),
@@ -343,8 +345,10 @@ create table if not exists public.tournament_matches (
   check (team_b_id is not null or team_b_source_group is not null)
 );
 
-create index if not exists idx_tournament_matches_event on public.tournament_matches(tournament_id);
+create index if not exists idx_tournament_matches_event_status on public.tournament_matches(tournament_id, status);
 create index if not exists idx_tournament_matches_starts_at on public.tournament_matches(starts_at);
+create index if not exists idx_tournament_matches_team_a on public.tournament_matches(team_a_id);
+create index if not exists idx_tournament_matches_team_b on public.tournament_matches(team_b_id);
 alter table public.tournament_matches enable row level security;
 
 drop trigger if exists trg_tournament_matches_updated_at on public.tournament_matches;
@@ -352,4 +356,152 @@ create trigger trg_tournament_matches_updated_at
 before update on public.tournament_matches
 for each row execute function public.set_updated_at();
 
+-- 완료된 대회의 스냅샷 보관본 (응답 본문 JSON 그대로). 다시 열면 지운다.
+create table if not exists public.tournament_archives (
+  tournament_id uuid primary key references public.tournaments(id) on delete cascade,
+  snapshot text not null,
+  etag text not null,
+  archived_at timestamptz not null default now()
+);
+
+alter table public.tournament_archives enable row level security;
+
+-- --------------------------------------------
+-- 9) Tournament summaries (GET /tournaments 집계 뷰)
+-- --------------------------------------------
+create or replace view public.tournament_summaries
+with (security_invoker = true) as
+select
+  e.*,
+  t.team_count,
+  m.match_count,
+  m.completed_match_count
+from public.tournaments e
+cross join lateral (
+  select count(*)::int as team_count
+  from public.tournament_teams
+  where tournament_id = e.id
+) t
+cross join lateral (
+  select
+    count(*)::int as match_count,
+    (count(*) filter (where status = 'completed'))::int as completed_match_count
+  from public.tournament_matches
+  where tournament_id = e.id
+) m;
+
+-- --------------------------------------------
+-- 10) Member tournament history (GET /members/{id}/tournaments 조인 뷰)
+-- --------------------------------------------
+create or replace view public.member_tournament_matches
+with (security_invoker = true) as
+select
+  mem.user_id,
+  e.id as tournament_id,
+  e.title,
+  e.starts_on,
+  e.ends_on,
+  e.status,
+  t.id as team_id,
+  t.name as team_name,
+  t.group_name,
+  m.id as match_id,
+  m.stage,
+  m.round_label,
+  m.starts_at as match_starts_at,
+  m.status as match_status,
+  o.id as opponent_team_id,
+  o.name as opponent_name,
+  case when m.team_a_id = t.id then m.team_a_score else m.team_b_score end as team_score,
+  case when m.team_a_id = t.id then m.team_b_score else m.team_a_score end as opponent_score,
+  m.winner_team_id
+from public.tournament_team_members mem
+join public.tournament_teams t on t.id = mem.team_id
+join public.tournaments e on e.id = t.tournament_id
+left join public.tournament_matches m
+  on m.tournament_id = t.tournament_id and (m.team_a_id = t.id or m.team_b_id = t.id)
+left join public.tournament_teams o
+  on o.id = case when m.team_a_id = t.id then m.team_b_id else m.team_a_id end;
+
+-- --------------------------------------------
+-- 11) Bulk export (GET /export/{dataset} 키셋 인덱스, 회원 전적 집계 함수)
+-- --------------------------------------------
+-- GET /export/{dataset}: 정렬 키 + id 키셋으로 페이지를 나눠 읽으므로 (정렬 키, id) 인덱스를 둔다.
+create index if not exists idx_debates_date_id on public.debates(debate_date, id);
+create index if not exists idx_records_date_id on public.records(date, id);
+create index if not exists idx_reservations_starts_at_id on public.reservations(starts_at, id);
+
+-- 회원별 토론 전적을 id 순서로 p_limit명씩 집계한다 (p_after 다음 회원부터).
+-- 기간(p_start ~ p_end, 토론일 기준)을 줄 수 있어 뷰 대신 함수로 둔다. winner_side가 기록된 토론만 승/패로 센다.
+create or replace function public.member_debate_stats(
+  p_start date default null,
+  p_end date default null,
+  p_after uuid default null,
+  p_limit int default 1000
+)
+returns table (user_id uuid, name text, generation text, major text, wins int, losses int, total int)
+language sql
+stable
+as $$
+  with page as (
+    select id, name, generation, major
+    from public.users
+    where p_after is null or id > p_after
+    order by id
+    limit p_limit
+  ),
+  -- 회원마다 따로 세면 토론 테이블을 회원 수만큼 다시 읽으므로, 페이지 전체를 한 번에 묶어 센다.
+  stats as (
+    select
+      p.user_id,
+      (count(*) filter (where d.winner_side = p.side))::int as wins,
+      (count(*) filter (where d.winner_side is not null and d.winner_side <> p.side))::int as losses,
+      count(*)::int as total
+    from public.debate_participants p
+    join public.debates d on d.id = p.debate_id
+    where p.user_id in (select id from page)
+      and (p_start is null or d.debate_date >= p_start)
+      and (p_end is null or d.debate_date <= p_end)
+    group by p.user_id
+  )
+  select u.id, u.name, u.generation, u.major,
+         coalesce(s.wins, 0), coalesce(s.losses, 0), coalesce(s.total, 0)
+  from page u
+  left join stats s on s.user_id = u.id
+  order by u.id;
+$$;
+
+-- PUT /debates/{id}/participants: 바뀐 명단을 한 트랜잭션으로 반영한다.
+-- 빠진 행 삭제 → 기존 행(id 있음) 갱신 → 신규 행 추가 → 승리 측 기록 순이며, 하나라도 실패하면 모두 되돌린다.
+-- 삭제를 먼저 해야 (debate_id, user_id) 유니크 제약에 걸리지 않는다.
+create or replace function public.apply_debate_roster(
+  p_debate_id uuid,
+  p_upserts jsonb default '[]',
+  p_stale_ids bigint[] default '{}',
+  p_winner_side public.debate_side default null
+)
+returns setof public.debate_participants
+language plpgsql
+as $$
+begin
+  delete from public.debate_participants where debate_id = p_debate_id and id = any(p_stale_ids);
+  return query
+    update public.debate_participants as dp
+    set side = src.side, participant_name = src.participant_name
+    from jsonb_populate_recordset(null::public.debate_participants, p_upserts) as src
+    where src.id is not null and dp.id = src.id and dp.debate_id = p_debate_id
+    returning dp.*;
+  return query
+    insert into public.debate_participants (debate_id, user_id, participant_name, side)
+    select p_debate_id, src.user_id, src.participant_name, src.side
+    from jsonb_populate_recordset(null::public.debate_participants, p_upserts) as src
+    where src.id is null
+    returning *;
+  if p_winner_side is not null then
+    update public.debates set winner_side = p_winner_side where id = p_debate_id;
+  end if;
+end;
+$$;
+
+
 commit;
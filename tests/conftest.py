@@ -0,0 +1,110 @@
+"""테스트 공통 준비.
+
+앱 설정은 임포트할 때 환경 변수에서 읽으므로, 가짜 PostgREST를 먼저 띄우고 환경 변수를 정한 뒤 앱을 임포트한다.
+서버는 세션 내내 하나를 쓰고, 테스트마다 테이블과 프로세스 상태(캐시, 보관본, 캘린더 피드, 브레이커, 멱등 키, 역할 캐시)를 되돌린다.
+캐시 TTL과 upstream 타임아웃은 장애 테스트가 몇 초 안에 끝나도록 짧게 둔다.
+"""
+
+import copy
+import os
+import time
+from typing import Dict
+
+import pytest
+
+from bench.datasets import build_dataset
+from bench.endpoints import JWT_SECRET, make_token
+from bench.fake_postgrest import FAKE_SERVICE_KEY, FakePostgrest
+
+SOFT_TTL = 0.5
+HARD_TTL = 4.0
+UPSTREAM_TIMEOUT = 1.5
+DEADLINE = 2.0
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 1.0
+
+_backend = FakePostgrest().start()
+os.environ.update(
+    SUPABASE_URL=_backend.url,
+    SUPABASE_SERVICE_ROLE_KEY=FAKE_SERVICE_KEY,
+    SUPABASE_JWT_SECRET=JWT_SECRET,
+    DATA_BACKEND="supabase",
+    SHARED_CACHE_PATH="",
+    WARMUP_ENABLED="false",
+    CACHE_TTL_SECONDS=str(SOFT_TTL),
+    CACHE_HARD_TTL_SECONDS=str(HARD_TTL),
+    UPSTREAM_TIMEOUT_SECONDS=str(UPSTREAM_TIMEOUT),
+    REQUEST_DEADLINE_SECONDS=str(DEADLINE),
+    BREAKER_FAILURE_THRESHOLD=str(BREAKER_THRESHOLD),
+    BREAKER_RESET_SECONDS=str(BREAKER_RESET),
+)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import auth, resilience  # noqa: E402
+from app.archives import archive_store  # noqa: E402
+from app.cache import response_cache  # noqa: E402
+from app.config import RETRY_BUDGET_MIN_PER_SECOND, RETRY_BUDGET_RATIO  # noqa: E402
+from app.ical import feed_store  # noqa: E402
+from app.idempotency import idempotency_store  # noqa: E402
+from app.main import app  # noqa: E402
+
+_DATASET = build_dataset("small", 7)
+
+
+def wait_for_refresh(timeout: float = 10.0) -> None:
+    """백그라운드 캐시 갱신 스레드가 끝날 때까지 기다린다."""
+    deadline = time.monotonic() + timeout
+    while response_cache.stats()["refreshing"] and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _stop_backend():
+    yield
+    _backend.stop()
+
+
+@pytest.fixture
+def dataset():
+    return _DATASET
+
+
+@pytest.fixture
+def backend() -> FakePostgrest:
+    """시드 데이터셋 사본을 올린 가짜 PostgREST. 테스트가 테이블이나 장애 설정을 바꿔도 다음 테스트에 남지 않는다."""
+    wait_for_refresh()
+    _backend.load(copy.deepcopy(_DATASET.tables))
+    _backend.fail_status = None
+    _backend.fail_next = 0
+    _backend.delay = 0.0
+    response_cache.enabled = True
+    response_cache.clear()
+    archive_store.clear()
+    feed_store.clear()
+    with resilience._breakers_lock:
+        resilience._breakers.clear()
+    resilience.retry_budget = resilience.RetryBudget(RETRY_BUDGET_RATIO, RETRY_BUDGET_MIN_PER_SECOND)
+    with auth._role_lock:
+        auth._role_cache.clear()
+    with idempotency_store._cond:
+        idempotency_store._records.clear()
+    yield _backend
+    wait_for_refresh()
+    _backend.fail_status = None
+    _backend.delay = 0.0
+
+
+@pytest.fixture
+def client(backend: FakePostgrest) -> TestClient:
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture
+def admin(dataset) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {make_token(dataset.admin_id)}"}
+
+
+@pytest.fixture
+def member(dataset) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {make_token(dataset.member_ids[0])}"}
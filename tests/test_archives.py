@@ -0,0 +1,65 @@
+"""완료된 대회 보관본 응답."""
+
+import pytest
+
+from app.repositories import get_repositories
+
+
+@pytest.fixture
+def event_path(client, dataset):
+    # 보관 기능 이전에 완료된 대회는 첫 조회 때 보관본이 생긴다.
+    path = f"/tournaments/{dataset.tournament_ids[0]}"
+    assert client.get(path).status_code == 200
+    return path
+
+
+def test_archive_is_revalidated_on_every_use(client, backend, event_path):
+    first = client.get(event_path)
+    assert first.headers["x-cache"] == "ARCHIVE"
+    assert first.headers["cache-control"] == "public, no-cache"
+    etag = first.headers["etag"]
+    assert client.get(event_path, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_reopened_event_is_not_served_from_archive(client, backend, admin, event_path):
+    etag = client.get(event_path).headers["etag"]
+    reopened = client.patch(event_path, json={"status": "ongoing", "venue": "소강당"}, headers=admin)
+    assert reopened.status_code == 200
+    response = client.get(event_path, headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.json()["venue"] == "소강당"
+    assert "etag" not in response.headers
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_each_encoding_has_its_own_etag(client, event_path, encoding):
+    identity = client.get(event_path, headers={"Accept-Encoding": "identity"})
+    compressed = client.get(event_path, headers={"Accept-Encoding": encoding})
+    assert "content-encoding" not in identity.headers
+    assert compressed.headers["content-encoding"] == encoding
+    assert compressed.headers["etag"] == identity.headers["etag"][:-1] + f'-{encoding}"'
+    assert "accept-encoding" in identity.headers["vary"].lower()
+
+    # 클라이언트가 어느 인코딩의 ETag를 들고 있든 같은 본문이므로 304이고, 304에는 이번 인코딩의 ETag를 싣는다.
+    for etag in (identity.headers["etag"], compressed.headers["etag"]):
+        response = client.get(event_path, headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == compressed.headers["etag"]
+
+
+def test_concurrent_freeze_serves_the_stored_archive(client, backend, dataset, monkeypatch):
+    # 다른 워커가 이 워커의 "보관본 없음" 확인과 저장 사이에 먼저 보관한 경우
+    event_id = dataset.tournament_ids[0]
+    tournaments = get_repositories().tournaments
+    save_archive = tournaments.save_archive
+
+    def raced(event_id, snapshot, etag):
+        save_archive(event_id, '{"archived_at":"other"}', '"other-worker"')
+        save_archive(event_id, snapshot, etag)
+
+    monkeypatch.setattr(tournaments, "save_archive", raced)
+    client.get(f"/tournaments/{event_id}")
+    stored = [row for row in backend.tables["tournament_archives"] if row["tournament_id"] == event_id]
+    assert [row["etag"] for row in stored] == ['"other-worker"']
+    response = client.get(f"/tournaments/{event_id}", headers={"Accept-Encoding": "identity"})
+    assert response.headers["etag"] == '"other-worker"'
+    assert response.json() == {"archived_at": "other"}
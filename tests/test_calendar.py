@@ -0,0 +1,45 @@
+"""iCalendar 피드의 조건부 요청."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+PATH = "/reservations/calendar.ics"
+
+
+def _free_slot(backend, after: datetime) -> datetime:
+    """피드 기간 안에서 기존 예약과 겹치지 않는 한 시간짜리 구간의 시작 시각."""
+    taken = [(row["starts_at"], row["ends_at"]) for row in backend.tables["reservations"]]
+    slot = after
+    while any(start < (slot + timedelta(hours=1)).isoformat() and slot.isoformat() < end for start, end in taken):
+        slot += timedelta(hours=1)
+    return slot
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_each_encoding_has_its_own_etag(client, backend, encoding):
+    identity = client.get(PATH, headers={"Accept-Encoding": "identity"})
+    compressed = client.get(PATH, headers={"Accept-Encoding": encoding})
+    assert identity.status_code == 200 and compressed.headers["content-encoding"] == encoding
+    assert compressed.headers["etag"] == identity.headers["etag"][:-1] + f'-{encoding}"'
+    assert compressed.headers["last-modified"] == identity.headers["last-modified"]
+
+    for etag in (identity.headers["etag"], compressed.headers["etag"]):
+        response = client.get(PATH, headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+        assert response.status_code == 304 and not response.content
+        assert response.headers["etag"] == compressed.headers["etag"]
+        assert "accept-encoding" in response.headers["vary"].lower()
+
+
+def test_new_reservation_changes_the_feed(client, backend, member):
+    first = client.get(PATH, headers={"Accept-Encoding": "gzip"})
+    since = client.get(PATH, headers={"Accept-Encoding": "gzip", "If-Modified-Since": first.headers["last-modified"]})
+    assert since.status_code == 304
+
+    starts_at = _free_slot(backend, datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=3))
+    body = {"title": "피드 확인", "starts_at": starts_at.isoformat(),
+            "ends_at": (starts_at + timedelta(hours=1)).isoformat()}
+    assert client.post("/reservations", json=body, headers=member).status_code == 200
+    changed = client.get(PATH, headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200 and changed.headers["etag"] != first.headers["etag"]
+    assert "피드 확인" in changed.text
@@ -0,0 +1,116 @@
+"""토론 명단 전체 저장 (PUT /debates/{id}/participants)."""
+
+import uuid
+from typing import Any, Dict, List
+
+import pytest
+
+
+@pytest.fixture
+def debate_id(dataset) -> str:
+    return dataset.debate_ids[0]
+
+
+def _stored(backend, debate_id: str) -> List[dict]:
+    return [row for row in backend.tables["debate_participants"] if row["debate_id"] == debate_id]
+
+
+def _entries(rows: List[dict]) -> List[Dict[str, Any]]:
+    return [{"user_id": row["user_id"], "participant_name": row["participant_name"], "side": row["side"]} for row in rows]
+
+
+def _put(client, admin, debate_id: str, participants: List[Dict[str, Any]], **extra: Any):
+    return client.put(f"/debates/{debate_id}/participants", json={"participants": participants, **extra}, headers=admin)
+
+
+def _wins(client, user_id: str) -> int:
+    return next(row["wins"] for row in client.get("/members/stats").json() if row["user_id"] == user_id)
+
+
+def test_side_swap_updates_rows_in_place(client, backend, admin, debate_id):
+    before = {row["user_id"]: dict(row) for row in _stored(backend, debate_id)}
+    swapped = [{**entry, "side": "con" if entry["side"] == "pro" else "pro"} for entry in _entries(list(before.values()))]
+    response = _put(client, admin, debate_id, swapped)
+    assert response.status_code == 200
+    after = {row["user_id"]: row for row in _stored(backend, debate_id)}
+    assert {user_id: row["id"] for user_id, row in after.items()} == {user_id: row["id"] for user_id, row in before.items()}
+    assert all(after[user_id]["side"] != row["side"] for user_id, row in before.items())
+    # 응답은 찬성 측이 앞이다.
+    sides = [row["side"] for row in response.json()]
+    assert sides == sorted(sides, key=lambda side: side != "pro")
+
+
+def test_guest_is_matched_by_name(client, backend, admin, debate_id):
+    entries = _entries(_stored(backend, debate_id)) + [{"participant_name": "게스트", "side": "pro"}]
+    guest_id = next(row["id"] for row in _put(client, admin, debate_id, entries).json() if row["user_id"] is None)
+
+    entries[-1] = {"participant_name": " 게스트 ", "side": "con"}
+    response = _put(client, admin, debate_id, entries)
+    guests = [row for row in _stored(backend, debate_id) if row["user_id"] is None]
+    assert response.status_code == 200
+    assert [(row["id"], row["participant_name"], row["side"]) for row in guests] == [(guest_id, "게스트", "con")]
+
+
+@pytest.mark.parametrize(
+    "duplicate",
+    [{"participant_name": "게스트", "side": "pro"}, None],
+    ids=["guest", "member"],
+)
+def test_duplicate_entries_are_rejected(client, backend, admin, debate_id, duplicate):
+    entries = _entries(_stored(backend, debate_id)) + [{"participant_name": "게스트", "side": "con"}]
+    entries.append(duplicate or {**entries[0], "side": "con"})
+    before = [dict(row) for row in _stored(backend, debate_id)]
+    assert _put(client, admin, debate_id, entries).status_code == 400
+    assert _stored(backend, debate_id) == before
+
+
+def test_missing_rows_are_deleted(client, backend, admin, dataset, debate_id):
+    rows = _stored(backend, debate_id)
+    kept, dropped = rows[:1], rows[1:]
+    newcomer = next(user_id for user_id in dataset.member_ids if user_id not in {row["user_id"] for row in rows})
+    response = _put(client, admin, debate_id, _entries(kept) + [{"user_id": newcomer, "side": "con"}])
+    assert response.status_code == 200
+    stored = _stored(backend, debate_id)
+    assert {row["user_id"] for row in stored} == {kept[0]["user_id"], newcomer}
+    assert not {row["id"] for row in dropped} & {row["id"] for row in stored}
+
+
+def test_unknown_debate_is_404(client, backend, admin):
+    missing = str(uuid.uuid4())
+    response = _put(client, admin, missing, [{"participant_name": "게스트", "side": "pro"}], winner_side="pro")
+    assert response.status_code == 404
+    assert _stored(backend, missing) == []
+
+
+def test_winner_side_invalidates_member_stats(client, backend, admin, debate_id):
+    rows = _stored(backend, debate_id)
+    debate = next(row for row in backend.tables["debates"] if row["id"] == debate_id)
+    player = rows[0]
+    losing_side = "con" if player["side"] == "pro" else "pro"
+    _put(client, admin, debate_id, _entries(rows), winner_side=losing_side)
+    before = _wins(client, player["user_id"])
+    assert client.get("/members/stats").headers["x-cache"] == "HIT"
+
+    response = _put(client, admin, debate_id, _entries(rows), winner_side=player["side"])
+    assert response.status_code == 200 and debate["winner_side"] == player["side"]
+    assert _wins(client, player["user_id"]) == before + 1
+
+
+def test_member_stats_is_invalidated_even_if_the_write_fails(client, backend, admin, debate_id):
+    rows = _stored(backend, debate_id)
+    player = rows[0]
+    next(row for row in backend.tables["debates"] if row["id"] == debate_id)["winner_side"] = None
+    before = _wins(client, player["user_id"])
+    apply = backend.rpcs["apply_debate_roster"]
+
+    def committed_then_lost(state, params):
+        # DB에는 반영됐지만 응답을 받지 못한 경우
+        apply(state, params)
+        raise ConnectionResetError
+
+    backend.rpcs["apply_debate_roster"] = committed_then_lost
+    try:
+        assert _put(client, admin, debate_id, _entries(rows), winner_side=player["side"]).status_code >= 500
+    finally:
+        backend.rpcs["apply_debate_roster"] = apply
+    assert _wins(client, player["user_id"]) == before + 1
@@ -0,0 +1,148 @@
+"""Idempotency-Key: 재시도 폭주에서도 생성은 한 번만 일어나는지 확인한다.
+
+같은 키의 요청을 스레드로 동시에 보낸다. 요청마다 TestClient가 이벤트 루프를 따로 띄우므로 핸들러가 실제로 겹쳐 돈다.
+공유 저장소(SHARED_CACHE_PATH) 경로는 임시 SQLite 파일로 만든 저장소를 끼워서 같은 시나리오로 본다.
+"""
+
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from app import idempotency
+from app.config import IDEMPOTENCY_LOCK_SECONDS, IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_TTL_SECONDS
+from app.repositories import get_repositories
+from app.shared_cache import SharedCacheStore
+from tests.conftest import DEADLINE
+
+STORM = 12
+SLOT = datetime(2031, 3, 2, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture(params=["memory", "shared"])
+def store(request, backend, tmp_path, monkeypatch):
+    if request.param == "shared":
+        shared = SharedCacheStore(str(tmp_path / "cache.sqlite3"), 1000)
+        monkeypatch.setattr(
+            idempotency,
+            "idempotency_store",
+            idempotency.SharedIdempotencyStore(
+                shared, IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_LOCK_SECONDS
+            ),
+        )
+    return idempotency.idempotency_store
+
+
+def _reservation(days: int = 0, **extra: Any) -> Dict[str, Any]:
+    starts_at = SLOT + timedelta(days=days)
+    return {"title": "연습", "starts_at": starts_at.isoformat(),
+            "ends_at": (starts_at + timedelta(hours=1)).isoformat(), **extra}
+
+
+def _post(client, path: str, headers: Dict[str, str], body: Dict[str, Any], key: str):
+    return client.post(path, json=body, headers={**headers, idempotency.HEADER: key})
+
+
+def _storm(client, path: str, headers: Dict[str, str], body: Dict[str, Any], key: str) -> List[Any]:
+    with ThreadPoolExecutor(STORM) as pool:
+        return list(pool.map(lambda _: _post(client, path, headers, body, key), range(STORM)))
+
+
+def _replayed(responses: List[Any]) -> int:
+    return sum(1 for response in responses if response.headers.get(idempotency.REPLAYED_HEADER) == "true")
+
+
+@pytest.mark.parametrize(
+    ("path", "table", "body"),
+    [
+        ("/reservations", "reservations", _reservation()),
+        ("/tournaments", "tournaments", {"title": "드릴 대회", "starts_on": "2031-03-01", "ends_on": "2031-03-02"}),
+        ("/debates", "debates", {"topic_text": "드릴 토론", "debate_date": "2031-03-01"}),
+    ],
+    ids=["reservations", "tournaments", "debates"],
+)
+def test_concurrent_duplicates_create_one_row(client, backend, store, admin, path, table, body):
+    # 첫 요청이 처리 중일 때 나머지가 도착하도록 upstream 왕복을 늘린다.
+    backend.delay = 0.05
+    before = len(backend.tables[table])
+    responses = _storm(client, path, admin, body, str(uuid.uuid4()))
+    assert [response.status_code for response in responses] == [200] * STORM
+    assert len(backend.tables[table]) - before == 1
+    assert len({response.content for response in responses}) == 1
+    assert _replayed(responses) == STORM - 1
+
+
+def test_completed_key_replays_without_upstream(client, backend, store, member):
+    key = str(uuid.uuid4())
+    first = _post(client, "/reservations", member, _reservation(), key)
+    requests = backend.requests
+    retries = [_post(client, "/reservations", member, _reservation(), key) for _ in range(5)]
+    assert backend.requests == requests
+    assert all(response.content == first.content for response in retries)
+
+
+def test_same_key_with_different_body_is_rejected(client, backend, store, member):
+    key = str(uuid.uuid4())
+    assert _post(client, "/reservations", member, _reservation(), key).status_code == 200
+    response = _post(client, "/reservations", member, _reservation(title="다른 예약"), key)
+    assert response.status_code == 422
+
+
+def test_keys_are_per_user(client, backend, store, admin, member):
+    key = str(uuid.uuid4())
+    body = _reservation(allow_simultaneous=True)
+    before = len(backend.tables["reservations"])
+    mine = _post(client, "/reservations", member, body, key)
+    theirs = _post(client, "/reservations", admin, body, key)
+    assert len(backend.tables["reservations"]) - before == 2
+    assert mine.content != theirs.content
+
+
+def test_client_errors_are_stored(client, backend, store, admin, member):
+    _post(client, "/reservations", member, _reservation(), str(uuid.uuid4()))
+    key = str(uuid.uuid4())
+    conflict = _post(client, "/reservations", admin, _reservation(), key)
+    assert conflict.status_code == 409
+    requests = backend.requests
+    again = [_post(client, "/reservations", admin, _reservation(), key) for _ in range(3)]
+    assert [response.status_code for response in again] == [409] * 3
+    assert backend.requests == requests
+
+
+def test_server_errors_are_not_stored(client, backend, store, member):
+    key = str(uuid.uuid4())
+    before = len(backend.tables["reservations"])
+    # 조회는 재시도되므로 재시도 횟수보다 넉넉히 실패시킨 뒤 되돌린다.
+    backend.fail_next = 10
+    failed = _post(client, "/reservations", member, _reservation(), key)
+    backend.fail_next = 0
+    assert failed.status_code >= 500
+    retried = _post(client, "/reservations", member, _reservation(), key)
+    assert retried.status_code == 200 and idempotency.REPLAYED_HEADER.lower() not in retried.headers
+    assert len(backend.tables["reservations"]) - before == 1
+
+
+def test_retry_while_in_flight_gets_409_after_deadline(client, backend, store, member, monkeypatch):
+    reservations = get_repositories().reservations
+    overlapping = reservations.overlapping
+    entered, release = threading.Event(), threading.Event()
+
+    def blocked(*args: Any, **kwargs: Any):
+        entered.set()
+        release.wait(10)
+        return overlapping(*args, **kwargs)
+
+    monkeypatch.setattr(reservations, "overlapping", blocked)
+    key = str(uuid.uuid4())
+    with ThreadPoolExecutor(1) as pool:
+        first = pool.submit(_post, client, "/reservations", member, _reservation(), key)
+        assert entered.wait(5)
+        monkeypatch.setattr(reservations, "overlapping", overlapping)
+        retry = _post(client, "/reservations", member, _reservation(), key)
+        release.set()
+        first.result()
+    assert retry.status_code == 409 and retry.headers["retry-after"]
+    assert retry.elapsed.total_seconds() >= DEADLINE - 0.1
@@ -0,0 +1,158 @@
+"""쓰기 후 캐시 태그 무효화: 캐시된 조회가 다음 요청에서 바로 새 값을 내는지 본다.
+
+조회를 두 번 해서 HIT까지 확인한 뒤 쓰고, 다음 조회가 MISS로 바뀐 값을 돌려주는지 확인한다.
+"""
+
+from typing import Any, Callable, Dict, Tuple
+
+import pytest
+
+RECORD = {
+    "title": "무효화 확인",
+    "category": "정책",
+    "date": "2031-03-01",
+    "summary": "요약",
+    "keyPoints": ["논점"],
+    "conclusion": "결론",
+    "participants": 4,
+    "participantNames": [],
+}
+
+
+def _warm(client, path: str) -> Any:
+    client.get(path)
+    response = client.get(path)
+    assert response.headers["x-cache"] == "HIT"
+    return response.json()
+
+
+def _fresh(client, path: str) -> Any:
+    response = client.get(path)
+    assert response.status_code == 200 and response.headers["x-cache"] == "MISS"
+    return response.json()
+
+
+# -----------------------------
+# POST/PUT/DELETE /records → GET /records
+# -----------------------------
+@pytest.mark.parametrize("method", ["post", "put", "delete"])
+def test_record_writes_refresh_the_list(client, backend, admin, method):
+    before = _warm(client, "/records")
+    target = backend.tables["records"][0]["id"]
+    if method == "post":
+        response = client.post("/records", json=RECORD, headers=admin)
+    elif method == "put":
+        response = client.put(f"/records/{target}", json=RECORD, headers=admin)
+    else:
+        response = client.delete(f"/records/{target}", headers=admin)
+    assert response.status_code == 200
+
+    after = {row["id"]: row for row in _fresh(client, "/records")}
+    if method == "post":
+        assert len(after) == len(before) + 1 and response.json()["id"] in after
+    elif method == "put":
+        assert after[target]["title"] == RECORD["title"]
+    else:
+        assert target not in after and len(after) == len(before) - 1
+
+
+# -----------------------------
+# 명단/승리 측 변경 → GET /members/stats
+# -----------------------------
+# (대상 회원, 쓰기 요청, 쓰기 전 (승, 전체) → 기대하는 (승, 전체))
+Change = Tuple[str, Callable[[], Any], Callable[[Tuple[int, int]], Tuple[int, int]]]
+
+
+def _stats(rows: Any, user_id: str) -> Tuple[int, int]:
+    row = next(row for row in rows if row["user_id"] == user_id)
+    return row["wins"], row["total"]
+
+
+def _decided_debate(backend) -> Dict[str, Any]:
+    return next(row for row in backend.tables["debates"] if row.get("winner_side"))
+
+
+def _roster(backend, debate_id: str):
+    return [row for row in backend.tables["debate_participants"] if row["debate_id"] == debate_id]
+
+
+def _add(client, backend, admin, dataset) -> Change:
+    debate = _decided_debate(backend)
+    playing = {row["user_id"] for row in _roster(backend, debate["id"])}
+    user_id = next(user_id for user_id in dataset.member_ids if user_id not in playing)
+
+    def write() -> Any:
+        payload = {"debate_id": debate["id"], "user_id": user_id, "side": debate["winner_side"], "participant_name": ""}
+        return client.post(f"/debates/{debate['id']}/participants", json=payload, headers=admin)
+
+    return user_id, write, lambda stats: (stats[0] + 1, stats[1] + 1)
+
+
+def _remove(client, backend, admin, dataset) -> Change:
+    debate = _decided_debate(backend)
+    player = next(row for row in _roster(backend, debate["id"]) if row["side"] == debate["winner_side"])
+    write = lambda: client.delete(f"/debates/{debate['id']}/participants/{player['user_id']}", headers=admin)
+    return player["user_id"], write, lambda stats: (stats[0] - 1, stats[1] - 1)
+
+
+def _winner(client, backend, admin, dataset) -> Change:
+    debate = _decided_debate(backend)
+    player = next(row for row in _roster(backend, debate["id"]) if row["side"] == debate["winner_side"])
+    losing_side = "con" if debate["winner_side"] == "pro" else "pro"
+    write = lambda: client.post(f"/debates/{debate['id']}/winner", params={"winner_side": losing_side}, headers=admin)
+    return player["user_id"], write, lambda stats: (stats[0] - 1, stats[1])
+
+
+@pytest.mark.parametrize("change", [_add, _remove, _winner], ids=["add", "remove", "winner"])
+def test_roster_and_winner_changes_refresh_member_stats(client, backend, admin, dataset, change):
+    user_id, write, expected = change(client, backend, admin, dataset)
+    before = _stats(_warm(client, "/members/stats"), user_id)
+    assert write().status_code == 200
+    assert _stats(_fresh(client, "/members/stats"), user_id) == expected(before)
+
+
+# -----------------------------
+# 대진 저장/결과 입력 → GET /members/{id}/tournaments
+# -----------------------------
+def _open_match(backend, event_id: str) -> Dict[str, Any]:
+    return next(
+        row for row in backend.tables["tournament_matches"]
+        if row["tournament_id"] == event_id and row["status"] != "completed"
+        and row.get("team_a_id") and row.get("team_b_id")
+    )
+
+
+def _member_of(backend, team_id: str) -> str:
+    return next(row["user_id"] for row in backend.tables["tournament_team_members"] if row["team_id"] == team_id)
+
+
+def _entry(history: Dict[str, Any], event_id: str) -> Dict[str, Any]:
+    return next(entry for entry in history["tournaments"] if entry["tournament_id"] == event_id)
+
+
+def test_match_result_refreshes_member_tournaments(client, backend, admin, dataset):
+    event_id = dataset.tournament_ids[-1]
+    match = _open_match(backend, event_id)
+    path = f"/members/{_member_of(backend, match['team_a_id'])}/tournaments"
+    before = _entry(_warm(client, path), event_id)
+
+    response = client.patch(
+        f"/tournaments/{event_id}/matches/{match['id']}/result",
+        json={"team_a_score": 80, "team_b_score": 70},
+        headers=admin,
+    )
+    assert response.status_code == 200
+    after = _entry(_fresh(client, path), event_id)
+    assert (after["played"], after["wins"]) == (before["played"] + 1, before["wins"] + 1)
+
+
+def test_setup_refreshes_member_tournaments(client, backend, admin, dataset):
+    event_id = dataset.tournament_ids[-1]
+    user_id = _member_of(backend, _open_match(backend, event_id)["team_a_id"])
+    path = f"/members/{user_id}/tournaments"
+    assert _entry(_warm(client, path), event_id)["team_name"] != "새 팀"
+
+    teams = [{"client_key": "new", "name": "새 팀", "group_name": "A", "members": [{"user_id": user_id}]}]
+    assert client.put(f"/tournaments/{event_id}/setup", json={"teams": teams}, headers=admin).status_code == 200
+    after = _entry(_fresh(client, path), event_id)
+    assert (after["team_name"], after["played"]) == ("새 팀", 0)
@@ -0,0 +1,31 @@
+"""GET /metrics 접근 제어: 기본은 막고, 관리자 토큰·METRICS_TOKEN·METRICS_PUBLIC으로만 연다."""
+
+import pytest
+
+from app import main
+
+SCRAPER_TOKEN = "scrape-secret"
+
+
+@pytest.mark.parametrize(
+    ("caller", "status"),
+    [("anonymous", 401), ("garbage", 401), ("member", 403), ("admin", 200)],
+)
+def test_metrics_are_closed_by_default(client, admin, member, caller, status):
+    headers = {"anonymous": {}, "garbage": {"Authorization": "Bearer nope"}, "member": member, "admin": admin}[caller]
+    response = client.get("/metrics", headers=headers)
+    assert response.status_code == status
+    if status == 200:
+        assert "http_requests_total" in response.text
+
+
+def test_scraper_token(client, monkeypatch):
+    monkeypatch.setattr(main, "METRICS_TOKEN", SCRAPER_TOKEN)
+    assert client.get("/metrics", headers={"Authorization": f"Bearer {SCRAPER_TOKEN}"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics").status_code == 401
+
+
+def test_public_opt_out(client, monkeypatch):
+    monkeypatch.setattr(main, "METRICS_PUBLIC", True)
+    assert client.get("/metrics").status_code == 200
@@ -0,0 +1,99 @@
+"""진출 확률 시뮬레이션의 조 순위 (app/odds.py).
+
+작은 조의 모든 경기 결과 조합을 시뮬레이션 축에 하나씩 늘어놓고, 벡터화한 순위가 결과마다
+TournamentEngine이 매긴 순위와 같은지 본다. 시드를 고정한 시뮬레이션도 뽑힌 결과를 엔진에 넣어 같은 순위인지 본다.
+"""
+
+import itertools
+import random
+from typing import List
+
+import numpy as np
+import pytest
+
+from app.odds import _Simulation
+from app.standings import DEFAULT_TIEBREAKERS, TournamentEngine
+
+CHAINS = [
+    list(DEFAULT_TIEBREAKERS),
+    ["points", "experience", "head_to_head"],
+    ["head_to_head"],
+    ["wins", "head_to_head", "score_diff"],
+    ["wins"],
+]
+
+
+def _teams(size: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    # 경력점수가 겹치도록 고르는 값을 줄여, 모든 기준이 같아 팀명 순으로 가는 경우도 나오게 한다.
+    return [
+        {"id": f"t{index}", "name": f"{chr(ord('A') + index)}팀", "group_name": "A",
+         "experience_score": rng.choice((1.0, 2.0))}
+        for index in range(size)
+    ]
+
+
+@pytest.mark.parametrize("size", [3, 4, 5])
+@pytest.mark.parametrize("chain", CHAINS, ids="-".join)
+def test_vectorized_rank_matches_engine_for_every_outcome(size, chain):
+    teams = _teams(size, seed=size)
+    pairs = list(itertools.combinations(range(size), 2))
+    outcomes = list(itertools.product((0, 1), repeat=len(pairs)))
+    event = {"tiebreakers": chain, "points_per_win": 3}
+
+    base = TournamentEngine(event, teams, [])
+    simulation = _Simulation(base, len(outcomes), "uniform", np.random.default_rng(0))
+    # _Simulation은 조 안의 팀을 팀명 순으로 둔다. 위 팀 목록도 같은 순서다.
+    wins = np.zeros((len(outcomes), size, size), dtype=np.int16)
+    for s, outcome in enumerate(outcomes):
+        for (a, b), a_lost in zip(pairs, outcome):
+            winner, loser = (b, a) if a_lost else (a, b)
+            wins[s, winner, loser] += 1
+    rows = {row["team_id"]: row for row in base.standings()}
+    order = simulation._rank(wins, [rows[team["id"]] for team in teams])
+
+    for s, outcome in enumerate(outcomes):
+        matches = [
+            {
+                "id": f"m{number}", "stage": "group", "group_name": "A",
+                "team_a_id": teams[a]["id"], "team_b_id": teams[b]["id"],
+                "winner_team_id": teams[b if a_lost else a]["id"], "status": "completed",
+            }
+            for number, ((a, b), a_lost) in enumerate(zip(pairs, outcome))
+        ]
+        expected = [row["team_id"] for row in TournamentEngine(event, teams, matches).standings()]
+        assert [teams[index]["id"] for index in order[s]] == expected, outcome
+
+
+@pytest.mark.parametrize("chain", CHAINS, ids="-".join)
+def test_simulated_groups_rank_like_the_engine(chain):
+    rng = random.Random(11)
+    teams = [{**team, "group_name": group} for group in "AB" for team in _teams(4, seed=ord(group))]
+    for team in teams:
+        team["id"] = f"{team['group_name']}-{team['id']}"
+    matches = []
+    for group in "AB":
+        members = [team for team in teams if team["group_name"] == group]
+        for number, (team_a, team_b) in enumerate(itertools.combinations(members, 2)):
+            match = {"id": f"{group}{number}", "stage": "group", "group_name": group,
+                     "team_a_id": team_a["id"], "team_b_id": team_b["id"], "status": "scheduled"}
+            # 절반은 점수까지 끝난 경기로 두어 score_diff 같은 기준도 값이 생기게 한다.
+            if number % 2:
+                score_a, score_b = rng.randint(50, 100), rng.randint(50, 100)
+                match.update(team_a_score=score_a, team_b_score=score_b, status="completed",
+                             winner_team_id=team_a["id"] if score_a >= score_b else team_b["id"])
+            matches.append(match)
+    event = {"tiebreakers": chain}
+    simulation = _Simulation(TournamentEngine(event, teams, matches), 500, "uniform", np.random.default_rng(7))
+    simulation.run_groups()
+
+    for s in range(simulation.n):
+        played = [
+            {**match, "status": "completed", "winner_team_id": simulation.team_ids[simulation.results[match["id"]][2][s]]}
+            for match in matches
+        ]
+        engine = TournamentEngine(event, teams, played)
+        for group, order in simulation.group_order.items():
+            assert [simulation.team_ids[index] for index in order[s]] == [
+                row["team_id"] for row in engine.standings_by_group[group]
+            ]
@@ -0,0 +1,102 @@
+"""Supabase 장애 주입: stale-while-revalidate, hard TTL, 재시도, deadline, 서킷 브레이커."""
+
+import time
+
+import pytest
+
+from app.cache import response_cache
+from app.metrics import upstream_retries
+from app.resilience import breaker
+from tests.conftest import BREAKER_RESET, BREAKER_THRESHOLD, DEADLINE, HARD_TTL, SOFT_TTL, wait_for_refresh
+
+
+@pytest.fixture
+def event_path(dataset):
+    # 완료된 대회는 보관본으로 응답하므로 응답 캐시를 타는 진행 중 대회를 쓴다.
+    return f"/tournaments/{dataset.tournament_ids[-1]}"
+
+
+def _retries() -> float:
+    # 첫 upstream 호출이 어느 테이블인지는 핸들러에 달렸으므로 전체 재시도 수를 본다.
+    return sum(upstream_retries._values.values())
+
+
+def _event(backend, path):
+    event_id = path.rsplit("/", 1)[-1]
+    return next(row for row in backend.tables["tournaments"] if row["id"] == event_id)
+
+
+def test_slow_upstream_serves_stale_without_waiting(client, backend, event_path):
+    first = client.get(event_path)
+    assert first.status_code == 200 and first.headers["x-cache"] == "MISS"
+    assert client.get(event_path).headers["x-cache"] == "HIT"
+
+    backend.delay = 1.0
+    time.sleep(SOFT_TTL)
+    started = time.perf_counter()
+    stale = client.get(event_path)
+    assert stale.headers["x-cache"] == "STALE"
+    assert time.perf_counter() - started < 0.5
+    assert stale.json() == first.json()
+
+
+def test_outage_serves_stale_with_warning_until_recovery(client, backend, event_path):
+    client.get(event_path)
+    backend.fail_status = 503
+    time.sleep(SOFT_TTL)
+    response = client.get(event_path)
+    assert response.status_code == 200 and response.headers["x-cache"] == "STALE"
+    wait_for_refresh()
+    response = client.get(event_path)
+    assert response.status_code == 200
+    assert "111" in response.headers.get("warning", "")
+
+    backend.fail_status = None
+    _event(backend, event_path)["title"] = "가을 토너먼트 (결선)"
+    client.get(event_path)
+    wait_for_refresh()
+    assert client.get(event_path).json()["title"] == "가을 토너먼트 (결선)"
+
+
+def test_entries_past_hard_ttl_are_not_served(client, backend, event_path):
+    assert client.get(event_path).status_code == 200
+    backend.fail_status = 503
+    time.sleep(HARD_TTL + 0.1)
+    assert client.get(event_path).status_code >= 500
+
+
+def test_transient_5xx_is_retried(client, backend, event_path):
+    response_cache.enabled = False
+    before = _retries()
+    backend.fail_next = 1
+    assert client.get(event_path).status_code == 200
+    assert _retries() > before
+
+
+def test_hung_upstream_ends_at_deadline(client, backend, event_path):
+    response_cache.enabled = False
+    backend.delay = 3.0
+    started = time.perf_counter()
+    response = client.get(event_path)
+    assert response.status_code == 504
+    assert time.perf_counter() - started < DEADLINE + 0.5
+
+
+def test_open_breaker_fails_fast_and_half_open_probe_closes_it(client, backend, event_path):
+    response_cache.enabled = False
+    backend.fail_status = 503
+    for _ in range(BREAKER_THRESHOLD):
+        if breaker("rest").state == "open":
+            break
+        client.get(event_path)
+    assert breaker("rest").state == "open"
+
+    before = backend.requests
+    response = client.get(event_path)
+    assert response.status_code == 503 and response.headers.get("retry-after")
+    assert backend.requests == before
+
+    backend.fail_status = None
+    time.sleep(BREAKER_RESET)
+    assert client.get(event_path).status_code == 200
+    assert breaker("rest").state == "closed"
@@ -0,0 +1,128 @@
+"""쓰기 엔드포인트의 upstream 호출 수를 고정한다.
+
+행마다 upstream을 부르는 코드로 되돌아가면 호출 수가 입력 크기에 따라 늘어나므로 여기서 바로 드러난다.
+관리자 역할 조회가 세지지 않도록 측정 전에 역할 캐시를 채운다. 라우트 예산(@query_budget)은 역할 조회까지
+센 값이므로, 여기서 잰 요청이 예산 경고를 남기면 실패한다.
+"""
+
+import logging
+from typing import Dict, List
+
+import pytest
+
+from app import auth
+from app.tracing import assert_num_queries
+
+BUDGET_WARNING = "upstream query budget"
+
+
+@pytest.fixture(autouse=True)
+def _prime_role_cache(backend, dataset):
+    auth.get_role(dataset.admin_id)
+
+
+@pytest.fixture(autouse=True)
+def _no_budget_warnings(caplog):
+    caplog.set_level(logging.WARNING, logger="app.tracing")
+    yield
+    assert not [record.getMessage() for record in caplog.get_records("call") if BUDGET_WARNING in record.getMessage()]
+
+
+def _roster(backend, debate_id: str) -> List[dict]:
+    return [row for row in backend.tables["debate_participants"] if row["debate_id"] == debate_id]
+
+
+def test_sync_members_lists_users_once(client, backend, admin):
+    users = backend.tables["users"]
+    users[1]["student_id"], users[2]["student_id"] = "20190001", "20190002"
+    csv_text = "\n".join([
+        "이름,학번,학과,기수",
+        f"{users[1]['name']},20190001,{users[1]['major']},{users[1]['generation']}",
+        f"{users[2]['name']},20190002,새학과,{users[2]['generation']}",
+        "신입,20260001,철학과,21기",
+    ])
+    # 회원 목록 1 + 변경 1명 갱신 1 + 신규 1명 계정 생성·프로필 확정 2
+    with assert_num_queries(4) as log:
+        response = client.post("/members/sync", json={"csv_text": csv_text}, headers=admin)
+    assert response.status_code == 200
+    assert (response.json()["created"], response.json()["updated"], response.json()["unchanged"]) == (1, 1, 1)
+    assert log.by_operation()[("users", "select")] == 1
+
+
+@pytest.mark.parametrize("existing", [False, True], ids=["insert", "update"])
+def test_add_participant(client, backend, admin, dataset, existing):
+    debate_id = dataset.debate_ids[0]
+    user_id = _roster(backend, debate_id)[0]["user_id"] if existing else dataset.member_ids[-1]
+    payload = {"debate_id": debate_id, "user_id": user_id, "side": "con", "participant_name": ""}
+    with assert_num_queries(2):
+        response = client.post(f"/debates/{debate_id}/participants", json=payload, headers=admin)
+    assert response.status_code == 200 and response.json()["side"] == "con"
+
+
+def test_replace_participants_writes_once(client, backend, admin, dataset):
+    debate_id = dataset.debate_ids[0]
+    roster = _roster(backend, debate_id)
+    entries: List[Dict[str, str]] = [
+        {"user_id": row["user_id"], "side": "con" if row["side"] == "pro" else "pro"} for row in roster
+    ]
+    entries.append({"participant_name": "게스트", "side": "pro"})
+    # 토론 확인 1 + 명단 조회 1 + 바뀐 행·승리 측을 한 번에 반영하는 RPC 1 (명단 크기와 무관)
+    with assert_num_queries(3):
+        response = client.put(
+            f"/debates/{debate_id}/participants",
+            json={"participants": entries, "winner_side": "pro"},
+            headers=admin,
+        )
+    assert response.status_code == 200 and len(response.json()) == len(entries)
+
+    # 바뀐 것이 없으면 토론 확인과 명단 조회만 한다.
+    with assert_num_queries(2):
+        client.put(f"/debates/{debate_id}/participants", json={"participants": entries}, headers=admin)
+
+
+def _setup(dataset) -> Dict[str, list]:
+    members = dataset.member_ids
+    teams = [
+        {"client_key": key, "name": f"{key}팀", "group_name": "1조",
+         "members": [{"user_id": members[i * 2]}, {"user_id": members[i * 2 + 1]}]}
+        for i, key in enumerate("ABCD")
+    ]
+    matches = [
+        {"client_key": f"m{i}", "starts_at": f"2026-11-0{i + 1}T10:00:00Z", "team_a_key": a, "team_b_key": b}
+        for i, (a, b) in enumerate([("A", "B"), ("C", "D"), ("A", "C"), ("B", "D")])
+    ]
+    return {"teams": teams, "matches": matches}
+
+
+def test_replace_tournament_setup(client, admin, dataset):
+    event_id = dataset.tournament_ids[-1]
+    # 대회·기존 팀 조회 2, 자식 삭제 3, 팀·팀원·경기 insert 3, 갱신된 대회 다시 읽기 4 (팀·경기 수와 무관)
+    with assert_num_queries(12):
+        response = client.put(f"/tournaments/{event_id}/setup", json=_setup(dataset), headers=admin)
+    assert response.status_code == 200
+    assert len(response.json()["teams"]) == 4 and len(response.json()["matches"]) == 4
+
+
+def test_setup_budget_covers_the_role_lookup(client, admin, dataset):
+    # 기본 예산(QUERY_BUDGET=10)보다 많이 부르는 라우트다. 역할 캐시가 비어 있어도 경고가 없어야 한다.
+    auth._role_cache.clear()
+    with assert_num_queries(13):
+        response = client.put(f"/tournaments/{dataset.tournament_ids[-1]}/setup", json=_setup(dataset), headers=admin)
+    assert response.status_code == 200
+
+
+def test_set_match_result_does_not_reload_event(client, backend, admin, dataset):
+    event_id = dataset.tournament_ids[-1]
+    match = next(
+        row for row in backend.tables["tournament_matches"]
+        if row["tournament_id"] == event_id and row.get("team_a_id") and row.get("team_b_id")
+    )
+    # 대회 읽기 4 + 경기 갱신 1. 응답은 다시 읽지 않고 엔진에서 다시 계산한다.
+    with assert_num_queries(5) as log:
+        response = client.patch(
+            f"/tournaments/{event_id}/matches/{match['id']}/result",
+            json={"team_a_score": 80, "team_b_score": 70},
+            headers=admin,
+        )
+    assert response.status_code == 200
+    assert log.by_operation()[("tournament_matches", "update")] == 1
@@ -0,0 +1,176 @@
+"""일정 생성 (app/scheduler.py, POST /tournaments/{id}/schedule/generate)."""
+
+from collections import Counter
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, List, Optional
+
+import pytest
+
+from app.scheduler import Fixture, assign_slots, group_fixtures, knockout_fixtures, slot_clock
+from app.standings import parse_source
+
+KST = timezone(timedelta(hours=9))
+STARTS_AT = datetime(2031, 3, 1, 9, tzinfo=KST)
+MATCH_MINUTES = 40
+VENUES = [("1관", 2), ("2관", 1)]
+
+
+def _groups(teams: int, group_size: int) -> Dict[str, List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for index in range(teams):
+        groups.setdefault(f"{index // group_size + 1}", []).append(f"t{index}")
+    return groups
+
+
+def _schedule(
+    teams: int, group_size: int, advance: int, rest_minutes: int, day_ends_at: Optional[time] = None
+) -> List[Fixture]:
+    fixtures, keys_by_group = group_fixtures(_groups(teams, group_size))
+    fixtures += knockout_fixtures(list(keys_by_group), keys_by_group, advance, third_place=True)
+    clock = slot_clock(STARTS_AT, MATCH_MINUTES, day_ends_at)
+    return assign_slots(fixtures, VENUES, clock, MATCH_MINUTES, rest_minutes)
+
+
+# 조 수·진출 팀 수를 바꿔 부전승이 생기는 대진(6·12자리)과 딱 맞는 대진(8·16자리)을 함께 본다.
+CASES = [(12, 4, 2, 0), (12, 3, 2, 40), (16, 4, 2, 80), (18, 3, 2, 40), (9, 3, 1, 120)]
+
+
+@pytest.fixture(params=CASES, ids=lambda case: "teams{}-size{}-adv{}-rest{}".format(*case))
+def case(request):
+    teams, group_size, advance, rest_minutes = request.param
+    return _schedule(teams, group_size, advance, rest_minutes), rest_minutes
+
+
+def test_every_fixture_is_scheduled_in_time_order(case):
+    fixtures, _ = case
+    assert all(fixture.starts_at is not None and fixture.venue for fixture in fixtures)
+    assert [fixture.starts_at for fixture in fixtures] == sorted(fixture.starts_at for fixture in fixtures)
+
+
+def test_no_team_plays_twice_in_one_slot(case):
+    fixtures, _ = case
+    seats = Counter((fixture.starts_at, team) for fixture in fixtures for team in fixture.teams)
+    assert max(seats.values()) == 1
+
+
+def test_venue_capacity_is_respected(case):
+    fixtures, _ = case
+    capacity = dict(VENUES)
+    usage = Counter((fixture.starts_at, fixture.venue) for fixture in fixtures)
+    assert all(count <= capacity[venue] for (_, venue), count in usage.items())
+
+
+def test_teams_rest_between_matches(case):
+    fixtures, rest_minutes = case
+    gap = timedelta(minutes=MATCH_MINUTES + rest_minutes)
+    starts: Dict[str, List[datetime]] = {}
+    for fixture in fixtures:
+        for team in fixture.teams:
+            starts.setdefault(team, []).append(fixture.starts_at)
+    for times in starts.values():
+        assert all(later - earlier >= gap for earlier, later in zip(times, times[1:]))
+
+
+def test_knockout_starts_after_the_matches_it_depends_on(case):
+    fixtures, rest_minutes = case
+    by_key = {fixture.key: fixture for fixture in fixtures}
+    gap = timedelta(minutes=MATCH_MINUTES + rest_minutes)
+    group_keys: Dict[str, List[str]] = {}
+    for fixture in fixtures:
+        if fixture.stage == "group":
+            group_keys.setdefault(fixture.round_label[:-1], []).append(fixture.key)
+
+    for fixture in fixtures:
+        for text in (fixture.source_a, fixture.source_b):
+            source = parse_source(text)
+            if source is None:
+                continue
+            # 진출 조건이 기대는 경기는 모두 after에 들어 있어야 한다: 조 순위면 그 조의 모든 경기.
+            needed = group_keys[source.ref] if source.kind == "group" else [source.ref]
+            assert set(needed) <= set(fixture.after)
+        for key in fixture.after:
+            assert by_key[key].starts_at + gap <= fixture.starts_at
+
+
+def test_byes_and_third_place_match():
+    # 3개 조 2팀씩 → 6자리 대진: 1·2번 시드(1조·2조 1위)는 부전승으로 4강에 오른다.
+    fixtures = _schedule(9, 3, 2, 0)
+    knockout = {fixture.key: fixture for fixture in fixtures if fixture.stage == "final"}
+    assert sorted(key for key in knockout if key.startswith("KO8-")) == ["KO8-1", "KO8-2"]
+    semis = [knockout["KO4-1"], knockout["KO4-2"]]
+    assert {semis[0].source_a, semis[1].source_a} == {"1", "2"}
+    assert {semis[0].source_b, semis[1].source_b} == {"winner:KO8-1", "winner:KO8-2"}
+
+    third, final = knockout["KO-3rd"], knockout["KO2-1"]
+    assert (third.source_a, third.source_b) == ("loser:KO4-1", "loser:KO4-2")
+    assert third.round_label == "3·4위전" and "KO-3rd" in final.after
+    assert third.starts_at < final.starts_at
+    # 6자리 토너먼트는 부전승과 상관없이 5경기, 여기에 3·4위전
+    assert len(knockout) == 6
+
+
+def test_day_end_pushes_matches_to_the_next_day():
+    fixtures = _schedule(16, 4, 2, 40, day_ends_at=time(12))
+    day_end = timedelta(hours=12 - STARTS_AT.hour)
+    for fixture in fixtures:
+        opening = fixture.starts_at.replace(hour=STARTS_AT.hour, minute=0)
+        assert fixture.starts_at + timedelta(minutes=MATCH_MINUTES) <= opening + day_end
+    assert fixtures[-1].starts_at.date() > STARTS_AT.date()
+
+
+def test_no_venue_is_an_error():
+    fixtures, _ = group_fixtures(_groups(4, 4))
+    with pytest.raises(ValueError):
+        assign_slots(fixtures, [], slot_clock(STARTS_AT, MATCH_MINUTES), MATCH_MINUTES)
+
+
+def _register_teams(client, admin, dataset, event_id: str, groups: Dict[str, List[str]]) -> None:
+    users = iter(dataset.member_ids)
+    teams = [
+        {"client_key": key, "name": f"{group}조 {key}", "group_name": group, "members": [{"user_id": next(users)}]}
+        for group, keys in groups.items()
+        for key in keys
+    ]
+    assert client.put(f"/tournaments/{event_id}/setup", json={"teams": teams}, headers=admin).status_code == 200
+
+
+def test_preview_round_trips_through_setup(client, backend, admin, dataset):
+    event_id = dataset.tournament_ids[-1]
+    _register_teams(client, admin, dataset, event_id, _groups(9, 3))
+    request = {
+        "starts_at": STARTS_AT.isoformat(),
+        "match_minutes": MATCH_MINUTES,
+        "rest_minutes": 40,
+        "venues": [{"name": name, "capacity": capacity} for name, capacity in VENUES],
+        "advance_per_group": 2,
+        "third_place_match": True,
+    }
+    response = client.post(f"/tournaments/{event_id}/schedule/generate", json=request, headers=admin)
+    assert response.status_code == 200
+    preview = response.json()
+    # 미리보기는 저장하지 않는다.
+    assert not [row for row in backend.tables["tournament_matches"] if row["tournament_id"] == event_id]
+
+    response = client.put(f"/tournaments/{event_id}/setup", json=preview, headers=admin)
+    assert response.status_code == 200
+    matches = response.json()["matches"]
+    planned = [(m["round_label"], m["venue"], datetime.fromisoformat(m["starts_at"])) for m in preview["matches"]]
+    stored = [(m["round_label"], m["venue"], datetime.fromisoformat(m["starts_at"])) for m in matches]
+    assert sorted(stored) == sorted(planned)
+
+    # winner:/loser:<client_key>는 저장된 경기 id로 바뀌고, 부전승 자리는 조 순위를 그대로 가리킨다.
+    by_id = {match["id"]: match for match in matches}
+    by_label = {match["round_label"]: match for match in matches}
+    for match in matches:
+        for text in (match["team_a_source_group"], match["team_b_source_group"]):
+            source = parse_source(text)
+            if source is not None and source.kind != "group":
+                assert source.ref in by_id
+    semis = [match for label, match in by_label.items() if label.startswith("4강")]
+    assert len(semis) == 2
+    assert {parse_source(semi["team_a_source_group"]).kind for semi in semis} == {"group"}
+    third = by_label["3·4위전"]
+    losers = {parse_source(third["team_a_source_group"]), parse_source(third["team_b_source_group"])}
+    assert {(source.kind, source.ref) for source in losers} == {("loser", semi["id"]) for semi in semis}
+    assert (third["team_a_name"], third["team_b_name"]) == ("4강 1경기 패자", "4강 2경기 패자")
+    assert datetime.fromisoformat(by_label["결승"]["starts_at"]) > datetime.fromisoformat(third["starts_at"])
@@ -0,0 +1,19 @@
+"""캐시 경로의 응답이 FastAPI 기본 경로(response_model 직렬화)와 같은 형식인지."""
+
+from typing import List
+
+from app.models import Reservation
+from app.serialization import adapter_for
+
+
+def test_reservations_month_keeps_model_datetime_format(client, dataset):
+    path = f"/reservations/month?date={dataset.anchor.isoformat()}"
+    miss = client.get(path)
+    hit = client.get(path)
+    assert miss.status_code == 200 and miss.json()
+    assert hit.headers["x-cache"] == "HIT" and hit.content == miss.content
+
+    adapter = adapter_for(List[Reservation])
+    # 모델로 다시 직렬화해도 바이트가 같아야 한다 (upstream의 '+00:00' 대신 모델의 'Z')
+    assert adapter.dump_json(adapter.validate_json(miss.content)) == miss.content
+    assert all(row["starts_at"].endswith("Z") for row in miss.json())
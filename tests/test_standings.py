@@ -0,0 +1,145 @@
+"""조 순위 동률 기준(tiebreakers), 진출 조건 풀기, 결과 증분 반영."""
+
+import copy
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from app.standings import DEFAULT_TIEBREAKERS, TournamentEngine, tiebreaker_chain
+from bench.standings import build_event, order, play
+
+
+def test_chain_drops_unknown_and_duplicate_names():
+    assert tiebreaker_chain(["wins", "bogus", "wins", "experience"]) == ("wins", "experience")
+
+
+@pytest.mark.parametrize("value", [None, [], ["bogus"]])
+def test_empty_chain_falls_back_to_default(value):
+    assert tiebreaker_chain(value) == DEFAULT_TIEBREAKERS
+
+
+def test_empty_stored_chain_still_ranks_by_points():
+    # 빈 기준으로 순위를 매기면 팀명 순이 되어 진 팀(A)이 1위가 된다.
+    teams = [{"id": "a", "name": "A", "group_name": "1조"}, {"id": "b", "name": "B", "group_name": "1조"}]
+    match = {
+        "id": "m1", "stage": "group", "group_name": "1조", "team_a_id": "a", "team_b_id": "b",
+        "team_a_score": 60, "team_b_score": 70, "winner_team_id": "b", "status": "completed",
+    }
+    engine = TournamentEngine({"tiebreakers": []}, teams, [match])
+    assert [row["team_id"] for row in engine.standings()] == ["b", "a"]
+
+
+@pytest.mark.parametrize("method", ["post", "patch"])
+def test_api_rejects_empty_chain(client, admin, dataset, method):
+    if method == "post":
+        body = {"title": "빈 기준", "starts_on": "2031-03-01", "ends_on": "2031-03-02", "tiebreakers": []}
+        response = client.post("/tournaments", json=body, headers=admin)
+    else:
+        response = client.patch(f"/tournaments/{dataset.tournament_ids[-1]}", json={"tiebreakers": []}, headers=admin)
+    assert response.status_code == 422
+
+
+def _team(team_id: str, group: str, experience: float) -> dict:
+    return {"id": team_id, "name": team_id.upper(), "group_name": group, "experience_score": experience}
+
+
+def _match(match_id: str, team_a: Optional[str] = None, team_b: Optional[str] = None, winner: Optional[str] = None,
+           group: Optional[str] = None, **fields: Any) -> dict:
+    return {
+        "id": match_id, "stage": "group" if group else "final", "group_name": group,
+        "team_a_id": team_a, "team_b_id": team_b, "team_a_score": None, "team_b_score": None,
+        "winner_team_id": winner, "status": "completed" if winner else "scheduled", **fields,
+    }
+
+
+def _round_robin(group: str, winners: Dict[Tuple[str, str], str]) -> List[dict]:
+    return [_match(f"{a}-{b}", a, b, winner, group=group) for (a, b), winner in winners.items()]
+
+
+# A조: x·y 2승, z·w 1승. y가 x를, z가 w를 이겼고 경력점수는 x·w가 낮다(유리하다).
+GROUP_A = {("x", "y"): "y", ("x", "z"): "x", ("x", "w"): "x", ("y", "z"): "y", ("y", "w"): "w", ("z", "w"): "z"}
+TEAMS_A = [_team("x", "A", 1), _team("y", "A", 3), _team("z", "A", 3), _team("w", "A", 1)]
+
+
+@pytest.mark.parametrize(
+    ("chain", "expected"),
+    [
+        (["points", "head_to_head", "experience"], ["y", "x", "z", "w"]),
+        (["points", "experience", "head_to_head"], ["x", "y", "w", "z"]),
+        (["head_to_head"], ["x", "y", "w", "z"]),
+    ],
+)
+def test_multi_key_chain_ranks_within_each_tie(chain, expected):
+    engine = TournamentEngine({"tiebreakers": chain}, TEAMS_A, _round_robin("A", GROUP_A))
+    assert [row["team_id"] for row in engine.standings()] == expected
+
+
+def test_cyclic_head_to_head_falls_through_to_the_next_key():
+    # x·y·z가 서로 한 번씩 이기고 w에게 모두 이겼다. 상대 전적이 모두 1승이라 경력점수로 가른다.
+    winners = {("x", "y"): "x", ("y", "z"): "y", ("x", "z"): "z", ("x", "w"): "x", ("y", "w"): "y", ("z", "w"): "z"}
+    teams = [_team("x", "A", 3), _team("y", "A", 1), _team("z", "A", 2), _team("w", "A", 1)]
+    engine = TournamentEngine({"tiebreakers": list(DEFAULT_TIEBREAKERS)}, teams, _round_robin("A", winners))
+    standings = engine.standings()
+    assert [row["team_id"] for row in standings] == ["y", "z", "x", "w"]
+    assert [row["head_to_head_wins"] for row in standings[:3]] == [1, 1, 1]
+
+
+def test_placeholders_resolve_from_standings_and_results():
+    teams = TEAMS_A + [_team("p", "B", 1), _team("q", "B", 1)]
+    knockout = [
+        _match("s1", team_a_source_group="A", team_b_source_group="B:2", round_label="4강"),
+        _match("s2", team_a_source_group=" B:1 ", team_b_source_group="A:2", round_label="4강"),
+        _match("final", team_a_source_group="winner:s1", team_b_source_group="winner:s2"),
+        _match("third", team_a_source_group="loser:s1", team_b_source_group="loser:s2"),
+        _match("extra", team_a_id="w", team_b_source_group="A:9"),
+    ]
+    matches = _round_robin("A", GROUP_A) + _round_robin("B", {("p", "q"): "p"}) + knockout
+    engine = TournamentEngine({}, teams, matches)
+
+    def pairs() -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        return {m["id"]: (m["resolved_team_a_id"], m["resolved_team_b_id"]) for m in map(engine.decorate, knockout)}
+
+    assert pairs() == {
+        "s1": ("y", "q"), "s2": ("p", "x"), "final": (None, None), "third": (None, None), "extra": ("w", None),
+    }
+    assert (knockout[2]["team_a_name"], knockout[3]["team_b_name"]) == ("4강 승자", "4강 패자")
+    assert knockout[4]["team_b_name"] == "A조 9위"
+
+    engine.apply_result("s1", {"winner_team_id": "q", "status": "completed"})
+    engine.apply_result("s2", {"winner_team_id": "p", "status": "completed"})
+    assert (pairs()["final"], pairs()["third"]) == (("q", "p"), ("y", "x"))
+
+    # 정정으로 x가 3승이 되면 y·z·w가 1승씩 맞물려 경력점수가 낮은 w가 2위로 올라간다.
+    # 조 순위에 기대는 경기와 그 패자가 가는 경기까지 다시 푼다.
+    affected = engine.apply_result("x-y", {"winner_team_id": "x"})
+    assert {"s1", "s2", "third"} <= affected
+    assert (pairs()["s1"], pairs()["s2"], pairs()["third"]) == (("x", "q"), ("p", "w"), ("x", "w"))
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_results_match_a_fresh_engine(seed):
+    event, teams, matches = build_event(4, seed)
+    rng = random.Random(seed)
+    engine = TournamentEngine(event, teams, matches)
+
+    def assert_fresh() -> None:
+        fresh = TournamentEngine(event, copy.deepcopy(teams), copy.deepcopy(matches))
+        assert fresh.resolved == engine.resolved
+        assert order(fresh.standings()) == order(engine.standings())
+
+    # 조별 리그부터 결승까지, 대진이 정해진 경기의 결과를 하나씩 넣는다.
+    while True:
+        ready = [m for m in matches if m["status"] != "completed" and all(engine.resolved[m["id"]])]
+        if not ready:
+            break
+        for match in ready:
+            engine.apply_result(match["id"], play(rng, *engine.resolved[match["id"]]))
+            assert_fresh()
+    assert all(match["status"] == "completed" for match in matches)
+
+    # 끝난 조별 경기의 승자를 뒤집어도(결과 정정) 새로 만든 엔진과 같다.
+    for match in rng.sample([m for m in matches if m["stage"] == "group"], 6):
+        loser_id = match["team_b_id"] if match["winner_team_id"] == match["team_a_id"] else match["team_a_id"]
+        engine.apply_result(match["id"], {"winner_team_id": loser_id})
+        assert_fresh()
@@ -0,0 +1,12 @@
+"""Server-Timing 노출 범위."""
+
+
+def test_server_timing_is_not_sent_to_public_requests(client, member):
+    assert "server-timing" not in client.get("/debates").headers
+    assert "server-timing" not in client.get("/debates", headers={**member, "X-Profile": "sample"}).headers
+
+
+def test_server_timing_is_sent_to_admin_profile_requests(client, admin):
+    response = client.get("/debates", headers={**admin, "X-Profile": "sample"})
+    assert response.headers.get("x-profile-id")
+    assert 'desc="debates select"' in response.headers["server-timing"]